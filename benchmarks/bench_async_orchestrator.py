@@ -0,0 +1,108 @@
+# python
+"""
+Wall-clock time of seven lookup pipelines: serial sync Orchestrator runs vs concurrent AsyncOrchestrator.
+
+Every extract and load sleeps for a simulated round-trip; the sync adapters are reused
+unchanged through the to_thread shims:
+    python benchmarks/bench_async_orchestrator.py [--entities 7] [--batches 5] [--rtt-ms 30] [--dest-limit 4]
+
+Expected shape: serial ~= entities * batches * (E + L); async ~= batches * E + entities *
+batches * L / dest-limit once loads saturate the destination limit.
+"""
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from application.services.async_orchestrator import AsyncOrchestrator, EndpointLimits, run_pipelines  # noqa: E402
+from application.services.orchestrator import Orchestrator  # noqa: E402
+from application.services.simple_examples import CountryIn, CountryTranslator  # noqa: E402
+from core.ports.etl_ports import LoadResult  # noqa: E402
+
+
+class RoundTripExtractor:
+    def __init__(self, rows, rtt):
+        self._rows = rows
+        self._rtt = rtt
+
+    def extract_batch(self, since, limit):
+        time.sleep(self._rtt)
+        return [r for r in self._rows if since is None or r.last_updated > since][:limit]
+
+
+class RoundTripLoader:
+    def __init__(self, rtt):
+        self._rtt = rtt
+
+    def load_batch(self, items, batch_id):
+        time.sleep(self._rtt)
+        return LoadResult(inserted=len(list(items)), updated=0, errors=[])
+
+
+def make_rows(n):
+    base = datetime(2020, 1, 1)
+    return [CountryIn(mb_id=i, iso_code=None, name=f'Name {i}', last_updated=base + timedelta(seconds=i))
+            for i in range(n)]
+
+
+def run_serial(args, rows, rtt) -> float:
+    t0 = time.perf_counter()
+    for _ in range(args.entities):
+        state = {'ts': None}
+
+        def persist(max_ts, batch_id, read_only=False):
+            if read_only:
+                return state['ts']
+            state['ts'] = max_ts
+
+        Orchestrator(RoundTripExtractor(rows, rtt), CountryTranslator(), RoundTripLoader(rtt),
+                     batch_size=args.batch_size).run_full_load(persist)
+    return time.perf_counter() - t0
+
+
+def run_async(args, rows, rtt) -> float:
+    limits = EndpointLimits({'destination': args.dest_limit, 'source': args.source_limit})
+
+    async def main():
+        return await run_pipelines({
+            f'entity{i}': AsyncOrchestrator(RoundTripExtractor(rows, rtt), CountryTranslator(), RoundTripLoader(rtt),
+                                            batch_size=args.batch_size, limits=limits
+                                            ).run_full_load(lambda ts, batch_id: None)
+            for i in range(args.entities)
+        })
+
+    t0 = time.perf_counter()
+    errors = asyncio.run(main())
+    assert not any(errors.values()), errors
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--entities', type=int, default=7)
+    ap.add_argument('--batches', type=int, default=5)
+    ap.add_argument('--batch-size', type=int, default=200)
+    ap.add_argument('--rtt-ms', type=float, default=30)
+    ap.add_argument('--dest-limit', type=int, default=4)
+    ap.add_argument('--source-limit', type=int, default=4)
+    args = ap.parse_args()
+    rows = make_rows(args.batches * args.batch_size)
+    rtt = args.rtt_ms / 1000.0
+
+    serial = run_serial(args, rows, rtt)
+    concurrent = run_async(args, rows, rtt)
+    print(f'entities={args.entities} batches={args.batches} rtt_ms={args.rtt_ms} '
+          f'limits(source,destination)=({args.source_limit},{args.dest_limit})')
+    print(f'serial sync:      {serial:.3f}s')
+    print(f'concurrent async: {concurrent:.3f}s')
+    print(f'speedup:          {serial / concurrent:.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# python
+"""
+Fixed vs adaptive batch size on a simulated entity with per-batch overhead and a size penalty.
+
+Each batch sleeps overhead + rows * per_row, plus a penalty for rows beyond --knee (standing in for
+lock escalation / log growth on very large MERGEs):
+    python benchmarks/bench_batch_sizing.py [--rows 200000] [--overhead-ms 20] [--per-row-us 5] [--knee 20000]
+
+Expected shape: small fixed batches pay the overhead per batch; the adaptive controller grows
+until it reaches the target latency or the knee, and ends near the best fixed size.
+"""
+import argparse
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from application.services.batch_sizing import AdaptiveBatchController  # noqa: E402
+from application.services.orchestrator import Orchestrator  # noqa: E402
+from application.services.simple_examples import CountryIn, CountryTranslator  # noqa: E402
+from core.ports.etl_ports import LoadResult  # noqa: E402
+
+
+class RangeExtractor:
+    """Serves rows by timestamp cursor; row i was updated at base + i seconds."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._base = rows[0].last_updated
+
+    def extract_batch(self, since, limit):
+        start = 0 if since is None else int((since - self._base).total_seconds()) + 1
+        return self._rows[start:start + limit]
+
+
+class CostModelLoader:
+    def __init__(self, overhead, per_row, knee):
+        self.overhead, self.per_row, self.knee = overhead, per_row, knee
+
+    def load_batch(self, items, batch_id):
+        n = len(items)
+        time.sleep(self.overhead + n * self.per_row + max(0, n - self.knee) * self.per_row * 3)
+        return LoadResult(inserted=n, updated=0, errors=[])
+
+
+def run(rows, loader, batch_size, sizer=None):
+    state = {'ts': None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state['ts']
+        state['ts'] = max_ts
+
+    orch = Orchestrator(RangeExtractor(rows), CountryTranslator(), loader, batch_size=batch_size, batch_sizer=sizer)
+    t0 = time.perf_counter()
+    orch.run_full_load(persist)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=200_000)
+    ap.add_argument('--overhead-ms', type=float, default=20.0)
+    ap.add_argument('--per-row-us', type=float, default=5.0)
+    ap.add_argument('--knee', type=int, default=20_000)
+    ap.add_argument('--target-s', type=float, default=0.5)
+    args = ap.parse_args()
+    base = datetime(2020, 1, 1)
+    rows = [CountryIn(mb_id=i, iso_code=None, name=f'Country {i}', last_updated=base + timedelta(seconds=i))
+            for i in range(args.rows)]
+    loader = CostModelLoader(args.overhead_ms / 1000, args.per_row_us / 1e6, args.knee)
+
+    print(f'rows={args.rows} overhead={args.overhead_ms}ms per_row={args.per_row_us}us knee={args.knee}')
+    for size in (500, 5000, 20000, 50000):
+        print(f'fixed {size:>6}: {run(rows, loader, size):6.2f}s')
+    sizer = AdaptiveBatchController(initial=500, min_size=100, max_size=100_000, target_latency_s=args.target_s)
+    elapsed = run(rows, loader, 500, sizer)
+    sizes = [d.new_size for d in sizer.decisions]
+    print(f'adaptive     : {elapsed:6.2f}s  sizes {sizes[0]} .. {sizes[-1]} (max {max(sizes)}, {len(sizes)} batches)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+# python
+"""
+Blocking-index candidate matching of artist batches against a large destination index.
+
+Builds a BlockingIndex of --artists names (built from a Zipf-weighted syllable inventory, with
+repeated names and country / NULL-country partitions like MusicBrainz), then matches batches of
+incoming rows - exact names, one-character typos and unseen names - with CandidateMatcher:
+    python benchmarks/bench_candidate_matcher.py [--artists 2000000] [--batch 500] [--batches 5]
+
+Expected shape: cost per row is bounded by BlockingIndex.max_probe_rows, not by the index
+size. A 500-row batch of exact names matches in ~10 ms at 2M artists. Rows needing fuzzy
+candidates (typos, unseen names) cost ~0.2-0.5 ms each, so a mixed batch takes ~100 ms.
+Lowering max_probe_rows trades typo recall for speed. Building the 2M-artist index takes
+about 80 s.
+"""
+import argparse
+import pathlib
+import random
+import sys
+import time
+from collections import Counter
+from itertools import accumulate
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from application.services.candidate_matcher import BlockingIndex, CandidateMatcher  # noqa: E402
+
+ONSETS = ['', 'b', 'br', 'c', 'ch', 'd', 'dr', 'f', 'g', 'gr', 'h', 'j', 'k', 'kr', 'l', 'm', 'n', 'p',
+          'pr', 'r', 's', 'sh', 'st', 't', 'tr', 'v', 'w', 'z']
+NUCLEI = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ou', 'y']
+CODAS = ['', '', 'n', 'r', 's', 'l', 'x', 'nd', 'rk', 'st']
+COUNTRIES = 120
+
+
+def syllables():
+    return [o + n + c for o in ONSETS for n in NUCLEI for c in CODAS]
+
+
+def names(rng, n):
+    sylls = syllables()
+    weights = list(accumulate(1.0 / (r ** 0.8) for r in range(1, len(sylls) + 1)))
+    seen = []
+    for _ in range(n):
+        if seen and rng.random() < 0.05:
+            yield rng.choice(seen)  # shared names ("John Smith")
+            continue
+        words = [''.join(rng.choices(sylls, cum_weights=weights, k=rng.randint(1, 3))) for _ in range(rng.choice((1, 2, 2, 3)))]
+        name = ' '.join(w.capitalize() for w in words)
+        if len(seen) < 10_000:
+            seen.append(name)
+        yield name
+
+
+def country(rng):
+    return None if rng.random() < 0.15 else min(COUNTRIES - 1, int(rng.paretovariate(1.2)) - 1)
+
+
+def typo(rng, name):
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice('aeioulnrst') + name[i + 1:]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--artists', type=int, default=2_000_000)
+    ap.add_argument('--batch', type=int, default=500)
+    ap.add_argument('--batches', type=int, default=5)
+    args = ap.parse_args()
+    rng = random.Random(7)
+
+    index = BlockingIndex()
+    sample = []
+    t0 = time.perf_counter()
+    for target_id, name in enumerate(names(rng, args.artists), 1):
+        row = (target_id, name, country(rng), rng.random() < 0.3)
+        index.add(*row)
+        if rng.random() < 0.001:
+            sample.append(row)
+    print(f'index: {len(index)} artists in {time.perf_counter() - t0:.1f}s')
+
+    matcher = CandidateMatcher(index)
+    fresh = names(random.Random(99), args.batch * args.batches * 2)
+    kinds = {'exact': lambda r: r[1], 'typo': lambda r: typo(rng, r[1]), 'unseen': lambda r: next(fresh)}
+    print(f'{"rows":<8} {"batch ms":>9} {"us/row":>8}  decisions')
+    for label, make in list(kinds.items()) + [('mixed', None)]:
+        timings, decisions = [], Counter()
+        for _ in range(args.batches):
+            rows = []
+            for i in range(args.batch):
+                target = rng.choice(sample)
+                kind = make or kinds[rng.choice(('exact', 'exact', 'typo', 'unseen'))]
+                rows.append({'source_id': i, 'name': kind(target), 'country_id': target[2], 'is_group': target[3]})
+            t0 = time.perf_counter()
+            results = matcher.match_batch(rows)
+            timings.append(time.perf_counter() - t0)
+            decisions.update(r.decision for r in results)
+        ms = sorted(timings)[len(timings) // 2] * 1000
+        print(f'{label:<8} {ms:>9.1f} {ms * 1000 / args.batch:>8.1f}  {dict(decisions)}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+# python
+"""
+Connect-per-batch vs. a shared ConnectionPool for concurrent pipeline threads.
+
+Simulates a driver whose connect (TCP + TLS + login) costs --connect-ms and whose batches
+hold a connection for --batch-ms, then runs --threads workers doing --batches batches each:
+    python benchmarks/bench_connection_pool.py [--threads 4] [--batches 50] [--connect-ms 40] [--batch-ms 5]
+
+Expected shape: the pool pays the connect cost once per connection instead of once per batch;
+with max_size below the thread count the wall time grows and the checkout wait p95 shows it.
+"""
+import argparse
+import pathlib
+import sys
+import threading
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.pool import ConnectionPool  # noqa: E402
+
+
+class SlowConnection:
+    def __init__(self, connect_s):
+        time.sleep(connect_s)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def run_threads(threads, body):
+    workers = [threading.Thread(target=body) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--threads', type=int, default=4)
+    ap.add_argument('--batches', type=int, default=50)
+    ap.add_argument('--connect-ms', type=float, default=40.0)
+    ap.add_argument('--batch-ms', type=float, default=5.0)
+    args = ap.parse_args()
+    connect_s, batch_s = args.connect_ms / 1000, args.batch_ms / 1000
+
+    def per_batch():
+        for _ in range(args.batches):
+            conn = SlowConnection(connect_s)
+            time.sleep(batch_s)
+            conn.close()
+
+    elapsed = run_threads(args.threads, per_batch)
+    print(f'{"connect per batch":<24} {elapsed:6.2f}s  connects={args.threads * args.batches}')
+
+    for max_size in sorted({args.threads, max(1, args.threads // 2)}, reverse=True):
+        pool = ConnectionPool(lambda: SlowConnection(connect_s), min_size=0, max_size=max_size,
+                              reset=lambda c: c.rollback())
+
+        def pooled():
+            for _ in range(args.batches):
+                with pool.checkout():
+                    time.sleep(batch_s)
+
+        elapsed = run_threads(args.threads, pooled)
+        s = pool.stats()
+        print(f'{f"pool max_size={max_size}":<24} {elapsed:6.2f}s  connects={s.created} waited={s.waited} '
+              f'wait p95<={s.wait.quantile(0.95) * 1000:.1f}ms')
+        pool.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
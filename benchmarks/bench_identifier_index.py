@@ -0,0 +1,89 @@
+# python
+"""
+Memory footprint and batch lookup rate of the mmap identifier index versus an in-process dict.
+
+Builds an MB id -> identity id map with gaps in the id space (like real MB ids), then resolves
+random batches of child-entity parent ids and appends + compacts a MERGE-sized delta:
+    python benchmarks/bench_identifier_index.py [--mappings 2000000] [--batch 5000]
+
+Expected shape: the index adds almost nothing to the Python heap (pages live in the OS cache)
+while a dict costs on the order of 100 bytes per mapping; the index resolves around an order of
+magnitude fewer ids/s than a dict, which is still far below one database round-trip per batch.
+"""
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.local.identifier_index import MmapIdentifierIndex  # noqa: E402
+
+
+def source_pairs(n: int):
+    for i in range(n):
+        yield 3 * i + 1, i + 1
+
+
+def heap_bytes(build) -> tuple:
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def lookup_rate(lookup, batches) -> float:
+    t0 = time.perf_counter()
+    rows = 0
+    for batch in batches:
+        lookup(batch)
+        rows += len(batch)
+    return rows / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--mappings', type=int, default=2_000_000)
+    ap.add_argument('--batch', type=int, default=5_000)
+    ap.add_argument('--batches', type=int, default=200)
+    args = ap.parse_args()
+    rng = random.Random(42)
+    batches = [[rng.randrange(1, 3 * args.mappings) for _ in range(args.batch)] for _ in range(args.batches)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = MmapIdentifierIndex(tmp, durable=False)
+        t0 = time.perf_counter()
+        index.rebuild('Artist', source_pairs(args.mappings))
+        build_s = time.perf_counter() - t0
+
+        mapping, dict_heap = heap_bytes(lambda: dict(source_pairs(args.mappings)))
+        _, index_heap = heap_bytes(lambda: index.lookup_many('Artist', batches[0]))
+
+        dict_rate = lookup_rate(lambda b: [mapping.get(k) for k in b], batches)
+        index_rate = lookup_rate(lambda b: index.lookup_many('Artist', b), batches)
+        assert index.lookup_many('Artist', batches[0]) == [mapping.get(k) for k in batches[0]]
+
+        delta = {3 * args.mappings + 3 * i + 1: args.mappings + i + 1 for i in range(args.batch)}
+        t0 = time.perf_counter()
+        index.add('Artist', delta)
+        add_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        index.compact('Artist')
+        compact_s = time.perf_counter() - t0
+        index.close()
+
+    print(f'mappings={args.mappings:,} batch={args.batch:,} batches={args.batches}')
+    print(f'{"store":>8} {"heap MB":>10} {"lookups/s":>12}')
+    print(f'{"dict":>8} {dict_heap / 2**20:>10,.1f} {dict_rate:>12,.0f}')
+    print(f'{"mmap":>8} {index_heap / 2**20:>10,.1f} {index_rate:>12,.0f}')
+    print(f'build {build_s:.2f}s  add({args.batch:,}) {add_ms:.1f}ms  compact {compact_s:.2f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+# python
+"""
+Per-page latency of OFFSET vs keyset (seek) pagination as the run advances through the table.
+
+Uses an on-disk SQLite stand-in for the MusicBrainz artist table so it runs anywhere:
+    python benchmarks/bench_keyset_pagination.py [--rows 1000000] [--page 500]
+
+Expected shape: OFFSET latency grows linearly with the offset, keyset latency stays flat.
+"""
+import argparse
+import pathlib
+import sqlite3
+import tempfile
+import time
+
+
+class SQLiteArtistSource:
+    """SourceRepository stand-in with the same paging SQL shape as PostgresRepository."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def fetch_artists_batch(self, offset, limit):
+        cur = self._conn.execute(
+            'SELECT id, name, sort_name, country FROM artist ORDER BY id LIMIT ? OFFSET ?', (limit, offset))
+        return cur.fetchall()
+
+    def fetch_artists_after(self, after_id, limit):
+        cur = self._conn.execute(
+            'SELECT id, name, sort_name, country FROM artist WHERE id > ? ORDER BY id LIMIT ?',
+            (after_id or 0, limit))
+        return cur.fetchall()
+
+
+def build_table(path: str, rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE artist (id INTEGER PRIMARY KEY, name TEXT, sort_name TEXT, country TEXT)')
+    conn.executemany(
+        'INSERT INTO artist VALUES (?, ?, ?, ?)',
+        ((i, f'Artist {i}', f'{i}, Artist', 'GB' if i % 3 else None) for i in range(1, rows + 1)))
+    conn.commit()
+    return conn
+
+
+def time_page(fn, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=1_000_000)
+    ap.add_argument('--page', type=int, default=500)
+    ap.add_argument('--points', type=int, default=8)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_table(str(pathlib.Path(tmp) / 'artist.db'), args.rows)
+        src = SQLiteArtistSource(conn)
+        print(f'rows={args.rows} page={args.page}')
+        print(f'{"position":>12} {"offset_ms":>10} {"keyset_ms":>10}')
+        step = max(1, (args.rows - args.page) // max(1, args.points - 1))
+        for position in range(0, args.rows - args.page + 1, step):
+            offset_ms = time_page(src.fetch_artists_batch, position, args.page)
+            # ids are 1..N, so the last id before `position` is `position` itself
+            keyset_ms = time_page(src.fetch_artists_after, position, args.page)
+            print(f'{position:>12} {offset_ms:>10.3f} {keyset_ms:>10.3f}')
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+# python
+"""
+Orchestrator memory budget: peak memory of a run whose extractor ignores `limit`.
+
+Streams wide rows from an extractor that returns everything newer than `since` in one page
+(as the in-memory extractors do) through a translator and a slow loader, sequentially and
+pipelined, with and without a MemoryBudget, and reports the tracemalloc peak:
+    python benchmarks/bench_memory_budget.py [--rows 20000] [--width 2000] [--budget-mb 8]
+
+Expected shape: without a budget the peak grows with the page (every row plus its translated
+copy at once). With one it stays near the budget at any page size; pipelined runs spill the
+chunks that do not fit and pay for it in write / read time rather than memory.
+"""
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from core.ports.etl_ports import LoadResult  # noqa: E402
+from application.services.memory_budget import MemoryBudget  # noqa: E402
+from application.services.orchestrator import Orchestrator  # noqa: E402
+
+BASE = datetime(2024, 1, 1)
+
+
+class GreedyExtractor:
+    """Timestamp-only extractor returning every newer row in one generator page."""
+
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+
+    def extract_batch(self, since, limit):
+        for i in range(self.rows):
+            ts = BASE + timedelta(seconds=i)
+            if since is None or ts > since:
+                yield {'id': i, 'name': f'artist {i} ' + 'x' * self.width, 'last_updated': ts}
+
+
+class Translator:
+    def translate_batch(self, items):
+        return [{'source_id': str(r['id']), 'name': r['name'].upper(), 'source_updated_at': r['last_updated']}
+                for r in items]
+
+
+class Loader:
+    def __init__(self, delay):
+        self.delay = delay
+        self.rows = 0
+
+    def load_batch(self, items, batch_id):
+        self.rows += len(items)
+        time.sleep(self.delay)
+        return LoadResult(inserted=len(items), updated=0, errors=[])
+
+
+def run(args, pipelined, budget):
+    loader = Loader(args.load_delay)
+    orch = Orchestrator(GreedyExtractor(args.rows, args.width), Translator(), loader, batch_size=args.batch,
+                        pipelined=pipelined, queue_depth=args.queue_depth, memory_budget=budget)
+    tracemalloc.start()
+    started = time.perf_counter()
+    orch.run_full_load(lambda ts, batch_id: None)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert loader.rows == args.rows
+    return peak, seconds, orch.memory_report
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=20_000)
+    ap.add_argument('--width', type=int, default=2000, help='bytes of text per row')
+    ap.add_argument('--batch', type=int, default=5000)
+    ap.add_argument('--budget-mb', type=float, default=8)
+    ap.add_argument('--queue-depth', type=int, default=16)
+    ap.add_argument('--load-delay', type=float, default=0.05, help='seconds per loaded batch')
+    args = ap.parse_args()
+
+    print(f"{'mode':<11} {'budget':<8} {'peak MiB':>9} {'est. MiB':>9} {'spilled':>8} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as spill_dir:
+        for pipelined in (False, True):
+            for budgeted in (False, True):
+                budget = MemoryBudget(int(args.budget_mb * 2**20), spill_dir=spill_dir) if budgeted else None
+                peak, seconds, report = run(args, pipelined, budget)
+                estimate = f'{report.peak_bytes / 2**20:.1f}' if report else '-'
+                spilled = report.spilled_chunks if report else '-'
+                print(f"{'pipelined' if pipelined else 'sequential':<11} {'yes' if budgeted else 'no':<8} "
+                      f'{peak / 2**20:>9.1f} {estimate:>9} {spilled:>8} {seconds:>8.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+# python
+"""
+Rows/sec of the staging + MERGE loader versus row-by-row upserts on a local stand-in engine.
+
+SQLite plays SQL Server: the loader runs unchanged except for a SQLite flavour of the staging
+and MERGE statements (UPDATE ... FROM + INSERT ... SELECT, both set-based). Text keys match on
+normalize_name, registered as a SQLite function with an expression index on the target. An
+optional per-statement latency models the network round-trip to a real server:
+    python benchmarks/bench_merge_loader.py [--rows 50000] [--batch-size 5000] [--rtt-ms 0.5]
+"""
+import argparse
+import dataclasses
+import pathlib
+import sqlite3
+import sys
+import time
+from uuid import uuid4
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.sqlserver.merge_loader import BulkMergeLoader, SqlServerMergeDialect  # noqa: E402
+from adapters.sqlserver.tables import TABLES  # noqa: E402
+from core.normalization import normalize_name  # noqa: E402
+
+
+class StandInConnection:
+    """sqlite3 connection with the SQLServerConnection surface and a simulated round-trip."""
+
+    def __init__(self, rtt: float):
+        self._db = sqlite3.connect(':memory:')
+        self._db.execute("ATTACH DATABASE ':memory:' AS music")
+        self._db.create_function('match_key', 1, normalize_name, deterministic=True)
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def _trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def execute(self, query, params=()):
+        self._trip()
+        return self._db.execute(query, params)
+
+    def executemany(self, query, rows):
+        self._trip()
+        return self._db.executemany(query, rows)
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+
+def _match_key(spec, table, k):
+    """Target-side key expression and the staging column it is compared with."""
+    column = f'{table}.{k}' if table else k
+    if k in {c.name for c in spec.match_columns}:
+        return f'match_key({column})', spec.normalized_column(k)
+    return column, k
+
+
+def create_target(conn: StandInConnection, spec):
+    cols = ', '.join(f'"{c}"' for c in spec.column_names)
+    conn._db.execute(f'CREATE TABLE {spec.qualified_name} ("{spec.id_column}" INTEGER PRIMARY KEY, {cols}, '
+                     f'UNIQUE ({", ".join(spec.key)}))')
+    key = ', '.join(_match_key(spec, '', k)[0] for k in spec.key)
+    conn._db.execute(f'CREATE INDEX music.ix_{spec.name}_match ON {spec.name} ({key})')
+
+
+class SQLiteMergeDialect(SqlServerMergeDialect):
+    def prepare_staging_sql(self, spec):
+        staged = spec.column_names + tuple(spec.normalized_column(c.name) for c in spec.match_columns)
+        cols = ', '.join(f'"{c}"' for c in staged)
+        return ['DROP TABLE IF EXISTS temp.stg',
+                f'CREATE TEMP TABLE stg (RowNo INTEGER PRIMARY KEY, BatchId, SourceId, {cols})']
+
+    def insert_staging_sql(self, spec):
+        staged = ('BatchId', 'SourceId') + spec.column_names + tuple(
+            spec.normalized_column(c.name) for c in spec.match_columns)
+        cols = ', '.join(f'"{c}"' for c in staged)
+        return f'INSERT INTO temp.stg ({cols}) VALUES ({", ".join("?" for _ in staged)})'
+
+    def merge(self, conn, spec):
+        key = ', '.join(spec.key)
+        returned = ', '.join(spec.key + spec.output_columns)
+        cols = ', '.join(spec.column_names)
+        group = ', '.join(_match_key(spec, 'stg', k)[1] for k in spec.key)
+        src = f'(SELECT * FROM temp.stg WHERE RowNo IN (SELECT MAX(RowNo) FROM temp.stg GROUP BY {group}))'
+
+        def on(table):
+            return ' AND '.join(f'{expr} IS s.{staged}'
+                                for expr, staged in (_match_key(spec, table, k) for k in spec.key))
+
+        changed = ' OR '.join(f'{spec.qualified_name}.{c} IS NOT s.{c}' for c in spec.non_key_columns) or '0'
+        sets = ', '.join(f'{c} = s.{c}' for c in spec.non_key_columns)
+        out = []
+        if sets:
+            match = on(spec.qualified_name)
+            rows = conn.execute(f'UPDATE {spec.qualified_name} SET {sets} FROM {src} AS s '
+                                f'WHERE {match} AND ({changed}) RETURNING {spec.id_column}, NULL, {returned}').fetchall()
+            out += [('UPDATE',) + tuple(r) for r in rows]
+        rows = conn.execute(f'INSERT INTO {spec.qualified_name} ({cols}) SELECT {cols} FROM {src} AS s '
+                            f'WHERE NOT EXISTS (SELECT 1 FROM {spec.qualified_name} t WHERE {on("t")}) '
+                            f'RETURNING {spec.id_column}, NULL, {returned}').fetchall()
+        out += [('INSERT',) + tuple(r) for r in rows]
+        return out
+
+
+def row_by_row(conn, spec, items):
+    """The pattern the MERGE replaces: one SELECT plus one INSERT or UPDATE per row."""
+    key_idx = [spec.column_names.index(k) for k in spec.key]
+    where = ' AND '.join(f'{k} IS ?' for k in spec.key)
+    sets = ', '.join(f'{c} = ?' for c in spec.non_key_columns)
+    non_key_idx = [spec.column_names.index(c) for c in spec.non_key_columns]
+    for it in items:
+        values = spec.row_values(it)
+        key = [values[i] for i in key_idx]
+        found = conn.execute(f'SELECT {spec.id_column} FROM {spec.qualified_name} WHERE {where}', key).fetchone()
+        if found:
+            conn.execute(f'UPDATE {spec.qualified_name} SET {sets} WHERE {spec.id_column} = ?',
+                         [values[i] for i in non_key_idx] + [found[0]])
+        else:
+            conn.execute(f'INSERT INTO {spec.qualified_name} ({", ".join(spec.column_names)}) '
+                         f'VALUES ({", ".join("?" for _ in values)})', values)
+    conn.commit()
+
+
+def make_artists(n, generation):
+    return [{'name': f'Artist {i}', 'sort_name': f'{i}, Artist', 'country_id': i % 200 or None,
+             'is_group': bool(i % 3), 'description': f'rev {generation}' if i % 4 == 0 else None}
+            for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=50_000)
+    ap.add_argument('--batch-size', type=int, default=5_000)
+    ap.add_argument('--rtt-ms', type=float, default=0.2)
+    args = ap.parse_args()
+    # the stand-in has no music.Identifier and the rows carry no MB id: bench the natural-key MERGE
+    spec = dataclasses.replace(TABLES['Artist'], identified=False)
+
+    print(f'table={spec.name} rows={args.rows} batch_size={args.batch_size} rtt_ms={args.rtt_ms}')
+    print(f'{"pass":>8} {"mode":>12} {"rows/s":>12} {"round trips":>12}')
+    set_conn, rbr_conn = StandInConnection(args.rtt_ms / 1000), StandInConnection(args.rtt_ms / 1000)
+    create_target(set_conn, spec)
+    create_target(rbr_conn, spec)
+    loader = BulkMergeLoader(set_conn, spec, dialect=SQLiteMergeDialect())
+    for generation, label in ((0, 'insert'), (1, 'update')):
+        items = make_artists(args.rows, generation)
+
+        set_conn.round_trips = 0
+        t0 = time.perf_counter()
+        for i in range(0, len(items), args.batch_size):
+            loader.load_batch(items[i:i + args.batch_size], uuid4())
+        merge_rate = len(items) / (time.perf_counter() - t0)
+        print(f'{label:>8} {"staging+MERGE":>12} {merge_rate:>12,.0f} {set_conn.round_trips:>12,}')
+
+        rbr_conn.round_trips = 0
+        t0 = time.perf_counter()
+        row_by_row(rbr_conn, spec, items)
+        rbr_rate = len(items) / (time.perf_counter() - t0)
+        print(f'{label:>8} {"row-by-row":>12} {rbr_rate:>12,.0f} {rbr_conn.round_trips:>12,}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+# python
+"""
+Throughput of serial vs process-pool translation for a CPU-heavy translator.
+
+The translator does diacritic stripping plus whitespace/case normalization per name, which is
+the shape of the artist/recording normalization that makes translation GIL-bound:
+    python benchmarks/bench_parallel_translator.py [--items 400000] [--chunk-size 2000]
+"""
+import argparse
+import os
+import pathlib
+import random
+import sys
+import time
+import unicodedata
+from datetime import datetime
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from application.services.parallel_translator import ParallelTranslator  # noqa: E402
+from application.services.simple_examples import CountryIn, CountryOut, CountryTranslator  # noqa: E402
+
+
+class HeavyNameTranslator(CountryTranslator):
+    """CountryTranslator plus NFKD diacritic stripping on every name."""
+
+    def translate(self, item: CountryIn) -> CountryOut:
+        out = super().translate(item)
+        decomposed = unicodedata.normalize('NFKD', out.normalized_name)
+        out.normalized_name = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+        return out
+
+    def translate_batch(self, items):
+        # per item, so every name pays for the extra normalization
+        return [self.translate(i) for i in items]
+
+
+def make_items(n: int):
+    rnd = random.Random(42)
+    words = ['Björk', 'Sigur Rós', 'Motörhead', 'Beyoncé', 'Café Tacvba', 'Mötley Crüe', 'The  Band', 'Ólafur']
+    now = datetime(2020, 1, 1)
+    return [CountryIn(mb_id=i, iso_code=None, name=f'  {rnd.choice(words)} {rnd.choice(words)} {i} ', last_updated=now)
+            for i in range(n)]
+
+
+def measure(translator, items) -> float:
+    t0 = time.perf_counter()
+    out = translator.translate_batch(items)
+    elapsed = time.perf_counter() - t0
+    assert len(out) == len(items)
+    return len(items) / elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--items', type=int, default=400_000)
+    ap.add_argument('--chunk-size', type=int, default=2000)
+    ap.add_argument('--workers', type=int, nargs='*', default=[1, 2, 4, 8])
+    args = ap.parse_args()
+
+    items = make_items(args.items)
+    serial = measure(HeavyNameTranslator(), items)
+    print(f'items={args.items} chunk_size={args.chunk_size} cpus={os.cpu_count()}')
+    print(f'{"mode":>10} {"rows/s":>12} {"vs serial":>10}')
+    print(f'{"serial":>10} {serial:>12,.0f} {1.0:>9.2f}x')
+    for workers in args.workers:
+        with ParallelTranslator(HeavyNameTranslator(), workers=workers, chunk_size=args.chunk_size) as tr:
+            tr.translate_batch(items[:args.chunk_size * workers])  # warm the pool
+            rate = measure(tr, items)
+        print(f'{f"{workers} proc":>10} {rate:>12,.0f} {rate / serial:>9.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
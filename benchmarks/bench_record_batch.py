@@ -0,0 +1,75 @@
+# python
+"""
+Allocations, peak memory and time per row of one artist page: row objects versus RecordBatch.
+
+Driver tuples are created up front (the driver allocates them either way); the measured part is
+what ETLService builds on top of them for one page - raw dicts, Artist objects and destination
+dicts in row mode; a source and a destination RecordBatch in columnar mode:
+    python benchmarks/bench_record_batch.py [--rows 500000]
+
+Expected shape: row mode holds three objects (plus their dicts) per row; columnar mode holds a
+few buffers per column, so live allocations per row drop to well below one.
+"""
+import argparse
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper  # noqa: E402
+from adapters.postgres.repository import ARTIST_FIELDS  # noqa: E402
+from application.services.lookup_cache import LookupCache  # noqa: E402
+from core.record_batch import RecordBatch  # noqa: E402
+
+COLUMNS = [f.name for f in ARTIST_FIELDS]
+
+
+def row_mode(mapper, tuples):
+    raw = [dict(zip(COLUMNS, t)) for t in tuples]
+    artists = [mapper.map_source_artist_to_domain(r) for r in raw]
+    return raw, artists, mapper.map_artists_to_destination(artists)
+
+
+def columnar_mode(mapper, tuples):
+    batch = RecordBatch.from_rows(ARTIST_FIELDS, tuples)
+    return batch, mapper.map_batch_to_destination(batch)
+
+
+def measure(fn, mapper, tuples) -> tuple:
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(mapper, tuples)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    live = sys.getallocatedblocks() - blocks
+    del result
+    return live, peak, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=500_000)
+    args = ap.parse_args()
+    countries = ['GB', 'US', 'IS', None, 'DE', 'JP']
+    tuples = [(i, f'Artist {i}', f'{i}, Artist', countries[i % len(countries)]) for i in range(1, args.rows + 1)]
+    lookups = LookupCache()
+    lookups.update('CountryCode', {c: n for n, c in enumerate(countries) if c})
+    mapper = MusicBrainzToDomainMapper(lookups)
+
+    print(f'rows={args.rows:,}')
+    print(f'{"mode":>9} {"live allocs/row":>16} {"peak bytes/row":>15} {"rows/s":>12}')
+    for name, fn in (('rows', row_mode), ('columnar', columnar_mode)):
+        live, peak, elapsed = measure(fn, mapper, tuples)
+        print(f'{name:>9} {live / args.rows:>16.2f} {peak / args.rows:>15,.0f} {args.rows / elapsed:>12,.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
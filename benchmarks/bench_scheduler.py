@@ -0,0 +1,51 @@
+# python
+"""
+Wall-clock time of the full MusicCollection entity graph run serially vs by the DAG scheduler.
+
+Each entity pipeline sleeps for a simulated duration (scaled by --scale) shaped like a nightly
+window: lookups are short, tracks and credits dominate:
+    python benchmarks/bench_scheduler.py [--scale 0.01] [--workers 8]
+
+Expected shape: serial ~= sum of all durations; scheduled ~= the critical path
+(Artist -> Album -> Edition -> Disc -> Track -> Credit / TrackGenre).
+"""
+import argparse
+import pathlib
+import sys
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from application.services.scheduler import MUSIC_COLLECTION_DAG, DagScheduler, build_nodes  # noqa: E402
+
+# relative run time of each entity pipeline
+DURATIONS = {
+    'Country': 1, 'ArtistType': 1, 'Genre': 1, 'MediumFormat': 1, 'Tag': 2, 'Website': 1, 'Label': 3,
+    'Artist': 20, 'Recording': 40, 'Album': 15, 'Edition': 15, 'Disc': 10, 'Track': 60,
+    'EditionLabel': 5, 'ArtistGenre': 5, 'AlbumGenre': 5, 'TrackGenre': 20, 'Credit': 30, 'ArtistMembership': 3,
+}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--scale', type=float, default=0.01, help='seconds per duration unit')
+    ap.add_argument('--workers', type=int, default=8)
+    args = ap.parse_args()
+    runs = {name: (lambda s=DURATIONS[name] * args.scale: time.sleep(s)) for name in MUSIC_COLLECTION_DAG}
+
+    t0 = time.perf_counter()
+    for name in DagScheduler(build_nodes(runs)).order:
+        runs[name]()
+    serial = time.perf_counter() - t0
+
+    report = DagScheduler(build_nodes(runs), max_workers=args.workers).run()
+    print(f'entities={len(runs)} workers={args.workers} scale={args.scale}s/unit')
+    print(f'serial:    {serial:.2f}s')
+    print(f'scheduled: {report.wall_s:.2f}s ({serial / report.wall_s:.2f}x)')
+    print(f'critical path {report.critical_path_s:.2f}s: {" -> ".join(report.critical_path)}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# python
+"""
+Replaying extracted batches from the local spool vs. extracting them from the source again.
+
+Populates a file-backed SQLite artist source, extracts it once in keyset pages while spooling
+every page, then times each way of getting the same pages to a loader:
+    python benchmarks/bench_spool.py [--rows 200000] [--batch-size 5000] [--durable]
+
+Expected shape: columnar replay costs about one string object per text value (numeric columns
+are views into the mapped segment) and beats even a local SQLite re-extract, itself a lower
+bound for the production Postgres over the network; dict replay adds the per-row dicts a row
+loader builds anyway. Spooling adds roughly half the extract time with --durable off and costs
+about 60 bytes per artist on disk.
+"""
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.local.spool import SpoolReader, SpoolWriter  # noqa: E402
+from adapters.synthetic.generator import SyntheticMusicBrainz  # noqa: E402
+from adapters.synthetic.sqlite import SQLiteSource  # noqa: E402
+
+
+def extract(source, batch_size, on_page=None):
+    after, rows = None, 0
+    while True:
+        page = source.fetch_artist_columns_after(after, batch_size)
+        if not len(page):
+            return rows
+        if on_page is not None:
+            on_page(page)
+        rows += len(page)
+        after = page['id'][len(page) - 1]
+
+
+def timed(label, rows, fn):
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f'{label:<28} {elapsed:7.3f}s  {rows / elapsed:>12,.0f} rows/s')
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--rows', type=int, default=200_000)
+    ap.add_argument('--batch-size', type=int, default=5000)
+    ap.add_argument('--durable', action='store_true', help='fsync every spooled batch')
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = SQLiteSource(str(pathlib.Path(tmp) / 'source.sqlite'))
+        rows = source.populate(SyntheticMusicBrainz(scale=args.rows).artists())
+        writer = SpoolWriter(str(pathlib.Path(tmp) / 'spool'), 'artist', durable=args.durable)
+
+        timed('extract (sqlite)', rows, lambda: extract(source, args.batch_size))
+        timed('extract + spool', rows, lambda: extract(source, args.batch_size, writer.append))
+
+        reader = SpoolReader(str(pathlib.Path(tmp) / 'spool'), 'artist')
+
+        def replay(to_dicts):
+            for _, batch in reader.iter_batches():
+                if to_dicts:
+                    batch.to_dicts()
+        timed('replay columnar (spool)', rows, lambda: replay(False))
+        timed('replay dicts (spool)', rows, lambda: replay(True))
+
+        size = sum(p.stat().st_size for p in (pathlib.Path(tmp) / 'spool').iterdir())
+        print(f'spool: {len(reader)} batches, {size / 2 ** 20:.1f} MiB, {size / rows:.0f} bytes/row')
+        reader.close()
+        source.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
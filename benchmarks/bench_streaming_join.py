@@ -0,0 +1,91 @@
+# python
+"""
+Peak memory of the streaming track join vs. an in-memory join, as the catalog grows.
+
+For each artist count, streams synthetic tracks (about 10 per release) through
+StreamingTrackJoin with a fixed sort budget against Disc / Recording maps in the mmap
+identifier index, and through a dict-and-list join, recording the Python heap peak:
+    python benchmarks/bench_streaming_join.py [--artists 2000,8000,32000] [--budget-mb 8]
+
+Expected shape: the streaming join's peak stays flat at about twice the budget (the sort's
+key list and the run read buffers come on top of the estimated row sizes) however many runs
+it spills; the in-memory join's peak grows linearly with the number of tracks (~260 MiB for
+350k tracks). The external sort costs roughly 2x the in-memory join's time.
+"""
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.local.identifier_index import MmapIdentifierIndex  # noqa: E402
+from adapters.synthetic.generator import SyntheticMusicBrainz  # noqa: E402
+from application.services.streaming_join import StreamingTrackJoin  # noqa: E402
+
+
+def medium_id(track):
+    # the synthetic tracks carry the medium number only; at most 2 media per release
+    return track['release_id'] * 4 + track['medium']
+
+
+def build_maps(gen, identifiers):
+    identifiers.rebuild('Recording', ((r['id'], i + 1) for i, r in enumerate(gen.recordings())))
+    media, last = [], None
+    for t in gen.tracks():
+        key = medium_id(t)
+        if key != last:
+            media.append(key)
+            last = key
+    identifiers.rebuild('Disc', ((m, i + 1) for i, m in enumerate(media)))
+
+
+def in_memory_join(gen, identifiers, batch_size):
+    tracks = list(gen.tracks())
+    discs = dict(zip(sorted({medium_id(t) for t in tracks}), range(1, len(tracks) + 1)))
+    recordings = {}
+    for t, rid in zip(tracks, identifiers.lookup_many('Recording', [t['recording_id'] for t in tracks])):
+        recordings[t['recording_id']] = rid
+    out = [{'disc_id': discs[medium_id(t)], 'recording_id': recordings[t['recording_id']], 'title': t['name'],
+            'track_number': t['position'], 'position': t['position'], 'duration_ms': t['length_ms'],
+            'source_id': t['id'], 'source_updated_at': t['last_updated']} for t in tracks]
+    return [out[i:i + batch_size] for i in range(0, len(out), batch_size)]
+
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, peak / 2**20, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--artists', default='2000,8000,32000')
+    ap.add_argument('--budget-mb', type=float, default=8)
+    ap.add_argument('--batch-size', type=int, default=5000)
+    args = ap.parse_args()
+
+    print(f'{"artists":>8} {"tracks":>9} {"join":<10} {"peak MiB":>9} {"runs":>5} {"seconds":>8}')
+    for artists in map(int, args.artists.split(',')):
+        gen = SyntheticMusicBrainz(artists)
+        with tempfile.TemporaryDirectory() as tmp, MmapIdentifierIndex(tmp, durable=False) as identifiers:
+            build_maps(gen, identifiers)
+            join = StreamingTrackJoin(identifiers, memory_budget_bytes=int(args.budget_mb * 2**20),
+                                      spill_dir=tmp, batch_size=args.batch_size, disc_key=medium_id)
+            # consume batch by batch, as a loader would
+            rows, peak, elapsed = measure(lambda: sum(len(b) for b in join.batches(gen.chunks(gen.tracks()))))
+            print(f'{artists:>8} {rows:>9} {"streaming":<10} {peak:>9.1f} {join.stats.spilled_runs:>5} {elapsed:>8.2f}')
+            rows, peak, elapsed = measure(lambda: sum(map(len, in_memory_join(gen, identifiers, args.batch_size))))
+            print(f'{artists:>8} {rows:>9} {"in-memory":<10} {peak:>9.1f} {"-":>5} {elapsed:>8.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+# python
+"""
+ETL benchmark suite on synthetic MusicBrainz data: throughput, latency and peak memory per stage.
+
+Streams seeded artists and recordings into the in-memory and SQLite stand-ins, runs ETLService
+(artists) and a pipelined Orchestrator (recordings) from them, and compares against a stored baseline:
+    python benchmarks/bench_suite.py [--scale 10k] [--backend both] [--batch-size 1000]
+        [--baseline benchmarks/baseline.json] [--save-baseline] [--threshold 0.25]
+
+Per case it reports rows/s end to end and per stage (rows / time spent in that stage), p50/p95
+batch latency, and the peak traced Python memory of a separate tracemalloc run (the stand-in
+sources are built beforehand and not counted). End-to-end
+throughput below baseline * (1 - threshold) or peak memory above baseline * (1 + threshold) is
+a regression and makes the script exit 1; stage rates and latencies of millisecond batches are
+too noisy to gate on and are reported only. Baselines are stored per scale; absolute numbers are
+machine-specific, so record one per machine (--save-baseline) before comparing.
+
+Expected shape: the memory backend about twice as fast as SQLite; load dominates the SQLite case
+and translate (row mapping + name normalization) the in-memory ones; peak memory of the SQLite
+case tracks the batch size, the in-memory cases also hold the loaded rows.
+"""
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper  # noqa: E402
+from adapters.synthetic.generator import SCALES, SyntheticMusicBrainz  # noqa: E402
+from adapters.synthetic.memory import InMemoryDestination, InMemoryExtractor, InMemorySource  # noqa: E402
+from adapters.synthetic.sqlite import SQLiteDestination, SQLiteSource  # noqa: E402
+from application.services.etl_service import ETLService  # noqa: E402
+from application.services.instrumentation import RunHooks  # noqa: E402
+from application.services.orchestrator import Orchestrator  # noqa: E402
+from core.normalization import default_normalizer  # noqa: E402
+from core.ports.etl_ports import LoadResult  # noqa: E402
+
+STAGES = ('extract', 'translate', 'load')
+DEFAULT_BASELINE = PROJECT_ROOT / 'benchmarks' / 'baseline.json'
+# gated metrics: (name, True when higher is better)
+COMPARED = (('rows_per_s', True), ('peak_mb', False))
+
+
+class StageTimes(RunHooks):
+    """Raw per-batch stage durations (the MetricsRecorder histograms are too coarse for p50/p95)."""
+
+    def __init__(self):
+        self.stage_s = {s: 0.0 for s in STAGES}
+        self.stage_rows = {s: 0 for s in STAGES}
+        self.batch_ms = []
+
+    def stage_finished(self, batch, stage, seconds, rows):
+        self.stage_s[stage] += seconds
+        self.stage_rows[stage] += rows
+
+    def batch_finished(self, batch):
+        self.batch_ms.append(batch.duration_ms)
+
+
+class RecordingTranslator:
+    def translate_batch(self, items):
+        names = default_normalizer.normalize_many([r['name'] for r in items])
+        return [{'source_id': str(r['id']), 'artist_source_id': str(r['artist_id']), 'name': r['name'].strip(),
+                 'normalized_name': n, 'length_ms': r['length_ms'], 'source_updated_at': r['last_updated']}
+                for r, n in zip(items, names)]
+
+
+class DictLoader:
+    def __init__(self):
+        self.rows = {}
+
+    def load_batch(self, items, batch_id):
+        before = len(self.rows)
+        for it in items:
+            self.rows[it['source_id']] = it
+        inserted = len(self.rows) - before
+        return LoadResult(inserted=inserted, updated=len(items) - inserted, errors=[])
+
+
+def artist_case(backend, gen, batch_size, tmp):
+    """
+    Stream the generated artists into the stand-in source once and return (run, rows): a
+    callable running one artist full load from it into a fresh destination, and the row count.
+    """
+    if backend == 'sqlite':
+        path = str(pathlib.Path(tmp) / 'source.sqlite')
+        source = SQLiteSource(path)
+        rows = source.populate(gen.artists())
+        source.close()
+    else:
+        # read-only, so every run can share it
+        memory_source = InMemorySource(gen.artists())
+        rows = len(memory_source)
+
+    def run(hooks):
+        if backend == 'memory':
+            src, dst = memory_source, InMemoryDestination()
+        else:
+            dst_path = pathlib.Path(tmp) / 'destination.sqlite'
+            for p in pathlib.Path(tmp).glob('destination.sqlite*'):
+                p.unlink()
+            src, dst = SQLiteSource(path), SQLiteDestination(str(dst_path))
+        ETLService(src, dst, MusicBrainzToDomainMapper(), batch_size=batch_size, columnar=backend == 'sqlite',
+                   hooks=hooks).run_full_load()
+        if backend == 'sqlite':
+            src.close()
+            dst.close()
+    return run, rows
+
+
+def recording_case(gen, batch_size):
+    extractor = InMemoryExtractor(gen.recordings())
+
+    def run(hooks):
+        Orchestrator(extractor, RecordingTranslator(), DictLoader(), batch_size=batch_size, pipelined=True,
+                     hooks=hooks, entity_name='Recording').run_full_load(persist_watermark_fn=lambda *a, **k: None)
+    return run, gen.recording_count
+
+
+def measure(run, rows):
+    times = StageTimes()
+    t0 = time.perf_counter()
+    run([times])
+    elapsed = time.perf_counter() - t0
+    result = {'rows': rows, 'seconds': round(elapsed, 4), 'rows_per_s': round(rows / elapsed)}
+    for stage in STAGES:
+        seconds = times.stage_s[stage]
+        result[f'{stage}_rows_per_s'] = round(times.stage_rows[stage] / seconds) if seconds else None
+    if len(times.batch_ms) >= 2:
+        cuts = statistics.quantiles(times.batch_ms, n=20, method='inclusive')
+        result['p50_ms'], result['p95_ms'] = round(cuts[9], 3), round(cuts[18], 3)
+    else:
+        result['p50_ms'] = result['p95_ms'] = round(times.batch_ms[0], 3) if times.batch_ms else None
+
+    tracemalloc.start()
+    run(None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result['peak_mb'] = round(peak / 2**20, 2)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return the regressions of results against baseline as printable lines."""
+    regressions = []
+    for case, metrics in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for key, higher_is_better in COMPARED:
+            new, old = metrics.get(key), base.get(key)
+            if not new or not old:
+                continue
+            worse = new < old * (1 - threshold) if higher_is_better else new > old * (1 + threshold)
+            if worse:
+                regressions.append(f'{case}: {key} {old} -> {new} ({(new - old) / old:+.0%})')
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument('--scale', default='10k', help=f'one of {", ".join(SCALES)} or an artist count')
+    ap.add_argument('--backend', choices=('memory', 'sqlite', 'both'), default='both')
+    ap.add_argument('--batch-size', type=int, default=1000)
+    ap.add_argument('--seed', type=int, default=42)
+    ap.add_argument('--repeat', type=int, default=3, help='timed runs per case; the fastest is reported')
+    ap.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    ap.add_argument('--save-baseline', action='store_true')
+    ap.add_argument('--threshold', type=float, default=0.25)
+    args = ap.parse_args()
+    scale = args.scale if args.scale in SCALES else int(args.scale)
+
+    gen = SyntheticMusicBrainz(scale, seed=args.seed)
+    backends = ('memory', 'sqlite') if args.backend == 'both' else (args.backend,)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # generator rows stream straight into the stand-ins; nothing holds them as a list
+        t0 = time.perf_counter()
+        cases = [(f'artist/{b}', *artist_case(b, gen, args.batch_size, tmp)) for b in backends]
+        cases.append(('recording/pipelined', *recording_case(gen, args.batch_size)))
+        gen_s = time.perf_counter() - t0
+        print(f'scale={args.scale} artists={gen.artist_count} recordings={gen.recording_count} '
+              f'generated and loaded into {len(cases)} stand-ins in {gen_s:.2f}s')
+        for name, run, rows in cases:
+            runs = [measure(run, rows) for _ in range(args.repeat)]
+            results[name] = max(runs, key=lambda r: r['rows_per_s'])
+
+    print(f'{"case":<20} {"rows/s":>10} {"extract":>10} {"translate":>10} {"load":>10} '
+          f'{"p50 ms":>8} {"p95 ms":>8} {"peak MB":>8}')
+    for name, r in results.items():
+        stage = [f'{r[f"{s}_rows_per_s"] or 0:>10,}' for s in STAGES]
+        print(f'{name:<20} {r["rows_per_s"]:>10,} {" ".join(stage)} {r["p50_ms"]:>8} {r["p95_ms"]:>8} '
+              f'{r["peak_mb"]:>8}')
+
+    path = pathlib.Path(args.baseline)
+    stored = json.loads(path.read_text()) if path.exists() else {}
+    if args.save_baseline:
+        stored[args.scale] = {'python': platform.python_version(), 'batch_size': args.batch_size,
+                              'results': results}
+        path.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n')
+        print(f'baseline for scale {args.scale} saved to {path}')
+        return 0
+    baseline = stored.get(args.scale)
+    if baseline is None:
+        print(f'no baseline for scale {args.scale} in {path}; run with --save-baseline to record one')
+        return 0
+    if baseline.get('batch_size') != args.batch_size:
+        print(f'note: baseline was recorded with batch size {baseline.get("batch_size")}')
+    regressions = compare(results, baseline['results'], args.threshold)
+    for line in regressions:
+        print(f'REGRESSION {line}')
+    if not regressions:
+        print(f'no regression beyond {args.threshold:.0%} against the baseline')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
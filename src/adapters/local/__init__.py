@@ -0,0 +1 @@
+﻿# local (on-disk) adapter package
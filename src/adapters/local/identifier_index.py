@@ -0,0 +1,288 @@
+# python
+# file: src/adapters/local/identifier_index.py
+
+"""
+Compact on-disk MB id -> MC identity id map (the music.Identifier mapping of U02-U05, cached
+locally so child entities can resolve their parents without a database round-trip).
+
+Per entity type the index keeps two files in `directory`:
+
+- `<entity>.idx`: the compacted base. An 8-byte magic followed by (source_id, identity_id)
+  int64 pairs sorted by source_id. The file is memory-mapped read-only, so resident memory
+  stays flat however many mappings there are; the OS pages in only what lookups touch.
+- `<entity>.delta`: append-only (source_id, identity_id) int64 pairs recorded after each MERGE
+  since the last compaction. Replayed into a dict on open; later pairs win.
+
+Lookups sort the requested ids once and walk the base with a monotonically advancing binary
+search, so a batch touches each base page at most once. compact() merges base and delta into a
+new base written next to the old one and swapped in with an atomic rename; replaying a delta
+that survived a crash after the rename is harmless because pairs are idempotent.
+
+Files are in native byte order: the index is a rebuildable local cache, not an exchange format.
+"""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+import logging
+import mmap
+import os
+import re
+import threading
+
+from core.ports.identifier_map import IdentifierMap
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MBIDMAP1"
+# mappings buffered in the delta before add() compacts automatically
+DEFAULT_COMPACT_THRESHOLD = 100_000
+# pairs written per chunk while streaming a new base file
+_WRITE_CHUNK = 65_536
+_ENTITY_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+
+class _EntityIndex:
+    """Base map + delta of one entity type. Not thread-safe; MmapIdentifierIndex serialises access."""
+
+    def __init__(self, directory: str, entity: str) -> None:
+        self.base_path = os.path.join(directory, f"{entity}.idx")
+        self.delta_path = os.path.join(directory, f"{entity}.delta")
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._pairs = memoryview(b"").cast("q")
+        self.delta: Dict[int, int] = {}
+        self._open_base()
+        self._replay_delta()
+
+    # -- base -------------------------------------------------------------------------------
+
+    def _open_base(self) -> None:
+        if not os.path.exists(self.base_path):
+            return
+        f = open(self.base_path, "rb")
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        if mm[:len(MAGIC)] != MAGIC or (len(mm) - len(MAGIC)) % 16:
+            mm.close()
+            f.close()
+            raise ValueError(f"{self.base_path} is not an identifier index file")
+        self._file, self._mm = f, mm
+        self._pairs = memoryview(mm)[len(MAGIC):].cast("q")
+
+    def _close_base(self) -> None:
+        # views must be released before the map can be closed (and the file replaced)
+        self._pairs.release()
+        self._pairs = memoryview(b"").cast("q")
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def base_size(self) -> int:
+        return len(self._pairs) // 2
+
+    def iter_base(self) -> Iterator[Tuple[int, int]]:
+        pairs = self._pairs
+        for i in range(0, len(pairs), 2):
+            yield pairs[i], pairs[i + 1]
+
+    # -- delta ------------------------------------------------------------------------------
+
+    def _replay_delta(self) -> None:
+        if not os.path.exists(self.delta_path):
+            return
+        with open(self.delta_path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % 16  # a torn trailing pair from a crash is dropped
+        pairs = array("q")
+        pairs.frombytes(data[:usable])
+        for i in range(0, len(pairs), 2):
+            self.delta[pairs[i]] = pairs[i + 1]
+
+    def append(self, mappings: Mapping[int, int], durable: bool) -> None:
+        pairs = array("q")
+        for source_id, identity in mappings.items():
+            pairs.append(int(source_id))
+            pairs.append(int(identity))
+        with open(self.delta_path, "ab") as f:
+            f.write(pairs.tobytes())
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        self.delta.update((int(k), int(v)) for k, v in mappings.items())
+
+    # -- lookups ----------------------------------------------------------------------------
+
+    def lookup_many(self, source_ids: Sequence[Optional[int]]) -> List[Optional[int]]:
+        out: List[Optional[int]] = [None] * len(source_ids)
+        keys = self._pairs[0::2]
+        ids = self._pairs[1::2]
+        delta = self.delta
+        lo, hi = 0, len(keys)
+        try:
+            order = sorted((i for i, s in enumerate(source_ids) if s is not None), key=source_ids.__getitem__)
+            for i in order:
+                source_id = source_ids[i]
+                found = delta.get(source_id)
+                if found is None and lo < hi:
+                    lo = bisect_left(keys, source_id, lo, hi)
+                    if lo < hi and keys[lo] == source_id:
+                        found = ids[lo]
+                out[i] = found
+        finally:
+            keys.release()
+            ids.release()
+        return out
+
+    # -- compaction -------------------------------------------------------------------------
+
+    def write_base(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        """Stream strictly ascending pairs into a new base file and swap it in atomically."""
+        tmp_path = self.base_path + ".tmp"
+        count = 0
+        last: Optional[int] = None
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            chunk = array("q")
+            for source_id, identity in pairs:
+                if last is not None and source_id <= last:
+                    f.close()
+                    os.remove(tmp_path)
+                    raise ValueError(f"identifier pairs must be strictly ascending by source id ({source_id} after {last})")
+                last = source_id
+                chunk.append(source_id)
+                chunk.append(identity)
+                count += 1
+                if len(chunk) >= 2 * _WRITE_CHUNK:
+                    f.write(chunk.tobytes())
+                    chunk = array("q")
+            f.write(chunk.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._close_base()
+        os.replace(tmp_path, self.base_path)
+        self._open_base()
+        return count
+
+    def merged(self) -> Iterator[Tuple[int, int]]:
+        """Base and delta merged in source id order; delta entries override base entries."""
+        delta = sorted(self.delta.items())
+        j = 0
+        for source_id, identity in self.iter_base():
+            while j < len(delta) and delta[j][0] < source_id:
+                yield delta[j]
+                j += 1
+            if j < len(delta) and delta[j][0] == source_id:
+                yield delta[j]
+                j += 1
+            else:
+                yield source_id, identity
+        yield from delta[j:]
+
+    def clear_delta(self) -> None:
+        with open(self.delta_path, "wb"):
+            pass
+        self.delta.clear()
+
+    def close(self) -> None:
+        self._close_base()
+
+
+class MmapIdentifierIndex(IdentifierMap):
+    """
+    IdentifierMap backed by sorted, memory-mapped int64 pair files (one set per entity type).
+
+    Responsibilities:
+    - batch lookups of MB integer ids against the compacted base and the pending delta
+    - durable, incremental recording of the source_ids a MERGE returns (add)
+    - compaction of the delta into the base, automatically once `compact_threshold` pending
+      mappings accumulate, or explicitly via compact()
+    - bulk (re)build of an entity's base from an ordered export, e.g. music.Identifier
+
+    Thread-safe: pipelines of one run may share an instance.
+    """
+
+    def __init__(self, directory: str, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 durable: bool = True) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        # fsync the delta after every add(); turn off for throwaway indexes (tests, benchmarks)
+        self.durable = durable
+        self._entities: Dict[str, _EntityIndex] = {}
+        self._lock = threading.Lock()
+
+    def lookup_many(self, entity: str, source_ids: Sequence[Optional[int]]) -> List[Optional[int]]:
+        with self._lock:
+            return self._entity(entity).lookup_many(source_ids)
+
+    def lookup(self, entity: str, source_id: int) -> Optional[int]:
+        return self.lookup_many(entity, [source_id])[0]
+
+    def add(self, entity: str, mappings: Mapping[int, int]) -> int:
+        if not mappings:
+            return 0
+        with self._lock:
+            index = self._entity(entity)
+            index.append(mappings, self.durable)
+            if len(index.delta) >= self.compact_threshold:
+                self._compact(entity, index)
+        return len(mappings)
+
+    def compact(self, entity: Optional[str] = None) -> Dict[str, int]:
+        """Fold pending mappings into the base of one entity (default: every open entity)."""
+        with self._lock:
+            names = [entity] if entity is not None else list(self._entities)
+            return {name: self._compact(name, self._entity(name)) for name in names}
+
+    def rebuild(self, entity: str, pairs: Iterable[Tuple[int, int]]) -> int:
+        """Replace an entity's map with `pairs`, which must be ascending by source id."""
+        with self._lock:
+            index = self._entity(entity)
+            count = index.write_base(pairs)
+            index.clear_delta()
+        logger.info("Rebuilt identifier index %s: %d mappings", entity, count)
+        return count
+
+    def size(self, entity: str) -> Tuple[int, int]:
+        """(compacted mappings, pending delta mappings) of an entity."""
+        with self._lock:
+            index = self._entity(entity)
+            return index.base_size, len(index.delta)
+
+    def close(self) -> None:
+        with self._lock:
+            for index in self._entities.values():
+                index.close()
+            self._entities.clear()
+
+    def __enter__(self) -> "MmapIdentifierIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _compact(self, entity: str, index: _EntityIndex) -> int:
+        if not index.delta:
+            return index.base_size
+        pending = len(index.delta)
+        count = index.write_base(index.merged())
+        index.clear_delta()
+        logger.info("Compacted identifier index %s: %d pending -> %d mappings", entity, pending, count)
+        return count
+
+    def _entity(self, entity: str) -> _EntityIndex:
+        index = self._entities.get(entity)
+        if index is None:
+            if not _ENTITY_RE.match(entity):
+                raise ValueError(f"Invalid entity name for identifier index: {entity!r}")
+            index = self._entities[entity] = _EntityIndex(self.directory, entity)
+        return index
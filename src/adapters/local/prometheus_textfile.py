@@ -0,0 +1,172 @@
+# python
+# file: src/adapters/local/prometheus_textfile.py
+
+"""
+Prometheus text exposition of a MetricsRecorder, written for node_exporter's textfile collector.
+
+The file is rewritten atomically (temp file + os.replace in the same directory) so the collector
+never reads a half-written file. As a RunHooks it rewrites at most every `min_interval_s` on
+batch end; call write() once more when the run finishes. Connection pools passed as `pools`
+are exported alongside (checkout wait histogram, connections by state, timeouts).
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import math
+import os
+import tempfile
+import threading
+import time
+
+from application.services.instrumentation import BatchMetrics, EntityMetrics, Histogram, MetricsRecorder, RunHooks
+from adapters.pool import ConnectionPool, PoolStats
+
+PREFIX = "etl"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram(lines: List[str], name: str, labels: Dict[str, str], hist: Histogram) -> None:
+    for bound, count in hist.cumulative():
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {count}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(hist.sum)}")
+    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+
+
+def render(entities: Mapping[str, EntityMetrics], prefix: str = PREFIX) -> str:
+    """Text exposition format (version 0.0.4) of a MetricsRecorder snapshot."""
+    families: List[Tuple[str, str, str, List[str]]] = [
+        (f"{prefix}_stage_duration_seconds", "histogram", "Duration of one pipeline stage for one batch.", []),
+        (f"{prefix}_batch_duration_seconds", "histogram", "Duration of one batch, extract to load.", []),
+        (f"{prefix}_rows_total", "counter", "Rows by processing outcome.", []),
+        (f"{prefix}_batches_total", "counter", "Finished batches by status.", []),
+        (f"{prefix}_rows_per_second", "gauge", "Extracted rows per second of the last batch.", []),
+        (f"{prefix}_queue_depth", "gauge", "Batches waiting in an inter-stage queue.", []),
+        (f"{prefix}_last_batch_end_timestamp_seconds", "gauge", "Unix time the last batch finished.", []),
+        (f"{prefix}_memory_peak_bytes", "gauge", "Estimated peak in-flight bytes of the last budgeted run.", []),
+        (f"{prefix}_spilled_chunks_total", "counter", "Chunks spilled to disk under the memory budget.", []),
+    ]
+    stage, batch, rows, batches, rate, depth, last, peak, spilled = (f[3] for f in families)
+    for entity, metrics in sorted(entities.items()):
+        base = {"entity": entity}
+        for stage_name, hist in sorted(metrics.stage_latency.items()):
+            _histogram(stage, families[0][0], {**base, "stage": stage_name}, hist)
+        if metrics.batch_latency.count:
+            _histogram(batch, families[1][0], base, metrics.batch_latency)
+        for kind, n in metrics.rows.items():
+            rows.append(f"{families[2][0]}{_labels({**base, 'kind': kind})} {n}")
+        for status, n in metrics.batches.items():
+            batches.append(f"{families[3][0]}{_labels({**base, 'status': status})} {n}")
+        rate.append(f"{families[4][0]}{_labels(base)} {_number(metrics.rows_per_s)}")
+        for queue_name, n in sorted(metrics.queue_depth.items()):
+            depth.append(f"{families[5][0]}{_labels({**base, 'queue': queue_name})} {n}")
+        if metrics.last_batch_end is not None:
+            last.append(f"{families[6][0]}{_labels(base)} {_number(metrics.last_batch_end.timestamp())}")
+        if metrics.memory_peak_bytes is not None:
+            peak.append(f"{families[7][0]}{_labels(base)} {metrics.memory_peak_bytes}")
+            spilled.append(f"{families[8][0]}{_labels(base)} {metrics.spilled_chunks}")
+    return _exposition(families)
+
+
+def render_pools(pools: Sequence[PoolStats], prefix: str = PREFIX) -> str:
+    """Text exposition of connection pool stats, for sizing min_size / max_size."""
+    families: List[Tuple[str, str, str, List[str]]] = [
+        (f"{prefix}_pool_wait_seconds", "histogram", "Time a checkout waited for a connection.", []),
+        (f"{prefix}_pool_connections", "gauge", "Open connections by state.", []),
+        (f"{prefix}_pool_max_connections", "gauge", "Configured maximum pool size.", []),
+        (f"{prefix}_pool_checkouts_total", "counter", "Checkouts, and those that had to wait.", []),
+        (f"{prefix}_pool_timeouts_total", "counter", "Checkouts that gave up after the checkout timeout.", []),
+        (f"{prefix}_pool_connections_closed_total", "counter", "Connections discarded, by reason.", []),
+    ]
+    wait, conns, limit, checkouts, timeouts, closed = (f[3] for f in families)
+    for stats in sorted(pools, key=lambda p: p.name):
+        base = {"pool": stats.name}
+        _histogram(wait, families[0][0], base, stats.wait)
+        conns.append(f"{families[1][0]}{_labels({**base, 'state': 'idle'})} {stats.idle}")
+        conns.append(f"{families[1][0]}{_labels({**base, 'state': 'in_use'})} {stats.in_use}")
+        limit.append(f"{families[2][0]}{_labels(base)} {stats.max_size}")
+        checkouts.append(f"{families[3][0]}{_labels({**base, 'waited': 'false'})} {stats.checkouts - stats.waited}")
+        checkouts.append(f"{families[3][0]}{_labels({**base, 'waited': 'true'})} {stats.waited}")
+        timeouts.append(f"{families[4][0]}{_labels(base)} {stats.timeouts}")
+        closed.append(f"{families[5][0]}{_labels({**base, 'reason': 'validation'})} {stats.validation_failures}")
+        closed.append(f"{families[5][0]}{_labels({**base, 'reason': 'error'})} "
+                      f"{stats.discarded - stats.validation_failures}")
+    return _exposition(families)
+
+
+def _exposition(families: List[Tuple[str, str, str, List[str]]]) -> str:
+    out: List[str] = []
+    for name, kind, help_text, samples in families:
+        if samples:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(samples)
+    return "\n".join(out) + "\n" if out else ""
+
+
+class PrometheusTextfileExporter(RunHooks):
+    """
+    Writes a MetricsRecorder to `path` in Prometheus text format.
+
+    Responsibilities:
+    - render histograms, counters and gauges with entity / stage labels
+    - replace the file atomically
+    - throttle rewrites triggered by batch ends to one per `min_interval_s`
+    """
+
+    def __init__(self, recorder: MetricsRecorder, path: str, min_interval_s: float = 10.0,
+                 prefix: str = PREFIX, pools: Sequence[ConnectionPool] = ()) -> None:
+        self.recorder = recorder
+        self.pools = list(pools)
+        self.path = path
+        self.min_interval_s = min_interval_s
+        self.prefix = prefix
+        self._last_write: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def batch_finished(self, batch: BatchMetrics) -> None:
+        now = time.monotonic()
+        if self._last_write is not None and now - self._last_write < self.min_interval_s:
+            return
+        self.write()
+
+    def write(self) -> None:
+        text = render(self.recorder.snapshot(), self.prefix)
+        if self.pools:
+            text += render_pools([p.stats() for p in self.pools], self.prefix)
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".etl-metrics-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self._last_write = time.monotonic()
+
+    def __enter__(self) -> "PrometheusTextfileExporter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.write()
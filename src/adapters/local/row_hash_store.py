@@ -0,0 +1,61 @@
+# python
+# file: src/adapters/local/row_hash_store.py
+
+from __future__ import annotations
+from typing import Dict, Iterable, Mapping
+import sqlite3
+import threading
+
+from core.ports.row_hash_store import RowHashStore
+
+# bound parameters per IN (...) query, below SQLite's default variable limit
+_CHUNK = 500
+
+
+class SQLiteRowHashStore(RowHashStore):
+    """
+    RowHashStore in a local SQLite file, one row per (entity, source_id).
+
+    Kept next to the identifier index rather than in MusicCollection so change detection costs
+    no destination round-trips; losing the file only means the next run reloads every row.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS row_hash ("
+            " entity TEXT NOT NULL, source_id TEXT NOT NULL, hash BLOB NOT NULL,"
+            " PRIMARY KEY (entity, source_id)) WITHOUT ROWID")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, entity: str, source_ids: Iterable[str]) -> Dict[str, bytes]:
+        ids = list(source_ids)
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            for i in range(0, len(ids), _CHUNK):
+                chunk = ids[i:i + _CHUNK]
+                marks = ", ".join("?" for _ in chunk)
+                rows = self._db.execute(
+                    f"SELECT source_id, hash FROM row_hash WHERE entity = ? AND source_id IN ({marks})",
+                    [entity, *chunk]).fetchall()
+                found.update((sid, bytes(digest)) for sid, digest in rows)
+        return found
+
+    def put_many(self, entity: str, hashes: Mapping[str, bytes]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO row_hash (entity, source_id, hash) VALUES (?, ?, ?)",
+                [(entity, sid, digest) for sid, digest in hashes.items()])
+            self._db.commit()
+
+    def clear(self, entity: str) -> None:
+        """Forget every hash of an entity so its next run reloads all rows."""
+        with self._lock:
+            self._db.execute("DELETE FROM row_hash WHERE entity = ?", (entity,))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,485 @@
+# python
+# file: src/adapters/local/spool.py
+
+"""
+Append-only local spool of extracted (or translated) batches, for replaying loads without
+touching the source again: extract once at night, load as often as needed, into as many
+environments as needed.
+
+A spool `name` in `directory` consists of:
+
+- `<name>.<n>.seg`: segment files of typed, columnar batch blocks, rolled over at
+  `segment_bytes`. Each block is a header (batch_id, row count, watermark range, CRC32 of the
+  body) followed by its columns: int / float / bool columns as raw native int64 / float64 /
+  int8 buffers, datetimes as int64 microseconds, strings as one UTF-8 blob plus int64 character
+  offsets, anything else as JSON. Every section is 8-byte aligned, so readers memory-map the
+  segment and hand numeric columns out as zero-copy memoryviews.
+- `<name>.index`: append-only fixed-size records (batch_id, segment, offset, length, rows,
+  min / max watermark). The index is the commit point: a block is visible once its index
+  record is written, a block without one (crash in between) is ignored, and a torn trailing
+  record is dropped on open.
+
+Files are in native byte order: the spool is a local cache between pipeline stages, not an
+exchange format. JSON-encoded columns round-trip JSON values only (others come back as str).
+"""
+
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID, uuid4
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+
+from core.record_batch import BOOL, FLOAT, INT, OBJECT, STR, Column, Field, RecordBatch
+from core.watermark import Watermark, sort_key
+from application.services.change_detection import row_fields
+
+logger = logging.getLogger(__name__)
+
+BLOCK_MAGIC = b"SPB1"
+# magic, batch_id, rows, min_ts, max_ts, column count, body crc32 (+4 pad -> 8-byte aligned)
+_BLOCK_HEADER = struct.Struct("=4s16sqqqII4x")
+# name length, kind, flags, (pad), data bytes, extra bytes
+_COLUMN_HEADER = struct.Struct("=HcB4xqq")
+# batch_id, segment, offset, length, rows, min_ts, max_ts
+_INDEX_RECORD = struct.Struct("=16sqqqqqq")
+
+NO_TS = -(2 ** 63)  # watermark sentinel for batches without a (non-null) timestamp
+DEFAULT_SEGMENT_BYTES = 256 * 2 ** 20
+
+_NUMERIC_KINDS = {b"q": "q", b"d": "d", b"b": "b"}
+_KIND_OF_TYPE = {INT: b"q", FLOAT: b"d", BOOL: b"b", STR: b"s"}
+_TYPE_OF_KIND = {b"q": INT, b"d": FLOAT, b"b": BOOL, b"s": STR, b"t": OBJECT, b"j": OBJECT}
+_FLAG_NULLS = 1
+_FLAG_AWARE = 2
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _micros(ts: datetime) -> int:
+    delta = ts - (_EPOCH_UTC if ts.tzinfo is not None else _EPOCH)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int, aware: bool) -> datetime:
+    return (_EPOCH_UTC if aware else _EPOCH) + timedelta(microseconds=value)
+
+
+@dataclass(frozen=True)
+class SpoolEntry:
+    """Index record of one spooled batch; min_ts / max_ts are None without a watermark."""
+    batch_id: UUID
+    segment: int
+    offset: int
+    length: int
+    rows: int
+    min_ts: Optional[datetime]
+    max_ts: Optional[datetime]
+
+
+# -- encoding --------------------------------------------------------------------------------
+
+def infer_fields(rows: Sequence[Dict[str, Any]]) -> List[Field]:
+    """Field types of dict rows: the common type of each key's non-null values."""
+    kinds: Dict[str, Optional[str]] = {}
+    for row in rows:
+        for name, value in row.items():
+            if value is None:
+                kinds.setdefault(name, None)
+                continue
+            kind = (BOOL if isinstance(value, bool) else INT if isinstance(value, int)
+                    else FLOAT if isinstance(value, float) else STR if isinstance(value, str) else OBJECT)
+            seen = kinds.get(name)
+            kinds[name] = kind if seen in (None, kind) else OBJECT
+    return [Field(name, kind or OBJECT) for name, kind in kinds.items()]
+
+
+def to_record_batch(items: Any) -> RecordBatch:
+    """A RecordBatch as-is; dict, dataclass or plain-object rows via their fields."""
+    if isinstance(items, RecordBatch):
+        return items
+    rows = [row_fields(item) for item in items]
+    return RecordBatch.from_dicts(infer_fields(rows), rows)
+
+
+def _encode_column(column: Column) -> Tuple[bytes, List[bytes]]:
+    """(column header + name, sections) of one column; sections are padded to 8 bytes."""
+    values = column.data
+    nulls = column.nulls
+    kind = _KIND_OF_TYPE.get(column.field.type, b"j")
+    flags = 0
+    extra = b""
+    if kind in _NUMERIC_KINDS:
+        data = (values if isinstance(values, array) else array(_NUMERIC_KINDS[kind], values)).tobytes()
+    elif kind == b"s":
+        text = [v if v is not None else "" for v in values]
+        offsets = array("q", [0])
+        total = 0
+        for v in text:
+            total += len(v)
+            offsets.append(total)
+        data, extra = offsets.tobytes(), "".join(text).encode("utf-8", "surrogatepass")
+    else:
+        present = [v for v in values if v is not None]
+        aware = {v.tzinfo is not None for v in present if isinstance(v, datetime)}
+        if present and len(aware) == 1 and all(type(v) is datetime for v in present):
+            kind = b"t"
+            flags |= _FLAG_AWARE if aware.pop() else 0
+            data = array("q", [_micros(v) if v is not None else 0 for v in values]).tobytes()
+        else:
+            def default(v: Any) -> Any:
+                return v.isoformat() if isinstance(v, (datetime, date)) else str(v)
+            data = json.dumps(list(values), ensure_ascii=False, default=default).encode("utf-8")
+    sections = []
+    if nulls is not None:
+        flags |= _FLAG_NULLS
+        sections.append(bytes(nulls) + b"\0" * _pad(len(nulls)))
+    sections.append(data + b"\0" * _pad(len(data)))
+    if extra:
+        sections.append(extra + b"\0" * _pad(len(extra)))
+    name = column.field.name.encode("utf-8")
+    header = _COLUMN_HEADER.pack(len(name), kind, flags, len(data), len(extra)) + name + b"\0" * _pad(len(name))
+    return header, sections
+
+
+def encode_block(batch: RecordBatch, batch_id: UUID, min_ts: int, max_ts: int) -> bytes:
+    parts: List[bytes] = []
+    for column in batch._columns.values():
+        header, sections = _encode_column(column)
+        parts.append(header)
+        parts.extend(sections)
+    body = b"".join(parts)
+    header = _BLOCK_HEADER.pack(BLOCK_MAGIC, batch_id.bytes, len(batch), min_ts, max_ts,
+                                len(batch.fields), zlib.crc32(body))
+    return header + body
+
+
+def decode_block(buf: memoryview, verify: bool = True) -> Tuple[UUID, RecordBatch]:
+    """Decode one block; numeric columns are views into `buf` (zero-copy)."""
+    magic, batch_bytes, rows, _, _, ncols, crc = _BLOCK_HEADER.unpack_from(buf, 0)
+    if magic != BLOCK_MAGIC:
+        raise ValueError("not a spool block")
+    pos = _BLOCK_HEADER.size
+    if verify and zlib.crc32(buf[pos:]) != crc:
+        raise ValueError(f"spool block {UUID(bytes=batch_bytes)} is corrupt (CRC mismatch)")
+    columns: List[Column] = []
+    for _ in range(ncols):
+        name_len, kind, flags, data_len, extra_len = _COLUMN_HEADER.unpack_from(buf, pos)
+        pos += _COLUMN_HEADER.size
+        name = bytes(buf[pos:pos + name_len]).decode("utf-8")
+        pos += name_len + _pad(name_len)
+        nulls = None
+        if flags & _FLAG_NULLS:
+            nulls = bytearray(buf[pos:pos + rows])
+            pos += rows + _pad(rows)
+        data = buf[pos:pos + data_len]
+        pos += data_len + _pad(data_len)
+        if kind in _NUMERIC_KINDS:
+            values: Any = data.cast(_NUMERIC_KINDS[kind])
+        elif kind == b"s":
+            offsets = data.cast("q")
+            text = str(buf[pos:pos + extra_len], "utf-8", "surrogatepass")
+            pos += extra_len + _pad(extra_len)
+            bounds = offsets.tolist()
+            values = list(map(text.__getitem__, map(slice, bounds, bounds[1:])))
+            if nulls is not None:
+                values = [None if null else v for null, v in zip(nulls, values)]
+        elif kind == b"t":
+            aware = bool(flags & _FLAG_AWARE)
+            values = [None if nulls is not None and nulls[i] else _from_micros(v, aware)
+                      for i, v in enumerate(data.cast("q"))]
+        else:
+            values = json.loads(str(data, "utf-8"))
+        columns.append(Column(Field(name, _TYPE_OF_KIND[kind]), values, nulls))
+    return UUID(bytes=batch_bytes), RecordBatch(columns)
+
+
+# -- writer / reader -------------------------------------------------------------------------
+
+class _SpoolFiles:
+    def __init__(self, directory: str, name: str) -> None:
+        if not _NAME_RE.match(name):
+            raise ValueError(f"invalid spool name {name!r}")
+        self.directory = directory
+        self.name = name
+        self.index_path = os.path.join(directory, f"{name}.index")
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{segment:06d}.seg")
+
+    def read_index(self, start: int = 0) -> Tuple[List[SpoolEntry], int]:
+        """Entries from byte `start` of the index, and the offset after the last whole record."""
+        if not os.path.exists(self.index_path):
+            return [], start
+        with open(self.index_path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        usable = len(data) - len(data) % _INDEX_RECORD.size  # a torn trailing record is dropped
+        entries = []
+        for rec in _INDEX_RECORD.iter_unpack(data[:usable]):
+            batch_bytes, segment, offset, length, rows, min_ts, max_ts = rec
+            entries.append(SpoolEntry(
+                UUID(bytes=batch_bytes), segment, offset, length, rows,
+                None if min_ts == NO_TS else _from_micros(min_ts, False),
+                None if max_ts == NO_TS else _from_micros(max_ts, False)))
+        return entries, start + usable
+
+
+def _watermark(batch: RecordBatch, ts_field: Optional[str]) -> Tuple[int, int]:
+    column = batch.get(ts_field) if ts_field else None
+    stamps = [_micros(_naive_utc(v)) for v in column if v is not None] if column is not None else []
+    return (min(stamps), max(stamps)) if stamps else (NO_TS, NO_TS)
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    # the index orders watermarks on one naive scale: aware stamps are stored as UTC wall-clock
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+
+
+class SpoolWriter:
+    """
+    Appends batches to a spool.
+
+    Responsibilities:
+    - encode a RecordBatch (or dict / dataclass rows) as one block in the current segment
+    - roll segments over at segment_bytes
+    - publish the block through an index record carrying batch_id and watermark range
+    - with durable=True, fsync the block before its index record, and the index record itself
+    """
+
+    def __init__(self, directory: str, name: str, ts_field: Optional[str] = None,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, durable: bool = True) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._files = _SpoolFiles(directory, name)
+        self.ts_field = ts_field
+        self.segment_bytes = segment_bytes
+        self.durable = durable
+        entries, _ = self._files.read_index()
+        self._segment = entries[-1].segment if entries else 0
+        self._lock = threading.Lock()
+
+    def append(self, items: Any, batch_id: Optional[UUID] = None) -> SpoolEntry:
+        batch = to_record_batch(items)
+        batch_id = batch_id or uuid4()
+        min_ts, max_ts = _watermark(batch, self.ts_field)
+        block = encode_block(batch, batch_id, min_ts, max_ts)
+        with self._lock:
+            path = self._files.segment_path(self._segment)
+            if os.path.exists(path) and os.path.getsize(path) and os.path.getsize(path) + len(block) > self.segment_bytes:
+                self._segment += 1
+                path = self._files.segment_path(self._segment)
+            with open(path, "ab") as f:
+                offset = f.tell()
+                offset += _pad(offset)
+                f.write(b"\0" * (offset - f.tell()))  # keep blocks 8-byte aligned after a torn write
+                f.write(block)
+                self._sync(f)
+            with open(self._files.index_path, "ab") as f:
+                f.write(_INDEX_RECORD.pack(batch_id.bytes, self._segment, offset, len(block), len(batch),
+                                           min_ts, max_ts))
+                self._sync(f)
+        return SpoolEntry(batch_id, self._segment, offset, len(block), len(batch),
+                          None if min_ts == NO_TS else _from_micros(min_ts, False),
+                          None if max_ts == NO_TS else _from_micros(max_ts, False))
+
+    def _sync(self, f: Any) -> None:
+        if self.durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class SpoolReader:
+    """
+    Memory-mapped read access to a spool.
+
+    Responsibilities:
+    - index lookups by batch_id and by watermark range
+    - decode blocks with numeric columns as views into the mapped segment (zero-copy)
+    - pick up batches appended after opening (refresh)
+
+    Batches returned by read() reference the segment maps; close() the reader only once they
+    are no longer used (a map with live views is left to the garbage collector).
+    """
+
+    def __init__(self, directory: str, name: str, verify: bool = True) -> None:
+        self._files = _SpoolFiles(directory, name)
+        self.verify = verify
+        self.entries: List[SpoolEntry] = []
+        self._by_id: Dict[UUID, SpoolEntry] = {}
+        self._index_pos = 0
+        self._maps: Dict[int, Tuple[Any, mmap.mmap]] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Load index records written since the last refresh; returns how many."""
+        entries, self._index_pos = self._files.read_index(self._index_pos)
+        with self._lock:
+            self.entries.extend(entries)
+            self._by_id.update((e.batch_id, e) for e in entries)
+        return len(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def rows(self) -> int:
+        return sum(e.rows for e in self.entries)
+
+    def find(self, batch_id: UUID) -> Optional[SpoolEntry]:
+        return self._by_id.get(batch_id)
+
+    def entries_between(self, since: Optional[datetime] = None,
+                        until: Optional[datetime] = None) -> List[SpoolEntry]:
+        """Entries holding rows with since < watermark <= until (open bounds when None)."""
+        since = _naive_utc(since) if since is not None else None
+        until = _naive_utc(until) if until is not None else None
+        return [e for e in self.entries
+                if e.max_ts is not None and (since is None or e.max_ts > since)
+                and (until is None or e.min_ts <= until)]
+
+    def read(self, entry: Union[SpoolEntry, UUID]) -> RecordBatch:
+        if isinstance(entry, UUID):
+            found = self.find(entry)
+            if found is None:
+                raise KeyError(f"batch {entry} is not in the spool")
+            entry = found
+        buf = memoryview(self._map(entry.segment))[entry.offset:entry.offset + entry.length]
+        return decode_block(buf, self.verify)[1]
+
+    def iter_batches(self, entries: Optional[Iterable[SpoolEntry]] = None) -> Iterator[Tuple[SpoolEntry, RecordBatch]]:
+        for entry in list(self.entries) if entries is None else entries:
+            yield entry, self.read(entry)
+
+    def _map(self, segment: int) -> mmap.mmap:
+        with self._lock:
+            opened = self._maps.get(segment)
+            if opened is None:
+                f = open(self._files.segment_path(segment), "rb")
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except Exception:
+                    f.close()
+                    raise
+                opened = self._maps[segment] = (f, mm)
+            elif len(opened[1]) < os.path.getsize(self._files.segment_path(segment)):
+                # the writer appended since the map was made: map the segment again
+                f, mm = opened
+                new = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                opened = self._maps[segment] = (f, new)
+                self._close_map(mm)
+            return opened[1]
+
+    @staticmethod
+    def _close_map(mm: mmap.mmap) -> None:
+        try:
+            mm.close()
+        except BufferError:  # batches still reference it; released with them
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            maps, self._maps = self._maps, {}
+        for f, mm in maps.values():
+            self._close_map(mm)
+            f.close()
+
+    def __enter__(self) -> "SpoolReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# -- pipeline stages -------------------------------------------------------------------------
+
+class SpoolingExtractor:
+    """
+    Extractor decorator that spools every page it returns, so a later run can replay it.
+
+    Pages are spooled before they are handed on: a page that reached the loader is always in
+    the spool, whatever happens to the load. The writer needs a ts_field: SpoolExtractor
+    replays by the watermark range the index records for each batch.
+    """
+
+    def __init__(self, inner: Any, writer: SpoolWriter) -> None:
+        if writer.ts_field is None:
+            raise ValueError("SpoolingExtractor needs a SpoolWriter with a ts_field to spool replayable pages")
+        self.inner = inner
+        self.writer = writer
+
+    def extract_batch(self, since: Optional[datetime], limit: int) -> Any:
+        items = self.inner.extract_batch(since=since, limit=limit)
+        items = items if isinstance(items, RecordBatch) else list(items)
+        if len(items):
+            self.writer.append(items)
+        return items
+
+
+class SpoolExtractor:
+    """
+    Extractor replaying a spool in watermark order: rows strictly after `since`, a datetime or
+    a Watermark on (ts_field, id_field). Without an id_field only the timestamp is compared.
+
+    Serves at most `limit` rows per call from one spooled batch, so page boundaries follow the
+    original extract. columnar=True returns RecordBatch slices (zero-copy); otherwise dict rows,
+    or `row_factory(**row)` objects (e.g. the extractor's original row dataclass). A spooled
+    batch without a watermark (written without ts_field, or all its stamps NULL) cannot be
+    placed in that order: extract_batch raises rather than skipping it.
+    """
+
+    def __init__(self, reader: SpoolReader, ts_field: str, id_field: Optional[str] = None,
+                 columnar: bool = False, row_factory: Optional[Callable[..., Any]] = None) -> None:
+        self.reader = reader
+        self.ts_field = ts_field
+        self.id_field = id_field
+        self.seeks_watermark = id_field is not None
+        self.columnar = columnar
+        self.row_factory = row_factory
+        self._cached: Optional[Tuple[SpoolEntry, RecordBatch, List[Tuple[Any, ...]]]] = None
+
+    def extract_batch(self, since: Union[None, datetime, Watermark], limit: int) -> Any:
+        since = Watermark.coerce(since)
+        if since is not None:
+            since = Watermark(_naive_utc(since.source_updated_at),
+                              since.source_id if self.id_field is not None else None)
+        entries = self.reader.entries
+        unordered = next((e for e in entries if e.max_ts is None and e.rows), None)
+        if unordered is not None:
+            raise ValueError(f"Spooled batch {unordered.batch_id} has no {self.ts_field} watermark "
+                             f"(spool written without ts_field?); it cannot be replayed in watermark order")
+        entries = [e for e in entries if e.max_ts is not None]
+        # spooled batches are in extract (watermark) order: skip those entirely before since
+        start = 0 if since is None else bisect_left([e.max_ts for e in entries], since.source_updated_at)
+        for entry in entries[start:]:
+            batch, keys = self._load(entry)
+            first = 0 if since is None else bisect_right(keys, since.key)
+            if first < len(batch):
+                page = batch.slice(first, min(len(batch), first + limit))
+                if self.columnar:
+                    return page
+                rows = page.to_dicts()
+                return [self.row_factory(**r) for r in rows] if self.row_factory is not None else rows
+        return RecordBatch([]) if self.columnar else []
+
+    def _load(self, entry: SpoolEntry) -> Tuple[RecordBatch, List[Tuple[Any, ...]]]:
+        if self._cached is None or self._cached[0] != entry:
+            batch = self.reader.read(entry)
+            stamps = [_naive_utc(v) if v is not None else None for v in batch[self.ts_field]]
+            ids = batch[self.id_field] if self.id_field is not None else [None] * len(batch)
+            self._cached = (entry, batch, [sort_key(ts, i) for ts, i in zip(stamps, ids)])
+        return self._cached[1], self._cached[2]
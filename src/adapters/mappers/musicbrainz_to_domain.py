@@ -1,9 +1,21 @@
 ﻿# python
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
+import logging
 from core.models import Artist
 from core.ports.mapper import Mapper
+from core.record_batch import Field, RecordBatch, INT
+from application.services.lookup_cache import LookupCache
+
+logger = logging.getLogger(__name__)
+
+# lookup index resolving MB ISO country codes to music.Country ids
+COUNTRY_CODE_INDEX = "CountryCode"
 
 class MusicBrainzToDomainMapper:
+    def __init__(self, lookups: Optional[LookupCache] = None):
+        # without a cache, country_id is left unresolved (None)
+        self._lookups = lookups
+
     def map_source_artist_to_domain(self, row: Dict[str, Any]) -> Artist:
         # Transform DB row dict to domain Artist
         return Artist(
@@ -15,9 +27,31 @@ class MusicBrainzToDomainMapper:
 
     # Not required here but implement to satisfy Mapper protocol in composition root if used directly
     def map_artist_to_destination(self, artist: Artist) -> Dict[str, Any]:
-        return {
-            'mb_id': artist.id,
-            'name': artist.name,
-            'sort_name': artist.sort_name,
-            'country': artist.country,
-        }
+        return self.map_artists_to_destination([artist])[0]
+
+    def map_artists_to_destination(self, artists: Sequence[Artist]) -> List[Dict[str, Any]]:
+        country_ids = self._resolve_countries([a.country for a in artists])
+        return [
+            {
+                'mb_id': artist.id,
+                'name': artist.name,
+                'sort_name': artist.sort_name,
+                'country': artist.country,
+                'country_id': country_id,
+            }
+            for artist, country_id in zip(artists, country_ids)
+        ]
+
+    def map_batch_to_destination(self, batch: RecordBatch) -> RecordBatch:
+        # id is renamed in place (buffer shared), only the country_id column is new
+        country_ids = self._resolve_countries(batch['country'])
+        return batch.rename({'id': 'mb_id'}).with_column(Field('country_id', INT), country_ids)
+
+    def _resolve_countries(self, codes) -> List[Optional[int]]:
+        # resolve the whole country column against the lookup cache in one pass
+        if self._lookups is None:
+            return [None] * len(codes)
+        resolution = self._lookups.resolve_many(COUNTRY_CODE_INDEX, codes)
+        if resolution.misses:
+            logger.warning("Unresolved country codes: %s", ", ".join(map(str, resolution.misses)))
+        return resolution.ids
@@ -0,0 +1,389 @@
+# python
+# file: src/adapters/pool.py
+
+"""
+Thread-safe pool of driver connections shared by the Postgres and SQL Server wrappers.
+
+Connection wrappers created with `pool=` no longer own a driver connection: raw() returns the
+connection bound to the calling thread - or asyncio task, when called from one - checking one
+out on first use, so repositories created once in the composition root can be used from any
+number of pipeline threads without sharing a driver connection (neither psycopg nor pyodbc
+connections may be used from two threads at once) and without reconnecting per batch.
+
+A binding lasts until release() / the wrapper's close(), or until its owner is gone: the
+pool reclaims connections bound to finished threads and tasks before it makes a caller wait.
+Executor threads (ThreadPoolExecutor workers, the asyncio.to_thread shims) live for the whole
+run, so the wrappers also end a binding with each unit of work - SQLServerConnection on
+commit() / rollback(), PostgresConnection when a stream ends or a session() block exits -
+and more such threads than max_size do not exhaust the pool.
+Returned connections are reset (rolled back) and go back to the idle stack; a borrow validates
+a connection that sat idle for longer than `validate_idle_s` and replaces it when it is dead.
+"""
+
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+import asyncio
+import logging
+import threading
+import time
+import weakref
+
+from application.services.instrumentation import Histogram
+
+logger = logging.getLogger(__name__)
+
+# checkout wait buckets: an unsized pool shows up as waits in the 0.1 s .. 30 s range
+POOL_WAIT_BUCKETS_S = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolTimeout(TimeoutError):
+    """No connection became available within the checkout timeout."""
+
+
+class PoolClosed(RuntimeError):
+    """The pool was closed; no further checkouts are possible."""
+
+
+@dataclass
+class PoolStats:
+    """Point-in-time counters of one pool; `wait` holds every checkout's wait in seconds."""
+    name: str
+    min_size: int
+    max_size: int
+    size: int = 0
+    idle: int = 0
+    in_use: int = 0
+    checkouts: int = 0
+    waited: int = 0  # checkouts that found no idle connection and had to block
+    timeouts: int = 0
+    created: int = 0
+    discarded: int = 0
+    validation_failures: int = 0
+    reclaimed: int = 0  # connections returned on behalf of finished threads / tasks
+    wait: Histogram = field(default_factory=lambda: Histogram(POOL_WAIT_BUCKETS_S))
+
+
+class _Turn:
+    """A blocked checkout; release() hands it a connection directly."""
+
+    __slots__ = ("conn", "returned_at")
+
+    def __init__(self) -> None:
+        self.conn: Optional[Any] = None
+        self.returned_at = 0.0
+
+
+def _owner() -> Tuple[Tuple[str, int], Any]:
+    """Affinity key and owner object of the caller: the running asyncio task, else the thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:  # no running event loop in this thread
+        task = None
+    if task is not None:
+        return ("task", id(task)), task
+    thread = threading.current_thread()
+    return ("thread", thread.ident or 0), thread
+
+
+def _alive(owner_ref: Callable[[], Any]) -> bool:
+    owner = owner_ref()
+    if owner is None:
+        return False
+    if isinstance(owner, threading.Thread):
+        return owner.is_alive()
+    return not owner.done()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of driver connections with checkout timeouts and thread / task affinity.
+
+    Responsibilities:
+    - open connections lazily up to max_size (min_size eagerly, via warm())
+    - block a checkout at most checkout_timeout_s, then raise PoolTimeout; blocked checkouts
+      are served in arrival order
+    - validate idle connections on borrow and replace dead ones
+    - bind one connection per thread / asyncio task (bound(), connection()) and reclaim the
+      bindings of owners that ended without releasing
+    - record checkout wait times and counters for sizing (stats())
+
+    connect() opens a driver connection; validate(conn) raises or returns False when the
+    connection is dead; reset(conn) runs before a connection is reused (e.g. rollback);
+    close(conn) disposes of it.
+    """
+
+    def __init__(self, connect: Callable[[], Any], min_size: int = 1, max_size: int = 8,
+                 checkout_timeout_s: float = 30.0, validate: Optional[Callable[[Any], Any]] = None,
+                 validate_idle_s: float = 5.0, reset: Optional[Callable[[Any], None]] = None,
+                 close: Optional[Callable[[Any], None]] = None, name: str = "pool") -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout_s = checkout_timeout_s
+        self.validate_idle_s = validate_idle_s
+        self._connect = connect
+        self._validate = validate
+        self._reset = reset
+        self._close = close if close is not None else (lambda conn: conn.close())
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (connection, returned at), newest right
+        self._bound: Dict[Tuple[str, int], Tuple[Any, Callable[[], Any]]] = {}
+        self._waiters: Deque[_Turn] = deque()  # blocked checkouts, oldest first
+        self._size = 0  # open connections, idle or checked out, plus ones being opened
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = PoolStats(name, min_size, max_size)
+
+    # -- plain checkouts -------------------------------------------------------------------
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Check out a connection; the caller must release() it."""
+        timeout = self.checkout_timeout_s if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        waited = reaped = False
+        while True:
+            conn, returned_at, create = None, 0.0, False
+            with self._cond:
+                if self._closed:
+                    raise PoolClosed(f"pool {self.name} is closed")
+                if self._idle and not self._waiters:
+                    conn, returned_at = self._idle.pop()  # LIFO: the most recently used is warmest
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                elif reaped:
+                    waited = True
+                    conn, returned_at, create = self._wait_turn(deadline, timeout)
+            if conn is None and not create:
+                # exhausted: give back connections of finished owners before blocking
+                self.reap()
+                reaped = True
+                continue
+            if create:
+                conn = self._open()
+            elif not self._usable(conn, returned_at):
+                continue
+            with self._cond:
+                self._stats.checkouts += 1
+                self._stats.waited += waited
+                self._stats.wait.observe(time.perf_counter() - started)
+            return conn
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """Return a checked-out connection; discard=True closes it instead (e.g. after a driver error)."""
+        if not discard and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception as ex:
+                logger.warning("Pool %s: reset failed, discarding connection: %s", self.name, ex)
+                discard = True
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._stats.discarded += discard
+            elif self._waiters:
+                # hand over in arrival order, so a releasing thread cannot starve the waiters
+                turn = self._waiters.popleft()
+                turn.conn, turn.returned_at = conn, time.monotonic()
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify_all()
+        if discard or self._closed:
+            self._dispose(conn)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Unbound checkout for the duration of the block; discarded when the block raises."""
+        conn = self.acquire(timeout)
+        failed = False
+        try:
+            yield conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(conn, discard=failed)
+
+    # -- thread / task affinity ------------------------------------------------------------
+
+    def bound(self) -> Any:
+        """The connection bound to the calling thread or task, checked out on first use."""
+        key, owner = _owner()
+        with self._cond:
+            entry = self._bound.get(key)
+            if entry is not None and entry[1]() is owner:
+                return entry[0]
+        if entry is not None:  # ident reused by a new thread / task: the old binding is stale
+            self._reclaim(key, entry)
+        conn = self.acquire()
+        with self._cond:
+            self._bound[key] = (conn, weakref.ref(owner))
+        return conn
+
+    def current(self) -> Optional[Any]:
+        """The connection bound to the caller, without checking one out."""
+        key, owner = _owner()
+        with self._cond:
+            entry = self._bound.get(key)
+        return entry[0] if entry is not None and entry[1]() is owner else None
+
+    def unbind(self, discard: bool = False) -> None:
+        """Release the caller's bound connection, if any."""
+        key, _ = _owner()
+        with self._cond:
+            entry = self._bound.pop(key, None)
+        if entry is not None:
+            self.release(entry[0], discard=discard)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Bind a connection for the block; nested blocks of the same owner share it."""
+        outer = self.current() is not None
+        key, _ = _owner()
+        conn = self.bound()
+        try:
+            yield conn
+        finally:
+            if not outer:
+                # by key, not by the caller: an abandoned generator may be closed on another thread
+                self._unbind(key, conn)
+
+    # -- lifecycle and metrics ---------------------------------------------------------------
+
+    def warm(self) -> None:
+        """Open connections until min_size are available."""
+        opened = []
+        with self._cond:
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+        try:
+            for _ in range(missing):
+                opened.append(self._connect())
+        finally:
+            with self._cond:
+                self._size -= missing - len(opened)
+                self._stats.created += len(opened)
+                now = time.monotonic()
+                self._idle.extend((conn, now) for conn in opened)
+                self._cond.notify_all()
+
+    def stats(self) -> PoolStats:
+        self.reap()
+        with self._cond:
+            s = self._stats
+            wait = Histogram(s.wait.bounds)
+            wait.counts, wait.sum, wait.count = list(s.wait.counts), s.wait.sum, s.wait.count
+            return PoolStats(
+                self.name, self.min_size, self.max_size, size=self._size, idle=len(self._idle),
+                in_use=self._size - len(self._idle), checkouts=s.checkouts, waited=s.waited, timeouts=s.timeouts,
+                created=s.created, discarded=s.discarded, validation_failures=s.validation_failures,
+                reclaimed=s.reclaimed, wait=wait)
+
+    def reap(self) -> int:
+        """Release connections bound to threads / tasks that have ended; returns how many."""
+        with self._cond:
+            stale = [(key, entry) for key, entry in self._bound.items() if not _alive(entry[1])]
+        for key, entry in stale:
+            self._reclaim(key, entry)
+        return len(stale)
+
+    def close(self) -> None:
+        """Close idle connections now and checked-out ones as they are released."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._dispose(conn)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- internals -------------------------------------------------------------------------
+
+    def _wait_turn(self, deadline: float, timeout: float) -> Tuple[Optional[Any], float, bool]:
+        """Queue for a connection (lock held); returns (handed-over connection, returned at, may open one)."""
+        turn = _Turn()
+        self._waiters.append(turn)
+        try:
+            while turn.conn is None:
+                if self._closed:
+                    raise PoolClosed(f"pool {self.name} is closed")
+                if self._size < self.max_size:  # a connection was discarded: open a replacement
+                    self._size += 1
+                    return None, 0.0, True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats.timeouts += 1
+                    raise PoolTimeout(f"no connection from pool {self.name} within {timeout}s "
+                                      f"({self.max_size} in use)")
+                self._cond.wait(remaining)
+            return turn.conn, turn.returned_at, False
+        finally:
+            if turn.conn is None:
+                self._waiters.remove(turn)
+
+    def _usable(self, conn: Any, returned_at: float) -> bool:
+        """Validate a connection taken from the idle stack; a dead one is discarded."""
+        if self._validate is None or time.monotonic() - returned_at < self.validate_idle_s:
+            return True
+        try:
+            ok = self._validate(conn) is not False
+        except Exception as ex:
+            logger.info("Pool %s: idle connection failed validation: %s", self.name, ex)
+            ok = False
+        if ok:
+            return True
+        with self._cond:
+            self._size -= 1
+            self._stats.validation_failures += 1
+            self._stats.discarded += 1
+            self._cond.notify_all()
+        self._dispose(conn)
+        return False
+
+    def _open(self) -> Any:
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._stats.created += 1
+        return conn
+
+    def _reclaim(self, key: Tuple[str, int], entry: Tuple[Any, Callable[[], Any]]) -> None:
+        with self._cond:
+            if self._bound.get(key) is not entry:
+                return
+            del self._bound[key]
+            self._stats.reclaimed += 1
+        logger.debug("Pool %s: reclaiming connection of finished %s %s", self.name, *key)
+        self.release(entry[0])
+
+    def _unbind(self, key: Tuple[str, int], conn: Any) -> None:
+        with self._cond:
+            entry = self._bound.get(key)
+            if entry is None or entry[0] is not conn:
+                return
+            del self._bound[key]
+        self.release(conn)
+
+    def _dispose(self, conn: Any) -> None:
+        try:
+            self._close(conn)
+        except Exception as ex:
+            logger.debug("Pool %s: error closing connection: %s", self.name, ex)
+
@@ -1,22 +1,129 @@
 ﻿# python
-# Minimal Postgres connection wrapper placeholder.
+# Minimal Postgres connection wrapper.
 # Keep real DB driver usage inside this module in production.
 
-from typing import Any, Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from adapters.pool import ConnectionPool
+
+DEFAULT_FETCH_SIZE = 2000
 
 class PostgresConnection:
-    def __init__(self, dsn: str):
+    """
+    Thin wrapper around a DB-API Postgres connection (psycopg 3 by default).
+
+    The driver is imported lazily so the rest of the code base (and the unit tests) do not
+    need it installed; pass `connect` to supply a different driver or a test double.
+
+    With `pool` (see create_pool), each calling thread or asyncio task uses the pooled
+    connection bound to it, so one wrapper can serve several pipelines. A stream hands the
+    connection back when it ends (unless an enclosing session() holds it), and so does the end
+    of a session() block; close() hands back any binding left.
+    """
+
+    def __init__(self, dsn: str, fetch_size: int = DEFAULT_FETCH_SIZE,
+                 connect: Optional[Callable[[str], Any]] = None, pool: Optional[ConnectionPool] = None):
+        if fetch_size <= 0:
+            raise ValueError("fetch_size must be positive")
         self.dsn = dsn
+        self.fetch_size = fetch_size
+        self._connect = connect
+        self._pool = pool
+        self._raw = None
+
+    @staticmethod
+    def create_pool(dsn: str, min_size: int = 1, max_size: int = 8, checkout_timeout_s: float = 30.0,
+                    connect: Optional[Callable[[str], Any]] = None, **kwargs: Any) -> ConnectionPool:
+        """Pool of driver connections to `dsn`, validated with SELECT 1 and rolled back on return."""
+        def open_connection() -> Any:
+            if connect is not None:
+                return connect(dsn)
+            import psycopg  # optional dependency, see requirements.txt
+            return psycopg.connect(dsn)
+        kwargs.setdefault("name", "postgres")
+        return ConnectionPool(open_connection, min_size=min_size, max_size=max_size,
+                              checkout_timeout_s=checkout_timeout_s, validate=_ping,
+                              reset=lambda conn: conn.rollback(), **kwargs)
+
+    def raw(self) -> Any:
+        """Return the underlying driver connection, opening it on first use."""
+        if self._pool is not None:
+            return self._pool.bound()
+        if self._raw is None:
+            connect = self._connect
+            if connect is None:
+                import psycopg  # optional dependency, see requirements.txt
+                connect = psycopg.connect
+            self._raw = connect(self.dsn)
+        return self._raw
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        """The caller's connection for the block; with a pool, bound for the block only."""
+        if self._pool is None:
+            yield self.raw()
+            return
+        with self._pool.connection() as conn:
+            yield conn
+
+    def cursor(self) -> Any:
+        # plain client-side cursor; use stream() for large result sets
+        return self.raw().cursor()
+
+    def stream(self, query: str, params: Optional[Dict[str, Any]] = None,
+               fetch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Execute `query` on a named (server-side) cursor and yield rows as dicts.
+
+        Rows are pulled from the server `fetch_size` at a time, so memory stays bounded by the
+        fetch size rather than by the size of the result. Named cursors live inside the
+        current transaction; the cursor is closed when the generator is exhausted or closed.
+        """
+        for columns, rows in self.stream_chunks(query, params, fetch_size):
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def stream_chunks(self, query: str, params: Optional[Dict[str, Any]] = None,
+                      fetch_size: Optional[int] = None) -> Iterator[Tuple[List[str], Sequence[tuple]]]:
+        """Like stream(), but yield (column names, driver tuples) per fetch, without per-row dicts."""
+        size = fetch_size or self.fetch_size
+        with self.session() as conn:
+            yield from self._fetch_chunks(conn, query, params, size)
+
+    @staticmethod
+    def _fetch_chunks(conn: Any, query: str, params: Optional[Dict[str, Any]],
+                      size: int) -> Iterator[Tuple[List[str], Sequence[tuple]]]:
+        cur = conn.cursor(name=f"mbetl_{uuid4().hex[:16]}")
+        try:
+            # psycopg honours itersize when iterating; we use fetchmany explicitly as well
+            cur.itersize = size
+            cur.execute(query, params)
+            columns = None
+            while True:
+                rows = cur.fetchmany(size)
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [d[0] for d in cur.description]
+                yield columns, rows
+        finally:
+            cur.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.unbind()
+            return
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
 
-    def cursor(self) -> Iterator:
-        # placeholder context manager to emulate a cursor
-        class C:
-            def __enter__(self_inner):
-                return self_inner
-            def __exit__(self_inner, exc_type, exc, tb):
-                return False
-            def execute(self_inner, *_args, **_kwargs):
-                pass
-            def __iter__(self_inner):
-                return iter([])
-        return C()
+def _ping(conn: Any) -> None:
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    finally:
+        cur.close()
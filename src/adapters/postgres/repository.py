@@ -1,12 +1,65 @@
 ﻿# python
-from typing import Iterable, Dict, Any
+from typing import Iterable, Dict, Any, Optional
 from core.ports.source_repository import SourceRepository
+from core.record_batch import Field, RecordBatch, INT, STR
+
+# Country is resolved to a single ISO code per area; an area may carry several codes.
+_ARTIST_COLUMNS = """
+    a.id,
+    a.name,
+    a.sort_name,
+    (SELECT iso.code FROM iso_3166_1 iso WHERE iso.area = a.area ORDER BY iso.code LIMIT 1) AS country
+"""
+
+ARTISTS_BY_OFFSET_SQL = f"""
+SELECT {_ARTIST_COLUMNS}
+FROM artist a
+ORDER BY a.id
+OFFSET %(offset)s LIMIT %(limit)s
+"""
+
+# Seek on the primary key: the index range scan starts at after_id, so every page costs the same.
+ARTISTS_AFTER_ID_SQL = f"""
+SELECT {_ARTIST_COLUMNS}
+FROM artist a
+WHERE a.id > %(after_id)s{{upper_bound}}
+ORDER BY a.id
+LIMIT %(limit)s
+"""
+
+# column order and types of _ARTIST_COLUMNS
+ARTIST_FIELDS = (Field("id", INT), Field("name", STR), Field("sort_name", STR), Field("country", STR))
 
 class PostgresRepository(SourceRepository):
-    def __init__(self, conn):
+    def __init__(self, conn, fetch_size: Optional[int] = None):
         self._conn = conn
+        # rows pulled per server round-trip; defaults to the connection's fetch size
+        self._fetch_size = fetch_size
 
     def fetch_artists_batch(self, offset: int, limit: int) -> Iterable[Dict[str, Any]]:
-        # Minimal stub: real implementation should use server-side cursor and SQL
-        # Here we return an empty list as placeholder
-        return []
+        # OFFSET paging re-scans every earlier row; kept for sources that cannot seek.
+        return self._conn.stream(ARTISTS_BY_OFFSET_SQL, {"offset": offset, "limit": limit},
+                                 fetch_size=self._fetch_size)
+
+    def fetch_artists_after(self, after_id: Optional[int], limit: int,
+                            before_id: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        sql, params = self._after_query(after_id, limit, before_id)
+        return self._conn.stream(sql, params, fetch_size=self._fetch_size)
+
+    def fetch_artist_columns_after(self, after_id: Optional[int], limit: int,
+                                   before_id: Optional[int] = None) -> RecordBatch:
+        # driver tuples go straight into column buffers; no dict per row
+        sql, params = self._after_query(after_id, limit, before_id)
+        chunks = [RecordBatch.from_rows(ARTIST_FIELDS, rows)
+                  for _, rows in self._conn.stream_chunks(sql, params, fetch_size=self._fetch_size)]
+        return RecordBatch.concat(chunks) if chunks else RecordBatch.from_rows(ARTIST_FIELDS, [])
+
+    @staticmethod
+    def _after_query(after_id: Optional[int], limit: int, before_id: Optional[int]):
+        # MB artist ids are positive serials, so 0 is a safe "before everything" key
+        params = {"after_id": after_id if after_id is not None else 0, "limit": limit}
+        upper_bound = ""
+        if before_id is not None:
+            upper_bound = " AND a.id < %(before_id)s"
+            params["before_id"] = before_id
+        return ARTISTS_AFTER_ID_SQL.format(upper_bound=upper_bound), params
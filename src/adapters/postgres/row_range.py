@@ -0,0 +1,34 @@
+# python
+# file: src/adapters/postgres/row_range.py
+
+from __future__ import annotations
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+
+class PostgresRowRange:
+    """
+    Source side of a reconciliation (a RowRangeSource): (key, *columns) rows of a MusicBrainz
+    table by key range, streamed from a server-side cursor.
+    """
+
+    def __init__(self, conn, table: str, columns: Sequence[str], key: str = "id",
+                 fetch_size: Optional[int] = None) -> None:
+        self._conn = conn
+        self.fetch_size = fetch_size
+        self._range_sql = f"SELECT MIN({key}), MAX({key}) FROM {table}"
+        self._rows_sql = (f"SELECT {', '.join((key, *columns))} FROM {table}"
+                          f" WHERE {key} >= %(lo)s AND {key} < %(hi)s ORDER BY {key}")
+
+    def key_range(self) -> Optional[Tuple[int, int]]:
+        with self._conn.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(self._range_sql)
+                lo, hi = cur.fetchone()
+            finally:
+                cur.close()
+        return None if lo is None else (int(lo), int(hi))
+
+    def rows_between(self, lo: int, hi: int) -> Iterator[Tuple[Any, ...]]:
+        for _, rows in self._conn.stream_chunks(self._rows_sql, {"lo": lo, "hi": hi}, self.fetch_size):
+            yield from rows
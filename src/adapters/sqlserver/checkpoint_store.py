@@ -0,0 +1,90 @@
+# python
+# file: src/adapters/sqlserver/checkpoint_store.py
+
+"""
+Checkpoints in music.ETLWatermark (ProcessFlow "Watermarking & idempotency").
+
+With manage_transaction=False the upsert joins the caller's open transaction on the same
+connection: ETLService saves the checkpoint before it commits the batch, so the batch and its
+checkpoint become durable together and a resumed run never skips or repeats committed rows.
+"""
+
+from __future__ import annotations
+from typing import Optional
+from uuid import UUID
+
+from core.ports.checkpoint_store import Checkpoint, CheckpointStore
+
+ETL_WATERMARK_DDL = """
+IF OBJECT_ID(N'music.ETLWatermark', N'U') IS NULL
+CREATE TABLE music.ETLWatermark (
+    EntityName nvarchar(100) NOT NULL,
+    PartitionKey nvarchar(100) NOT NULL,
+    LastSourceKey bigint NULL,
+    LastSourceUpdated datetime2(6) NULL,
+    BatchId uniqueidentifier NULL,
+    RowsCommitted bigint NOT NULL,
+    Completed bit NOT NULL,
+    UpdatedAt datetime2(3) NOT NULL CONSTRAINT DF_ETLWatermark_UpdatedAt DEFAULT SYSUTCDATETIME(),
+    CONSTRAINT PK_ETLWatermark PRIMARY KEY (EntityName, PartitionKey)
+)
+"""
+
+SELECT_SQL = """
+SELECT LastSourceKey, LastSourceUpdated, BatchId, RowsCommitted, Completed, UpdatedAt
+FROM music.ETLWatermark WHERE EntityName = ? AND PartitionKey = ?
+"""
+
+# HOLDLOCK: concurrent partitions of one entity must not race the insert branch
+UPSERT_SQL = """
+MERGE music.ETLWatermark WITH (HOLDLOCK) AS t
+USING (SELECT ? AS EntityName, ? AS PartitionKey) AS s
+ON t.EntityName = s.EntityName AND t.PartitionKey = s.PartitionKey
+WHEN MATCHED THEN UPDATE SET LastSourceKey = ?, LastSourceUpdated = ?, BatchId = ?, RowsCommitted = ?,
+    Completed = ?, UpdatedAt = SYSUTCDATETIME()
+WHEN NOT MATCHED THEN INSERT (EntityName, PartitionKey, LastSourceKey, LastSourceUpdated, BatchId, RowsCommitted,
+    Completed) VALUES (s.EntityName, s.PartitionKey, ?, ?, ?, ?, ?);
+"""
+
+DELETE_SQL = "DELETE FROM music.ETLWatermark WHERE EntityName = ? AND PartitionKey = ?"
+
+
+class SQLServerCheckpointStore(CheckpointStore):
+    """CheckpointStore over music.ETLWatermark; see the module docstring for manage_transaction."""
+
+    def __init__(self, conn, manage_transaction: bool = True) -> None:
+        self._conn = conn
+        self.manage_transaction = manage_transaction
+
+    def ensure_table(self) -> None:
+        self._conn.execute(ETL_WATERMARK_DDL)
+        self._conn.commit()
+
+    def load(self, entity: str, partition: str = "") -> Optional[Checkpoint]:
+        row = self._conn.execute(SELECT_SQL, (entity, partition)).fetchone()
+        if row is None:
+            return None
+        last_key, last_ts, batch_id, rows, completed, updated_at = row
+        return Checkpoint(entity=entity, partition=partition, last_key=last_key, last_ts=last_ts,
+                          batch_id=UUID(str(batch_id)) if batch_id else None, rows=int(rows),
+                          completed=bool(completed), updated_at=updated_at)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        values = (checkpoint.last_key, checkpoint.last_ts,
+                  str(checkpoint.batch_id) if checkpoint.batch_id else None, checkpoint.rows,
+                  int(checkpoint.completed))
+        self._execute(UPSERT_SQL, (checkpoint.entity, checkpoint.partition, *values, *values))
+
+    def clear(self, entity: str, partition: str = "") -> None:
+        self._execute(DELETE_SQL, (entity, partition))
+
+    def _execute(self, sql: str, params) -> None:
+        if not self.manage_transaction:
+            self._conn.execute(sql, params)
+            return
+        try:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
@@ -1,9 +1,96 @@
 ﻿# python
-# Minimal SQL Server connection wrapper placeholder.
+# Minimal SQL Server connection wrapper.
+# Keep real DB driver usage inside this module in production.
+
+from typing import Any, Callable, Optional, Sequence
+
+from adapters.pool import ConnectionPool
 
 class SQLServerConnection:
-    def __init__(self, conn_str: str):
+    """
+    Thin wrapper around a pyodbc connection.
+
+    The driver is imported lazily; pass `connect` to supply a different driver or a test double.
+    Transactions are explicit (autocommit off): callers commit or roll back per batch.
+
+    With `pool` (see create_pool), each calling thread or asyncio task uses the pooled
+    connection bound to it - its transaction included - until the transaction ends: commit()
+    and rollback() hand the connection back, as does close().
+    """
+
+    def __init__(self, conn_str: str, connect: Optional[Callable[[str], Any]] = None,
+                 fast_executemany: bool = True, pool: Optional[ConnectionPool] = None):
         self.conn_str = conn_str
+        self.fast_executemany = fast_executemany
+        self._connect = connect
+        self._pool = pool
+        self._raw = None
+
+    @staticmethod
+    def create_pool(conn_str: str, min_size: int = 1, max_size: int = 8, checkout_timeout_s: float = 30.0,
+                    connect: Optional[Callable[[str], Any]] = None, **kwargs: Any) -> ConnectionPool:
+        """Pool of driver connections to `conn_str`, validated with SELECT 1 and rolled back on return."""
+        def open_connection() -> Any:
+            return (connect or _pyodbc_connect)(conn_str)
+        kwargs.setdefault("name", "sqlserver")
+        return ConnectionPool(open_connection, min_size=min_size, max_size=max_size,
+                              checkout_timeout_s=checkout_timeout_s, validate=_ping,
+                              reset=lambda conn: conn.rollback(), **kwargs)
+
+    def raw(self) -> Any:
+        """Return the underlying driver connection, opening it on first use."""
+        if self._pool is not None:
+            return self._pool.bound()
+        if self._raw is None:
+            self._raw = (self._connect or _pyodbc_connect)(self.conn_str)
+        return self._raw
 
     def execute(self, query: str, params=None):
-        pass
+        cur = self.raw().cursor()
+        if params is None:
+            cur.execute(query)
+        else:
+            cur.execute(query, params)
+        return cur
+
+    def executemany(self, query: str, rows: Sequence[Sequence[Any]]):
+        """Array-bound insert: with fast_executemany pyodbc sends all rows in one round-trip."""
+        cur = self.raw().cursor()
+        cur.fast_executemany = self.fast_executemany
+        cur.executemany(query, rows)
+        return cur
+
+    def commit(self) -> None:
+        self.raw().commit()
+        if self._pool is not None:
+            # the unit of work is over; a long-lived worker thread must not keep the connection
+            self._pool.unbind()
+
+    def rollback(self) -> None:
+        raw = self._pool.current() if self._pool is not None else self._raw
+        if raw is not None:
+            raw.rollback()
+            if self._pool is not None:
+                self._pool.unbind()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.unbind()
+            return
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+
+def _pyodbc_connect(conn_str: str) -> Any:
+    import pyodbc  # optional dependency, see requirements.txt
+    return pyodbc.connect(conn_str, autocommit=False)
+
+
+def _ping(conn: Any) -> None:
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    finally:
+        cur.close()
@@ -0,0 +1,33 @@
+# python
+# file: src/adapters/sqlserver/identifier_source.py
+
+from __future__ import annotations
+from typing import Iterator, Tuple
+
+# music.Identifier.EntityType codes written by the ETL
+ENTITY_TYPES = {"Artist": 1, "Recording": 2, "Album": 3, "Edition": 4, "Disc": 5, "Track": 6}
+MUSICBRAINZ_SOURCE = "MusicBrainz"
+
+IDENTIFIER_PAIRS_SQL = """
+SELECT TRY_CAST(i.[Value] AS bigint) AS SourceId, i.[EntityId]
+FROM music.Identifier i
+WHERE i.[EntityType] = ? AND i.[Source] = ? AND TRY_CAST(i.[Value] AS bigint) IS NOT NULL
+ORDER BY SourceId
+"""
+
+
+class SQLServerIdentifierSource:
+    """Streams the MusicBrainz rows of music.Identifier as (MB id, identity id), ascending by MB id."""
+
+    def __init__(self, conn, fetch_size: int = 10_000) -> None:
+        self._conn = conn
+        self.fetch_size = fetch_size
+
+    def fetch_identifier_pairs(self, entity: str) -> Iterator[Tuple[int, int]]:
+        cur = self._conn.execute(IDENTIFIER_PAIRS_SQL, (ENTITY_TYPES[entity], MUSICBRAINZ_SOURCE))
+        while True:
+            rows = cur.fetchmany(self.fetch_size)
+            if not rows:
+                return
+            for source_id, entity_id in rows:
+                yield int(source_id), int(entity_id)
@@ -0,0 +1,101 @@
+# python
+# file: src/adapters/sqlserver/junction_store.py
+
+"""
+JunctionStore over the MusicCollection junction tables.
+
+Per owner range: one ordered SELECT of the current pairs; per delta: an array-bound INSERT of
+the new pairs and, for deletions, an array-bound insert into a session-scoped #del_<Table>
+followed by one joined DELETE. Unchanged ranges cost the SELECT only.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+from core.ports.junction_store import JunctionStore
+from adapters.sqlserver.tables import JUNCTIONS, JunctionSpec
+
+logger = logging.getLogger(__name__)
+
+
+class SqlServerJunctionDialect:
+    """T-SQL for fetching and applying the pair deltas of a JunctionSpec."""
+
+    @staticmethod
+    def _scope_where(spec: JunctionSpec, alias: str = "") -> str:
+        prefix = f"{alias}." if alias else ""
+        return "".join(f" AND {prefix}[{col}] = ?" for col, _ in spec.scope)
+
+    def select_sql(self, spec: JunctionSpec) -> str:
+        o, m = spec.owner_column, spec.member_column
+        return (f"SELECT [{o}], [{m}] FROM {spec.qualified_name} "
+                f"WHERE [{o}] >= ? AND [{o}] < ?{self._scope_where(spec)} ORDER BY [{o}], [{m}]")
+
+    def insert_sql(self, spec: JunctionSpec) -> str:
+        cols = [spec.owner_column, spec.member_column] + [c for c, _ in spec.scope]
+        return (f"INSERT INTO {spec.qualified_name} ({', '.join(f'[{c}]' for c in cols)}) "
+                f"VALUES ({', '.join('?' for _ in cols)})")
+
+    def prepare_delete_sql(self, spec: JunctionSpec) -> List[str]:
+        return [
+            f"DROP TABLE IF EXISTS {spec.staging_name}",
+            f"CREATE TABLE {spec.staging_name} (Owner int NOT NULL, Member int NOT NULL, PRIMARY KEY (Owner, Member))",
+        ]
+
+    def stage_delete_sql(self, spec: JunctionSpec) -> str:
+        return f"INSERT INTO {spec.staging_name} (Owner, Member) VALUES (?, ?)"
+
+    def delete_sql(self, spec: JunctionSpec) -> str:
+        return (f"DELETE t FROM {spec.qualified_name} AS t JOIN {spec.staging_name} AS d "
+                f"ON t.[{spec.owner_column}] = d.Owner AND t.[{spec.member_column}] = d.Member"
+                f"{self._scope_where(spec, 't')}")
+
+
+class SQLServerJunctionStore(JunctionStore):
+    """
+    JunctionStore for the tables in JUNCTIONS (plus any JunctionSpec passed in `specs`, e.g.
+    credit_junction(...) under a name of its own).
+
+    manage_transaction=True commits (or rolls back) each apply(); pass False when the caller
+    owns the transaction.
+    """
+
+    def __init__(self, conn, specs: Optional[Dict[str, JunctionSpec]] = None, dialect=None,
+                 manage_transaction: bool = True) -> None:
+        self._conn = conn
+        self.specs = dict(JUNCTIONS, **(specs or {}))
+        self.dialect = dialect or SqlServerJunctionDialect()
+        self.manage_transaction = manage_transaction
+
+    def spec(self, table: Union[str, JunctionSpec]) -> JunctionSpec:
+        if isinstance(table, JunctionSpec):
+            return table
+        try:
+            return self.specs[table]
+        except KeyError:
+            raise KeyError(f"no junction spec for {table!r}") from None
+
+    def fetch_pairs(self, table: str, lo: int, hi: int) -> List[Tuple[int, int]]:
+        spec = self.spec(table)
+        params = (lo, hi) + tuple(v for _, v in spec.scope)
+        return [(int(o), int(m)) for o, m in self._conn.execute(self.dialect.select_sql(spec), params).fetchall()]
+
+    def apply(self, table: str, inserts: Sequence[Tuple[int, int]], deletes: Sequence[Tuple[int, int]]) -> None:
+        spec = self.spec(table)
+        scope = tuple(v for _, v in spec.scope)
+        try:
+            if deletes:
+                for sql in self.dialect.prepare_delete_sql(spec):
+                    self._conn.execute(sql)
+                self._conn.executemany(self.dialect.stage_delete_sql(spec), list(deletes))
+                self._conn.execute(self.dialect.delete_sql(spec), scope or None)
+            if inserts:
+                self._conn.executemany(self.dialect.insert_sql(spec), [tuple(p) + scope for p in inserts])
+            if self.manage_transaction:
+                self._conn.commit()
+        except Exception:
+            if self.manage_transaction:
+                self._conn.rollback()
+            raise
+        logger.debug("Junction %s +%d -%d", spec.name, len(inserts), len(deletes))
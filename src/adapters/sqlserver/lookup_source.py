@@ -0,0 +1,23 @@
+# python
+# file: src/adapters/sqlserver/lookup_source.py
+
+from __future__ import annotations
+from typing import Any, Iterable, Sequence, Tuple
+
+from core.ports.lookup_source import LookupSource
+from adapters.sqlserver.tables import TABLES
+
+
+class SQLServerLookupSource(LookupSource):
+    """Reads natural key -> identity id pairs of a MusicCollection lookup table in one SELECT."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def fetch_lookup_ids(self, table: str, key_columns: Sequence[str]) -> Iterable[Tuple[Any, ...]]:
+        spec = TABLES[table]
+        unknown = set(key_columns) - set(spec.column_names)
+        if unknown:
+            raise ValueError(f"{table} has no column(s) {sorted(unknown)}")
+        cols = ", ".join(f"[{c}]" for c in tuple(key_columns) + (spec.id_column,))
+        return [tuple(r) for r in self._conn.execute(f"SELECT {cols} FROM {spec.qualified_name}").fetchall()]
@@ -0,0 +1,315 @@
+# python
+# file: src/adapters/sqlserver/merge_loader.py
+
+"""
+Set-based loader: bulk insert into a typed staging table, then one MERGE per batch.
+
+Per batch the loader does four round-trips regardless of batch size:
+1-2. (re)create the session-scoped staging table #stg_<Table> (DROP, then CREATE),
+3. array-bound INSERT of every row (pyodbc fast_executemany),
+4. a single MERGE ... OUTPUT that upserts on the table's natural key and returns the
+   action, identity id, MB source id, natural key and TableSpec.output_columns of every
+   inserted or updated row.
+
+An `identified` table (TableSpec.identified) is matched on its music.Identifier mapping first:
+the MERGE source resolves each staged MB id through UX_Identifier, a row with a mapping matches
+that row only, and the natural key (if any) applies to rows without one. A fifth, array-bound
+round-trip records the mapping of every row the MERGE returned that has none yet; for a table
+with a natural key, a sixth maps the staged MB ids the MERGE returned nothing for (unchanged
+rows, and MB ids that share a key with another row of the batch) to the row that key matches.
+
+Text key columns (TableSpec.match_columns) are staged as their normalize_name value,
+Normalized<Column>, and the MERGE compares it under MATCH_COLLATION with match_sql over the
+target column: the same whitespace rules, but accent-insensitive on every script where
+normalize_name strips Latin diacritics only. The MERGE key is therefore looser than the
+LookupCache key ("Йорк" and "Иорк" are one row to the MERGE, two names to the cache), and the
+staged rows are deduplicated under the same collation (staged_key) so that no two of them match
+one target row. match_sql is evaluated per target row: a MERGE on a text key
+reads the target table rather than seeking its Name index. For the large entity tables, an
+indexed persisted computed column over match_sql restores the seek.
+"""
+
+from __future__ import annotations
+from itertools import repeat
+from typing import Any, Iterable, List, Sequence, Tuple
+from uuid import UUID
+import logging
+
+from core.ports.etl_ports import LoadResult
+from core.record_batch import RecordBatch
+from adapters.sqlserver.identifier_source import ENTITY_TYPES, MUSICBRAINZ_SOURCE
+from adapters.sqlserver.tables import TableSpec
+
+logger = logging.getLogger(__name__)
+
+
+# compares case- and accent-insensitively; looser than normalize_name, which keeps the marks of
+# non-Latin scripts (Cyrillic "й", kana dakuten) that an _AI collation ignores
+MATCH_COLLATION = "Latin1_General_100_CI_AI"
+# the characters other than the space that str.split() (and so normalize_name) treats as whitespace
+_WHITESPACE = [c for c in range(0x3001) if chr(c).isspace() and c != 0x20]
+
+
+def _q(column: str) -> str:
+    return f"[{column}]"
+
+
+class SqlServerMergeDialect:
+    """T-SQL for the staging + MERGE sequence of a TableSpec."""
+
+    def prepare_staging_sql(self, spec: TableSpec) -> List[str]:
+        typed = ",\n    ".join([f"{_q(c.name)} {c.sql_type} NULL" for c in spec.columns]
+                              + [f"{_q(spec.normalized_column(c.name))} {c.sql_type} NULL"
+                                 for c in spec.match_columns])
+        return [
+            f"DROP TABLE IF EXISTS {spec.staging_name}",
+            f"CREATE TABLE {spec.staging_name} (\n    RowNo int IDENTITY(1,1) NOT NULL,\n"
+            f"    BatchId uniqueidentifier NOT NULL,\n    SourceId bigint NULL,\n    {typed}\n)",
+        ]
+
+    def insert_staging_sql(self, spec: TableSpec) -> str:
+        staged = ("BatchId", "SourceId") + spec.column_names + tuple(
+            spec.normalized_column(c.name) for c in spec.match_columns)
+        cols = ", ".join(_q(c) for c in staged)
+        marks = ", ".join("?" for _ in staged)
+        return f"INSERT INTO {spec.staging_name} ({cols}) VALUES ({marks})"
+
+    def match_sql(self, column: str) -> str:
+        """The T-SQL matching form of a name: whitespace as normalize_name splits it, trimmed and
+        collapsed to single spaces, compared under MATCH_COLLATION."""
+        spaced = (f"TRANSLATE({column}, {' + '.join(f'NCHAR({c})' for c in _WHITESPACE)}, "
+                  f"N'{' ' * len(_WHITESPACE)}')")
+        collapsed = (f"REPLACE(REPLACE(REPLACE(TRIM({spaced}), N' ', N' ' + NCHAR(1)), NCHAR(1) + N' ', N''), "
+                     f"NCHAR(1), N'')")
+        return f"{collapsed} COLLATE {MATCH_COLLATION}"
+
+    def staged_key(self, spec: TableSpec, alias: str = "") -> List[str]:
+        """The staging-side natural key, under the collation the MERGE compares it with.
+
+        Staged rows are deduplicated on these expressions: two names normalize_name keeps apart
+        but MATCH_COLLATION equates ("Йорк", "Иорк") fall in one partition, so they cannot both
+        match the same target row.
+        """
+        prefix = f"{alias}." if alias else ""
+        text = {c.name for c in spec.match_columns}
+        return [f"{prefix}{_q(spec.normalized_column(k))} COLLATE {MATCH_COLLATION}" if k in text
+                else f"{prefix}{_q(k)}" for k in spec.key]
+
+    def identifier_sql(self, spec: TableSpec) -> str:
+        """Insert one MB id -> identity id mapping unless the MB id is already mapped."""
+        return (
+            "INSERT INTO music.Identifier ([EntityType], [EntityId], [Source], [Value], [IsPrimary])\n"
+            "SELECT ?, ?, ?, ?, 1\n"
+            "WHERE NOT EXISTS (SELECT 1 FROM music.Identifier i\n"
+            "                  WHERE i.[EntityType] = ? AND i.[Source] = ? AND i.[Value] = ?)"
+        )
+
+    def identifier_params(self, spec: TableSpec, output: Sequence[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+        entity_type = ENTITY_TYPES[spec.name]
+        return [(entity_type, identity, MUSICBRAINZ_SOURCE, str(source_id), entity_type, MUSICBRAINZ_SOURCE,
+                 str(source_id))
+                for _, identity, source_id, *_ in output if source_id is not None]
+
+    def key_match(self, spec: TableSpec, target: str, source: str) -> str:
+        """The natural-key predicate between a target row and a staging row (aliases given)."""
+        normalized = {c.name: _q(spec.normalized_column(c.name)) for c in spec.match_columns}
+
+        def match(k: str) -> str:
+            if k in normalized:
+                return f"{source}.{normalized[k]} = {self.match_sql(f'{target}.{_q(k)}')}"
+            if k in spec.nullable_key:
+                return (f"({target}.{_q(k)} = {source}.{_q(k)}"
+                        f" OR ({target}.{_q(k)} IS NULL AND {source}.{_q(k)} IS NULL))")
+            return f"{target}.{_q(k)} = {source}.{_q(k)}"
+
+        return " AND ".join(match(k) for k in spec.key)
+
+    def identifier_by_key_sql(self, spec: TableSpec) -> str:
+        """Map every staged MB id still without a mapping to the row its natural key matches.
+
+        Covers the rows the MERGE returns nothing for: a matched row that did not change, and a
+        staged row that lost the one-row-per-target dedup to another MB id with the same key.
+        """
+        entity_type = ENTITY_TYPES[spec.name]
+        value = "CAST(d.[SourceId] AS nvarchar(120))"
+        return (
+            "INSERT INTO music.Identifier ([EntityType], [EntityId], [Source], [Value], [IsPrimary])\n"
+            f"SELECT {entity_type}, k.[Id], N'{MUSICBRAINZ_SOURCE}', {value}, 1\n"
+            "FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY [SourceId] ORDER BY RowNo DESC) AS rn\n"
+            f"      FROM {spec.staging_name} WHERE [SourceId] IS NOT NULL) d\n"
+            f"CROSS APPLY (SELECT TOP (1) n.{_q(spec.id_column)} AS [Id] FROM {spec.qualified_name} n\n"
+            f"             WHERE {self.key_match(spec, 'n', 'd')}\n"
+            f"             ORDER BY n.{_q(spec.id_column)}) k\n"
+            "WHERE d.rn = 1\n"
+            "  AND NOT EXISTS (SELECT 1 FROM music.Identifier i\n"
+            f"                  WHERE i.[EntityType] = {entity_type} AND i.[Source] = N'{MUSICBRAINZ_SOURCE}'"
+            f" AND i.[Value] = {value})"
+        )
+
+    def merge_sql(self, spec: TableSpec) -> str:
+        cols = ", ".join(_q(c) for c in spec.column_names)
+        d_cols = ", ".join(f"d.{_q(c)}" for c in spec.column_names)
+        if spec.identified:
+            source = self._identified_source_sql(spec)
+            on = f"t.{_q(spec.id_column)} = s.[MatchedId]"
+        else:
+            key = ", ".join(self.staged_key(spec))
+            # later staging rows win when a batch carries the same natural key twice
+            source = (
+                f"    SELECT d.[SourceId], {d_cols}\n"
+                f"    FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY RowNo DESC) AS rn\n"
+                f"          FROM {spec.staging_name}) d\n"
+                f"    WHERE d.rn = 1\n"
+            )
+            on = self.key_match(spec, "t", "s")
+        sql = (
+            f"MERGE {spec.qualified_name} WITH (HOLDLOCK) AS t\n"
+            f"USING (\n"
+            f"{source}"
+            f") AS s\n"
+            f"ON ({on})\n"
+        )
+        # a row matched through its id takes the staged key too, so a renamed artist is renamed
+        non_key = spec.column_names if spec.identified else spec.non_key_columns
+        if non_key:
+            s_cols = ", ".join(f"s.{_q(c)}" for c in non_key)
+            t_cols = ", ".join(f"t.{_q(c)}" for c in non_key)
+            sets = [f"t.{_q(c)} = s.{_q(c)}" for c in non_key]
+            if spec.touch_column:
+                sets.append(f"t.{_q(spec.touch_column)} = sysutcdatetime()")
+            # EXCEPT compares NULLs as equal, so unchanged rows are not rewritten
+            sql += (
+                f"WHEN MATCHED AND EXISTS (SELECT {s_cols} EXCEPT SELECT {t_cols}) THEN\n"
+                f"    UPDATE SET {', '.join(sets)}\n"
+            )
+        s_all = ", ".join(f"s.{_q(c)}" for c in spec.column_names)
+        out_key = "".join(f", inserted.{_q(k)}" for k in spec.key + spec.output_columns)
+        sql += (
+            f"WHEN NOT MATCHED BY TARGET THEN\n"
+            f"    INSERT ({cols}) VALUES ({s_all})\n"
+            f"OUTPUT $action, inserted.{_q(spec.id_column)}, s.[SourceId]{out_key};"
+        )
+        return sql
+
+    def _identified_source_sql(self, spec: TableSpec) -> str:
+        """MERGE source of an identified table: each staged row resolved to its target id first.
+
+        A row's MatchedId is its Identifier mapping, else (for rows without one) the row its
+        natural key matches, else NULL for a new row. The MERGE then joins on that id alone, and
+        the source keeps one row per target: the last staged row per MB id, then per MatchedId,
+        then per natural key among the new rows, so two MB ids sharing a key can neither match the
+        same target row twice nor insert it twice. Rows that lose are mapped by
+        identifier_by_key_sql.
+        """
+        d_cols = ", ".join(f"d.{_q(c)}" for c in spec.column_names)
+        mapped = (f"        LEFT JOIN music.Identifier i ON i.[EntityType] = {ENTITY_TYPES[spec.name]}"
+                  f" AND i.[Source] = N'{MUSICBRAINZ_SOURCE}'"
+                  f" AND i.[Value] = CAST(d.[SourceId] AS nvarchar(120))\n")
+        if spec.key:
+            resolved = "COALESCE(i.[EntityId], k.[Id])"
+            mapped += (f"        OUTER APPLY (SELECT TOP (1) n.{_q(spec.id_column)} AS [Id]"
+                       f" FROM {spec.qualified_name} n\n"
+                       f"                     WHERE i.[EntityId] IS NULL AND {self.key_match(spec, 'n', 'd')}\n"
+                       f"                     ORDER BY n.{_q(spec.id_column)}) k\n")
+            new_row = self.staged_key(spec, "d")
+            strict = [k for k in spec.key if k not in spec.nullable_key]
+            if strict:
+                # a NULL in a non-nullable key column matches nothing: such rows are all kept
+                nulls = " OR ".join(f"d.{_q(k)} IS NULL" for k in strict)
+                new_row.append(f"CASE WHEN {nulls} THEN d.[RowNo] END")
+        else:
+            resolved = "i.[EntityId]"
+            new_row = ["d.[RowNo]"]
+        partition = ", ".join([resolved] + [f"CASE WHEN {resolved} IS NULL THEN {e} END" for e in new_row])
+        return (
+            f"    SELECT r.* FROM (\n"
+            f"        SELECT d.[SourceId], {d_cols}, {resolved} AS [MatchedId],\n"
+            f"               ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY d.[RowNo] DESC) AS rk\n"
+            f"        FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY COALESCE([SourceId], -[RowNo])"
+            f" ORDER BY RowNo DESC) AS rn\n"
+            f"              FROM {spec.staging_name}) d\n"
+            f"{mapped}"
+            f"        WHERE d.rn = 1\n"
+            f"    ) r\n"
+            f"    WHERE r.rk = 1\n"
+        )
+
+    def merge(self, conn, spec: TableSpec) -> List[Tuple[Any, ...]]:
+        """Run the MERGE and return (action, id, source_id, *key, *output_columns) rows."""
+        return [tuple(r) for r in conn.execute(self.merge_sql(spec)).fetchall()]
+
+
+class BulkMergeLoader:
+    """
+    Loader[TOut] for any TableSpec.
+
+    Items may be dicts, objects or a RecordBatch; values are read per ColumnSpec.source_field
+    (for a RecordBatch, the column of that name). The result's
+    `ids` maps natural key -> identity id for every row the MERGE inserted or updated
+    (unchanged matched rows produce no OUTPUT row); `source_ids` maps the MB id of those rows
+    (item `source_id` / `mb_id`) -> identity id for the Identifier index, and `rows` carries
+    their key and output columns by name for LookupCache.update_from_result.
+
+    manage_transaction=True commits (or rolls back) each batch; pass False when the caller owns
+    the transaction, as SQLServerRepository does.
+    """
+
+    def __init__(self, conn, spec: TableSpec, dialect=None, manage_transaction: bool = True) -> None:
+        self._conn = conn
+        self.spec = spec
+        self.dialect = dialect or SqlServerMergeDialect()
+        self.manage_transaction = manage_transaction
+
+    def load_batch(self, items: Iterable[Any], batch_id: UUID) -> LoadResult:
+        batch_tag = str(batch_id)
+        if isinstance(items, RecordBatch):
+            columns = self.spec.batch_columns(items)
+            rows = list(zip(repeat(batch_tag, len(items)), self.spec.batch_source_ids(items), *columns,
+                            *self.spec.batch_match_columns(columns)))
+        else:
+            rows = []
+            for it in items:
+                values = self.spec.row_values(it)
+                rows.append((batch_tag, self.spec.source_id_of(it)) + values + self.spec.match_values(values))
+        if not rows:
+            return LoadResult(inserted=0, updated=0, errors=[])
+        try:
+            for sql in self.dialect.prepare_staging_sql(self.spec):
+                self._conn.execute(sql)
+            self._conn.executemany(self.dialect.insert_staging_sql(self.spec), rows)
+            output = self.dialect.merge(self._conn, self.spec)
+            mappings = self.dialect.identifier_params(self.spec, output) if self.spec.identified else []
+            if mappings:
+                self._conn.executemany(self.dialect.identifier_sql(self.spec), mappings)
+            if self.spec.identified and self.spec.key:
+                self._conn.execute(self.dialect.identifier_by_key_sql(self.spec))
+            if self.manage_transaction:
+                self._conn.commit()
+        except Exception:
+            if self.manage_transaction:
+                self._conn.rollback()
+            raise
+        return self._result(output)
+
+    def _result(self, output: Sequence[Tuple[Any, ...]]) -> LoadResult:
+        inserted = updated = 0
+        ids = {}
+        source_ids = {}
+        rows = []
+        width = len(self.spec.key)
+        returned = self.spec.key + self.spec.output_columns
+        for action, identity, source_id, *values in output:
+            if action == "INSERT":
+                inserted += 1
+            elif action == "UPDATE":
+                updated += 1
+            if width:
+                key = values[:width]
+                ids[key[0] if width == 1 else tuple(key)] = identity
+            if returned:
+                rows.append((dict(zip(returned, values)), identity))
+            if source_id is not None:
+                source_ids[source_id] = identity
+        logger.debug("MERGE %s inserted=%d updated=%d", self.spec.name, inserted, updated)
+        return LoadResult(inserted=inserted, updated=updated, errors=[], ids=ids, source_ids=source_ids,
+                          rows=rows)
@@ -0,0 +1,78 @@
+# python
+# file: src/adapters/sqlserver/quarantine_store.py
+
+"""
+Quarantined rows in music.Quarantine (U09, ProcessFlow "Error handling & quarantine").
+
+ProcessFlow names staging.Quarantine; the destination DDL only creates the music schema, so
+the table lives next to music.ETLRun and music.ETLWatermark. Payloads are stored as JSON.
+Use a connection of its own: rows are quarantined while the loader's batch transaction is
+being given up on, and must commit regardless of it.
+"""
+
+from __future__ import annotations
+from typing import List, Sequence
+from uuid import UUID
+import json
+
+from core.ports.quarantine_store import QuarantinedRow, QuarantineStore
+
+QUARANTINE_DDL = """
+IF OBJECT_ID(N'music.Quarantine', N'U') IS NULL
+CREATE TABLE music.Quarantine (
+    QuarantineId bigint IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    EntityName nvarchar(100) NOT NULL,
+    BatchId uniqueidentifier NOT NULL,
+    SourceId nvarchar(100) NULL,
+    Payload nvarchar(max) NOT NULL,
+    ErrorType nvarchar(200) NOT NULL,
+    ErrorMessage nvarchar(max) NOT NULL,
+    QuarantinedAt datetime2(3) NOT NULL CONSTRAINT DF_Quarantine_QuarantinedAt DEFAULT SYSUTCDATETIME(),
+    INDEX IX_Quarantine_Entity (EntityName, QuarantineId)
+)
+"""
+
+INSERT_SQL = """
+INSERT INTO music.Quarantine (EntityName, BatchId, SourceId, Payload, ErrorType, ErrorMessage)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_PENDING_SQL = """
+SELECT TOP (?) QuarantineId, BatchId, SourceId, Payload, ErrorType, ErrorMessage, QuarantinedAt
+FROM music.Quarantine WHERE EntityName = ? ORDER BY QuarantineId
+"""
+
+
+def _payload(row: QuarantinedRow) -> str:
+    return json.dumps(row.payload, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class SQLServerQuarantineStore(QuarantineStore):
+    """QuarantineStore over music.Quarantine; each add() is one array-bound insert and commit."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def ensure_table(self) -> None:
+        self._conn.execute(QUARANTINE_DDL)
+        self._conn.commit()
+
+    def add(self, rows: Sequence[QuarantinedRow]) -> None:
+        if not rows:
+            return
+        params = [(r.entity, str(r.batch_id), r.source_id, _payload(r), r.error_type, r.error_message) for r in rows]
+        try:
+            self._conn.executemany(INSERT_SQL, params)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def pending(self, entity: str, limit: int = 1000) -> List[QuarantinedRow]:
+        cur = self._conn.execute(SELECT_PENDING_SQL, (limit, entity))
+        return [
+            QuarantinedRow(entity=entity, batch_id=UUID(str(batch_id)), source_id=source_id,
+                           payload=json.loads(payload), error_type=error_type, error_message=message,
+                           quarantined_at=at, quarantine_id=qid)
+            for qid, batch_id, source_id, payload, error_type, message, at in cur.fetchall()
+        ]
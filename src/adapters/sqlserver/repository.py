@@ -1,21 +1,36 @@
 ﻿# python
-from typing import Iterable, Dict, Any
+from typing import Iterable, Dict, Any, Optional
+from uuid import uuid4
 from core.ports.destination_repository import DestinationRepository
+from core.ports.identifier_map import IdentifierMap
+from adapters.sqlserver.merge_loader import BulkMergeLoader
+from adapters.sqlserver.tables import TABLES
 
 class SQLServerRepository(DestinationRepository):
-    def __init__(self, conn):
+    def __init__(self, conn, identifiers: Optional[IdentifierMap] = None):
         self._conn = conn
+        # the caller (ETLService) owns the transaction, so the loader must not commit
+        self._artists = BulkMergeLoader(conn, TABLES["Artist"], manage_transaction=False)
+        # MB id -> ArtistId mappings of the open transaction, published to the index on commit
+        self._identifiers = identifiers
+        self._pending: Dict[int, int] = {}
 
     def begin_transaction(self) -> None:
-        # begin TX on real connection
-        pass
+        # pyodbc runs with autocommit off: a transaction is implicitly open until commit/rollback
+        self._pending = {}
 
     def commit(self) -> None:
-        pass
+        self._conn.commit()
+        if self._identifiers is not None and self._pending:
+            self._identifiers.add("Artist", self._pending)
+        self._pending = {}
 
     def rollback(self) -> None:
-        pass
+        self._conn.rollback()
+        self._pending = {}
 
     def upsert_artists(self, records: Iterable[Dict[str, Any]]) -> int:
-        # Real implementation: bulk insert into staging table + MERGE
-        return 0
+        # bulk insert into staging table + one MERGE
+        result = self._artists.load_batch(records, uuid4())
+        self._pending.update(result.source_ids)
+        return result.inserted + result.updated
@@ -0,0 +1,79 @@
+# python
+# file: src/adapters/sqlserver/review_store.py
+
+"""
+Ambiguous matches in music.ETLReview (U02 weak natural-key matches, U08 review flow).
+
+UseCases names staging.ETLReview; like music.Quarantine the table lives in the music schema,
+which is the only one the destination DDL creates. Candidates are stored as a JSON array of
+[destination id, score] pairs, best first. Use a connection of its own, as for quarantine.
+"""
+
+from __future__ import annotations
+from typing import List, Sequence
+from uuid import UUID
+import json
+
+from core.ports.review_store import ReviewItem, ReviewStore
+
+REVIEW_DDL = """
+IF OBJECT_ID(N'music.ETLReview', N'U') IS NULL
+CREATE TABLE music.ETLReview (
+    ReviewId bigint IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    EntityName nvarchar(100) NOT NULL,
+    BatchId uniqueidentifier NOT NULL,
+    SourceId nvarchar(100) NULL,
+    Payload nvarchar(max) NOT NULL,
+    Reason nvarchar(200) NOT NULL,
+    Candidates nvarchar(max) NOT NULL,
+    FlaggedAt datetime2(3) NOT NULL CONSTRAINT DF_ETLReview_FlaggedAt DEFAULT SYSUTCDATETIME(),
+    INDEX IX_ETLReview_Entity (EntityName, ReviewId)
+)
+"""
+
+INSERT_SQL = """
+INSERT INTO music.ETLReview (EntityName, BatchId, SourceId, Payload, Reason, Candidates)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_PENDING_SQL = """
+SELECT TOP (?) ReviewId, BatchId, SourceId, Payload, Reason, Candidates, FlaggedAt
+FROM music.ETLReview WHERE EntityName = ? ORDER BY ReviewId
+"""
+
+
+def _json(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class SQLServerReviewStore(ReviewStore):
+    """ReviewStore over music.ETLReview; each add() is one array-bound insert and commit."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def ensure_table(self) -> None:
+        self._conn.execute(REVIEW_DDL)
+        self._conn.commit()
+
+    def add(self, items: Sequence[ReviewItem]) -> None:
+        if not items:
+            return
+        params = [(i.entity, str(i.batch_id), i.source_id, _json(i.payload), i.reason,
+                   _json([[target, round(score, 4)] for target, score in i.candidates])) for i in items]
+        try:
+            self._conn.executemany(INSERT_SQL, params)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def pending(self, entity: str, limit: int = 1000) -> List[ReviewItem]:
+        cur = self._conn.execute(SELECT_PENDING_SQL, (limit, entity))
+        return [
+            ReviewItem(entity=entity, batch_id=UUID(str(batch_id)), source_id=source_id,
+                       payload=json.loads(payload), reason=reason,
+                       candidates=[(int(t), float(s)) for t, s in json.loads(candidates)],
+                       flagged_at=at, review_id=rid)
+            for rid, batch_id, source_id, payload, reason, candidates, at in cur.fetchall()
+        ]
@@ -0,0 +1,69 @@
+# python
+# file: src/adapters/sqlserver/row_range.py
+
+from __future__ import annotations
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+from adapters.sqlserver.identifier_source import ENTITY_TYPES, MUSICBRAINZ_SOURCE
+from adapters.sqlserver.tables import TableSpec
+
+# numeric MB id of an Identifier row
+CAST_KEY = "TRY_CAST(i.[Value] AS bigint)"
+
+KEY_RANGE_SQL = """
+SELECT MIN({key}), MAX({key})
+FROM music.Identifier i
+WHERE i.[EntityType] = ? AND i.[Source] = ?
+"""
+
+ROWS_SQL = """
+SELECT {key} AS SourceId, {columns}
+FROM music.Identifier i
+JOIN {table} t ON t.[{id_column}] = i.[EntityId]
+WHERE i.[EntityType] = ? AND i.[Source] = ?
+  AND {key} >= ? AND {key} < ?
+ORDER BY SourceId
+"""
+
+
+class SQLServerRowRange:
+    """
+    Destination side of a reconciliation (a RowRangeSource): rows of a music table keyed by the
+    MusicBrainz id recorded for them in music.Identifier, as (MB id, *columns).
+
+    Identifier.Value is nvarchar, so by default the id range is a TRY_CAST filter that no index
+    can seek: every rows_between() reads all MusicBrainz mappings of the entity from
+    UX_Identifier and sorts the matches, and a reconciliation pays that once per chunk it
+    drills into. For the large entity tables, add an indexed persisted key column and pass its
+    name as `key_column`; the range then seeks on it:
+
+        ALTER TABLE music.Identifier ADD SourceKey AS TRY_CAST([Value] AS bigint) PERSISTED;
+        CREATE INDEX IX_Identifier_SourceKey ON music.Identifier (EntityType, [Source], SourceKey)
+            INCLUDE (EntityId);
+    """
+
+    def __init__(self, conn, spec: TableSpec, columns: Optional[Sequence[str]] = None,
+                 entity: Optional[str] = None, fetch_size: int = 10_000,
+                 key_column: Optional[str] = None) -> None:
+        self._conn = conn
+        self.spec = spec
+        self.columns = tuple(columns or spec.column_names)
+        self.entity_type = ENTITY_TYPES[entity or spec.name]
+        self.fetch_size = fetch_size
+        key = f"i.[{key_column}]" if key_column else CAST_KEY
+        self._range_sql = KEY_RANGE_SQL.format(key=key)
+        self._rows_sql = ROWS_SQL.format(key=key, columns=", ".join(f"t.[{c}]" for c in self.columns),
+                                         table=spec.qualified_name, id_column=spec.id_column)
+
+    def key_range(self) -> Optional[Tuple[int, int]]:
+        lo, hi = self._conn.execute(self._range_sql, (self.entity_type, MUSICBRAINZ_SOURCE)).fetchone()
+        return None if lo is None else (int(lo), int(hi))
+
+    def rows_between(self, lo: int, hi: int) -> Iterator[Tuple[Any, ...]]:
+        cur = self._conn.execute(self._rows_sql, (self.entity_type, MUSICBRAINZ_SOURCE, lo, hi))
+        while True:
+            rows = cur.fetchmany(self.fetch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield (int(row[0]), *row[1:])
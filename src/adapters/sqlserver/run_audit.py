@@ -0,0 +1,85 @@
+# python
+# file: src/adapters/sqlserver/run_audit.py
+
+"""
+ETLRun audit rows (ProcessFlow "Observability & metrics": store run metadata in MC.ETLRun).
+
+One row per finished batch, written right after the batch's own transaction committed (the
+hooks' batch_finished), so the audit never records a batch that was rolled back as succeeded.
+Use a connection of its own when the pipeline's loader shares one with an open transaction.
+"""
+
+from __future__ import annotations
+from typing import Any, Tuple
+
+from application.services.instrumentation import EXTRACT, LOAD, TRANSLATE, BatchMetrics, RunHooks
+
+ETL_RUN_TABLE = "music.ETLRun"
+
+ETL_RUN_DDL = """
+IF OBJECT_ID(N'music.ETLRun', N'U') IS NULL
+CREATE TABLE music.ETLRun (
+    ETLRunId bigint IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    BatchId uniqueidentifier NOT NULL,
+    EntityName nvarchar(100) NOT NULL,
+    BatchNumber int NOT NULL,
+    Status varchar(16) NOT NULL,
+    StartTime datetime2(3) NOT NULL,
+    EndTime datetime2(3) NULL,
+    DurationMs int NOT NULL,
+    ExtractMs int NULL,
+    TranslateMs int NULL,
+    LoadMs int NULL,
+    RowsExtracted int NOT NULL,
+    RowsTranslated int NOT NULL,
+    RowsInserted int NOT NULL,
+    RowsUpdated int NOT NULL,
+    RowsLoaded int NOT NULL,
+    RowsSkipped int NOT NULL,
+    RowsError int NOT NULL,
+    ErrorSample nvarchar(max) NULL
+)
+"""
+
+INSERT_SQL = f"""
+INSERT INTO {ETL_RUN_TABLE} (
+    BatchId, EntityName, BatchNumber, Status, StartTime, EndTime, DurationMs, ExtractMs, TranslateMs, LoadMs,
+    RowsExtracted, RowsTranslated, RowsInserted, RowsUpdated, RowsLoaded, RowsSkipped, RowsError, ErrorSample
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _ms(seconds: Any) -> Any:
+    return None if seconds is None else int(round(seconds * 1000))
+
+
+def audit_row(batch: BatchMetrics) -> Tuple[Any, ...]:
+    # datetime2 has no offset: store UTC wall-clock time
+    start = batch.started_at.replace(tzinfo=None)
+    end = batch.ended_at.replace(tzinfo=None) if batch.ended_at is not None else None
+    return (
+        str(batch.batch_id), batch.entity, batch.batch_number, batch.status, start, end,
+        int(round(batch.duration_ms)), _ms(batch.stage_s.get(EXTRACT)), _ms(batch.stage_s.get(TRANSLATE)),
+        _ms(batch.stage_s.get(LOAD)), batch.rows_extracted, batch.rows_translated, batch.rows_inserted,
+        batch.rows_updated, batch.rows_loaded, batch.rows_skipped, batch.rows_error,
+        "\n".join(batch.error_samples) or None,
+    )
+
+
+class SQLServerRunAudit(RunHooks):
+    """Appends a music.ETLRun row per finished batch and commits it."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def ensure_table(self) -> None:
+        self._conn.execute(ETL_RUN_DDL)
+        self._conn.commit()
+
+    def batch_finished(self, batch: BatchMetrics) -> None:
+        try:
+            self._conn.execute(INSERT_SQL, audit_row(batch))
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
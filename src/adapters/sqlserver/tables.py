@@ -0,0 +1,264 @@
+# python
+# file: src/adapters/sqlserver/tables.py
+
+"""
+Loader-facing descriptions of the MusicCollection tables in DestinationDDL.sql.
+
+Each TableSpec lists the columns the ETL writes (identity and audit columns excluded), their
+SQL types for the typed staging table, and the natural key used by the set-based MERGE.
+Entity tables are matched by Identifier first (see UseCases U02-U05); the natural key here
+is the fallback match the MERGE applies to rows that reach it. Tables without a unique natural
+key in the DDL (Album, Edition; Recording's only one is ISRC) are `identified`: the MERGE
+itself matches them on their music.Identifier mapping and records it for new rows.
+
+Text key columns are matched on core.normalization.normalize_name, staged as
+Normalized<Column> next to the display value (ProcessFlow "Matching & normalization rules").
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import re
+
+from core.normalization import default_normalizer
+from core.record_batch import INT, RecordBatch
+
+SCHEMA = "music"
+
+
+def _snake(name: str) -> str:
+    # SortName -> sort_name, ISRC -> isrc, DurationMs -> duration_ms, BPM -> bpm
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).lower()
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    sql_type: str
+    # attribute / dict key read from TOut items (default: snake_case of the column name)
+    field: Optional[str] = None
+    # constant used when the item carries no value (NOT NULL columns with a DDL default)
+    default: Any = None
+    # column whose value is used when the item carries no value (e.g. SortName <- Name)
+    default_from: Optional[str] = None
+
+    @property
+    def source_field(self) -> str:
+        return self.field or _snake(self.name)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    id_column: str
+    columns: Tuple[ColumnSpec, ...]
+    key: Tuple[str, ...]
+    # key columns that may be NULL and therefore need a null-safe match
+    nullable_key: Tuple[str, ...] = ()
+    # audit column stamped with sysutcdatetime() when a row is updated
+    touch_column: Optional[str] = None
+    # matched on the row's music.Identifier mapping (MB id) first, then on `key` if any
+    identified: bool = False
+    # non-key columns the MERGE also returns, so secondary lookup indexes (CountryCode) stay current
+    output_columns: Tuple[str, ...] = ()
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{SCHEMA}.{self.name}"
+
+    @property
+    def staging_name(self) -> str:
+        return f"#stg_{self.name}"
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(c.name for c in self.columns)
+
+    @property
+    def non_key_columns(self) -> Tuple[str, ...]:
+        return tuple(c.name for c in self.columns if c.name not in self.key)
+
+    @property
+    def match_columns(self) -> Tuple[ColumnSpec, ...]:
+        """Text key columns, matched on their normalized name rather than the raw value."""
+        return tuple(c for c in self.columns if c.name in self.key and c.sql_type.startswith("nvarchar"))
+
+    @staticmethod
+    def normalized_column(column: str) -> str:
+        return f"Normalized{column}"
+
+    def match_values(self, values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """Normalized match keys of a row in column order (see match_columns)."""
+        names = self.column_names
+        return tuple(default_normalizer(values[names.index(c.name)]) for c in self.match_columns)
+
+    def batch_match_columns(self, columns: Sequence[Sequence[Any]]) -> List[List[Any]]:
+        """match_values for the output of batch_columns: one normalized column per match column."""
+        names = self.column_names
+        return [default_normalizer.normalize_many(columns[names.index(c.name)]) for c in self.match_columns]
+
+    def row_values(self, item: Any) -> Tuple[Any, ...]:
+        """Read this table's columns from a dict or attribute-bearing TOut item."""
+        get = item.get if isinstance(item, dict) else (lambda f, _d=None: getattr(item, f, None))
+        values: Dict[str, Any] = {}
+        for col in self.columns:
+            values[col.name] = get(col.source_field, None)
+        for col in self.columns:
+            if values[col.name] is None:
+                if col.default_from is not None:
+                    values[col.name] = values[col.default_from]
+                elif col.default is not None:
+                    values[col.name] = col.default
+        return tuple(values[c] for c in self.column_names)
+
+    def batch_columns(self, batch: RecordBatch) -> List[Sequence[Any]]:
+        """Column-wise row_values for a RecordBatch: one value sequence per column, defaults applied."""
+        n = len(batch)
+        raw = {col.name: batch.get(col.source_field) for col in self.columns}
+        columns: List[Sequence[Any]] = []
+        for col in self.columns:
+            values = raw[col.name]
+            fallback = raw.get(col.default_from) if col.default_from is not None else None
+            if values is None:
+                if fallback is not None:
+                    values = fallback
+                else:
+                    values = [col.default] * n
+            elif values.null_count and (fallback is not None or col.default is not None):
+                values = [v if v is not None else (fallback[i] if fallback is not None else col.default)
+                          for i, v in enumerate(values)]
+            columns.append(values)
+        return columns
+
+    @staticmethod
+    def source_id_of(item: Any) -> Optional[int]:
+        """MB integer id carried by a TOut item (`source_id` or `mb_id`), if any."""
+        get = item.get if isinstance(item, dict) else (lambda f, _d=None: getattr(item, f, None))
+        value = get("source_id", None)
+        if value is None:
+            value = get("mb_id", None)
+        return _as_int(value)
+
+    @staticmethod
+    def batch_source_ids(batch: RecordBatch) -> Sequence[Optional[int]]:
+        column = batch.get("source_id")
+        if column is None:
+            column = batch.get("mb_id")
+        if column is None:
+            return [None] * len(batch)
+        if column.field.type == INT:
+            return column
+        return [_as_int(v) for v in column]
+
+    def key_of(self, values: Tuple[Any, ...]) -> Any:
+        """Natural key of a row in column order: scalar for single-column keys, else a tuple."""
+        index = [self.column_names.index(k) for k in self.key]
+        key = tuple(values[i] for i in index)
+        return key[0] if len(key) == 1 else key
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _name_desc(size: int = 100) -> Tuple[ColumnSpec, ...]:
+    return (ColumnSpec("Name", f"nvarchar({size})"), ColumnSpec("Description", "nvarchar(400)"))
+
+
+TABLES: Dict[str, TableSpec] = {spec.name: spec for spec in (
+    # --- lookups (U01)
+    TableSpec("Country", "CountryId",
+              (ColumnSpec("Name", "nvarchar(100)"), ColumnSpec("CountryCode", "char(2)", field="code"),
+               ColumnSpec("Description", "nvarchar(400)")),
+              key=("Name",), output_columns=("CountryCode",)),
+    TableSpec("ArtistType", "ArtistTypeId", _name_desc(), key=("Name",)),
+    TableSpec("Genre", "GenreId", _name_desc() + (ColumnSpec("ParentGenreId", "int"),), key=("Name",)),
+    TableSpec("Label", "LabelId",
+              (ColumnSpec("Name", "nvarchar(200)"), ColumnSpec("SortName", "nvarchar(200)", default_from="Name"),
+               ColumnSpec("CountryId", "int")),
+              key=("Name", "CountryId"), nullable_key=("CountryId",)),
+    TableSpec("MediumFormat", "MediumFormatId",
+              (ColumnSpec("Name", "nvarchar(100)"), ColumnSpec("Kind", "int", default=0),
+               ColumnSpec("Description", "nvarchar(400)")),
+              key=("Name",)),
+    TableSpec("Tag", "TagId", (ColumnSpec("Name", "nvarchar(100)"),), key=("Name",)),
+    TableSpec("Website", "WebsiteId",
+              (ColumnSpec("Name", "nvarchar(100)"), ColumnSpec("Url", "nvarchar(200)")),
+              key=("Name",)),
+    # --- entities (U02-U05)
+    TableSpec("Artist", "ArtistId",
+              (ColumnSpec("Name", "nvarchar(200)"), ColumnSpec("SortName", "nvarchar(200)", default_from="Name"),
+               ColumnSpec("ArtistTypeId", "int"), ColumnSpec("IsGroup", "bit", default=False),
+               ColumnSpec("Description", "nvarchar(max)"), ColumnSpec("CountryId", "int"),
+               ColumnSpec("FirstActivityYear", "int")),
+              # matched on the Identifier first, so a renamed artist keeps its row;
+              # UX_Artist_Name_Country_Group applies to MB ids without a mapping
+              key=("Name", "CountryId", "IsGroup"), nullable_key=("CountryId",), touch_column="UpdatedUtc",
+              identified=True),
+    TableSpec("Recording", "RecordingId",
+              (ColumnSpec("Name", "nvarchar(250)"), ColumnSpec("DurationMs", "int"), ColumnSpec("ISRC", "char(12)"),
+               ColumnSpec("PrimaryArtistId", "int")),
+              # UX_Recording_ISRC; a NULL ISRC never matches, so those rows rely on the Identifier
+              key=("ISRC",), identified=True),
+    TableSpec("Album", "AlbumId",
+              (ColumnSpec("Name", "nvarchar(250)"), ColumnSpec("SortName", "nvarchar(250)", default_from="Name"),
+               ColumnSpec("PrimaryArtistId", "int"), ColumnSpec("AlbumType", "int", default=0),
+               ColumnSpec("FirstReleaseDate", "date"), ColumnSpec("Rating", "tinyint")),
+              key=(), touch_column="UpdatedUtc", identified=True),
+    TableSpec("Edition", "EditionId",
+              (ColumnSpec("AlbumId", "int"), ColumnSpec("Title", "nvarchar(250)"), ColumnSpec("Status", "int", default=0),
+               ColumnSpec("ReleaseDate", "date"), ColumnSpec("Barcode", "bigint"), ColumnSpec("Packaging", "int"),
+               ColumnSpec("Description", "nvarchar(1000)")),
+              key=(), touch_column="UpdatedUtc", identified=True),
+    TableSpec("Disc", "DiscId",
+              (ColumnSpec("EditionId", "int"), ColumnSpec("DiscNumber", "int"), ColumnSpec("MediumFormatId", "int"),
+               ColumnSpec("Name", "nvarchar(200)")),
+              key=("EditionId", "DiscNumber")),
+    TableSpec("Track", "TrackId",
+              (ColumnSpec("DiscId", "int"), ColumnSpec("RecordingId", "int"), ColumnSpec("Title", "nvarchar(250)"),
+               ColumnSpec("SortTitle", "nvarchar(250)", default_from="Title"), ColumnSpec("TrackNumber", "int"),
+               ColumnSpec("Position", "int"), ColumnSpec("DurationMs", "int"), ColumnSpec("ISRC", "char(12)"),
+               ColumnSpec("BPM", "decimal(6,2)"), ColumnSpec("MusicalKey", "nvarchar(12)"),
+               ColumnSpec("LanguageCode", "char(3)"), ColumnSpec("ExplicitFlag", "bit", default=False),
+               ColumnSpec("LyricsAvailable", "bit", default=False)),
+              key=("DiscId", "TrackNumber")),
+)}
+
+
+@dataclass(frozen=True)
+class JunctionSpec:
+    """
+    A junction table (U06) as a set of (owner, member) pairs, synced by JunctionSyncLoader.
+
+    `scope` holds constant columns that select this pair set and are written on insert, e.g.
+    the TargetType and Role of one kind of Credit; other columns take their DDL defaults.
+    """
+    name: str
+    owner_column: str
+    member_column: str
+    scope: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{SCHEMA}.{self.name}"
+
+    @property
+    def staging_name(self) -> str:
+        return f"#del_{self.name}"
+
+
+JUNCTIONS: Dict[str, JunctionSpec] = {spec.name: spec for spec in (
+    JunctionSpec("ArtistGenre", "ArtistId", "GenreId"),
+    JunctionSpec("AlbumGenre", "AlbumId", "GenreId"),
+    JunctionSpec("TrackGenre", "TrackId", "GenreId"),
+    # a member with several stints (JoinedDate) is one pair; deleting it removes every stint
+    JunctionSpec("ArtistMembership", "GroupArtistId", "MemberArtistId"),
+)}
+
+
+def credit_junction(target_type: int, role: str) -> JunctionSpec:
+    """Credit pairs (TargetId, ArtistId) of one target type and role, e.g. performers of tracks."""
+    return JunctionSpec("Credit", "TargetId", "ArtistId", scope=(("TargetType", target_type), ("Role", role)))
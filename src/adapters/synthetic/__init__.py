@@ -0,0 +1 @@
+﻿# synthetic data and stand-in adapters (benchmarks, tests)
@@ -0,0 +1,235 @@
+# python
+# file: src/adapters/synthetic/generator.py
+
+"""
+Seeded generator of MusicBrainz-shaped rows for benchmarks and tests.
+
+The distributions follow what makes the real data hard, not its exact values:
+- name tokens are drawn Zipf-distributed from a vocabulary, and a share of artists reuse a
+  popular full name ("John Williams" problem), so name caches and matchers see realistic repetition,
+- a share of names is non-ASCII: Latin with diacritics, Cyrillic, Greek, Japanese, plus stray
+  whitespace, so normalization does real work,
+- a large share of artists has no country (NULL), the rest is skewed towards a few countries,
+- ids are increasing with gaps; last_updated is non-decreasing with ties across page boundaries,
+- releases per artist and tracks per release are skewed (a few artists dominate).
+
+Every entity stream is generated independently from (seed, entity), is deterministic, and
+is produced lazily, so 10M-row scales never materialize in memory. Only the id tables that
+child rows reference are held, as packed arrays (8 bytes per parent).
+"""
+
+from __future__ import annotations
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Sequence
+import random
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# rows of the other entities per artist (MusicBrainz has ~15 recordings and ~2 releases per artist)
+RECORDINGS_PER_ARTIST = 4
+RELEASES_PER_ARTIST = 1
+
+NULL_COUNTRY_SHARE = 0.35
+NON_ASCII_SHARE = 0.15
+DUPLICATE_NAME_SHARE = 0.05
+NULL_SORT_NAME_SHARE = 0.05
+_CHUNK = 10_000
+_EPOCH = datetime(2010, 1, 1)
+
+_WORDS = (
+    "The", "Band", "Orchestra", "Quartet", "John", "Williams", "Black", "Blue", "Red", "Brothers",
+    "Sisters", "Project", "Sound", "System", "Night", "Day", "Love", "Dead", "Boys", "Girls",
+    "Smith", "Jones", "Brown", "Miller", "Davis", "Garcia", "Wilson", "Moore", "Taylor", "Thomas",
+    "Electric", "Light", "Dark", "Star", "Moon", "Sun", "River", "Stone", "Fire", "Ice",
+    "Collective", "Ensemble", "Trio", "Club", "Machine", "Ghost", "Wolf", "Crow", "Rose", "Street",
+)
+_UNICODE_NAMES = (
+    "Björk", "Sigur Rós", "Mötley Crüe", "Beyoncé", "Motörhead", "Françoise Hardy", "Dvořák", "Łódź Trio",
+    "Ævar Þór", "Øystein Sevåg", "Céline Dion", "Zoë Keating", "Кино", "Аквариум", "Мумий Тролль",
+    "Σωκράτης Μάλαμας", "Μίκης Θεοδωράκης", "坂本龍一", "宇多田ヒカル", "きゃりーぱみゅぱみゅ", "ＹＭＯ",
+    "Ｂｌｕｅ　Ｓｔａｒ", "Sinéad O’Connor", "Café Tacvba", "Los Fabulosos Cadillacs", "Mañana Mañana",
+)
+_COUNTRIES = ("US", "GB", "DE", "JP", "FR", "SE", "CA", "IT", "NL", "AU", "BR", "ES", "FI", "NO", "IS", "RU", "GR")
+_TITLE_WORDS = (
+    "Love", "Song", "Night", "Intro", "Outro", "Blues", "Dance", "Remix", "Live", "Version", "Part",
+    "Dream", "Heart", "Home", "Road", "Rain", "Summer", "Winter", "Tonight", "Forever", "Again", "You",
+)
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return list(accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+
+
+class SyntheticMusicBrainz:
+    """
+    Lazy, deterministic MusicBrainz-like row streams.
+
+    Responsibilities:
+    - artists / recordings / releases / tracks as dict rows shaped like the Postgres source rows
+    - the same rows for the same (seed, scale), independent of which streams are consumed
+
+    Row shapes:
+    - artist:    id, name, sort_name, country, last_updated
+    - recording: id, artist_id, name, length_ms, last_updated
+    - release:   id, artist_id, name, country, date, last_updated
+    - track:     id, release_id, recording_id, medium, position, name, length_ms, last_updated
+    """
+
+    def __init__(self, scale: Any = "10k", seed: int = 42) -> None:
+        self.artist_count = SCALES[scale] if isinstance(scale, str) else int(scale)
+        if self.artist_count < 1:
+            raise ValueError("scale must be at least one artist")
+        self.seed = seed
+        self._word_weights = _zipf_weights(len(_WORDS))
+        self._title_weights = _zipf_weights(len(_TITLE_WORDS))
+        self._country_weights = _zipf_weights(len(_COUNTRIES), 1.3)
+
+    @property
+    def recording_count(self) -> int:
+        return self.artist_count * RECORDINGS_PER_ARTIST
+
+    @property
+    def release_count(self) -> int:
+        return self.artist_count * RELEASES_PER_ARTIST
+
+    def _rng(self, entity: str, stream: str = "attrs") -> random.Random:
+        # ids, timestamps and attributes draw from separate streams, so the id sequence of an
+        # entity can be regenerated alone (for the foreign keys of its children)
+        return random.Random(f"{self.seed}:{entity}:{stream}")
+
+    def _id_stream(self, entity: str, n: int) -> Iterator[int]:
+        return self._ids(self._rng(entity, "id"), n)
+
+    def _ts_stream(self, entity: str, n: int) -> Iterator[datetime]:
+        return self._timestamps(self._rng(entity, "ts"), n)
+
+    def _id_table(self, entity: str, n: int) -> Sequence[int]:
+        return array("q", self._id_stream(entity, n))
+
+    @staticmethod
+    def _ids(rng: random.Random, n: int) -> Iterator[int]:
+        # increasing with occasional gaps (deleted / merged entities)
+        current = 0
+        for _ in range(n):
+            current += 1 if rng.random() < 0.9 else rng.randint(2, 50)
+            yield current
+
+    @staticmethod
+    def _timestamps(rng: random.Random, n: int) -> Iterator[datetime]:
+        # non-decreasing; ~20% ties with the previous row (bulk edits share a timestamp)
+        ts = _EPOCH
+        for _ in range(n):
+            if rng.random() >= 0.2:
+                ts += timedelta(seconds=rng.randint(1, 120))
+            yield ts
+
+    def _artist_name(self, rng: random.Random, recent: List[str]) -> str:
+        roll = rng.random()
+        if recent and roll < DUPLICATE_NAME_SHARE:
+            return rng.choice(recent)
+        if roll < DUPLICATE_NAME_SHARE + NON_ASCII_SHARE:
+            name = rng.choice(_UNICODE_NAMES)
+            if rng.random() < 0.3:
+                name = f"{name} {rng.choices(_WORDS, cum_weights=self._word_weights)[0]}"
+        else:
+            words = rng.choices(_WORDS, cum_weights=self._word_weights, k=rng.choice((1, 2, 2, 2, 3)))
+            name = " ".join(words)
+        if rng.random() < 0.02:
+            name = f" {name}  "  # stray whitespace from the source
+        return name
+
+    @staticmethod
+    def _sort_name(rng: random.Random, name: str) -> Any:
+        if rng.random() < NULL_SORT_NAME_SHARE:
+            return None
+        parts = name.split()
+        if len(parts) == 2 and parts[0] != "The":
+            return f"{parts[1]}, {parts[0]}"
+        if len(parts) > 1 and parts[0] == "The":
+            return f"{' '.join(parts[1:])}, The"
+        return name.strip()
+
+    def _country(self, rng: random.Random) -> Any:
+        if rng.random() < NULL_COUNTRY_SHARE:
+            return None
+        return rng.choices(_COUNTRIES, cum_weights=self._country_weights)[0]
+
+    def _title(self, rng: random.Random) -> str:
+        return " ".join(rng.choices(_TITLE_WORDS, cum_weights=self._title_weights, k=rng.randint(1, 4)))
+
+    def _parent_ids(self, rng: random.Random, parents: int, n: int) -> Iterator[int]:
+        """Skewed parent ordinals (0-based): a few parents own many children."""
+        weights = _zipf_weights(min(parents, 1000), 0.9)
+        hot = min(parents, 1000)
+        for _ in range(n):
+            if rng.random() < 0.3:
+                yield rng.choices(range(hot), cum_weights=weights)[0]
+            else:
+                yield rng.randrange(parents)
+
+    def artists(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("artist")
+        n = self.artist_count
+        recent: List[str] = []
+        for artist_id, ts in zip(self._id_stream("artist", n), self._ts_stream("artist", n)):
+            name = self._artist_name(rng, recent)
+            if len(recent) < 500:
+                recent.append(name)
+            elif rng.random() < 0.01:
+                recent[rng.randrange(500)] = name
+            yield {"id": artist_id, "name": name, "sort_name": self._sort_name(rng, name),
+                   "country": self._country(rng), "last_updated": ts}
+
+    def artist_ids(self) -> Sequence[int]:
+        return self._id_table("artist", self.artist_count)
+
+    def recordings(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("recording")
+        artist_ids = self.artist_ids()
+        n = self.recording_count
+        for rec_id, ts, parent in zip(self._id_stream("recording", n), self._ts_stream("recording", n),
+                                      self._parent_ids(self._rng("recording", "parent"), len(artist_ids), n)):
+            yield {"id": rec_id, "artist_id": artist_ids[parent], "name": self._title(rng),
+                   "length_ms": rng.randint(30_000, 600_000) if rng.random() > 0.1 else None,
+                   "last_updated": ts}
+
+    def releases(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("release")
+        artist_ids = self.artist_ids()
+        n = self.release_count
+        for rel_id, ts, parent in zip(self._id_stream("release", n), self._ts_stream("release", n),
+                                      self._parent_ids(self._rng("release", "parent"), len(artist_ids), n)):
+            year = rng.randint(1950, 2024)
+            yield {"id": rel_id, "artist_id": artist_ids[parent], "name": self._title(rng),
+                   "country": self._country(rng),
+                   "date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() > 0.2 else None,
+                   "last_updated": ts}
+
+    def tracks(self) -> Iterator[Dict[str, Any]]:
+        """Tracks release by release; 1-2 media per release, 1-20 tracks per medium (skewed to ~10)."""
+        rng = self._rng("track")
+        recording_ids = self._id_table("recording", self.recording_count)
+        stamps = self._ts_stream("track", 2**62)
+        track_id = 0
+        for release_id in self._id_stream("release", self.release_count):
+            for medium in range(1, 2 if rng.random() < 0.85 else 3):
+                for position in range(1, max(1, min(20, int(rng.gauss(10, 4)))) + 1):
+                    track_id += 1
+                    yield {"id": track_id, "release_id": release_id,
+                           "recording_id": recording_ids[rng.randrange(len(recording_ids))], "medium": medium,
+                           "position": position, "name": self._title(rng),
+                           "length_ms": rng.randint(30_000, 600_000) if rng.random() > 0.1 else None,
+                           "last_updated": next(stamps)}
+
+    @staticmethod
+    def chunks(rows: Iterator[Dict[str, Any]], size: int = _CHUNK) -> Iterator[List[Dict[str, Any]]]:
+        chunk: List[Dict[str, Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
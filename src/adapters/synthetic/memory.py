@@ -0,0 +1,110 @@
+# python
+# file: src/adapters/synthetic/memory.py
+
+"""
+In-memory stand-ins for the artist source and destination.
+
+They implement the same ports as PostgresRepository and SQLServerRepository, so ETLService
+and the benchmarks run unchanged against them; cost is pure Python, which isolates the
+pipeline's own overhead from database time.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from core.ports.destination_repository import DestinationRepository
+from core.ports.source_repository import SourceRepository
+from core.record_batch import RecordBatch
+from core.watermark import Watermark, sort_key
+from adapters.postgres.repository import ARTIST_FIELDS
+
+_ARTIST_KEYS = tuple(f.name for f in ARTIST_FIELDS)
+
+
+class InMemorySource(SourceRepository):
+    """Artist rows (generator dicts) served with offset, keyset and columnar paging."""
+
+    def __init__(self, artists: Iterable[Dict[str, Any]]) -> None:
+        rows = sorted(artists, key=lambda r: r["id"])
+        # positional rows in ARTIST_FIELDS order, as a driver would return them
+        self._rows: List[Tuple[Any, ...]] = [tuple(r.get(k) for k in _ARTIST_KEYS) for r in rows]
+        self._ids: List[int] = [r[0] for r in self._rows]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def fetch_artists_batch(self, offset: int, limit: int) -> Iterable[Dict[str, Any]]:
+        return [dict(zip(_ARTIST_KEYS, r)) for r in self._rows[offset:offset + limit]]
+
+    def fetch_artists_after(self, after_id: Optional[int], limit: int,
+                            before_id: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        return [dict(zip(_ARTIST_KEYS, r)) for r in self._page(after_id, limit, before_id)]
+
+    def fetch_artist_columns_after(self, after_id: Optional[int], limit: int,
+                                   before_id: Optional[int] = None) -> RecordBatch:
+        return RecordBatch.from_rows(ARTIST_FIELDS, self._page(after_id, limit, before_id))
+
+    def _page(self, after_id: Optional[int], limit: int, before_id: Optional[int]) -> List[Tuple[Any, ...]]:
+        start = 0 if after_id is None else bisect_right(self._ids, after_id)
+        stop = len(self._ids) if before_id is None else bisect_left(self._ids, before_id)
+        return self._rows[start:min(stop, start + limit)]
+
+
+class InMemoryExtractor:
+    """
+    Extractor over any generated entity stream, seeking on (`ts_field`, `id_field`) strictly
+    after `since`, as `WHERE (last_updated, id) > (...) ORDER BY last_updated, id LIMIT n` would.
+
+    A bare datetime `since` keeps the timestamp-only semantics: every row of that timestamp is
+    behind it.
+    """
+
+    seeks_watermark = True
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], ts_field: str = "last_updated", id_field: str = "id") -> None:
+        self._rows = sorted(rows, key=lambda r: sort_key(r[ts_field], r[id_field]))
+        self._keys: List[Tuple[Any, ...]] = [sort_key(r[ts_field], r[id_field]) for r in self._rows]
+
+    def extract_batch(self, since: Union[None, datetime, Watermark], limit: int) -> List[Dict[str, Any]]:
+        since = Watermark.coerce(since)
+        start = 0 if since is None else bisect_right(self._keys, since.key)
+        return self._rows[start:start + limit]
+
+
+class InMemoryDestination(DestinationRepository):
+    """
+    Artist destination keyed by MB id with commit / rollback semantics.
+
+    fail_after: raise on the upsert after that many successful ones (once), to exercise
+    failure and resume paths.
+    """
+
+    def __init__(self, fail_after: Optional[int] = None) -> None:
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.commits = 0
+        self.fail_after = fail_after
+        self._upserts = 0
+        self._pending: Dict[int, Dict[str, Any]] = {}
+
+    def begin_transaction(self) -> None:
+        self._pending = {}
+
+    def commit(self) -> None:
+        self.rows.update(self._pending)
+        self._pending = {}
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self._pending = {}
+
+    def upsert_artists(self, records: Union[Iterable[Dict[str, Any]], RecordBatch]) -> int:
+        if self.fail_after is not None and self._upserts >= self.fail_after:
+            self.fail_after = None
+            raise RuntimeError("injected destination failure")
+        self._upserts += 1
+        rows = records.to_dicts() if isinstance(records, RecordBatch) else list(records)
+        for row in rows:
+            self._pending[int(row["mb_id"])] = row
+        return len(rows)
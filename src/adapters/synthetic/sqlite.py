@@ -0,0 +1,177 @@
+# python
+# file: src/adapters/synthetic/sqlite.py
+
+"""
+SQLite-backed stand-ins for the artist source and destination.
+
+Unlike the in-memory ones they pay for SQL parsing, B-tree seeks, row decoding and
+transactions, so benchmarks see a database-shaped cost profile without a Postgres or SQL Server
+instance. Use a file path for scales that do not fit in memory (10M artists).
+"""
+
+from __future__ import annotations
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import sqlite3
+
+from core.ports.destination_repository import DestinationRepository
+from core.ports.source_repository import SourceRepository
+from core.record_batch import RecordBatch
+from application.services.reconciliation import DIGEST_MASK, row_digest
+from adapters.postgres.repository import ARTIST_FIELDS
+
+_INSERT_CHUNK = 10_000
+_ARTIST_KEYS = tuple(f.name for f in ARTIST_FIELDS)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # autocommit mode: transactions are opened explicitly with BEGIN
+    db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class SQLiteSource(SourceRepository):
+    """Artist source table mirroring the Postgres query shapes (offset, keyset and columnar)."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._db = _connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS artist ("
+            " id INTEGER PRIMARY KEY, name TEXT NOT NULL, sort_name TEXT, country TEXT, last_updated TEXT)")
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._db
+
+    def populate(self, artists: Iterable[Dict[str, Any]]) -> int:
+        """Bulk insert generator rows; returns the number of rows written."""
+        rows = ((a["id"], a["name"], a["sort_name"], a["country"], str(a["last_updated"])) for a in artists)
+        total = 0
+        while True:
+            chunk = list(islice(rows, _INSERT_CHUNK))
+            if not chunk:
+                return total
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO artist VALUES (?, ?, ?, ?, ?)", chunk)
+            self._db.execute("COMMIT")
+            total += len(chunk)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM artist").fetchone()[0]
+
+    def fetch_artists_batch(self, offset: int, limit: int) -> Iterable[Dict[str, Any]]:
+        cur = self._db.execute("SELECT id, name, sort_name, country FROM artist ORDER BY id LIMIT ? OFFSET ?",
+                               (limit, offset))
+        return [dict(zip(_ARTIST_KEYS, r)) for r in cur.fetchall()]
+
+    def fetch_artists_after(self, after_id: Optional[int], limit: int,
+                            before_id: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        return [dict(zip(_ARTIST_KEYS, r)) for r in self._page(after_id, limit, before_id)]
+
+    def fetch_artist_columns_after(self, after_id: Optional[int], limit: int,
+                                   before_id: Optional[int] = None) -> RecordBatch:
+        return RecordBatch.from_rows(ARTIST_FIELDS, self._page(after_id, limit, before_id))
+
+    def _page(self, after_id: Optional[int], limit: int, before_id: Optional[int]) -> List[Tuple[Any, ...]]:
+        sql = "SELECT id, name, sort_name, country FROM artist WHERE id > ?"
+        params: List[Any] = [after_id if after_id is not None else 0]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        params.append(limit)
+        return self._db.execute(sql + " ORDER BY id LIMIT ?", params).fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class SQLiteDestination(DestinationRepository):
+    """Artist destination table with an upsert on the MB id (INSERT ... ON CONFLICT DO UPDATE)."""
+
+    UPSERT_SQL = (
+        "INSERT INTO artist (mb_id, name, sort_name, country, country_id) VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (mb_id) DO UPDATE SET name = excluded.name, sort_name = excluded.sort_name,"
+        " country = excluded.country, country_id = excluded.country_id")
+    COLUMNS = ("mb_id", "name", "sort_name", "country", "country_id")
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._db = _connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS artist ("
+            " mb_id INTEGER PRIMARY KEY, name TEXT NOT NULL, sort_name TEXT, country TEXT, country_id INTEGER)")
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._db
+
+    def begin_transaction(self) -> None:
+        self._db.execute("BEGIN")
+
+    def commit(self) -> None:
+        self._db.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+
+    def upsert_artists(self, records: Union[Iterable[Dict[str, Any]], RecordBatch]) -> int:
+        if isinstance(records, RecordBatch):
+            rows = [(int(r[0]), *r[1:]) for r in records.rows(self.COLUMNS)]
+        else:
+            rows = [(int(r["mb_id"]), r["name"], r["sort_name"], r["country"], r["country_id"]) for r in records]
+        self._db.executemany(self.UPSERT_SQL, rows)
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM artist").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _signed(digest: int) -> int:
+    # SQLite integers are signed 64-bit
+    return digest - (1 << 64) if digest >= 1 << 63 else digest
+
+
+class _DigestSum:
+    """SQLite aggregate: sum (mod 2**64) of the row digests of a group."""
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def step(self, *row: Any) -> None:
+        self.total = (self.total + row_digest(row)) & DIGEST_MASK
+
+    def finalize(self) -> int:
+        return _signed(self.total)
+
+
+class SQLiteRowRange:
+    """
+    One side of a reconciliation over a SQLite table (a RowRangeSource): (key, *columns) rows
+    by key range. Chunk digests are aggregated inside SQLite, so only one row per non-empty
+    chunk reaches the caller.
+    """
+
+    def __init__(self, db: sqlite3.Connection, table: str, key: str, columns: Sequence[str]) -> None:
+        self._db = db
+        self._db.create_aggregate("mbetl_digest_sum", -1, _DigestSum)
+        selected = ", ".join((key, *columns))
+        self._range_sql = f"SELECT MIN({key}), MAX({key}) FROM {table}"
+        self._rows_sql = f"SELECT {selected} FROM {table} WHERE {key} >= ? AND {key} < ? ORDER BY {key}"
+        self._digest_sql = (f"SELECT ({key} - ?) / ? AS chunk, COUNT(*), mbetl_digest_sum({selected})"
+                            f" FROM {table} WHERE {key} >= ? AND {key} < ? GROUP BY chunk")
+
+    def key_range(self) -> Optional[Tuple[int, int]]:
+        lo, hi = self._db.execute(self._range_sql).fetchone()
+        return None if lo is None else (lo, hi)
+
+    def rows_between(self, lo: int, hi: int) -> Iterator[Tuple[Any, ...]]:
+        return self._db.execute(self._rows_sql, (lo, hi))
+
+    def chunk_digests(self, lo: int, hi: int, width: int) -> Iterator[Tuple[int, int, int]]:
+        for index, count, digest in self._db.execute(self._digest_sql, (lo, width, lo, hi)):
+            yield index, count, digest & DIGEST_MASK
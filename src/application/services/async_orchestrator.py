@@ -0,0 +1,255 @@
+# python
+# file: src/application/services/async_orchestrator.py
+
+"""
+asyncio-native orchestration of extract -> translate -> load.
+
+One AsyncOrchestrator runs one entity pipeline: while batch N loads, the extract of batch N+1
+is already in flight (prefetch). Several pipelines - e.g. the seven U01 lookups, which write
+independent tables - run concurrently through run_pipelines(), so their database round-trips
+overlap instead of queueing behind each other.
+
+EndpointLimits caps the round-trips in flight per endpoint (source database, destination
+database, ...), whichever pipelines they come from. Synchronous adapters join through the
+to_thread shims (AsyncExtractorShim / AsyncLoaderShim), so entities can migrate one at a time.
+A shim runs its adapter on a worker thread: adapters that share one driver connection must use
+an endpoint limit of 1, since DB-API connections are not safe for concurrent use.
+"""
+
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Dict, Generic, Iterable, Mapping, Optional, Union
+from uuid import UUID, uuid4
+import asyncio
+import inspect
+import logging
+
+from core.ports.etl_ports import (
+    AsyncExtractor, AsyncLoader, Extractor, Loader, LoadResult, Translator, TIn, TOut,
+)
+from core.record_batch import RecordBatch
+from core.watermark import Watermark, max_watermark, persist_watermark, since_for
+from application.services.lookup_cache import LookupCache
+
+logger = logging.getLogger(__name__)
+
+SOURCE_ENDPOINT = "source"
+DESTINATION_ENDPOINT = "destination"
+DEFAULT_ENDPOINT_LIMIT = 4
+
+
+class EndpointLimits:
+    """Per-endpoint concurrency limits (asyncio semaphores), shared by all pipelines of a run."""
+
+    def __init__(self, limits: Optional[Mapping[str, int]] = None, default: int = DEFAULT_ENDPOINT_LIMIT) -> None:
+        if default < 1 or any(v < 1 for v in (limits or {}).values()):
+            raise ValueError("endpoint limits must be >= 1")
+        self._limits = dict(limits or {})
+        self.default = default
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self.peak: Dict[str, int] = {}
+
+    def limit(self, endpoint: str) -> int:
+        return self._limits.get(endpoint, self.default)
+
+    @asynccontextmanager
+    async def acquire(self, endpoint: str) -> AsyncIterator[None]:
+        sem = self._semaphores.get(endpoint)
+        if sem is None:
+            sem = self._semaphores[endpoint] = asyncio.Semaphore(self.limit(endpoint))
+        async with sem:
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+            self.peak[endpoint] = max(self.peak.get(endpoint, 0), self._in_flight[endpoint])
+            try:
+                yield
+            finally:
+                self._in_flight[endpoint] -= 1
+
+
+class AsyncExtractorShim(Generic[TIn]):
+    """AsyncExtractor over a synchronous Extractor: each page is pulled on a worker thread."""
+
+    def __init__(self, extractor: Extractor[TIn]) -> None:
+        self.extractor = extractor
+        self.seeks_watermark = getattr(extractor, "seeks_watermark", False)
+
+    async def extract_batch(self, since: Union[None, datetime, Watermark], limit: int) -> Any:
+        return await asyncio.to_thread(self._extract, since, limit)
+
+    def _extract(self, since: Union[None, datetime, Watermark], limit: int) -> Any:
+        items = self.extractor.extract_batch(since=since, limit=limit)
+        if isinstance(items, RecordBatch):
+            return items
+        # a lazy page is materialized on the worker thread, and no further than `limit` when seeking
+        return list(islice(items, limit)) if self.seeks_watermark else list(items)
+
+
+class AsyncLoaderShim(Generic[TOut]):
+    """AsyncLoader over a synchronous Loader: each batch is loaded on a worker thread."""
+
+    def __init__(self, loader: Loader[TOut]) -> None:
+        self.loader = loader
+
+    async def load_batch(self, items: Iterable[TOut], batch_id: UUID) -> LoadResult:
+        return await asyncio.to_thread(self.loader.load_batch, items, batch_id)
+
+
+def as_async_extractor(extractor: Union[Extractor[TIn], AsyncExtractor[TIn]]) -> AsyncExtractor[TIn]:
+    return extractor if inspect.iscoroutinefunction(extractor.extract_batch) else AsyncExtractorShim(extractor)
+
+
+def as_async_loader(loader: Union[Loader[TOut], AsyncLoader[TOut]]) -> AsyncLoader[TOut]:
+    return loader if inspect.iscoroutinefunction(loader.load_batch) else AsyncLoaderShim(loader)
+
+
+async def _maybe_await(value: Any) -> Any:
+    return await value if inspect.isawaitable(value) else value
+
+
+class AsyncOrchestrator(Generic[TIn, TOut]):
+    """
+    asyncio counterpart of Orchestrator for one entity pipeline.
+
+    Responsibilities:
+    - drive extract -> translate -> load, prefetching the next page while the current one loads
+    - hold an endpoint slot (EndpointLimits) for every extract and load round-trip
+    - retry failed loads, publish MERGE OUTPUT ids to the lookup cache, persist watermarks
+
+    Sync or async adapters are accepted; sync ones are wrapped in the to_thread shims.
+    Translation runs on a worker thread so CPU-bound translators do not stall other pipelines.
+    As in Orchestrator's pipelined mode, the in-run cursor is the Watermark (max
+    source_updated_at, source_id) of the translated batch, handed to watermark-seeking
+    extractors as is and to the others as its timestamp; persist_watermark_fn(max_ts, batch_id)
+    (plus `watermark=` when it accepts it, as in Orchestrator) may be a plain function or a
+    coroutine function and is called only after its batch loaded.
+    """
+
+    def __init__(
+        self,
+        extractor: Union[Extractor[TIn], AsyncExtractor[TIn]],
+        translator: Translator[TIn, TOut],
+        loader: Union[Loader[TOut], AsyncLoader[TOut]],
+        batch_size: int = 1000,
+        max_retries: int = 2,
+        prefetch: bool = True,
+        limits: Optional[EndpointLimits] = None,
+        source_endpoint: str = SOURCE_ENDPOINT,
+        destination_endpoint: str = DESTINATION_ENDPOINT,
+        lookup_cache: Optional[LookupCache] = None,
+        lookup_index: Optional[str] = None,
+    ) -> None:
+        self.extractor = as_async_extractor(extractor)
+        self.translator = translator
+        self.loader = as_async_loader(loader)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.prefetch = prefetch
+        self.limits = limits or EndpointLimits()
+        self.source_endpoint = source_endpoint
+        self.destination_endpoint = destination_endpoint
+        self.lookup_cache = lookup_cache
+        self.lookup_index = lookup_index
+        self._warned_limit = False
+
+    async def run_incremental(self, since: Union[None, datetime, Watermark], persist_watermark_fn) -> int:
+        """Run from `since` until the source is exhausted; returns the number of batches loaded."""
+        next_since = Watermark.coerce(since)
+        pending: Optional[asyncio.Task] = asyncio.ensure_future(self._extract(next_since))
+        batches = 0
+        try:
+            while True:
+                items = await pending
+                pending = None
+                if not len(items):
+                    logger.info("No more rows to process; exiting.")
+                    break
+                batches += 1
+                batch_id = uuid4()
+                logger.info("Processing batch %s (id=%s) since=%s", batches, batch_id, next_since)
+                translated = await self._translate(items, batch_id)
+                watermark = max_watermark(translated)
+                advancing = watermark is not None and (next_since is None or watermark > next_since)
+                if advancing and self.prefetch:
+                    # the next page is fetched while this one loads
+                    pending = asyncio.ensure_future(self._extract(watermark))
+                await self._load_with_retries(translated, batch_id)
+                await _maybe_await(persist_watermark(persist_watermark_fn, watermark, batch_id))
+                if not advancing:
+                    # without an advancing watermark the next extract would return the same rows
+                    logger.info("Watermark did not advance past %s; stopping.", next_since)
+                    break
+                next_since = watermark
+                if pending is None:
+                    pending = asyncio.ensure_future(self._extract(next_since))
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+        return batches
+
+    async def run_full_load(self, persist_watermark_fn) -> int:
+        return await self.run_incremental(since=None, persist_watermark_fn=persist_watermark_fn)
+
+    async def _extract(self, since: Optional[Watermark]) -> Any:
+        limit = self.batch_size
+        seeks = getattr(self.extractor, "seeks_watermark", False)
+        async with self.limits.acquire(self.source_endpoint):
+            items = await self.extractor.extract_batch(since_for(self.extractor, since), limit)
+        if not isinstance(items, RecordBatch):
+            # as in Orchestrator: a watermark-seeking page past `limit` is cut, its rest extracted again
+            items = list(islice(items, limit)) if seeks else list(items)
+        elif seeks and len(items) > limit:
+            items = items.slice(0, limit)
+        if len(items) > limit and not self._warned_limit:
+            self._warned_limit = True
+            logger.warning("%s returned %d rows for limit %d; batches are not bounded",
+                           type(self.extractor).__name__, len(items), limit)
+        return items
+
+    async def _translate(self, items: Any, batch_id: UUID) -> Any:
+        try:
+            return await asyncio.to_thread(self.translator.translate_batch, items)
+        except Exception as ex:
+            logger.exception("Translation failed for batch %s: %s", batch_id, ex)
+            raise
+
+    async def _load_with_retries(self, translated: Any, batch_id: UUID) -> LoadResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.limits.acquire(self.destination_endpoint):
+                    result: LoadResult = await self.loader.load_batch(translated, batch_id)
+                logger.info(
+                    "Loaded batch %s inserted=%d updated=%d errors=%d",
+                    batch_id, result.inserted, result.updated, len(result.errors),
+                )
+                if self.lookup_cache is not None and self.lookup_index:
+                    self.lookup_cache.update_from_result(self.lookup_index, result)
+                return result
+            except Exception as ex:
+                logger.exception("Load failed (attempt %d) for batch %s: %s", attempt, batch_id, ex)
+                if attempt > self.max_retries:
+                    logger.error("Max retries reached for batch %s; aborting.", batch_id)
+                    raise
+                logger.info("Retrying batch %s (attempt %d)...", batch_id, attempt + 1)
+
+
+async def run_pipelines(pipelines: Mapping[str, Awaitable[Any]]) -> Dict[str, Optional[BaseException]]:
+    """
+    Run independent pipelines (e.g. run_full_load coroutines of different lookup tables)
+    concurrently. A failing pipeline does not cancel the others; returns name -> error or None.
+    """
+    names = list(pipelines)
+    outcomes = await asyncio.gather(*(pipelines[n] for n in names), return_exceptions=True)
+    errors: Dict[str, Optional[BaseException]] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Pipeline %s failed: %s", name, outcome)
+            errors[name] = outcome
+        else:
+            errors[name] = None
+    return errors
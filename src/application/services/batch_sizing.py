@@ -0,0 +1,197 @@
+# python
+# file: src/application/services/batch_sizing.py
+
+"""
+Adaptive batch sizing (C01 batch size tuning).
+
+A fixed batch size is wrong for most entities: a lookup page of 500 rows is a few
+milliseconds of work, a page of wide track rows may be seconds and tens of megabytes. The
+AdaptiveBatchController observes every batch - stage durations, rows/s and process RSS - and
+moves the next batch size toward the size that meets a target latency, within configured
+bounds and below a memory ceiling.
+
+Decision order per observation:
+1. RSS above the ceiling: shrink by `shrink` (memory wins over everything else).
+2. Growing last time lowered throughput: step back and cap growth at the previous size.
+   The cap is not permanent: after `cap_decay` further observations with no RSS pressure it
+   rises by `growth` (up to max_size), so a drop caused by a passing condition (a lock storm,
+   another job's memory) is retried rather than limiting the rest of the run.
+3. Otherwise aim at target_latency_s using the smoothed per-row cost, changing the size by at
+   most `growth` / `shrink` per step and ignoring changes within `tolerance`; no growth while
+   RSS is within `headroom` of the ceiling.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_BATCH = 100
+DEFAULT_MAX_BATCH = 50_000
+DEFAULT_TARGET_LATENCY_S = 2.0
+
+
+@dataclass(frozen=True)
+class BatchObservation:
+    """Measured cost of one batch; stage durations in seconds."""
+    rows: int
+    extract_s: float = 0.0
+    translate_s: float = 0.0
+    load_s: float = 0.0
+    rss_bytes: Optional[int] = None
+
+    @property
+    def latency_s(self) -> float:
+        return self.extract_s + self.translate_s + self.load_s
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.latency_s if self.latency_s > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class BatchDecision:
+    old_size: int
+    new_size: int
+    reason: str
+    observation: BatchObservation
+
+
+class AdaptiveBatchController:
+    """
+    Chooses the size of the next batch from the cost of the previous ones.
+
+    Responsibilities:
+    - expose the current `batch_size` to extract stages
+    - fold each BatchObservation into a smoothed per-row cost and pick the next size
+    - keep the size within [min_size, max_size] and RSS below max_rss_bytes
+    - log every decision and keep them in `decisions` for the run report
+
+    rss_fn (e.g. infra.process.current_rss_bytes) samples process memory when an observation
+    carries none; without it and without max_rss_bytes only latency drives the size.
+    Short batches (fewer rows than requested, i.e. the end of the source) are observed for their
+    cost but never grow the size. Thread-safe: pipelined extract stages read `batch_size`
+    while the load stage observes.
+    """
+
+    def __init__(
+        self,
+        initial: int = 1000,
+        min_size: int = DEFAULT_MIN_BATCH,
+        max_size: int = DEFAULT_MAX_BATCH,
+        target_latency_s: float = DEFAULT_TARGET_LATENCY_S,
+        max_rss_bytes: Optional[int] = None,
+        rss_fn: Optional[Callable[[], int]] = None,
+        growth: float = 2.0,
+        shrink: float = 0.5,
+        tolerance: float = 0.2,
+        smoothing: float = 0.5,
+        headroom: float = 0.9,
+        cap_decay: int = 10,
+    ) -> None:
+        if not 1 <= min_size <= max_size:
+            raise ValueError("batch bounds must satisfy 1 <= min_size <= max_size")
+        if target_latency_s <= 0:
+            raise ValueError("target_latency_s must be > 0")
+        if growth <= 1 or not 0 < shrink < 1:
+            raise ValueError("growth must be > 1 and shrink in (0, 1)")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        if cap_decay < 1:
+            raise ValueError("cap_decay must be >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency_s = target_latency_s
+        self.max_rss_bytes = max_rss_bytes
+        self.rss_fn = rss_fn
+        self.growth = growth
+        self.shrink = shrink
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.cap_decay = cap_decay
+        self.decisions: List[BatchDecision] = []
+        self._size = self._clamp(initial)
+        self._cap = max_size
+        self._steady = 0  # observations since the cap was last lowered or raised
+        self._row_cost_s: Optional[float] = None
+        self._last_rows_per_s: Optional[float] = None
+        self._size_before_growth: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self) -> int:
+        return self._size
+
+    def observe(self, observation: BatchObservation) -> int:
+        """Record one batch and return the size of the next one."""
+        if observation.rss_bytes is None and self.rss_fn is not None:
+            observation = BatchObservation(observation.rows, observation.extract_s, observation.translate_s,
+                                           observation.load_s, self.rss_fn())
+        with self._lock:
+            old = self._size
+            new, reason = self._decide(observation)
+            self._size = new
+            self._size_before_growth = old if new > old else None
+            if observation.rows_per_s > 0:
+                self._last_rows_per_s = observation.rows_per_s
+        self.decisions.append(BatchDecision(old, new, reason, observation))
+        rss = observation.rss_bytes
+        logger.info(
+            "Batch size %d -> %d (%s): %d rows in %.3fs [E %.3f T %.3f L %.3f], %.0f rows/s, rss %s",
+            old, new, reason, observation.rows, observation.latency_s, observation.extract_s,
+            observation.translate_s, observation.load_s, observation.rows_per_s,
+            f"{rss / 2**20:.0f} MiB" if rss is not None else "n/a",
+        )
+        return new
+
+    def _decide(self, obs: BatchObservation) -> Tuple[int, str]:
+        size = self._size
+        rss = obs.rss_bytes
+        if self.max_rss_bytes is not None and rss is not None and rss > self.max_rss_bytes:
+            self._cap = max(self.min_size, min(self._cap, size - 1))
+            self._steady = 0
+            return self._clamp(size * self.shrink), "rss over ceiling"
+        if obs.rows <= 0 or obs.latency_s <= 0:
+            return size, "no measurement"
+
+        cost = obs.latency_s / obs.rows
+        if self._row_cost_s is None:
+            self._row_cost_s = cost
+        else:
+            self._row_cost_s = self.smoothing * cost + (1 - self.smoothing) * self._row_cost_s
+
+        prev = self._last_rows_per_s
+        before = self._size_before_growth
+        if before is not None and prev is not None and obs.rows_per_s < prev * (1 - self.tolerance):
+            # the larger batch was slower per row (lock escalation, log growth, memory pressure)
+            self._cap = before
+            self._steady = 0
+            return before, "throughput dropped"
+
+        near_ceiling = self.max_rss_bytes is not None and rss is not None and rss > self.headroom * self.max_rss_bytes
+        if self._cap < self.max_size and not near_ceiling:
+            self._steady += 1
+            if self._steady >= self.cap_decay:
+                self._cap = min(self.max_size, int(self._cap * self.growth))
+                self._steady = 0
+                logger.debug("Batch size cap raised to %d", self._cap)
+
+        ideal = self.target_latency_s / self._row_cost_s
+        target = min(max(ideal, size * self.shrink), size * self.growth)
+        if abs(target - size) <= self.tolerance * size:
+            return size, "on target"
+        if target > size:
+            if obs.rows < size:
+                return size, "short batch"
+            if near_ceiling:
+                return size, "rss near ceiling"
+            grown = min(self._clamp(target), max(self._cap, size))
+            return grown, "under target latency" if grown > size else "at cap"
+        return self._clamp(target), "over target latency"
+
+    def _clamp(self, size: float) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
@@ -0,0 +1,305 @@
+# python
+# file: src/application/services/candidate_matcher.py
+
+"""
+Candidate matching of incoming artists / labels against the destination (U02 fallback match,
+U08 review).
+
+Matching an unmapped row on its natural key (Name, CountryId, IsGroup) by comparing it with
+every destination row is quadratic. The BlockingIndex narrows each row to a handful of
+candidates:
+
+- an exact postings chain per normalized name (all countries, read filtered by country),
+- per country partition (NULL country is a partition of its own): postings of the name's
+  first `prefix_len` characters and of its character trigrams.
+
+A row whose normalized name exists gets the rows of that name in its own country and the
+NULL-country partition (or, when there are none, in other countries). Otherwise it probes its
+own partition (plus the NULL-country one), and of its prefix/trigram keys only the rarest: a name
+sharing at least `min_share` of the query's keys must share one of the `keys - shared + 1`
+rarest (the prefix-filter principle), so the others need not be read. Postings are read
+rarest first up to `max_probe_rows` entries; a name made only of stop-grams ("the", " of")
+is narrowed by intersecting its rarest postings instead, trading recall for a bounded cost.
+
+CandidateMatcher scores the candidates of a batch (trigram Dice similarity, penalised when
+IsGroup or a known country disagrees), accepts a clear winner, routes weak, ambiguous and
+NULL-country matches to a ReviewStore and reports everything else as new.
+"""
+
+from __future__ import annotations
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass, field, is_dataclass
+from itertools import chain
+from math import ceil
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID, uuid4
+import logging
+
+from core.normalization import NameNormalizer, default_normalizer
+from core.ports.review_store import ReviewItem, ReviewStore
+
+logger = logging.getLogger(__name__)
+
+MATCHED = "matched"
+REVIEW = "review"
+NEW = "new"
+
+_NO_COUNTRY = -1
+_UNKNOWN = 2
+# name padding, so that the first and last characters get grams of their own
+_START, _END = "\x02", "\x03"
+_PREFIX = "\x01"
+
+
+def name_grams(normalized: str, n: int = 3) -> Set[str]:
+    """Character n-grams of a normalized name, padded at both ends."""
+    padded = f"{_START}{normalized}{_END}"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def dice(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+def _flag(value: Optional[bool]) -> int:
+    return _UNKNOWN if value is None else int(bool(value))
+
+
+class BlockingIndex:
+    """
+    Append-only blocking index over destination rows (id, name, country id, is-group).
+
+    Responsibilities:
+    - keep the rows compactly (typed arrays, one normalized string per row)
+    - maintain exact-name chains and per-country prefix / trigram postings
+    - generate the candidate rows of one normalized name
+
+    Not thread-safe for concurrent add(); lookups may run concurrently once built.
+    """
+
+    def __init__(self, prefix_len: int = 4, min_share: float = 0.5, max_probe_rows: int = 1000,
+                 normalizer: NameNormalizer = default_normalizer) -> None:
+        self.prefix_len = prefix_len
+        self.min_share = min_share
+        self.max_probe_rows = max_probe_rows
+        self.normalize = normalizer
+        self.ids = array("q")
+        self.names: List[str] = []
+        self.countries = array("i")
+        self.groups = bytearray()
+        self._exact: Dict[str, int] = {}
+        self._same = array("i")  # previous row with the same normalized name, or -1
+        self._postings: Dict[int, Dict[str, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def keys(self, normalized: str) -> List[str]:
+        """The prefix and trigram posting keys of a normalized name."""
+        return [_PREFIX + normalized[:self.prefix_len], *name_grams(normalized)]
+
+    def add(self, target_id: int, name: Optional[str], country_id: Optional[int] = None,
+            is_group: Optional[bool] = None) -> int:
+        normalized = self.normalize(name) or ""
+        row = len(self.ids)
+        self.ids.append(target_id)
+        self.names.append(normalized)
+        country = _NO_COUNTRY if country_id is None else country_id
+        self.countries.append(country)
+        self.groups.append(_flag(is_group))
+        self._same.append(self._exact.get(normalized, -1))
+        self._exact[normalized] = row
+        partition = self._postings.get(country)
+        if partition is None:
+            partition = self._postings[country] = {}
+        for key in self.keys(normalized):
+            posting = partition.get(key)
+            if posting is None:
+                partition[key] = array("i", (row,))
+            else:
+                posting.append(row)
+        return row
+
+    def build(self, rows: Iterable[Tuple[int, Optional[str], Optional[int], Optional[bool]]]) -> int:
+        """Add (target id, name, country id, is group) rows; returns the index size."""
+        for target_id, name, country_id, is_group in rows:
+            self.add(target_id, name, country_id, is_group)
+        logger.info("Blocking index: %d rows in %d country partitions", len(self.ids), len(self._postings))
+        return len(self.ids)
+
+    def candidates(self, normalized: str, country_id: Optional[int], limit: int = 20) -> List[int]:
+        """
+        Candidate rows for a normalized name: the rows with exactly that name when there are
+        any (a fuzzy candidate never outscores them, see _exact_rows()), else the rows of the
+        query's partitions sharing the most keys.
+        """
+        found = self._exact_rows(normalized, country_id, limit)
+        if found:
+            return found
+        keys = self.keys(normalized)
+        probe = len(keys) - max(1, ceil(self.min_share * len(keys))) + 1
+        partitions = [_NO_COUNTRY] if country_id is None else [country_id, _NO_COUNTRY]
+        read: List[Iterable[int]] = []
+        for country in partitions:
+            partition = self._postings.get(country)
+            if partition is not None:
+                read.extend(self._probe(partition, keys, probe, limit))
+        counts = Counter(chain.from_iterable(read))
+        if len(counts) <= limit:
+            return list(counts)
+        # most shared keys first; ties (common with few keys read) go to the closest length
+        ranked = sorted(counts.items(), key=itemgetter(1), reverse=True)[:limit * 4]
+        size, names = len(normalized), self.names
+        ranked.sort(key=lambda rc: (-rc[1], abs(len(names[rc[0]]) - size)))
+        return [r for r, _ in ranked[:limit]]
+
+    def _exact_rows(self, normalized: str, country_id: Optional[int], limit: int) -> List[int]:
+        """
+        Rows named `normalized`: those of the query's country, then NULL-country ones, and only
+        when there are none, those of other countries. Walks the whole chain of the name, so a
+        common name spread over many countries never crowds out the query's own partition.
+        """
+        country = _NO_COUNTRY if country_id is None else country_id
+        own: List[int] = []
+        unknown: List[int] = []
+        other: List[int] = []
+        row = self._exact.get(normalized, -1)
+        while row >= 0 and len(own) < limit:
+            row_country = self.countries[row]
+            if row_country == country:
+                own.append(row)
+            elif row_country == _NO_COUNTRY:
+                unknown.append(row)
+            elif len(other) < limit:
+                other.append(row)
+            row = self._same[row]
+        return (own + unknown)[:limit] or other
+
+    def _probe(self, partition: Dict[str, array], keys: List[str], probe: int, limit: int) -> List[Iterable[int]]:
+        """The rarest `probe` postings of one partition that fit the read budget."""
+        postings = sorted((p for p in map(partition.get, keys) if p is not None), key=len)[:probe]
+        if not postings:
+            return []
+        if len(postings[0]) > self.max_probe_rows:
+            # only stop-grams: keep the rows sharing the rarest few keys (C-level set ops)
+            pool = set(postings[0])
+            for posting in postings[1:]:
+                narrower = pool.intersection(posting)
+                if len(narrower) < limit:
+                    break
+                pool = narrower
+                if len(pool) <= self.max_probe_rows:
+                    break
+            return [sorted(pool)[:self.max_probe_rows]]
+        budget, read = self.max_probe_rows, []
+        for posting in postings:
+            if len(posting) > budget:
+                break
+            read.append(posting)
+            budget -= len(posting)
+        return read
+
+
+@dataclass
+class MatchResult:
+    source_id: Any
+    decision: str
+    target_id: Optional[int] = None
+    score: float = 0.0
+    reason: Optional[str] = None
+    # (destination id, score), best first
+    candidates: List[Tuple[int, float]] = field(default_factory=list)
+
+
+class CandidateMatcher:
+    """
+    Batch scorer over a BlockingIndex.
+
+    Responsibilities:
+    - rank the candidates of every row of a batch
+    - decide per row: MATCHED (clear winner at or above `accept`), REVIEW (a candidate at or
+      above `review` but weak, ambiguous within `margin`, or the row has no country), NEW
+    - write the REVIEW rows with their top candidates to the ReviewStore, once per batch
+
+    Rows are dicts or objects with `name`, `country_id`, `is_group` and `source_id`.
+    """
+
+    def __init__(self, index: BlockingIndex, review_store: Optional[ReviewStore] = None,
+                 entity: str = "Artist", accept: float = 0.92, review: float = 0.6, margin: float = 0.05,
+                 candidates: int = 10, top_k: int = 5) -> None:
+        self.index = index
+        self.review_store = review_store
+        self.entity = entity
+        self.accept = accept
+        self.review = review
+        self.margin = margin
+        self.candidate_limit = candidates
+        self.top_k = top_k
+
+    def match_batch(self, rows: Sequence[Any], batch_id: Optional[UUID] = None) -> List[MatchResult]:
+        batch_id = batch_id or uuid4()
+        results = [self.match(row) for row in rows]
+        flagged = [ReviewItem(entity=self.entity, batch_id=batch_id,
+                              source_id=None if res.source_id is None else str(res.source_id),
+                              payload=_payload(row), reason=res.reason or "", candidates=res.candidates)
+                   for row, res in zip(rows, results) if res.decision == REVIEW]
+        if flagged and self.review_store is not None:
+            self.review_store.add(flagged)
+        if rows:
+            logger.info("Matched %s batch %s: %d matched, %d to review, %d new", self.entity, batch_id,
+                        sum(r.decision == MATCHED for r in results), len(flagged),
+                        sum(r.decision == NEW for r in results))
+        return results
+
+    def match(self, row: Any) -> MatchResult:
+        get = row.get if isinstance(row, dict) else (lambda f, _d=None: getattr(row, f, None))
+        source_id = get("source_id", None)
+        country_id = get("country_id", None)
+        normalized = self.index.normalize(get("name", None)) or ""
+        scored = self.score(normalized, country_id, get("is_group", None))
+        if not scored or scored[0][1] < self.review:
+            return MatchResult(source_id, NEW, candidates=scored)
+        target, best = scored[0]
+        runner_up = scored[1][1] if len(scored) > 1 else 0.0
+        if best < self.accept:
+            reason = "weak match"
+        elif best - runner_up < self.margin:
+            reason = "ambiguous"
+        elif country_id is None:
+            reason = "no country"
+        else:
+            return MatchResult(source_id, MATCHED, target, best, candidates=scored)
+        return MatchResult(source_id, REVIEW, None, best, reason, scored)
+
+    def score(self, normalized: str, country_id: Optional[int], is_group: Optional[bool]) -> List[Tuple[int, float]]:
+        """Top `top_k` (destination id, score) of the candidates of one row, best first."""
+        index = self.index
+        query = name_grams(normalized)
+        group = _flag(is_group)
+        country = _NO_COUNTRY if country_id is None else country_id
+        scored = []
+        for row in index.candidates(normalized, country_id, self.candidate_limit):
+            name = index.names[row]
+            score = 1.0 if name == normalized else dice(query, name_grams(name))
+            if group != _UNKNOWN and index.groups[row] not in (group, _UNKNOWN):
+                score *= 0.8
+            row_country = index.countries[row]
+            if country != _NO_COUNTRY and row_country not in (country, _NO_COUNTRY):
+                score *= 0.9
+            scored.append((index.ids[row], score))
+        scored.sort(key=lambda c: -c[1])
+        return scored[:self.top_k]
+
+
+def _payload(row: Any) -> Dict[str, Any]:
+    if isinstance(row, dict):
+        return dict(row)
+    if is_dataclass(row):
+        return asdict(row)
+    return dict(vars(row)) if hasattr(row, "__dict__") else {"row": repr(row)}
@@ -1,30 +1,200 @@
 ﻿# python
-from typing import Iterable, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import uuid4
+import logging
+import time
+from core.ports.checkpoint_store import Checkpoint, CheckpointStore
 from core.ports.source_repository import SourceRepository
 from core.ports.destination_repository import DestinationRepository
 from core.ports.mapper import Mapper
 from core.models import Artist
+from core.record_batch import RecordBatch
+from application.services.partitioned import KeyRange
+from application.services.batch_sizing import AdaptiveBatchController
+from application.services.change_detection import ChangeDetector
+from application.services.instrumentation import (
+    EXTRACT, LOAD, TRANSLATE, BatchMetrics, RunHooks, as_hooks, close_batch, record_stage,
+)
+
+logger = logging.getLogger(__name__)
+
+PAGINATION_KEYSET = "keyset"
+PAGINATION_OFFSET = "offset"
 
 class ETLService:
-    def __init__(self, src: SourceRepository, dst: DestinationRepository, mapper: Mapper, batch_size: int = 500):
+    """
+    Artist full-load service.
+
+    pagination:
+    - "keyset" (default): seek on the last seen source id (`key_field` of the raw row), so every
+      page costs the same regardless of how far into the table the run is.
+    - "offset": legacy OFFSET/LIMIT paging; cost grows with the offset.
+
+    change_detector: optional; destination rows whose content hash matches their last committed
+    load are not sent to the destination (returned as the run's skipped count).
+
+    columnar: pages travel as RecordBatches (source -> mapper -> destination) instead of raw
+    dicts, Artist objects and destination dicts, so a page costs a few column buffers rather
+    than three objects per row. Requires keyset pagination.
+
+    batch_sizer: optional AdaptiveBatchController; each page is requested at its current size
+    and reports fetch (extract), mapping (translate) and upsert (load) durations back to it.
+
+    hooks: optional RunHooks receiving one BatchMetrics per page, labelled `entity_name`. The
+    destination reports only inserted + updated, so pages carry rows_loaded, not the split.
+
+    checkpoints: optional CheckpointStore. Every committed page records the last key (and row
+    count, for offset paging) of (entity_name, key range); a run that finds an incomplete
+    checkpoint resumes after it instead of starting over. A run that reaches the end marks the
+    checkpoint completed, so the next full load starts from the beginning again.
+    """
+
+    def __init__(self, src: SourceRepository, dst: DestinationRepository, mapper: Mapper, batch_size: int = 500,
+                 pagination: str = PAGINATION_KEYSET, key_field: str = "id",
+                 change_detector: Optional[ChangeDetector] = None, columnar: bool = False,
+                 batch_sizer: Optional[AdaptiveBatchController] = None,
+                 hooks: Union[None, RunHooks, Sequence[RunHooks]] = None, entity_name: str = "Artist",
+                 checkpoints: Optional[CheckpointStore] = None):
+        if pagination not in (PAGINATION_KEYSET, PAGINATION_OFFSET):
+            raise ValueError(f"Unknown pagination mode: {pagination!r}")
+        if columnar and pagination != PAGINATION_KEYSET:
+            raise ValueError("columnar mode requires keyset pagination")
         self.src = src
         self.dst = dst
         self.mapper = mapper
         self.batch_size = batch_size
+        self.pagination = pagination
+        self.key_field = key_field
+        self.change_detector = change_detector
+        self.columnar = columnar
+        self.batch_sizer = batch_sizer
+        self.hooks = as_hooks(hooks)
+        self.entity_name = entity_name
+        self.checkpoints = checkpoints
 
-    def run_full_load(self) -> None:
+    def run_full_load(self, key_range: Optional[KeyRange] = None) -> int:
+        """
+        Load every artist, or only ids in `key_range` (keyset mode only). Restricting each
+        instance to one range lets PartitionedRunner drive several services concurrently.
+        Returns the number of rows skipped as unchanged.
+        """
+        if key_range is not None and self.pagination != PAGINATION_KEYSET:
+            raise ValueError("key_range requires keyset pagination")
         offset = 0
+        last_key: Optional[Any] = key_range.lo - 1 if key_range is not None else None
+        before_id = key_range.hi if key_range is not None else None
+        partition = key_range.name if key_range is not None else ""
+        resumed = self._resume_point(partition)
+        if resumed is not None:
+            offset = resumed.rows
+            if resumed.last_key is not None:
+                last_key = resumed.last_key
+        skipped = 0
+        batch_number = 0
         while True:
-            rows = list(self.src.fetch_artists_batch(offset, self.batch_size))
-            if not rows:
+            limit = self.batch_sizer.batch_size if self.batch_sizer is not None else self.batch_size
+            metrics = BatchMetrics(uuid4(), self.entity_name, batch_number + 1)
+            page: Any
+            if self.columnar:
+                page = self.src.fetch_artist_columns_after(last_key, limit, before_id=before_id)
+            elif self.pagination == PAGINATION_KEYSET:
+                page = list(self.src.fetch_artists_after(last_key, limit, before_id=before_id))
+            else:
+                page = list(self.src.fetch_artists_batch(offset, limit))
+            if not len(page):
                 break
-            domain_objs: List[Artist] = [self.mapper.map_source_artist_to_domain(r) for r in rows]
-            dest_rows = [self.mapper.map_artist_to_destination(a) for a in domain_objs]
+            batch_number += 1
+            metrics.rows_extracted = len(page)
+            if self.hooks is not None:
+                self.hooks.batch_started(metrics)
+            record_stage(self.hooks, metrics, EXTRACT, metrics.perf_start, len(page))
+            offset += len(page)
+            last_key = page[self.key_field][len(page) - 1] if self.columnar else page[-1][self.key_field]
+            checkpoint = None
+            if self.checkpoints is not None:
+                checkpoint = Checkpoint(self.entity_name, partition, last_key=last_key,
+                                        batch_id=metrics.batch_id, rows=offset)
+            skipped += self._load_page(page, metrics, checkpoint)
+        if self.checkpoints is not None:
+            self._save_checkpoint(Checkpoint(self.entity_name, partition, last_key=last_key, rows=offset,
+                                             completed=True))
+        if skipped:
+            logger.info("Artist load skipped %d unchanged rows", skipped)
+        return skipped
+
+    def _resume_point(self, partition: str) -> Optional[Checkpoint]:
+        if self.checkpoints is None:
+            return None
+        checkpoint = self.checkpoints.load(self.entity_name, partition)
+        if checkpoint is None or checkpoint.completed:
+            return None
+        logger.info("Resuming %s%s after key %s (%d rows already committed, batch %s)",
+                    self.entity_name, f" [{partition}]" if partition else "", checkpoint.last_key,
+                    checkpoint.rows, checkpoint.batch_id)
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Checkpoint) -> None:
+        """Save outside a batch; a store that joins transactions gets one of its own."""
+        if self.checkpoints.manage_transaction:
+            self.checkpoints.save(checkpoint)
+            return
+        try:
+            self.dst.begin_transaction()
+            self.checkpoints.save(checkpoint)
+            self.dst.commit()
+        except Exception:
+            self.dst.rollback()
+            raise
+
+    def _load_page(self, page: Any, metrics: BatchMetrics, checkpoint: Optional[Checkpoint] = None) -> int:
+        """Map and upsert one page; returns the rows skipped as unchanged."""
+        try:
+            started = time.perf_counter()
+            dest_rows = self._map_batch(page) if self.columnar else self._map_rows(page)
+            metrics.rows_translated = len(dest_rows)
+            record_stage(self.hooks, metrics, TRANSLATE, started, metrics.rows_translated)
+            started = time.perf_counter()
+            metrics.rows_skipped, metrics.rows_loaded = self._upsert(dest_rows, checkpoint)
+            record_stage(self.hooks, metrics, LOAD, started, metrics.rows_translated)
+        except BaseException as ex:
+            close_batch(self.hooks, metrics, ex)
+            raise
+        close_batch(self.hooks, metrics, batch_sizer=self.batch_sizer)
+        return metrics.rows_skipped
+
+    def _map_rows(self, rows: List[Dict[str, Any]]) -> Any:
+        domain_objs: List[Artist] = [self.mapper.map_source_artist_to_domain(r) for r in rows]
+        return self.mapper.map_artists_to_destination(domain_objs)
+
+    def _map_batch(self, batch: RecordBatch) -> Any:
+        return self.mapper.map_batch_to_destination(batch)
+
+    def _upsert(self, dest_rows: Any, checkpoint: Optional[Checkpoint] = None) -> Tuple[int, int]:
+        """
+        Upsert in one transaction; returns (rows skipped as unchanged, rows inserted or updated).
+
+        The checkpoint is saved inside the transaction when the store joins it, otherwise right
+        after the commit - never before the rows it covers are durable.
+        """
+        changes = self.change_detector.filter(dest_rows) if self.change_detector is not None else None
+        if changes is not None:
+            dest_rows = changes.changed
+        in_transaction = checkpoint is not None and not self.checkpoints.manage_transaction
+        loaded = 0
+        if len(dest_rows) or in_transaction:
             try:
                 self.dst.begin_transaction()
-                self.dst.upsert_artists(dest_rows)
+                if len(dest_rows):
+                    loaded = self.dst.upsert_artists(dest_rows) or 0
+                if in_transaction:
+                    self.checkpoints.save(checkpoint)
                 self.dst.commit()
             except Exception:
                 self.dst.rollback()
                 raise
-            offset += len(rows)
+        if checkpoint is not None and not in_transaction:
+            self.checkpoints.save(checkpoint)
+        if changes is None:
+            return 0, loaded
+        self.change_detector.commit(changes)
+        return changes.skipped, loaded
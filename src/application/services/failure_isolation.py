@@ -0,0 +1,213 @@
+# python
+# file: src/application/services/failure_isolation.py
+
+"""
+Load failure isolation (U09): backoff retries for transient errors, then batch bisection.
+
+A batch whose load still fails after its retries is split in halves that are loaded on their
+own; failing halves are split again, down to single rows. Good halves commit as they succeed
+and each row that fails alone goes to the QuarantineStore with its error and batch_id, so one
+poison row costs about 2 * log2(batch size) extra loads instead of the whole run.
+
+Bisection relies on loads being idempotent per row (the loaders MERGE on the natural key):
+rows of a half that committed before the batch is given up on are simply merged again when
+the batch is replayed.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import logging
+import random
+import threading
+import time
+
+from core.ports.etl_ports import LoadResult
+from core.ports.quarantine_store import QuarantinedRow, QuarantineStore
+from core.record_batch import RecordBatch
+from application.services.change_detection import row_fields, source_id_of
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATEs worth retrying: serialization failure / deadlock victim, timeouts, lost connections
+TRANSIENT_SQLSTATES = frozenset({"40001", "40P01", "HYT00", "HYT01", "08001", "08004", "08006", "08S01"})
+# DB-API classes that signal an operational rather than a data problem
+TRANSIENT_ERROR_NAMES = frozenset({"OperationalError", "InterfaceError"})
+
+LoadFn = Callable[[Any, UUID], LoadResult]
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Best-effort classification of an error as transient (worth retrying as-is)."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # psycopg exposes sqlstate / pgcode, pyodbc puts the SQLSTATE first in args
+    state = getattr(exc, "sqlstate", None) or getattr(exc, "pgcode", None)
+    if state is None and exc.args and isinstance(exc.args[0], str):
+        state = exc.args[0]
+    if state in TRANSIENT_SQLSTATES:
+        return True
+    if "deadlock" in str(exc).lower():  # SQL Server 1205 is not always reported with its SQLSTATE
+        return True
+    return type(exc).__name__ in TRANSIENT_ERROR_NAMES
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter for transient errors; other errors are raised at once.
+
+    The n-th retry waits base_delay_s * multiplier ** (n - 1), capped at max_delay_s and
+    spread by +/- jitter so parallel pipelines do not retry in lockstep.
+    """
+    max_retries: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+    transient: Callable[[BaseException], bool] = is_transient
+    sleep: Callable[[float], None] = time.sleep
+
+    def delay(self, retry: int) -> float:
+        base = min(self.max_delay_s, self.base_delay_s * self.multiplier ** (retry - 1))
+        return base * (1 + self.jitter * (2 * random.random() - 1)) if self.jitter else base
+
+    def call(self, fn: LoadFn, items: Any, batch_id: UUID) -> LoadResult:
+        retry = 0
+        while True:
+            try:
+                return fn(items, batch_id)
+            except Exception as ex:
+                if retry >= self.max_retries or not self.transient(ex):
+                    raise
+                retry += 1
+                wait = self.delay(retry)
+                logger.warning("Transient load error for batch %s (%d rows), retry %d/%d in %.2fs: %s",
+                               batch_id, len(items), retry, self.max_retries, wait, ex)
+                self.sleep(wait)
+
+
+class QuarantineLimitExceeded(RuntimeError):
+    """More rows of a batch failed than bisection may quarantine; the failure looks systemic."""
+
+
+class FailureIsolation:
+    """
+    Retry, then bisect a failing batch and quarantine the rows that fail on their own.
+
+    Responsibilities:
+    - retry each load (the batch, then every half) with the RetryPolicy
+    - split failing chunks recursively and merge the LoadResults of the chunks that committed
+    - write the failing rows with error detail and batch_id to the QuarantineStore
+    - give up (QuarantineLimitExceeded, nothing quarantined) once more than
+      max_quarantine_ratio of a batch has failed: a missing table or a dead server is not a
+      poison row, and bisecting it would only multiply the round-trips. Rows are isolated
+      depth-first, so a systemic failure costs about 2 * ratio * batch size loads before
+      the batch is given up on.
+
+    The returned LoadResult lists the quarantined rows in `errors` (so run metrics count them)
+    and their source ids in `quarantined`.
+    """
+
+    def __init__(self, quarantine: QuarantineStore, entity: str, retry: Optional[RetryPolicy] = None,
+                 max_quarantine_ratio: float = 0.1) -> None:
+        if not 0 < max_quarantine_ratio <= 1:
+            raise ValueError("max_quarantine_ratio must be in (0, 1]")
+        self.quarantine = quarantine
+        self.entity = entity
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.max_quarantine_ratio = max_quarantine_ratio
+
+    def load(self, items: Any, batch_id: UUID, load_fn: LoadFn) -> LoadResult:
+        try:
+            return self.retry.call(load_fn, items, batch_id)
+        except Exception as ex:
+            if not len(items):
+                raise
+            logger.warning("Load of batch %s failed (%s: %s); bisecting %d rows",
+                           batch_id, type(ex).__name__, ex, len(items))
+            first_error = ex
+        limit = max(1, int(len(items) * self.max_quarantine_ratio))
+        loaded: List[LoadResult] = []
+        failed: List[Tuple[Any, BaseException]] = []
+        loads = self._bisect(items, batch_id, load_fn, first_error, loaded, failed, limit)
+        if len(failed) > limit:
+            raise QuarantineLimitExceeded(
+                f"batch {batch_id}: more than {limit} of {len(items)} rows fail to load; last error: "
+                f"{type(failed[-1][1]).__name__}: {failed[-1][1]}") from first_error
+        rows = [self._quarantined(row, batch_id, error) for row, error in failed]
+        self.quarantine.add(rows)
+        logger.warning("Batch %s: quarantined %d of %d rows after %d extra loads",
+                       batch_id, len(rows), len(items), loads)
+        return self._merge(loaded, rows)
+
+    def _bisect(self, items: Any, batch_id: UUID, load_fn: LoadFn, error: BaseException,
+                loaded: List[LoadResult], failed: List[Tuple[Any, BaseException]], limit: int) -> int:
+        """Isolate the failing rows of a chunk known to fail; returns the number of loads issued."""
+        if len(items) == 1:
+            failed.append((_single_row(items), error))
+            return 0
+        mid = len(items) // 2
+        loads = 0
+        for half in (_slice(items, 0, mid), _slice(items, mid, len(items))):
+            if len(failed) > limit:
+                break
+            loads += 1
+            try:
+                loaded.append(self.retry.call(load_fn, half, batch_id))
+            except Exception as ex:
+                loads += self._bisect(half, batch_id, load_fn, ex, loaded, failed, limit)
+        return loads
+
+    def _quarantined(self, row: Any, batch_id: UUID, error: BaseException) -> QuarantinedRow:
+        return QuarantinedRow(
+            entity=self.entity, batch_id=batch_id, source_id=source_id_of(row), payload=row_fields(row),
+            error_type=type(error).__name__, error_message=str(error), quarantined_at=datetime.now(timezone.utc))
+
+    @staticmethod
+    def _merge(results: Sequence[LoadResult], quarantined: Sequence[QuarantinedRow]) -> LoadResult:
+        merged = LoadResult(inserted=0, updated=0, errors=[])
+        for r in results:
+            merged.inserted += r.inserted
+            merged.updated += r.updated
+            merged.skipped += r.skipped
+            merged.deleted += r.deleted
+            merged.errors.extend(r.errors)
+            merged.ids.update(r.ids)
+            merged.rows.extend(r.rows)
+            merged.source_ids.update(r.source_ids)
+            merged.quarantined.extend(r.quarantined)
+        for q in quarantined:
+            merged.errors.append({"source_id": q.source_id, "error": f"{q.error_type}: {q.error_message}",
+                                  "quarantined": True})
+            if q.source_id is not None:
+                merged.quarantined.append(q.source_id)
+        return merged
+
+
+def _slice(items: Any, start: int, stop: int) -> Any:
+    return items.slice(start, stop) if isinstance(items, RecordBatch) else items[start:stop]
+
+
+def _single_row(items: Any) -> Any:
+    return items.row(0) if isinstance(items, RecordBatch) else items[0]
+
+
+class InMemoryQuarantineStore(QuarantineStore):
+    """Process-local QuarantineStore for tests and dry runs."""
+
+    def __init__(self) -> None:
+        self.rows: List[QuarantinedRow] = []
+        self._lock = threading.Lock()
+
+    def add(self, rows: Sequence[QuarantinedRow]) -> None:
+        with self._lock:
+            for row in rows:
+                row.quarantine_id = len(self.rows) + 1
+                self.rows.append(row)
+
+    def pending(self, entity: str, limit: int = 1000) -> List[QuarantinedRow]:
+        with self._lock:
+            return [r for r in self.rows if r.entity == entity][:limit]
@@ -0,0 +1,291 @@
+# python
+# file: src/application/services/fan_out.py
+
+"""
+Single-scan fan-out extraction: one source table feeding several entity pipelines.
+
+Artist, ArtistGenre, Identifier and ArtistMembership rows all derive from the MB artist rows
+and their relations; with one Orchestrator per entity the same source tables are scanned once
+per entity. FanOutExtractor scans the source once, on its own thread, and routes every page to
+each registered route - the rows as they are, or child rows derived from them - through a
+bounded queue per route. A route is the Extractor of its own Orchestrator, so each pipeline
+keeps its translator, loader, commits and watermark:
+
+- every routed page is tagged with the source cursor it ends at; a pipeline whose cursor is
+  already past a page (it got further in an earlier run) skips it, so the scan starts at the
+  oldest cursor of the routes (`since` of run()) and each pipeline resumes where it stopped,
+- a route registered with `after=` hands out a page only once the upstream route's pipeline
+  has loaded every row routed to it up to that page (counted by the upstream route's
+  `progress` hook), which keeps FK order between pipelines that run concurrently,
+- each queue holds `queue_depth` pages, so the slowest pipeline throttles the scan.
+
+Pages are sized by the scan (`batch_size` source rows), not by the downstream `limit`; give
+the pipelines a batch_size of at least the largest routed page or a MemoryBudget to chunk it.
+Derived rows must keep the source_updated_at / source_id of the row they come from through
+translation, as every translated row does, so that each pipeline's watermark follows the scan.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+import logging
+import queue
+import threading
+import time
+
+from core.ports.etl_ports import Extractor
+from core.watermark import Watermark, since_for, sort_key
+from application.services.instrumentation import SUCCEEDED as BATCH_SUCCEEDED, BatchMetrics, RunHooks
+from application.services.scheduler import FAILED, SUCCEEDED, NodeResult, ScheduleReport
+
+logger = logging.getLogger(__name__)
+
+# end-of-scan marker in a route queue
+_END = object()
+# how often blocked scan / route threads re-check for cancellation (seconds)
+_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class _RoutedPage:
+    rows: List[Any]
+    # cursor of the last source row of the page
+    end: Watermark
+    # rows routed to the `after` route up to and including this page
+    upstream_rows: int = 0
+
+
+class RouteProgress(RunHooks):
+    """Counts the rows a route's pipeline has loaded; add it to that pipeline's hooks."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.finished = False
+        self._changed = threading.Condition()
+
+    def batch_finished(self, batch: BatchMetrics) -> None:
+        if batch.status == BATCH_SUCCEEDED:
+            self.advance(batch.rows_extracted)
+
+    def advance(self, rows: int) -> None:
+        with self._changed:
+            self.rows += rows
+            self._changed.notify_all()
+
+    def finish(self) -> None:
+        with self._changed:
+            self.finished = True
+            self._changed.notify_all()
+
+    def wait_for(self, rows: int, cancelled: threading.Event) -> bool:
+        """Wait until `rows` rows are loaded; False if the pipeline finished (or was cancelled) first."""
+        with self._changed:
+            while self.rows < rows:
+                if self.finished or cancelled.is_set():
+                    return False
+                self._changed.wait(_POLL_INTERVAL)
+            return True
+
+
+class QueueExtractor:
+    """
+    Extractor of one fan-out route: hands out, in scan order, the pages routed to it.
+
+    Returns no rows once the scan is complete; raises when the scan failed or the upstream
+    route stopped before loading the rows a page depends on.
+    """
+
+    # pages come whole from the scan and must not be cut to `limit`
+    seeks_watermark = False
+
+    def __init__(self, fan: "FanOutExtractor", name: str, derive: Optional[Callable[[List[Any]], Iterable[Any]]],
+                 after: Optional["QueueExtractor"], queue_depth: int) -> None:
+        self.fan = fan
+        self.name = name
+        self.derive = derive
+        self.after = after
+        self.progress = RouteProgress()
+        self.closed = threading.Event()
+        self.pages = 0
+        self.rows = 0
+        self.skipped_pages = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._ended = False
+
+    def extract_batch(self, since: Union[None, datetime, Watermark], limit: int) -> List[Any]:
+        since = Watermark.coerce(since)
+        while not self._ended:
+            page = self._queue.get()
+            if page is _END:
+                self._ended = True
+                break
+            if _behind(page.end, since):
+                # loaded by an earlier run of this pipeline
+                self.skipped_pages += 1
+                self.progress.advance(len(page.rows))
+                continue
+            if self.after is not None and not self.after.progress.wait_for(page.upstream_rows, self.closed):
+                raise RuntimeError(f"Fan-out route {self.name}: upstream route {self.after.name} stopped "
+                                   f"before loading the rows up to {page.end}")
+            self.pages += 1
+            self.rows += len(page.rows)
+            return page.rows
+        if self.fan.error is not None:
+            raise RuntimeError(f"Fan-out scan failed: {self.fan.error}") from self.fan.error
+        return []
+
+    def close(self) -> None:
+        """The route's pipeline stopped: the scan drops its pages from now on."""
+        self.closed.set()
+        self.progress.finish()
+        # unblock a scan waiting on a full queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _put(self, item: Any, stop: threading.Event) -> bool:
+        while not (self.closed.is_set() or stop.is_set()):
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def _behind(end: Watermark, since: Optional[Watermark]) -> bool:
+    if since is None:
+        return False
+    if since.source_id is None:
+        # a timestamp-only cursor may sit before some rows of its own timestamp
+        return end.source_updated_at < since.source_updated_at
+    return end <= since
+
+
+class FanOutExtractor:
+    """
+    One scan of a source Extractor feeding several pipelines.
+
+    Responsibilities:
+    - page through the source once, on its own thread, seeking on the (`ts_field`, `id_field`)
+      cursor of the rows it has read
+    - route every page to each registered route, as-is or through the route's `derive`
+    - run the routes' pipelines concurrently (run()) and report them like DagScheduler nodes
+
+    Routes are registered before run(); a route's `after` must be registered before it.
+    """
+
+    def __init__(self, source: Extractor[Any], batch_size: int = 5000, queue_depth: int = 4,
+                 ts_field: str = "last_updated", id_field: str = "id") -> None:
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be >= 1")
+        self.source = source
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
+        self.ts_field = ts_field
+        self.id_field = id_field
+        self.routes: Dict[str, QueueExtractor] = {}
+        self.error: Optional[BaseException] = None
+        self.pages = 0
+        self.rows = 0
+        self._stop = threading.Event()
+
+    def route(self, name: str, derive: Optional[Callable[[List[Any]], Iterable[Any]]] = None,
+              after: Optional[str] = None) -> QueueExtractor:
+        """
+        Register a route: its pages are the scanned pages, or `derive(page)` for child rows.
+        With `after`, its pages wait until that route's pipeline loaded up to them.
+        """
+        if name in self.routes:
+            raise ValueError(f"Duplicate fan-out route: {name}")
+        if after is not None and after not in self.routes:
+            raise ValueError(f"Fan-out route {name} is after unknown route {after}")
+        route = QueueExtractor(self, name, derive, self.routes.get(after) if after else None, self.queue_depth)
+        self.routes[name] = route
+        return route
+
+    def run(self, pipelines: Mapping[str, Callable[[], Any]],
+            since: Union[None, datetime, Watermark] = None) -> ScheduleReport:
+        """
+        Scan from `since` (the oldest cursor of the routes' pipelines) and run the pipeline of
+        every route concurrently, e.g. `lambda: orchestrator.run_incremental(...)`. Raises the
+        first failure once everything stopped.
+        """
+        if set(pipelines) != set(self.routes):
+            raise ValueError(f"Pipelines {sorted(pipelines)} do not match the routes {sorted(self.routes)}")
+        t0 = time.monotonic()
+        results: Dict[str, NodeResult] = {}
+        self.error = None
+        self._stop.clear()
+        scan = threading.Thread(target=self._scan, args=(Watermark.coerce(since),), name="fanout-scan", daemon=True)
+        scan.start()
+
+        def run_route(name: str) -> None:
+            result = results[name] = NodeResult(name, "running", started_s=time.monotonic() - t0)
+            try:
+                pipelines[name]()
+                result.status = SUCCEEDED
+            except BaseException as ex:
+                logger.error("Fan-out pipeline %s failed: %s", name, ex)
+                result.status, result.error = FAILED, ex
+            finally:
+                result.finished_s = time.monotonic() - t0
+                self.routes[name].close()
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.routes), thread_name_prefix="fanout") as pool:
+                for name in self.routes:
+                    pool.submit(run_route, name)
+        finally:
+            self._stop.set()
+            scan.join()
+        report = ScheduleReport(results=results, wall_s=time.monotonic() - t0)
+        logger.info("Fan-out scan: %d pages, %d source rows for %d routes (%s)\n%s", self.pages, self.rows,
+                    len(self.routes), ", ".join(f"{r.name}: {r.rows} rows, {r.skipped_pages} pages skipped"
+                                                for r in self.routes.values()), report.summary())
+        if self.error is not None:
+            raise self.error
+        for result in results.values():
+            if result.error is not None:
+                raise result.error
+        return report
+
+    def _scan(self, cursor: Optional[Watermark]) -> None:
+        routed = {name: 0 for name in self.routes}
+        try:
+            while not self._stop.is_set() and not all(r.closed.is_set() for r in self.routes.values()):
+                page = list(self.source.extract_batch(since=since_for(self.source, cursor), limit=self.batch_size))
+                if not page:
+                    break
+                end = self._page_end(page)
+                if end is None or (cursor is not None and end <= cursor):
+                    logger.warning("Fan-out scan cursor did not advance past %s; stopping.", cursor)
+                    break
+                self.pages += 1
+                self.rows += len(page)
+                for name, route in self.routes.items():
+                    rows = page if route.derive is None else list(route.derive(page))
+                    routed[name] += len(rows)
+                    if rows and not route.closed.is_set():
+                        upstream = routed[route.after.name] if route.after is not None else 0
+                        route._put(_RoutedPage(rows, end, upstream), self._stop)
+                cursor = end
+        except BaseException as ex:
+            logger.exception("Fan-out scan failed: %s", ex)
+            self.error = ex
+        finally:
+            for route in self.routes.values():
+                route._put(_END, self._stop)
+
+    def _page_end(self, page: List[Any]) -> Optional[Watermark]:
+        ts_field, id_field = self.ts_field, self.id_field
+        if isinstance(page[0], dict):
+            pairs = ((r.get(ts_field), r.get(id_field)) for r in page)
+        else:
+            pairs = ((getattr(r, ts_field, None), getattr(r, id_field, None)) for r in page)
+        best = max((p for p in pairs if p[0] is not None), key=lambda p: sort_key(*p), default=None)
+        return Watermark(*best) if best is not None else None
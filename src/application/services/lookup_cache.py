@@ -0,0 +1,192 @@
+# python
+# file: src/application/services/lookup_cache.py
+
+"""
+Run-wide natural key -> identity id cache for the lookup tables (U01 postconditions).
+
+Entity loads (U02-U05) resolve country codes, artist types, genres, labels and formats for
+every row. Instead of per-row SELECTs or joins, the cache is filled once per run by a bulk
+preload (one query per table), kept current from the rows that MERGE loaders return - every
+index of the loaded table, so a Country MERGE also refreshes the CountryCode index - and
+resolves whole columns of keys at once.
+
+String keys are compared on core.normalization.normalize_name (trimmed, whitespace-collapsed,
+Latin diacritics stripped, casefolded), the key translators emit and the MERGE loaders match
+on, so a name resolves to the same row here as in the MERGE.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import logging
+import threading
+
+from core.ports.etl_ports import LoadResult
+from core.ports.lookup_source import LookupSource
+from core.normalization import default_normalizer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LookupIndex:
+    """One cached mapping: `key_columns` of `table` -> identity id, addressed by `name`."""
+    table: str
+    key_columns: Tuple[str, ...]
+    name: str = ""
+
+    @property
+    def index_name(self) -> str:
+        return self.name or self.table
+
+
+# The default index of each table uses the table's MERGE natural key, so LoadResult.ids from
+# its loader can be applied directly. Country is also indexed by ISO code for entity mapping.
+DEFAULT_INDEXES: Tuple[LookupIndex, ...] = (
+    LookupIndex("Country", ("Name",)),
+    LookupIndex("Country", ("CountryCode",), name="CountryCode"),
+    LookupIndex("ArtistType", ("Name",)),
+    LookupIndex("Genre", ("Name",)),
+    LookupIndex("Label", ("Name", "CountryId")),
+    LookupIndex("MediumFormat", ("Name",)),
+    LookupIndex("Tag", ("Name",)),
+    LookupIndex("Website", ("Name",)),
+)
+
+
+@dataclass
+class LookupStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class Resolution:
+    """Result of resolve_many: ids aligned with the input keys (None = miss), distinct misses."""
+    ids: List[Optional[int]]
+    misses: List[Any]
+
+
+def normalize_key(key: Any) -> Any:
+    if isinstance(key, str):
+        return default_normalizer(key)
+    if isinstance(key, tuple):
+        return tuple(normalize_key(k) for k in key)
+    return key
+
+
+class LookupCache:
+    """
+    In-process lookup id cache shared by every pipeline of one ETL run.
+
+    Thread-safe for concurrent readers and writers (partitioned / pipelined runs). Lookups of
+    None (e.g. an artist without a country) resolve to None and are not counted as misses.
+    """
+
+    def __init__(self, indexes: Sequence[LookupIndex] = DEFAULT_INDEXES) -> None:
+        self._indexes: Dict[str, LookupIndex] = {ix.index_name: ix for ix in indexes}
+        self._maps: Dict[str, Dict[Any, int]] = {name: {} for name in self._indexes}
+        self._stats: Dict[str, LookupStats] = {name: LookupStats() for name in self._indexes}
+        self._lock = threading.Lock()
+
+    def preload(self, source: LookupSource, tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Bulk-load every index of the given tables (default: all) with one query per table."""
+        by_table: Dict[str, List[LookupIndex]] = {}
+        for ix in self._indexes.values():
+            if tables is None or ix.table in tables:
+                by_table.setdefault(ix.table, []).append(ix)
+        loaded: Dict[str, int] = {}
+        for table, indexes in by_table.items():
+            columns: List[str] = []
+            for ix in indexes:
+                columns.extend(c for c in ix.key_columns if c not in columns)
+            rows = list(source.fetch_lookup_ids(table, columns))
+            for ix in indexes:
+                positions = [columns.index(c) for c in ix.key_columns]
+                entries = {}
+                for row in rows:
+                    key = tuple(row[p] for p in positions)
+                    if all(k is None for k in key):
+                        continue
+                    entries[normalize_key(key[0] if len(key) == 1 else key)] = row[-1]
+                with self._lock:
+                    self._maps[ix.index_name] = entries
+                loaded[ix.index_name] = len(entries)
+            logger.info("Preloaded lookup %s: %d rows", table, len(rows))
+        return loaded
+
+    def update(self, index: str, ids: Mapping[Any, int]) -> None:
+        """Add or replace key -> id entries, e.g. the OUTPUT ids of a lookup MERGE."""
+        entries = {normalize_key(k): v for k, v in ids.items()}
+        with self._lock:
+            self._maps[self._require(index)].update(entries)
+
+    def update_from_result(self, index: str, result: LoadResult) -> None:
+        """
+        Apply the result of a MERGE into the table of `index`: every index of that table whose
+        key columns the OUTPUT rows (LoadResult.rows) carry is refreshed from them; `index`
+        itself falls back to LoadResult.ids when they do not.
+        """
+        table = self._indexes[self._require(index)].table
+        returned = result.rows[0][0].keys() if result.rows else ()
+        updates: Dict[str, Dict[Any, int]] = {}
+        for ix in self._indexes.values():
+            if ix.table != table:
+                continue
+            if returned and all(c in returned for c in ix.key_columns):
+                entries = {}
+                for values, identity in result.rows:
+                    key = tuple(values[c] for c in ix.key_columns)
+                    if all(k is None for k in key):
+                        continue
+                    entries[normalize_key(key[0] if len(key) == 1 else key)] = identity
+                updates[ix.index_name] = entries
+            elif ix.index_name == index and result.ids:
+                updates[index] = {normalize_key(k): v for k, v in result.ids.items()}
+        with self._lock:
+            for name, entries in updates.items():
+                self._maps[name].update(entries)
+
+    def resolve(self, index: str, key: Any) -> Optional[int]:
+        return self.resolve_many(index, [key]).ids[0]
+
+    def resolve_many(self, index: str, keys: Iterable[Any]) -> Resolution:
+        """Resolve a column of keys in one pass; unresolved keys are reported once each."""
+        mapping = self._maps[self._require(index)]
+        ids: List[Optional[int]] = []
+        misses: Dict[Any, None] = {}
+        hits = missed = 0
+        get = mapping.get
+        for key in keys:
+            if key is None:
+                ids.append(None)
+                continue
+            found = get(normalize_key(key))
+            ids.append(found)
+            if found is None:
+                missed += 1
+                misses.setdefault(key)
+            else:
+                hits += 1
+        with self._lock:
+            stats = self._stats[index]
+            stats.hits += hits
+            stats.misses += missed
+        return Resolution(ids=ids, misses=list(misses))
+
+    def stats(self) -> Dict[str, LookupStats]:
+        with self._lock:
+            return {name: LookupStats(s.hits, s.misses) for name, s in self._stats.items()}
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._maps.values())
+
+    def _require(self, index: str) -> str:
+        if index not in self._indexes:
+            raise KeyError(f"Unknown lookup index: {index}")
+        return index
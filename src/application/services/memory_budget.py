@@ -0,0 +1,250 @@
+# python
+# file: src/application/services/memory_budget.py
+
+"""
+Memory budget for the batches an Orchestrator run holds in flight (backpressure and spill).
+
+Unbounded, a run holds whatever the extractor returns - more than `limit` rows for extractors
+that ignore it, or a page of very wide rows - plus its translated copy, and nothing stops it
+short of an OOM. With a MemoryBudget the orchestrator consumes extractor output as a stream,
+cut into chunks of at most `limit` rows and `chunk_bytes`, and accounts the estimated
+resident size of every chunk from extraction to the end of its load:
+
+- a chunk is reserved for its footprint: its own size plus that of its translation, scaled
+  by the translated / extracted size ratio observed so far (footprint(), translated()),
+- the extract side reserves without waiting (try_reserve); a chunk that does not fit is
+  pickled to a local spill file instead of growing the heap. While a spilled chunk waits to be
+  read back, later chunks are spilled as well, so chunks stay in order and the one at the head
+  of the queue never waits for bytes held behind it,
+- the stage that needs a spilled chunk back waits until enough bytes are released (reserve),
+  which is the backpressure on the stages upstream of it,
+- a reservation is granted whenever nothing else is in flight, so a chunk larger than the
+  budget on its own still makes progress rather than deadlocking.
+
+Peak in-flight bytes, spills and the time spent waiting are reported per run (MemoryReport).
+Sizes are estimates (sys.getsizeof of a sample of rows and their values), not RSS.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Iterable, Iterator, List, Optional
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from core.record_batch import RecordBatch
+from application.services.streaming_join import row_bytes
+
+logger = logging.getLogger(__name__)
+
+# rows sized per estimate; evenly spread over the batch
+_SAMPLE_ROWS = 32
+# while chunking a stream, re-measure the row size every this many rows
+_SAMPLE_EVERY = 64
+# how often a blocked reserve() re-checks its stop event (seconds)
+_POLL_INTERVAL = 0.05
+
+
+def _object_bytes(row: Any) -> int:
+    if isinstance(row, (dict, tuple, list)):
+        return row_bytes(row)
+    if is_dataclass(row):
+        return sys.getsizeof(row) + sum(sys.getsizeof(getattr(row, f.name)) for f in fields(row))
+    if hasattr(row, "__dict__"):
+        return sys.getsizeof(row) + row_bytes(vars(row))
+    return sys.getsizeof(row)
+
+
+def estimate_bytes(items: Any) -> int:
+    """Approximate resident size of a batch: a list of rows, or a RecordBatch."""
+    if isinstance(items, RecordBatch):
+        total = 0
+        for name in items.names:
+            column = items[name]
+            data = column.data
+            total += sys.getsizeof(data) + (sys.getsizeof(column.nulls) if column.nulls is not None else 0)
+            if isinstance(data, list) and data:
+                step = max(1, len(data) // _SAMPLE_ROWS)
+                sample = data[::step]
+                total += sum(map(sys.getsizeof, sample)) * len(data) // len(sample)
+        return total
+    count = len(items)
+    if not count:
+        return sys.getsizeof(items)
+    step = max(1, count // _SAMPLE_ROWS)
+    sample = items[::step]
+    return sys.getsizeof(items) + sum(map(_object_bytes, sample)) * count // len(sample)
+
+
+@dataclass
+class MemoryReport:
+    """Memory accounting of one run."""
+    budget_bytes: int
+    peak_bytes: int = 0
+    spilled_chunks: int = 0
+    spilled_rows: int = 0
+    spilled_bytes: int = 0
+    # time stages spent waiting for the budget
+    blocked_s: float = 0.0
+    # reservations granted beyond the budget because nothing else was in flight
+    oversized_chunks: int = 0
+
+
+@dataclass
+class SpilledChunk:
+    """A chunk pickled to a spill file; MemoryBudget.restore() reads it back and deletes the file."""
+    path: str
+    rows: int
+    nbytes: int
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def load(self) -> Any:
+        with open(self.path, "rb") as f:
+            items = pickle.load(f)
+        os.remove(self.path)
+        return items
+
+
+class MemoryBudget:
+    """
+    Byte budget shared by the stages of one run.
+
+    Responsibilities:
+    - account reservations against `budget_bytes` and track the peak (thread-safe)
+    - grant or refuse reservations immediately (try_reserve) or wait for releases (reserve)
+    - spill chunks to a private temp directory under `spill_dir`, removed by close()
+
+    `chunk_bytes` (default a quarter of the budget) bounds the chunks the orchestrator cuts
+    extractor output into. Reusable across runs: start_run() resets the report.
+    """
+
+    def __init__(self, budget_bytes: int, spill_dir: Optional[str] = None, chunk_bytes: Optional[int] = None) -> None:
+        if budget_bytes <= 0:
+            raise ValueError("budget_bytes must be positive")
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.chunk_bytes = chunk_bytes or max(1, budget_bytes // 4)
+        self.in_flight = 0
+        # translated / extracted bytes of the last chunk translated
+        self.expansion = 1.0
+        self.pending_spills = 0
+        self.report = MemoryReport(budget_bytes)
+        self._changed = threading.Condition()
+        self._tmpdir: Optional[str] = None
+
+    def start_run(self) -> MemoryReport:
+        with self._changed:
+            self.in_flight = 0
+            self.expansion = 1.0
+            self.pending_spills = 0
+            self.report = MemoryReport(self.budget_bytes)
+            return self.report
+
+    def footprint(self, nbytes: int) -> int:
+        """Bytes to reserve for an extracted chunk of `nbytes`: the chunk plus its translation."""
+        return int(nbytes * (1.0 + self.expansion))
+
+    def translated(self, extracted_bytes: int, translated_bytes: int) -> None:
+        if extracted_bytes > 0:
+            self.expansion = translated_bytes / extracted_bytes
+
+    def try_reserve(self, nbytes: int) -> bool:
+        """Reserve without waiting; refused while the budget is full or a spilled chunk is pending."""
+        with self._changed:
+            return not self.pending_spills and self._grant(nbytes)
+
+    def reserve(self, nbytes: int, stop: Optional[threading.Event] = None) -> bool:
+        """Wait until `nbytes` fit (or nothing else is in flight); False if `stop` was set first."""
+        with self._changed:
+            if self._grant(nbytes):
+                return True
+            started = time.perf_counter()
+            try:
+                while not self._grant(nbytes):
+                    if stop is not None and stop.is_set():
+                        return False
+                    self._changed.wait(_POLL_INTERVAL)
+                return True
+            finally:
+                self.report.blocked_s += time.perf_counter() - started
+
+    def release(self, nbytes: int) -> None:
+        with self._changed:
+            self.in_flight = max(0, self.in_flight - nbytes)
+            self._changed.notify_all()
+
+    def exchange(self, released: int, reserved: int) -> None:
+        """Swap one reservation for another without waiting (a batch replaced by its translation)."""
+        with self._changed:
+            self.in_flight = max(0, self.in_flight - released) + reserved
+            self.report.peak_bytes = max(self.report.peak_bytes, self.in_flight)
+            self._changed.notify_all()
+
+    def _grant(self, nbytes: int) -> bool:
+        if self.in_flight and self.in_flight + nbytes > self.budget_bytes:
+            return False
+        if nbytes > self.budget_bytes:
+            self.report.oversized_chunks += 1
+        self.in_flight += nbytes
+        self.report.peak_bytes = max(self.report.peak_bytes, self.in_flight)
+        return True
+
+    def spill(self, items: Any, nbytes: int) -> SpilledChunk:
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="mbetl-spill-", dir=self.spill_dir)
+        fd, path = tempfile.mkstemp(suffix=".chunk", dir=self._tmpdir)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._changed:
+            self.pending_spills += 1
+            self.report.spilled_chunks += 1
+            self.report.spilled_rows += len(items)
+            self.report.spilled_bytes += os.path.getsize(path)
+        logger.debug("Spilled chunk of %d rows (~%d bytes) to %s", len(items), nbytes, path)
+        return SpilledChunk(path, len(items), nbytes)
+
+    def restore(self, chunk: SpilledChunk) -> Any:
+        """Read a spilled chunk back (reserve its footprint first)."""
+        items = chunk.load()
+        with self._changed:
+            self.pending_spills -= 1
+        return items
+
+    def close(self) -> None:
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+
+def iter_chunks(items: Iterable[Any], limit: int, chunk_bytes: int) -> Iterator[Any]:
+    """
+    Cut extractor output into chunks of at most `limit` rows and about `chunk_bytes`. Rows are
+    pulled one at a time, so a streaming extractor is never drained further than one chunk
+    ahead of the consumer; a RecordBatch is sliced.
+    """
+    if isinstance(items, RecordBatch):
+        total = len(items)
+        if total:
+            size = max(1, min(limit, chunk_bytes * total // max(1, estimate_bytes(items))))
+            for start in range(0, total, size):
+                yield items.slice(start, start + size)
+        return
+    chunk: List[Any] = []
+    nbytes = per_row = 0
+    for row in items:
+        if not len(chunk) % _SAMPLE_EVERY:
+            per_row = _object_bytes(row) + 8
+        chunk.append(row)
+        nbytes += per_row
+        if len(chunk) >= limit or nbytes >= chunk_bytes:
+            yield chunk
+            chunk, nbytes = [], 0
+    if chunk:
+        yield chunk
@@ -2,14 +2,38 @@
 # file: src/application/services/orchestrator.py
 
 from __future__ import annotations
-from typing import Generic, TypeVar, Iterable, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar, Iterable, Iterator, Optional, Sequence, Union
 from datetime import datetime
+from itertools import islice
 from uuid import uuid4, UUID
 import logging
+import queue
+import threading
+import time
+from core.ports.checkpoint_store import Checkpoint, CheckpointStore
 from core.ports.etl_ports import Extractor, Translator, Loader, LoadResult, TIn, TOut
+from core.ports.identifier_map import IdentifierMap
+from core.record_batch import RecordBatch
+from core.watermark import Watermark, max_watermark, persist_watermark, since_for
+from application.services.batch_sizing import AdaptiveBatchController
+from application.services.change_detection import ChangeDetector
+from application.services.failure_isolation import FailureIsolation
+from application.services.instrumentation import (
+    EXTRACT, LOAD, TRANSLATE, BatchMetrics, RunHooks, as_hooks, close_batch, record_stage,
+)
+from application.services.lookup_cache import LookupCache
+from application.services.memory_budget import MemoryBudget, MemoryReport, SpilledChunk, estimate_bytes, iter_chunks
 
 logger = logging.getLogger(__name__)
 
+# end-of-stream marker passed between pipeline stages
+_END = object()
+# end-of-page marker: every chunk of the last extracted page has been passed on
+_PAGE_END = object()
+# how often blocked pipeline workers re-check the stop flag (seconds)
+_POLL_INTERVAL = 0.05
+
 TIn = TypeVar("TIn")
 TOut = TypeVar("TOut")
 
@@ -21,6 +45,59 @@ class Orchestrator(Generic[TIn, TOut]):
     - drive extract -> translate -> load loop
     - manage batch ids and watermarks (caller persists watermark)
     - handle basic retries/errors per batch
+
+    The in-run cursor is a Watermark: the highest (source_updated_at, source_id) of the
+    translated rows of the last batch. Extractors that declare `seeks_watermark = True` receive
+    it as `since` and must return at most `limit` rows strictly after it in (timestamp, id)
+    order; pages they over-deliver are cut to `limit`. Other extractors receive its timestamp,
+    as before, and an over-long page is loaded whole (cutting it could drop rows that share
+    the boundary timestamp) with a warning. persist_watermark_fn(max_ts, batch_id) also gets
+    the Watermark as `watermark=` when it accepts that keyword (see core.watermark.persist_watermark);
+    store it and hand it back as `since` to resume inside a tie group. Its read_only read-back is
+    not used within a run.
+
+    Execution modes:
+    - sequential (default): extract, translate and load one batch at a time.
+    - pipelined: extract, translate and load each run on their own worker, connected by
+      bounded queues of `queue_depth` batches, so batch N+1 is extracted while batch N loads.
+      Loads (and watermark persistence) still happen strictly in batch order.
+
+    With a `change_detector`, rows whose content hash is unchanged since their last load are
+    dropped right before the load; LoadResult.skipped reports them. Watermarks are still derived
+    from every translated row, so skipped rows advance the cursor too.
+
+    With a `batch_sizer` (AdaptiveBatchController), each extract asks it for the page size and
+    every loaded batch reports its stage durations back; `batch_size` is then only the initial
+    size. In pipelined mode the next page is requested before the current one has loaded, so
+    a decision takes effect one batch later.
+
+    `hooks` (RunHooks, or a list of them) receive a BatchMetrics per batch - stage durations,
+    row counts, status - labelled with `entity_name`; in pipelined mode they also get the
+    depth of the inter-stage queues each time the load stage takes a batch.
+
+    With `checkpoints` (a CheckpointStore that commits on its own), the watermark of every
+    loaded page is checkpointed under (entity_name, partition) - timestamp in last_ts, numeric
+    source id in last_key - right after its loads committed, and a run resumes from the
+    checkpoint when it is ahead of the `since` it was given. persist_watermark_fn then becomes
+    optional; when both are set, both are written. The checkpoint is not atomic with the load:
+    loaders commit their own transactions, so there is none for the store to join. A crash
+    between a load's commit and the checkpoint replays at most that page (every batch of it,
+    when a memory budget chunked it) on the next run, which the MERGE loaders absorb as
+    unchanged rows. Loaders that are not idempotent need ETLService, whose checkpoint commits
+    with the batch.
+
+    With `failure_isolation`, a failing load is retried with backoff only for transient errors
+    and then bisected: the rows that fail on their own are quarantined and the batch succeeds
+    with the rest, instead of `max_retries` immediate retries followed by aborting the run.
+
+    With a `memory_budget` (MemoryBudget), extractor output is consumed as a stream and cut into
+    chunks of at most `batch_size` rows and the budget's `chunk_bytes`; each chunk is
+    translated and loaded as a batch of its own, so an over-long or very wide page no longer
+    has to fit in memory (pages of timestamp-only extractors are loaded whole, chunk by chunk).
+    In pipelined mode a chunk that does not fit the budget is spilled to local disk and the
+    translate stage waits for room before reading it back. Watermarks and checkpoints advance
+    once per extracted page, after its last chunk loaded. `memory_report` holds the peak and
+    the spills of the last run; hooks receive it via run_memory().
     """
 
     def __init__(
@@ -30,82 +107,492 @@ class Orchestrator(Generic[TIn, TOut]):
         loader: Loader[TOut],
         batch_size: int = 1000,
         max_retries: int = 2,
+        pipelined: bool = False,
+        queue_depth: int = 2,
+        lookup_cache: Optional[LookupCache] = None,
+        lookup_index: Optional[str] = None,
+        identifier_map: Optional[IdentifierMap] = None,
+        identifier_entity: Optional[str] = None,
+        change_detector: Optional[ChangeDetector] = None,
+        batch_sizer: Optional[AdaptiveBatchController] = None,
+        hooks: Union[None, RunHooks, Sequence[RunHooks]] = None,
+        entity_name: str = "",
+        checkpoints: Optional[CheckpointStore] = None,
+        partition: str = "",
+        failure_isolation: Optional[FailureIsolation] = None,
+        memory_budget: Optional[MemoryBudget] = None,
     ) -> None:
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be >= 1")
+        if checkpoints is not None and not checkpoints.manage_transaction:
+            # loaders own their transactions, so there is no open one for the store to join
+            raise ValueError("Orchestrator checkpoints must commit on their own (manage_transaction=True)")
         self.extractor = extractor
         self.translator = translator
         self.loader = loader
         self.batch_size = batch_size
         self.max_retries = max_retries
+        self.pipelined = pipelined
+        self.queue_depth = queue_depth
+        # lookup pipelines publish their MERGE OUTPUT ids into the run-wide cache
+        self.lookup_cache = lookup_cache
+        self.lookup_index = lookup_index
+        # entity pipelines record the MB id -> identity ids of each committed MERGE
+        self.identifier_map = identifier_map
+        self.identifier_entity = identifier_entity
+        self.change_detector = change_detector
+        self.batch_sizer = batch_sizer
+        self.hooks = as_hooks(hooks)
+        self.entity_name = entity_name
+        self.checkpoints = checkpoints
+        self.partition = partition
+        self.failure_isolation = failure_isolation
+        self.memory_budget = memory_budget
+        self.memory_report: Optional[MemoryReport] = None
+        self._warned_limit = False
 
-    def run_incremental(self, since: Optional[datetime], persist_watermark_fn) -> None:
+    def run_incremental(self, since: Union[None, datetime, Watermark], persist_watermark_fn=None) -> None:
         """
-        Run incremental ETL starting from 'since'. persist_watermark_fn(max_ts, batch_id) should
-        persist watermark and any metadata in the destination (DB).
+        Run incremental ETL starting after 'since' (a timestamp or a Watermark).
+        persist_watermark_fn(max_ts, batch_id[, watermark=]) should persist watermark and any
+        metadata in the destination (DB).
         """
+        self._run(since, persist_watermark_fn, full=False)
+
+    def _run(self, since: Union[None, datetime, Watermark], persist_watermark_fn, full: bool) -> None:
+        if persist_watermark_fn is None and self.checkpoints is None:
+            raise ValueError("either persist_watermark_fn or checkpoints is required")
+        since = self._resume_since(since, full)
+        budget = self.memory_budget
+        if budget is not None:
+            self.memory_report = budget.start_run()
+        try:
+            if self.pipelined:
+                self._run_pipelined(since, persist_watermark_fn)
+            else:
+                self._run_sequential(since, persist_watermark_fn)
+        finally:
+            if budget is not None:
+                budget.close()
+                self._report_memory(budget.report)
+        self._checkpoint(None, None, completed=True)
+
+    def _run_sequential(self, since: Optional[Watermark], persist_watermark_fn) -> None:
+        budget = self.memory_budget
         batch_number = 0
         next_since = since
         while True:
-            batch_number += 1
-            batch_id = uuid4()
-            logger.info("Starting batch %s (id=%s) since=%s", batch_number, batch_id, next_since)
-            items = list(self.extractor.extract_batch(since=next_since, limit=self.batch_size))
-            if not items:
+            page = _Page()
+            chunks = self._extract_chunks(next_since)
+            while True:
+                batch_id = uuid4()
+                batch = BatchMetrics(batch_id, self.entity_name, batch_number + 1)
+                items = next(chunks, None)
+                if items is None:
+                    break
+                batch_number += 1
+                logger.info("Starting batch %s (id=%s) since=%s", batch_number, batch_id, next_since)
+                self._extracted(batch, items)
+                held = 0
+                try:
+                    if budget is not None:
+                        # nothing else is in flight, so this only accounts the chunk
+                        extracted_bytes = estimate_bytes(items)
+                        held = budget.footprint(extracted_bytes)
+                        budget.reserve(held)
+                    translated = self._timed_translate(batch, items)
+                    if budget is not None:
+                        items, held = None, self._account_translation(extracted_bytes, held, translated)
+                    self._timed_load(batch, translated)
+                except BaseException as ex:
+                    self._batch_done(batch, ex)
+                    raise
+                finally:
+                    if budget is not None:
+                        budget.release(held)
+                self._batch_done(batch)
+                # Derive watermark from translated payloads if present (caller policy)
+                page.add(batch)
+                page.watermark = _later(page.watermark, max_watermark(translated))
+                items = translated = None
+            if not page.batches:
                 logger.info("No more rows to process; exiting.")
                 break
+            self._commit_page(page, persist_watermark_fn)
+            if page.watermark is None or (next_since is not None and page.watermark <= next_since):
+                # without an advancing watermark the next extract would return the same rows
+                logger.info("Watermark did not advance past %s; stopping.", next_since)
+                break
+            next_since = page.watermark
+
+    def _commit_page(self, page: "_Page", persist_watermark_fn) -> None:
+        """Checkpoint / persist the watermark of a page once all of its batches loaded."""
+        self._checkpoint(page.watermark, page.batch_id, page.rows)
+        if persist_watermark_fn is not None:
+            persist_watermark(persist_watermark_fn, page.watermark, page.batch_id)
+
+    # -- checkpoints -----------------------------------------------------------------------
+
+    def _resume_since(self, since: Union[None, datetime, Watermark], full: bool) -> Optional[Watermark]:
+        """Start after the checkpoint when it is ahead of `since`; a full load ignores completed runs."""
+        since = Watermark.coerce(since)
+        if self.checkpoints is None:
+            return since
+        checkpoint = self.checkpoints.load(self.entity_name, self.partition)
+        if checkpoint is None or checkpoint.last_ts is None or (full and checkpoint.completed):
+            return since
+        resume = Watermark(checkpoint.last_ts, checkpoint.last_key)
+        if since is not None and resume <= since:
+            return since
+        logger.info("Resuming %s from checkpoint %s (batch %s)", self.entity_name or "run",
+                    resume, checkpoint.batch_id)
+        return resume
+
+    def _checkpoint(self, watermark: Optional[Watermark], batch_id: Optional[UUID], rows: int = 0,
+                    completed: bool = False) -> None:
+        if self.checkpoints is None:
+            return
+        previous = self.checkpoints.load(self.entity_name, self.partition)
+        # batches without timestamps keep the previous cursor rather than resetting it
+        if previous is not None and previous.last_ts is not None:
+            before = Watermark(previous.last_ts, previous.last_key)
+            if watermark is None or watermark < before:
+                watermark = before
+        if previous is not None and not previous.completed:
+            rows += previous.rows
+        self.checkpoints.save(Checkpoint(
+            self.entity_name, self.partition,
+            last_key=watermark.int_id if watermark is not None else None,
+            last_ts=watermark.source_updated_at if watermark is not None else None,
+            batch_id=batch_id if batch_id is not None else (previous.batch_id if previous else None),
+            rows=rows, completed=completed))
+
+    def _extract(self, since: Optional[Watermark]) -> Any:
+        # columnar extractors return a RecordBatch, which is passed through as-is
+        limit = self.batch_sizer.batch_size if self.batch_sizer is not None else self.batch_size
+        seeks = getattr(self.extractor, "seeks_watermark", False)
+        items = self.extractor.extract_batch(since=since_for(self.extractor, since), limit=limit)
+        if not isinstance(items, RecordBatch):
+            # a watermark-seeking page past `limit` is cut; its rest is extracted again next batch
+            items = list(islice(items, limit)) if seeks else list(items)
+        elif seeks and len(items) > limit:
+            items = items.slice(0, limit)
+        if len(items) > limit and not self._warned_limit:
+            self._warned_limit = True
+            logger.warning("%s returned %d rows for limit %d; batches are not bounded",
+                           type(self.extractor).__name__, len(items), limit)
+        return items
+
+    def _extract_chunks(self, since: Optional[Watermark]) -> Iterator[Any]:
+        """
+        The next page as batches: the whole page, or with a memory budget chunks of it, pulled
+        from the extractor's output one at a time.
+        """
+        budget = self.memory_budget
+        if budget is None:
+            items = self._extract(since)
+            if len(items):
+                yield items
+            return
+        limit = self.batch_sizer.batch_size if self.batch_sizer is not None else self.batch_size
+        items = self.extractor.extract_batch(since=since_for(self.extractor, since), limit=limit)
+        if getattr(self.extractor, "seeks_watermark", False):
+            # a watermark-seeking page past `limit` is cut; its rest is extracted again next batch
+            items = items.slice(0, limit) if isinstance(items, RecordBatch) else islice(items, limit)
+        rows = 0
+        for chunk in iter_chunks(items, limit, budget.chunk_bytes):
+            rows += len(chunk)
+            yield chunk
+        if rows > limit and not self._warned_limit:
+            self._warned_limit = True
+            logger.warning("%s returned %d rows for limit %d; loading them in chunks",
+                           type(self.extractor).__name__, rows, limit)
+
+    def _account_translation(self, extracted_bytes: int, held: int, translated: Any) -> int:
+        """Replace a chunk's footprint reservation by the size of its translation; returns the latter."""
+        translated_bytes = estimate_bytes(translated)
+        self.memory_budget.translated(extracted_bytes, translated_bytes)
+        self.memory_budget.exchange(held, translated_bytes)
+        return translated_bytes
+
+    def _report_memory(self, report: MemoryReport) -> None:
+        logger.info("%s memory: peak ~%d of %d bytes in flight, %d chunks (%d rows) spilled, %.2fs waiting",
+                    self.entity_name or "run", report.peak_bytes, report.budget_bytes, report.spilled_chunks,
+                    report.spilled_rows, report.blocked_s)
+        if self.hooks is not None:
+            self.hooks.run_memory(self.entity_name, report)
+
+    def _translate(self, items: list, batch_id: UUID) -> list:
+        try:
+            return self.translator.translate_batch(items)
+        except Exception as ex:
+            logger.exception("Translation failed for batch %s: %s", batch_id, ex)
+            # optional: move items to quarantine via loader or external handler
+            raise
+
+    # -- per-batch instrumentation ---------------------------------------------------------
+
+    def _extracted(self, batch: BatchMetrics, items: Any) -> None:
+        """Record a non-empty extract; the batch was created (and its clock started) before it."""
+        batch.rows_extracted = len(items)
+        if self.hooks is not None:
+            self.hooks.batch_started(batch)
+        record_stage(self.hooks, batch, EXTRACT, batch.perf_start, batch.rows_extracted)
+
+    def _timed_translate(self, batch: BatchMetrics, items: Any) -> Any:
+        started = time.perf_counter()
+        translated = self._translate(items, batch.batch_id)
+        batch.rows_translated = len(translated)
+        record_stage(self.hooks, batch, TRANSLATE, started, batch.rows_translated)
+        return translated
+
+    def _timed_load(self, batch: BatchMetrics, translated: Any) -> None:
+        started = time.perf_counter()
+        batch.record_load(self._load_changed(translated, batch.batch_id))
+        record_stage(self.hooks, batch, LOAD, started, batch.rows_translated)
 
+    def _batch_done(self, batch: BatchMetrics, error: Optional[BaseException] = None) -> None:
+        close_batch(self.hooks, batch, error, self.batch_sizer)
+
+    def _load_changed(self, translated: list, batch_id: UUID) -> LoadResult:
+        """
+        Load the rows of a batch that changed since their last load.
+
+        Filtering happens here on the load side, after the previous batch committed its hashes,
+        so a row repeated in consecutive batches is always compared with what was last written.
+        """
+        if self.change_detector is None:
+            return self._load_with_retries(translated, batch_id)
+        changes = self.change_detector.filter(translated)
+        if changes.changed:
+            result = self._load_with_retries(changes.changed, batch_id)
+        else:
+            result = LoadResult(inserted=0, updated=0, errors=[])
+        result.skipped = changes.skipped
+        for source_id in result.quarantined:
+            # not loaded: keep comparing against the last committed state
+            changes.hashes.pop(source_id, None)
+        self.change_detector.commit(changes)
+        if changes.skipped:
+            logger.info("Batch %s skipped %d unchanged of %d rows", batch_id, changes.skipped, len(translated))
+        return result
+
+    def _load_with_retries(self, translated: list, batch_id: UUID) -> LoadResult:
+        if self.failure_isolation is not None:
+            return self.failure_isolation.load(translated, batch_id, self._load_once)
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                translated = self.translator.translate_batch(items)
+                return self._load_once(translated, batch_id)
             except Exception as ex:
-                logger.exception("Translation failed for batch %s: %s", batch_id, ex)
-                # optional: move items to quarantine via loader or external handler
-                raise
+                logger.exception("Load failed (attempt %d) for batch %s: %s", attempt, batch_id, ex)
+                if attempt > self.max_retries:
+                    logger.error("Max retries reached for batch %s; aborting.", batch_id)
+                    # move to quarantine or rethrow depending on policy
+                    raise
+                logger.info("Retrying batch %s (attempt %d)...", batch_id, attempt + 1)
+
+    def _load_once(self, translated: Any, batch_id: UUID) -> LoadResult:
+        """One loader call; publishes the committed ids to the lookup cache and identifier map."""
+        result: LoadResult = self.loader.load_batch(translated, batch_id)
+        logger.info(
+            "Loaded batch %s inserted=%d updated=%d errors=%d",
+            batch_id,
+            result.inserted,
+            result.updated,
+            len(result.errors),
+        )
+        if self.lookup_cache is not None and self.lookup_index:
+            self.lookup_cache.update_from_result(self.lookup_index, result)
+        if self.identifier_map is not None and self.identifier_entity and result.source_ids:
+            self.identifier_map.add(self.identifier_entity, result.source_ids)
+        return result
+
+    def _run_pipelined(self, since: Optional[Watermark], persist_watermark_fn) -> None:
+        """
+        Pipelined variant of run_incremental.
+
+        Stage workers:
+        - extract (thread): pulls the next batch as soon as the translate stage has derived the
+          cursor of the previous one, so extraction overlaps with loading.
+        - translate (thread): translates and hands the batch's watermark back to extract.
+        - load (calling thread): loads batches in FIFO order and persists each watermark
+          after its batch succeeded, so watermarks never run ahead of committed data.
+
+        The in-run cursor comes from the translated payloads rather than the persist read-back,
+        because the previous batch is usually still loading when the next extract starts.
+        The first error in any stage stops all workers and is re-raised here.
+        """
+        extracted: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        translated_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        cursor_q: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+            return _END
+
+        def worker(name: str, body: Callable[[], None], downstream: queue.Queue) -> threading.Thread:
+            def run() -> None:
+                try:
+                    body()
+                except BaseException as ex:  # surfaced to the caller below
+                    logger.exception("Pipeline stage %s failed: %s", name, ex)
+                    errors.append(ex)
+                    stop.set()
+                finally:
+                    put(downstream, _END)
+            return threading.Thread(target=run, name=f"orchestrator-{name}", daemon=True)
+
+        budget = self.memory_budget
 
-            attempt = 0
+        def extract_stage() -> None:
+            batch_number = 0
+            next_since = since
+            while not stop.is_set():
+                chunks = self._extract_chunks(next_since)
+                extracted_any = False
+                while not stop.is_set():
+                    batch_id = uuid4()
+                    batch = BatchMetrics(batch_id, self.entity_name, batch_number + 1)
+                    items = next(chunks, None)
+                    if items is None:
+                        break
+                    batch_number += 1
+                    extracted_any = True
+                    logger.info("Extracted batch %s (id=%s) since=%s", batch_number, batch_id, next_since)
+                    self._extracted(batch, items)
+                    held = extracted_bytes = 0
+                    if budget is not None:
+                        extracted_bytes = estimate_bytes(items)
+                        held = budget.footprint(extracted_bytes)
+                        if not budget.try_reserve(held):
+                            # over budget: park the chunk on disk rather than on the heap
+                            items, held = budget.spill(items, extracted_bytes), 0
+                    if not put(extracted, (batch, items, held, extracted_bytes)):
+                        return
+                    items = None
+                if not extracted_any:
+                    logger.info("No more rows to process; exiting.")
+                    return
+                if not put(extracted, _PAGE_END):
+                    return
+                cursor = get(cursor_q)
+                if cursor is _END:
+                    return
+                if cursor is None or (next_since is not None and cursor <= next_since):
+                    # without an advancing watermark the next extract would return the same rows
+                    logger.info("Watermark did not advance past %s; stopping extraction.", next_since)
+                    return
+                next_since = cursor
+
+        def translate_stage() -> None:
+            page_watermark: Optional[Watermark] = None
             while True:
-                attempt += 1
+                msg = get(extracted)
+                if msg is _END:
+                    return
+                if msg is _PAGE_END:
+                    if not put(cursor_q, page_watermark) or not put(translated_q, (_PAGE_END, page_watermark)):
+                        return
+                    page_watermark = None
+                    continue
+                batch, items, held, extracted_bytes = msg
                 try:
-                    result: LoadResult = self.loader.load_batch(translated, batch_id)
-                    logger.info(
-                        "Loaded batch %s inserted=%d updated=%d errors=%d",
-                        batch_id,
-                        result.inserted,
-                        result.updated,
-                        len(result.errors),
-                    )
-                    # Derive watermark from translated payloads if present (caller policy)
-                    max_ts = self._max_source_ts(translated)
-                    persist_watermark_fn(max_ts, batch_id)
+                    if isinstance(items, SpilledChunk):
+                        # backpressure: read a spilled chunk back only once it fits the budget
+                        if not budget.reserve(budget.footprint(extracted_bytes), stop):
+                            return
+                        held = budget.footprint(extracted_bytes)
+                        items = budget.restore(items)
+                    translated = self._timed_translate(batch, items)
+                    if budget is not None:
+                        items, held = None, self._account_translation(extracted_bytes, held, translated)
+                except BaseException as ex:
+                    if budget is not None:
+                        budget.release(held)
+                    self._batch_done(batch, ex)
+                    raise
+                page_watermark = _later(page_watermark, max_watermark(translated))
+                if not put(translated_q, (batch, translated, held)):
+                    return
+
+        workers = [
+            worker("extract", extract_stage, extracted),
+            worker("translate", translate_stage, translated_q),
+        ]
+        for w in workers:
+            w.start()
+        try:
+            page = _Page()
+            while True:
+                msg = get(translated_q)
+                if msg is _END:
                     break
-                except Exception as ex:
-                    logger.exception("Load failed (attempt %d) for batch %s: %s", attempt, batch_id, ex)
-                    if attempt > self.max_retries:
-                        logger.error("Max retries reached for batch %s; aborting.", batch_id)
-                        # move to quarantine or rethrow depending on policy
-                        raise
-                    logger.info("Retrying batch %s (attempt %d)...", batch_id, attempt + 1)
-
-            # prepare for next loop: set since to last watermark persisted
-            next_since = persist_watermark_fn(None, None, read_only=True)  # optional read-back hook
-            # if persist_watermark_fn doesn't support read, caller must manage 'since' externally
-
-    def run_full_load(self, persist_watermark_fn) -> None:
+                if msg[0] is _PAGE_END:
+                    page.watermark = msg[1]
+                    self._commit_page(page, persist_watermark_fn)
+                    page = _Page()
+                    continue
+                batch, translated, held = msg
+                if self.hooks is not None:
+                    self.hooks.queue_depth(self.entity_name, "extracted", extracted.qsize())
+                    self.hooks.queue_depth(self.entity_name, "translated", translated_q.qsize())
+                try:
+                    self._timed_load(batch, translated)
+                except BaseException as ex:
+                    self._batch_done(batch, ex)
+                    raise
+                finally:
+                    if budget is not None:
+                        budget.release(held)
+                self._batch_done(batch)
+                page.add(batch)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            stop.set()
+            for w in workers:
+                w.join()
+        if errors:
+            raise errors[0]
+
+    def run_full_load(self, persist_watermark_fn=None) -> None:
         """Convenience wrapper to run with no since watermark (full scan)."""
-        self.run_incremental(since=None, persist_watermark_fn=persist_watermark_fn)
+        self._run(None, persist_watermark_fn, full=True)
 
-    @staticmethod
-    def _max_source_ts(items: Iterable[TOut]) -> Optional[datetime]:
-        """
-        Attempt to derive maximum source timestamp from translated items.
-        TOut implementations should include a 'source_updated_at' attribute or key in dict payload.
-        """
-        max_ts = None
-        for it in items:
-            ts = None
-            if hasattr(it, "source_updated_at"):
-                ts = getattr(it, "source_updated_at")
-            elif isinstance(it, dict):
-                ts = it.get("source_updated_at")
-            if ts:
-                if not max_ts or ts > max_ts:
-                    max_ts = ts
-        return max_ts
\ No newline at end of file
+
+@dataclass
+class _Page:
+    """Progress through one extracted page, whose chunks load as batches of their own."""
+    watermark: Optional[Watermark] = None
+    rows: int = 0
+    batches: int = 0
+    batch_id: Optional[UUID] = None
+
+    def add(self, batch: BatchMetrics) -> None:
+        self.rows += batch.rows_translated
+        self.batches += 1
+        self.batch_id = batch.batch_id
+
+
+def _later(a: Optional[Watermark], b: Optional[Watermark]) -> Optional[Watermark]:
+    if a is None:
+        return b
+    return a if b is None or b <= a else b
@@ -0,0 +1,103 @@
+# python
+# file: src/application/services/parallel_translator.py
+
+"""
+Process-pool wrapper for CPU-heavy Translators.
+
+Translation is pure Python and holds the GIL, so threads do not help once normalization gets
+expensive. ParallelTranslator shards each batch into chunks, translates the chunks in worker
+processes and reassembles the results in input order. The wrapped translator (and the items
+it receives/returns) must be picklable.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Generic, Iterable, List, Optional
+import logging
+import os
+
+from core.ports.etl_ports import Translator, TIn, TOut
+
+logger = logging.getLogger(__name__)
+
+# translator instance installed once per worker process by the pool initializer
+_worker_translator = None
+
+
+def _init_worker(translator) -> None:
+    global _worker_translator
+    _worker_translator = translator
+
+
+def _translate_chunk(chunk: list) -> list:
+    return _worker_translator.translate_batch(chunk)
+
+
+class ParallelTranslator(Generic[TIn, TOut]):
+    """
+    Translator[TIn, TOut] that fans translate_batch out over a ProcessPoolExecutor.
+
+    - workers: number of worker processes (default: os.cpu_count()).
+    - chunk_size: items per task sent to a worker; larger chunks amortize pickling overhead.
+    - min_parallel_items: batches smaller than this are translated inline (default: 2 * chunk_size,
+      the smallest batch that makes two tasks), since shipping a batch that fits one chunk to a
+      single worker only adds pickling to the same serial translation.
+
+    The pool is started lazily on the first large batch and reused across batches; call
+    close() (or use as a context manager) to shut it down.
+    """
+
+    def __init__(
+        self,
+        translator: Translator[TIn, TOut],
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        min_parallel_items: Optional[int] = None,
+        mp_context=None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.translator = translator
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_parallel_items = 2 * chunk_size if min_parallel_items is None else min_parallel_items
+        self._mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def translate(self, item: TIn) -> TOut:
+        return self.translator.translate(item)
+
+    def translate_batch(self, items: Iterable[TIn]) -> List[TOut]:
+        items = items if isinstance(items, list) else list(items)
+        if len(items) < self.min_parallel_items:
+            return self.translator.translate_batch(items)
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        out: List[TOut] = []
+        # Executor.map yields results in submission order, which keeps the batch order intact
+        for part in self._executor().map(_translate_chunk, chunks):
+            out.extend(part)
+        return out
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            logger.info("Starting translation pool with %d workers (chunk_size=%d)", self.workers, self.chunk_size)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(self.translator,),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> "ParallelTranslator[TIn, TOut]":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
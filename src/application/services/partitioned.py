@@ -0,0 +1,181 @@
+# python
+# file: src/application/services/partitioned.py
+
+"""
+Range-partitioned parallel runs.
+
+The source key space (MB integer ids) is split into N contiguous id ranges and one independent
+extract -> translate -> load chain runs per range on a thread pool. Every range keeps its own
+watermark, so a failed or slow partition can be re-run without redoing the others: re-running
+a finished partition resumes from its watermark and extracts nothing.
+
+Partitions must not contend for the same natural keys in the destination (UseCases C02); id
+ranges of the same entity satisfy that for the entity rows themselves.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Union
+from uuid import UUID
+import logging
+import threading
+import time
+
+from core.ports.etl_ports import Extractor, Translator, Loader, TIn, TOut
+from core.watermark import Watermark
+from application.services.orchestrator import Orchestrator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class KeyRange:
+    """Half-open id range [lo, hi)."""
+    lo: int
+    hi: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.lo}-{self.hi}"
+
+    def __contains__(self, key: int) -> bool:
+        return self.lo <= key < self.hi
+
+
+def split_key_range(lo: int, hi: int, partitions: int) -> List[KeyRange]:
+    """Split [lo, hi) into `partitions` contiguous ranges of (nearly) equal width."""
+    if partitions < 1:
+        raise ValueError("partitions must be >= 1")
+    if hi <= lo:
+        raise ValueError("empty key range")
+    partitions = min(partitions, hi - lo)
+    width, extra = divmod(hi - lo, partitions)
+    ranges = []
+    start = lo
+    for i in range(partitions):
+        end = start + width + (1 if i < extra else 0)
+        ranges.append(KeyRange(start, end))
+        start = end
+    return ranges
+
+
+@dataclass
+class PartitionResult:
+    key_range: KeyRange
+    succeeded: bool
+    duration_s: float
+    error: Optional[BaseException] = None
+
+
+class PartitionWatermarks:
+    """
+    Thread-safe in-process watermark table keyed by partition.
+
+    persist_fn(key_range) returns a persist_watermark_fn compatible with Orchestrator for that
+    partition. It stores the full (timestamp, source id) Watermark and its read_only read-back
+    returns it, so a partition that failed inside a tie group resumes after its last loaded row
+    rather than after the whole timestamp. Replace with a DB-backed store for durable runs; the
+    callback shape is the same.
+    """
+
+    def __init__(self, initial: Optional[Dict[str, Union[datetime, Watermark]]] = None) -> None:
+        self._lock = threading.Lock()
+        self._marks: Dict[str, Optional[Watermark]] = {
+            name: Watermark.coerce(since) for name, since in (initial or {}).items()}
+
+    def get(self, key_range: KeyRange) -> Optional[datetime]:
+        """The partition's watermark timestamp."""
+        mark = self.watermark(key_range)
+        return mark.source_updated_at if mark is not None else None
+
+    def watermark(self, key_range: KeyRange) -> Optional[Watermark]:
+        with self._lock:
+            return self._marks.get(key_range.name)
+
+    def persist_fn(self, key_range: KeyRange):
+        def persist_watermark_fn(max_ts: Optional[datetime], batch_id: Optional[UUID], read_only: bool = False,
+                                 watermark: Optional[Watermark] = None) -> Optional[Watermark]:
+            with self._lock:
+                if not read_only and max_ts is not None:
+                    self._marks[key_range.name] = watermark or Watermark.coerce(max_ts)
+                return self._marks.get(key_range.name)
+        return persist_watermark_fn
+
+
+class PartitionedRunner:
+    """
+    Run one job per key range concurrently and report per-partition outcomes.
+
+    A failing partition does not cancel the others; run() returns a PartitionResult for every
+    range and the caller decides whether to re-run the failed ones.
+    """
+
+    def __init__(self, run_partition: Callable[[KeyRange], None], max_workers: Optional[int] = None) -> None:
+        self.run_partition = run_partition
+        self.max_workers = max_workers
+
+    def run(self, partitions: Sequence[KeyRange]) -> List[PartitionResult]:
+        workers = self.max_workers or len(partitions) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="partition") as pool:
+            results = list(pool.map(self._run_one, partitions))
+        failed = [r.key_range.name for r in results if not r.succeeded]
+        if failed:
+            logger.error("%d of %d partitions failed: %s", len(failed), len(results), ", ".join(failed))
+        return results
+
+    def _run_one(self, key_range: KeyRange) -> PartitionResult:
+        t0 = time.perf_counter()
+        logger.info("Starting partition %s", key_range.name)
+        try:
+            self.run_partition(key_range)
+        except Exception as ex:
+            logger.exception("Partition %s failed: %s", key_range.name, ex)
+            return PartitionResult(key_range, False, time.perf_counter() - t0, ex)
+        logger.info("Finished partition %s", key_range.name)
+        return PartitionResult(key_range, True, time.perf_counter() - t0)
+
+
+class PartitionedOrchestrator(Generic[TIn, TOut]):
+    """
+    Orchestrator chains over key ranges.
+
+    - extractor_factory(key_range) must return an Extractor restricted to that range.
+    - loader_factory(key_range) returns the Loader for that range; loaders usually hold a
+      destination connection, so each partition gets its own.
+    - the translator is shared and must therefore be stateless.
+    Each chain resumes from the partition's watermark in `watermarks`.
+    """
+
+    def __init__(
+        self,
+        extractor_factory: Callable[[KeyRange], Extractor[TIn]],
+        translator: Translator[TIn, TOut],
+        loader_factory: Callable[[KeyRange], Loader[TOut]],
+        watermarks: PartitionWatermarks,
+        batch_size: int = 1000,
+        max_retries: int = 2,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.extractor_factory = extractor_factory
+        self.translator = translator
+        self.loader_factory = loader_factory
+        self.watermarks = watermarks
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._runner = PartitionedRunner(self._run_partition, max_workers=max_workers)
+
+    def run(self, partitions: Sequence[KeyRange]) -> List[PartitionResult]:
+        return self._runner.run(partitions)
+
+    def _run_partition(self, key_range: KeyRange) -> None:
+        orch = Orchestrator(
+            self.extractor_factory(key_range),
+            self.translator,
+            self.loader_factory(key_range),
+            batch_size=self.batch_size,
+            max_retries=self.max_retries,
+        )
+        persist = self.watermarks.persist_fn(key_range)
+        orch.run_incremental(since=persist(None, None, read_only=True), persist_watermark_fn=persist)
@@ -0,0 +1,233 @@
+# python
+# file: src/application/services/scheduler.py
+
+"""
+Dependency-aware scheduler for multi-entity runs (UseCases U01-U06).
+
+Entity pipelines are nodes of a DAG whose edges are the destination's foreign keys: a node
+starts as soon as every parent has committed, independent nodes run concurrently (the
+lookups, the junction tables), and a failed node skips only its descendants.
+
+After the run the report names the critical path - the dependency chain with the largest
+summed run time - which bounds the wall-clock time of the run however many workers there are.
+"""
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# MusicCollection load order, derived from the FKs in DestinationDDL.sql.
+# Label references Country, so it is the one lookup that waits for another.
+MUSIC_COLLECTION_DAG: Dict[str, Tuple[str, ...]] = {
+    # U01 lookups
+    "Country": (),
+    "ArtistType": (),
+    "Genre": (),
+    "MediumFormat": (),
+    "Tag": (),
+    "Website": (),
+    "Label": ("Country",),
+    # U02-U05 entities
+    "Artist": ("Country", "ArtistType"),
+    "Recording": ("Artist",),
+    "Album": ("Artist",),
+    "Edition": ("Album",),
+    "Disc": ("Edition", "MediumFormat"),
+    "Track": ("Disc", "Recording"),
+    # U06 junctions
+    "EditionLabel": ("Edition", "Label"),
+    "ArtistGenre": ("Artist", "Genre"),
+    "AlbumGenre": ("Album", "Genre"),
+    "TrackGenre": ("Track", "Genre"),
+    "Credit": ("Artist", "Track"),
+    "ArtistMembership": ("Artist",),
+}
+
+
+@dataclass(frozen=True)
+class PipelineNode:
+    name: str
+    run: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class NodeResult:
+    name: str
+    status: str
+    # seconds since the start of the schedule (None for skipped nodes)
+    started_s: Optional[float] = None
+    finished_s: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def duration_s(self) -> float:
+        if self.started_s is None or self.finished_s is None:
+            return 0.0
+        return self.finished_s - self.started_s
+
+
+@dataclass
+class ScheduleReport:
+    results: Dict[str, NodeResult]
+    wall_s: float
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_s: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return all(r.status == SUCCEEDED for r in self.results.values())
+
+    def summary(self) -> str:
+        lines = [f"{'node':<18} {'status':<10} {'start s':>8} {'run s':>8}"]
+        for r in sorted(self.results.values(), key=lambda r: (r.started_s is None, r.started_s or 0.0, r.name)):
+            start = f"{r.started_s:.2f}" if r.started_s is not None else "-"
+            lines.append(f"{r.name:<18} {r.status:<10} {start:>8} {r.duration_s:>8.2f}")
+        lines.append(f"wall {self.wall_s:.2f}s; critical path {self.critical_path_s:.2f}s: "
+                     + " -> ".join(self.critical_path))
+        return "\n".join(lines)
+
+
+def build_nodes(runs: Mapping[str, Callable[[], Any]],
+                graph: Mapping[str, Sequence[str]] = MUSIC_COLLECTION_DAG) -> List[PipelineNode]:
+    """
+    Nodes for the pipelines in `runs`, wired by `graph`.
+
+    Entities of the graph without a pipeline in this run are bypassed transitively: Track still
+    waits for Edition when Disc is not part of the run.
+    """
+    unknown = set(runs) - set(graph)
+    if unknown:
+        raise ValueError(f"No dependencies declared for: {sorted(unknown)}")
+
+    def present_parents(name: str, seen: Set[str]) -> Set[str]:
+        found: Set[str] = set()
+        for parent in graph[name]:
+            if parent in seen:
+                continue
+            seen.add(parent)
+            found |= {parent} if parent in runs else present_parents(parent, seen)
+        return found
+
+    return [PipelineNode(name, run, tuple(sorted(present_parents(name, set())))) for name, run in runs.items()]
+
+
+class DagScheduler:
+    """
+    Runs PipelineNodes in dependency order on a thread pool.
+
+    Responsibilities:
+    - validate the graph (unknown parents, duplicates, cycles) before anything runs
+    - start each node once all its parents succeeded, up to `max_workers` at a time
+    - on failure, skip every descendant and let unrelated branches finish
+    - report per-node timings and the critical path
+    """
+
+    def __init__(self, nodes: Sequence[PipelineNode], max_workers: Optional[int] = None) -> None:
+        self.nodes: Dict[str, PipelineNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate pipeline node: {node.name}")
+            self.nodes[node.name] = node
+        for node in nodes:
+            missing = [p for p in node.depends_on if p not in self.nodes]
+            if missing:
+                raise ValueError(f"{node.name} depends on unknown node(s): {missing}")
+        self.children: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for node in nodes:
+            for parent in node.depends_on:
+                self.children[parent].append(node.name)
+        self.order = self._topological_order()
+        self.max_workers = max_workers or min(8, max(1, len(self.nodes)))
+
+    def run(self) -> ScheduleReport:
+        t0 = time.monotonic()
+        results: Dict[str, NodeResult] = {}
+        waiting = {name: len(node.depends_on) for name, node in self.nodes.items()}
+        running: Dict[Future, str] = {}
+
+        def start(pool: ThreadPoolExecutor, name: str) -> None:
+            logger.info("Starting pipeline %s", name)
+            results[name] = NodeResult(name, "running", started_s=time.monotonic() - t0)
+            running[pool.submit(self.nodes[name].run)] = name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag") as pool:
+            for name in self.order:
+                if waiting[name] == 0:
+                    start(pool, name)
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = results[name]
+                    result.finished_s = time.monotonic() - t0
+                    error = future.exception()
+                    if error is not None:
+                        logger.error("Pipeline %s failed after %.2fs: %s", name, result.duration_s, error)
+                        result.status, result.error = FAILED, error
+                        self._skip_descendants(name, results)
+                        continue
+                    result.status = SUCCEEDED
+                    logger.info("Pipeline %s committed in %.2fs", name, result.duration_s)
+                    for child in self.children[name]:
+                        waiting[child] -= 1
+                        if waiting[child] == 0 and child not in results:
+                            start(pool, child)
+        report = ScheduleReport(results=results, wall_s=time.monotonic() - t0)
+        report.critical_path, report.critical_path_s = self._critical_path(results)
+        logger.info("Run schedule:\n%s", report.summary())
+        return report
+
+    def _skip_descendants(self, name: str, results: Dict[str, NodeResult]) -> None:
+        stack = list(self.children[name])
+        while stack:
+            child = stack.pop()
+            if child in results:
+                continue
+            logger.warning("Skipping pipeline %s: upstream %s failed", child, name)
+            results[child] = NodeResult(child, SKIPPED)
+            stack.extend(self.children[child])
+
+    def _critical_path(self, results: Mapping[str, NodeResult]) -> Tuple[List[str], float]:
+        """Longest chain of measured run times along dependency edges."""
+        best: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for name in self.order:
+            parents = [p for p in self.nodes[name].depends_on if p in best]
+            parent = max(parents, key=best.__getitem__, default=None)
+            via[name] = parent
+            best[name] = results[name].duration_s + (best[parent] if parent is not None else 0.0)
+        if not best:
+            return [], 0.0
+        end = max(best, key=best.__getitem__)
+        path: List[str] = []
+        node: Optional[str] = end
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return path[::-1], best[end]
+
+    def _topological_order(self) -> List[str]:
+        indegree = {name: len(node.depends_on) for name, node in self.nodes.items()}
+        ready = [name for name in self.nodes if indegree[name] == 0]
+        order: List[str] = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for child in self.children[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(name for name, deg in indegree.items() if deg > 0)
+            raise ValueError(f"Dependency cycle among: {cyclic}")
+        return order
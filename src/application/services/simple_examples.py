@@ -7,12 +7,15 @@ These are useful for local unit tests and demonstration of the orchestrator flow
 """
 
 from __future__ import annotations
-from typing import Iterable, List, Optional
+from itertools import islice
+from typing import Iterable, List, Optional, Union
 from datetime import datetime
 from uuid import UUID, uuid4
 from dataclasses import dataclass
 
 from core.ports.etl_ports import Extractor, Translator, Loader, ExtractedRow, LoadResult
+from core.normalization import default_normalizer
+from core.watermark import Watermark, sort_key
 
 # Example TIn / TOut shapes
 @dataclass
@@ -31,18 +34,31 @@ class CountryOut:
     source_updated_at: Optional[datetime]
 
 class InMemoryCountryExtractor(Extractor[CountryIn]):
+    seeks_watermark = True
+
     def __init__(self, rows: Iterable[CountryIn]):
-        self._rows = list(rows)
+        # scan order of the watermark: (last_updated, mb_id)
+        self._rows = sorted(rows, key=lambda r: sort_key(r.last_updated, r.mb_id))
 
-    def extract_batch(self, since: Optional[datetime], limit: int) -> Iterable[CountryIn]:
-        # naive implementation: filter by last_updated
-        for r in self._rows:
-            if since is None or (r.last_updated and r.last_updated > since):
-                yield r
+    def extract_batch(self, since: Union[None, datetime, Watermark], limit: int) -> List[CountryIn]:
+        since = Watermark.coerce(since)
+        rows = (r for r in self._rows if since is None or since.precedes(r.last_updated, r.mb_id))
+        return list(islice(rows, limit))
 
 class CountryTranslator(Translator[CountryIn, CountryOut]):
+    def __init__(self, normalizer=default_normalizer):
+        self._normalizer = normalizer
+
     def translate(self, item: CountryIn) -> CountryOut:
-        normalized = " ".join(item.name.strip().lower().split())
+        return self._build(item, self._normalizer(item.name))
+
+    def translate_batch(self, items: Iterable[CountryIn]) -> List[CountryOut]:
+        items = list(items)
+        normalized = self._normalizer.normalize_many([i.name for i in items])
+        return [self._build(i, n) for i, n in zip(items, normalized)]
+
+    @staticmethod
+    def _build(item: CountryIn, normalized: str) -> CountryOut:
         code = (item.iso_code or "").upper() if item.iso_code else None
         return CountryOut(
             source_id=str(item.mb_id),
@@ -52,9 +68,6 @@ class CountryTranslator(Translator[CountryIn, CountryOut]):
             source_updated_at=item.last_updated,
         )
 
-    def translate_batch(self, items: Iterable[CountryIn]) -> List[CountryOut]:
-        return [self.translate(i) for i in items]
-
 class InMemoryLoader(Loader[CountryOut]):
     def __init__(self):
         # in-memory "destination" table keyed by (code or name)
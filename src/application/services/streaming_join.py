@@ -0,0 +1,294 @@
+# python
+# file: src/application/services/streaming_join.py
+
+"""
+Memory-bounded streaming join of MB tracks against the Disc and Recording identity maps (U05).
+
+A music.Track row needs the DiscId of its medium and the RecordingId of its recording. Holding
+every track of the catalog (or both id maps as dicts) in memory does not fit once editions
+number in the millions, so the join streams:
+
+1. incoming track rows are projected to compact tuples and fed to an ExternalSorter keyed by
+   the medium's source id; past `memory_budget_bytes` the sorter spills sorted runs to local
+   files and later merges them with heapq.merge,
+2. the sorted stream is resolved against the Disc map in ascending chunks - the IdentifierMap
+   walks its sorted base forward, so this is a merge join against the memory-mapped index -
+   and re-sorted (external again) by recording source id,
+3. the second sorted stream is resolved against the Recording map the same way and emitted as
+   Track rows (snake_case Track columns plus source_id / source_updated_at) in batches a
+   Loader, e.g. BulkMergeLoader over TABLES["Track"], consumes directly.
+
+Resident memory is the sort budget plus one read buffer per merged run and one lookup chunk,
+independent of catalog size. Tracks whose medium or recording has no identity yet are counted
+and dropped; they resolve on the next run, after their parents load.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from uuid import uuid4
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+from core.ports.etl_ports import Loader, LoadResult
+from core.ports.identifier_map import IdentifierMap
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+# sorted runs merged at once; more runs are first merged into longer ones
+DEFAULT_FAN_IN = 64
+# bounds on the rows per pickled record of a run file, i.e. the read buffer of a run in a merge
+_MIN_RUN_CHUNK = 64
+_MAX_RUN_CHUNK = 4096
+# estimate the in-memory size of one row in this many
+_SAMPLE_EVERY = 512
+
+
+def row_bytes(row: Any) -> int:
+    """Approximate resident size of a row: a tuple / list / dict container plus its values."""
+    if isinstance(row, dict):
+        return sys.getsizeof(row) + sum(map(sys.getsizeof, row.values()))
+    if isinstance(row, (tuple, list)):
+        return sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+    return sys.getsizeof(row)
+
+
+class ExternalSorter:
+    """
+    Sorts a stream of rows larger than memory.
+
+    Responsibilities:
+    - buffer rows up to `memory_budget_bytes` (sizes estimated from a sample of rows)
+    - sort a full buffer and spill it as a run of pickled chunks to a private temp directory
+    - merge the runs (and the last in-memory buffer) lazily with heapq.merge, at most `fan_in`
+      at a time, and delete the spill files once the sorted stream is consumed or closed
+
+    Rows must be picklable; `key` must give mutually comparable values. Single use.
+    """
+
+    def __init__(self, key: Callable[[Any], Any], memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET,
+                 spill_dir: Optional[str] = None, fan_in: int = DEFAULT_FAN_IN) -> None:
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.key = key
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = spill_dir
+        self.fan_in = fan_in
+        self._buffer: List[Any] = []
+        self._row_bytes = 0
+        self._runs: List[str] = []
+        self._tmpdir: Optional[str] = None
+        self.rows = 0
+        self.spilled_rows = 0
+        self.spilled_runs = 0
+
+    def add(self, row: Any) -> None:
+        buffer = self._buffer
+        if not len(buffer) % _SAMPLE_EVERY:
+            self._row_bytes = max(self._row_bytes, row_bytes(row))
+        buffer.append(row)
+        self.rows += 1
+        if len(buffer) * (self._row_bytes + 8) > self.memory_budget_bytes:
+            self._spill()
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def sorted(self) -> Iterator[Any]:
+        """The rows in key order; consumes the sorter."""
+        try:
+            self._buffer.sort(key=self.key)
+            if not self._runs:
+                yield from self._drain()
+                return
+            while len(self._runs) >= self.fan_in:
+                # merge neighbouring runs in place, so ties keep their arrival order
+                groups = [self._runs[i:i + self.fan_in] for i in range(0, len(self._runs), self.fan_in)]
+                self._runs = [self._merge_runs(group) for group in groups]
+            yield from merge(*map(self._read_run, self._runs), self._drain(), key=self.key)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._buffer = []
+        self._runs = []
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def _drain(self) -> Iterator[Any]:
+        # hand the sorted buffer out row by row, releasing each one, so that a downstream
+        # sorter can fill its own budget while this one empties
+        buffer, self._buffer = self._buffer, []
+        buffer.reverse()
+        while buffer:
+            yield buffer.pop()
+
+    def _spill(self) -> None:
+        self._buffer.sort(key=self.key)
+        self.spilled_rows += len(self._buffer)
+        self.spilled_runs += 1
+        self._runs.append(self._write_run(self._buffer))
+        self._buffer = []
+        logger.debug("Spilled sorted run %d (%d rows so far)", len(self._runs), self.spilled_rows)
+
+    def _merge_runs(self, paths: List[str]) -> str:
+        if len(paths) == 1:
+            return paths[0]
+        merged = self._write_run(merge(*map(self._read_run, paths), key=self.key))
+        for path in paths:
+            os.remove(path)
+        return merged
+
+    def _write_run(self, rows: Iterable[Any]) -> str:
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="extsort-", dir=self.spill_dir)
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self._tmpdir)
+        rows = iter(rows)
+        # the read buffers of a full merge take at most half the budget
+        per_chunk = self.memory_budget_bytes // (2 * self.fan_in * (self._row_bytes + 8))
+        per_chunk = min(_MAX_RUN_CHUNK, max(_MIN_RUN_CHUNK, per_chunk))
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = list(islice(rows, per_chunk))
+                if not chunk:
+                    break
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Any]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                yield from chunk
+
+
+@dataclass
+class TrackJoinStats:
+    tracks: int = 0
+    emitted: int = 0
+    unresolved_disc: int = 0
+    unresolved_recording: int = 0
+    spilled_runs: int = 0
+    spilled_rows: int = 0
+
+
+# projected track tuple: (disc source id, recording source id, id, position, name, length_ms, last_updated)
+_DISC, _RECORDING = 0, 1
+_disc_key = itemgetter(_DISC)
+_recording_key = itemgetter(_RECORDING)
+
+
+class StreamingTrackJoin:
+    """
+    Joins MB track rows with their DiscId and RecordingId within a fixed memory budget.
+
+    Responsibilities:
+    - project track rows (dicts shaped like the source track row) to compact tuples
+    - external-sort by medium, resolve DiscIds; external-sort by recording, resolve RecordingIds
+    - emit music.Track rows in batches of `batch_size`, or load them via run()
+
+    `disc_key(row)` gives the source id of a track's medium in the `disc_entity` keyspace of the
+    IdentifierMap (default: the row's `medium_id`). Each of the two sorts gets the whole budget:
+    the second only fills while the first is being merged out of its run files.
+    """
+
+    def __init__(self, identifiers: IdentifierMap, memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET,
+                 spill_dir: Optional[str] = None, batch_size: int = 5000, lookup_chunk: int = 10_000,
+                 disc_key: Optional[Callable[[Dict[str, Any]], int]] = None, disc_entity: str = "Disc",
+                 recording_entity: str = "Recording", fan_in: int = DEFAULT_FAN_IN) -> None:
+        self.identifiers = identifiers
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = spill_dir
+        self.batch_size = batch_size
+        self.lookup_chunk = lookup_chunk
+        self.disc_key = disc_key or itemgetter("medium_id")
+        self.disc_entity = disc_entity
+        self.recording_entity = recording_entity
+        self.fan_in = fan_in
+        self.stats = TrackJoinStats()
+
+    def batches(self, tracks: Iterable[Any]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Track rows in batches, ordered by recording source id. `tracks` yields track rows or
+        pages (lists) of them, e.g. the extractor's sorted runs.
+        """
+        self.stats = stats = TrackJoinStats()
+        by_disc = self._sorter(_disc_key)
+        by_recording = self._sorter(_recording_key)
+        try:
+            disc_key = self.disc_key
+            for item in tracks:
+                rows = item if isinstance(item, list) else (item,)
+                stats.tracks += len(rows)
+                by_disc.extend((disc_key(r), r["recording_id"], r["id"], r["position"], r["name"],
+                                r.get("length_ms"), r.get("last_updated")) for r in rows)
+            for chunk in self._resolve(by_disc.sorted(), _DISC, self.disc_entity):
+                by_recording.extend(chunk)
+            batch: List[Dict[str, Any]] = []
+            for chunk in self._resolve(by_recording.sorted(), _RECORDING, self.recording_entity):
+                for disc_id, recording_id, track_id, position, name, length_ms, last_updated in chunk:
+                    batch.append({"disc_id": disc_id, "recording_id": recording_id, "title": name,
+                                  "track_number": position, "position": position, "duration_ms": length_ms,
+                                  "source_id": track_id, "source_updated_at": last_updated})
+                while len(batch) >= self.batch_size:
+                    stats.emitted += self.batch_size
+                    yield batch[:self.batch_size]
+                    batch = batch[self.batch_size:]
+            if batch:
+                stats.emitted += len(batch)
+                yield batch
+        finally:
+            by_disc.close()
+            by_recording.close()
+            stats.spilled_runs = by_disc.spilled_runs + by_recording.spilled_runs
+            stats.spilled_rows = by_disc.spilled_rows + by_recording.spilled_rows
+        if stats.unresolved_disc or stats.unresolved_recording:
+            logger.warning("Track join dropped %d tracks without a disc and %d without a recording identity",
+                           stats.unresolved_disc, stats.unresolved_recording)
+
+    def run(self, tracks: Iterable[Any], loader: Loader) -> LoadResult:
+        """Join `tracks` and load every batch; returns the summed LoadResult."""
+        total = LoadResult(inserted=0, updated=0, errors=[])
+        for batch in self.batches(tracks):
+            result = loader.load_batch(batch, uuid4())
+            total.inserted += result.inserted
+            total.updated += result.updated
+            total.errors.extend(result.errors)
+        logger.info("Track join: %d tracks in, %d out (%d spilled runs)", self.stats.tracks,
+                    self.stats.emitted, self.stats.spilled_runs)
+        return total
+
+    def _sorter(self, key: Callable[[Any], Any]) -> ExternalSorter:
+        return ExternalSorter(key, self.memory_budget_bytes, self.spill_dir, self.fan_in)
+
+    def _resolve(self, rows: Iterator[tuple], slot: int, entity: str) -> Iterator[List[tuple]]:
+        """Replace the source id in `slot` with its identity id, chunk by chunk in key order."""
+        stats = self.stats
+        while True:
+            chunk = list(islice(rows, self.lookup_chunk))
+            if not chunk:
+                return
+            ids = self.identifiers.lookup_many(entity, [r[slot] for r in chunk])
+            resolved = [r[:slot] + (i,) + r[slot + 1:] for r, i in zip(chunk, ids) if i is not None]
+            missing = len(chunk) - len(resolved)
+            if missing:
+                if slot == _DISC:
+                    stats.unresolved_disc += missing
+                else:
+                    stats.unresolved_recording += missing
+            yield resolved
+
@@ -0,0 +1,85 @@
+# python
+# file: src/core/normalization.py
+
+"""
+Name normalization shared by every translator, the lookup cache and the loaders' matching.
+
+Rules (ProcessFlow "Matching & normalization rules"):
+- trim and collapse internal whitespace to single spaces,
+- Unicode compatibility folding (NFKD: full-width forms, ligatures such as "ﬁ"),
+- strip diacritics from Latin letters ("Björk" -> "bjork", "Sigur Rós" -> "sigur ros"), including
+  letters without a decomposition ("ø", "ł", "æ"); marks on other scripts are kept, since
+  e.g. Cyrillic "й" and Japanese dakuten distinguish letters rather than decorate them,
+- casefold.
+
+normalize_name() is the one matching key of a name in Python: translators emit it
+(normalized_name) and LookupCache indexes on it. The MERGE loaders stage it next to the display
+name but compare it with the destination column under an accent-insensitive SQL collation
+(SqlServerMergeDialect.match_sql), which also ignores the non-Latin marks kept here, so the
+database may treat two names as one row that this function keeps apart.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterable, List, Optional
+import unicodedata
+
+DEFAULT_CACHE_SIZE = 200_000
+
+# Latin letters NFKD does not decompose
+_LATIN_FOLD = str.maketrans({
+    "ø": "o", "Ø": "O", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ħ": "h", "Ħ": "H",
+    "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "ß": "ss", "þ": "th", "Þ": "TH", "ı": "i",
+})
+# combining marks are dropped only after base letters below this code point (Latin blocks)
+_LATIN_END = 0x0250
+
+
+def _strip_latin_marks(text: str) -> str:
+    out = []
+    base = 0
+    for ch in unicodedata.normalize("NFKD", text):
+        if unicodedata.combining(ch):
+            if base < _LATIN_END:
+                continue
+        else:
+            base = ord(ch)
+        out.append(ch)
+    return unicodedata.normalize("NFC", "".join(out)).translate(_LATIN_FOLD)
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Canonical matching form of a name; None stays None."""
+    if name is None:
+        return None
+    if name.isascii():
+        return " ".join(name.split()).lower()
+    return " ".join(_strip_latin_marks(name).split()).casefold()
+
+
+class NameNormalizer:
+    """
+    Column-at-a-time, memoized normalize_name.
+
+    Artist, label, tag and genre names repeat heavily across a run, so results are kept in a
+    bounded LRU (functools.lru_cache; thread-safe) shared by every batch the instance sees.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._normalize = lru_cache(maxsize=maxsize)(normalize_name)
+
+    def __call__(self, name: Optional[str]) -> Optional[str]:
+        return self._normalize(name)
+
+    def normalize_many(self, names: Iterable[Optional[str]]) -> List[Optional[str]]:
+        return list(map(self._normalize, names))
+
+    def cache_info(self):
+        return self._normalize.cache_info()
+
+    def clear(self) -> None:
+        self._normalize.cache_clear()
+
+
+# process-wide instance used by translators that do not need their own cache
+default_normalizer = NameNormalizer()
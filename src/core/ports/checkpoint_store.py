@@ -0,0 +1,52 @@
+# python
+# file: src/core/ports/checkpoint_store.py
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Protocol
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    Progress of one entity (and partition) as of its last committed batch.
+
+    last_key: last source key loaded (keyset runs); last_ts: max source_updated_at loaded
+    (watermark runs), with the numeric source id of that row in last_key as the tie-break. completed is set once a run reached the end of its source; a full load
+    resumes only from an incomplete checkpoint, an incremental run from any.
+    """
+    entity: str
+    partition: str = ""
+    last_key: Optional[int] = None
+    last_ts: Optional[datetime] = None
+    batch_id: Optional[UUID] = None
+    rows: int = 0  # rows committed by the run that wrote the checkpoint
+    completed: bool = False
+    updated_at: Optional[datetime] = None
+
+
+class CheckpointStore(Protocol):
+    """
+    Durable per-entity run progress.
+
+    manage_transaction: True when save() commits on its own; the caller then saves right after
+    the batch committed (a crash in between replays at most that batch, which the MERGE makes
+    idempotent). False when save() joins the destination's open transaction; the caller saves
+    before committing the batch, so data and checkpoint commit atomically.
+    """
+
+    manage_transaction: bool
+
+    def load(self, entity: str, partition: str = "") -> Optional[Checkpoint]:
+        """Return the last saved checkpoint, or None when the entity never committed a batch."""
+        ...
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """Insert or replace the checkpoint of (entity, partition)."""
+        ...
+
+    def clear(self, entity: str, partition: str = "") -> None:
+        """Forget the checkpoint so the next run starts from the beginning."""
+        ...
@@ -1,5 +1,6 @@
 ﻿# python
-from typing import Iterable, Dict, Any, Protocol
+from typing import Iterable, Dict, Any, Protocol, Union
+from core.record_batch import RecordBatch
 
 class DestinationRepository(Protocol):
     def begin_transaction(self) -> None:
@@ -8,6 +9,6 @@ class DestinationRepository(Protocol):
         ...
     def rollback(self) -> None:
         ...
-    def upsert_artists(self, records: Iterable[Dict[str, Any]]) -> int:
-        \"\"\"Upsert artists into destination, return number of affected rows.\"\"\"
+    def upsert_artists(self, records: Union[Iterable[Dict[str, Any]], RecordBatch]) -> int:
+        """Upsert artists (dicts or a destination-shaped RecordBatch), return number of affected rows."""
         ...
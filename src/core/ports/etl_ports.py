@@ -2,9 +2,9 @@
 # file: src/core/ports/etl_ports.py
 
 from __future__ import annotations
-from typing import Iterable, Protocol, TypeVar, Generic, Optional
+from typing import Iterable, Protocol, Sequence, TypeVar, Generic, Optional
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from uuid import UUID
 
 TIn = TypeVar("TIn")
@@ -21,10 +21,27 @@ class LoadResult:
     inserted: int
     updated: int
     errors: list[dict]
+    # natural key -> destination identity id, as captured from MERGE OUTPUT (optional)
+    ids: dict = field(default_factory=dict)
+    # ({column: value} of the key and output columns, identity id) per MERGE OUTPUT row (optional)
+    rows: list = field(default_factory=list)
+    # MB integer source id -> destination identity id for rows that carried a source id (optional)
+    source_ids: dict = field(default_factory=dict)
+    # rows dropped before the load because their content hash was unchanged
+    skipped: int = 0
+    # source ids of rows moved to quarantine instead of being loaded (also listed in errors)
+    quarantined: list = field(default_factory=list)
+    # rows removed from the destination (junction sync deletes)
+    deleted: int = 0
 
 class Extractor(Protocol[TIn]):
     def extract_batch(self, since: Optional[datetime], limit: int) -> Iterable[TIn]:
-        """Return an iterable of TIn records from source."""
+        """
+        Return an iterable of TIn records from source (or one columnar RecordBatch).
+
+        Extractors with `seeks_watermark = True` receive a core.watermark.Watermark (or a bare
+        datetime) and return at most `limit` rows strictly after it, ordered by (timestamp, id).
+        """
         ...
 
 class Translator(Protocol[TIn, TOut]):
@@ -33,10 +50,20 @@ class Translator(Protocol[TIn, TOut]):
         ...
 
     def translate_batch(self, items: Iterable[TIn]) -> list[TOut]:
-        """Optional batch translation (default: map translate over items)."""
+        """Optional batch translation (default: map translate over items); may map RecordBatch -> RecordBatch."""
         ...
 
 class Loader(Protocol[TOut]):
     def load_batch(self, items: Iterable[TOut], batch_id: UUID) -> LoadResult:
-        """Load TOut items (staging + upsert) and return LoadResult."""
+        """Load TOut items or a RecordBatch (staging + upsert) and return LoadResult."""
+        ...
+
+class AsyncExtractor(Protocol[TIn]):
+    async def extract_batch(self, since: Optional[datetime], limit: int) -> Sequence[TIn]:
+        """Awaitable Extractor.extract_batch; returns the whole page (a sequence or RecordBatch)."""
+        ...
+
+class AsyncLoader(Protocol[TOut]):
+    async def load_batch(self, items: Iterable[TOut], batch_id: UUID) -> LoadResult:
+        """Awaitable Loader.load_batch."""
         ...
@@ -0,0 +1,16 @@
+# python
+# file: src/core/ports/identifier_map.py
+
+from __future__ import annotations
+from typing import List, Mapping, Optional, Protocol, Sequence
+
+class IdentifierMap(Protocol):
+    """Source (MB integer id) -> destination identity id mapping, one keyspace per entity type."""
+
+    def lookup_many(self, entity: str, source_ids: Sequence[int]) -> List[Optional[int]]:
+        """Resolve a column of source ids; the result is aligned with the input (None = unmapped)."""
+        ...
+
+    def add(self, entity: str, mappings: Mapping[int, int]) -> int:
+        """Record new or changed source id -> identity id mappings; returns the number recorded."""
+        ...
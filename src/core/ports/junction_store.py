@@ -0,0 +1,25 @@
+# python
+# file: src/core/ports/junction_store.py
+
+from __future__ import annotations
+from typing import Iterable, Protocol, Sequence, Tuple
+
+
+class JunctionStore(Protocol):
+    """
+    Destination side of a junction table seen as a set of (owner id, member id) pairs, e.g.
+    ArtistGenre as (ArtistId, GenreId).
+
+    manage_transaction: True when apply() commits its deltas on its own; False when it joins
+    the caller's open transaction.
+    """
+
+    manage_transaction: bool
+
+    def fetch_pairs(self, table: str, lo: int, hi: int) -> Iterable[Tuple[int, int]]:
+        """Current pairs of the owners lo <= owner < hi (any order)."""
+        ...
+
+    def apply(self, table: str, inserts: Sequence[Tuple[int, int]], deletes: Sequence[Tuple[int, int]]) -> None:
+        """Insert and delete the given pairs in bulk, as one unit of work."""
+        ...
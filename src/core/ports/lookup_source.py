@@ -0,0 +1,10 @@
+# python
+# file: src/core/ports/lookup_source.py
+
+from __future__ import annotations
+from typing import Any, Iterable, Protocol, Sequence, Tuple
+
+class LookupSource(Protocol):
+    def fetch_lookup_ids(self, table: str, key_columns: Sequence[str]) -> Iterable[Tuple[Any, ...]]:
+        """Return (key_col_1, ..., key_col_n, identity_id) for every row of a lookup table in one query."""
+        ...
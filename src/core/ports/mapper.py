@@ -1,9 +1,16 @@
 ﻿# python
-from typing import Dict, Any, Protocol
+from typing import Dict, Any, List, Protocol, Sequence
 from core.models import Artist
+from core.record_batch import RecordBatch
 
 class Mapper(Protocol):
     def map_source_artist_to_domain(self, row: Dict[str, Any]) -> Artist:
         ...
     def map_artist_to_destination(self, artist: Artist) -> Dict[str, Any]:
         ...
+    def map_artists_to_destination(self, artists: Sequence[Artist]) -> List[Dict[str, Any]]:
+        """Batch form of map_artist_to_destination; lets mappers resolve lookup ids per column."""
+        ...
+    def map_batch_to_destination(self, batch: RecordBatch) -> RecordBatch:
+        """Columnar source page -> destination-shaped RecordBatch, without per-row objects."""
+        ...
@@ -0,0 +1,33 @@
+# python
+# file: src/core/ports/quarantine_store.py
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+from uuid import UUID
+
+
+@dataclass
+class QuarantinedRow:
+    """One row the loader rejected, with enough context to fix and reprocess it (U09)."""
+    entity: str
+    batch_id: UUID
+    source_id: Optional[str]
+    payload: Dict[str, Any]
+    error_type: str
+    error_message: str
+    quarantined_at: Optional[datetime] = None
+    quarantine_id: Optional[int] = None  # assigned by the store
+
+
+class QuarantineStore(Protocol):
+    """Durable parking place for rows that failed to load."""
+
+    def add(self, rows: Sequence[QuarantinedRow]) -> None:
+        """Persist rows independently of the (rolled back) batch transaction that rejected them."""
+        ...
+
+    def pending(self, entity: str, limit: int = 1000) -> List[QuarantinedRow]:
+        """Return quarantined rows of an entity, oldest first, for reprocessing."""
+        ...
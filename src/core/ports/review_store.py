@@ -0,0 +1,34 @@
+# python
+# file: src/core/ports/review_store.py
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+from uuid import UUID
+
+
+@dataclass
+class ReviewItem:
+    """An incoming row whose match is ambiguous, with its ranked candidates (U02, U08)."""
+    entity: str
+    batch_id: UUID
+    source_id: Optional[str]
+    payload: Dict[str, Any]
+    reason: str
+    # (destination id, score), best first
+    candidates: List[Tuple[int, float]] = field(default_factory=list)
+    flagged_at: Optional[datetime] = None
+    review_id: Optional[int] = None  # assigned by the store
+
+
+class ReviewStore(Protocol):
+    """Where weak matches wait for a human decision instead of being auto-merged."""
+
+    def add(self, items: Sequence[ReviewItem]) -> None:
+        """Persist review items, independently of the batch that flagged them."""
+        ...
+
+    def pending(self, entity: str, limit: int = 1000) -> List[ReviewItem]:
+        """Return flagged rows of an entity, oldest first."""
+        ...
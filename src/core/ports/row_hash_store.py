@@ -0,0 +1,16 @@
+# python
+# file: src/core/ports/row_hash_store.py
+
+from __future__ import annotations
+from typing import Dict, Iterable, Mapping, Protocol
+
+class RowHashStore(Protocol):
+    """Persisted content hash of the last loaded destination row, per entity and source id."""
+
+    def get_many(self, entity: str, source_ids: Iterable[str]) -> Dict[str, bytes]:
+        """Return the stored hashes of the given source ids (ids without a hash are omitted)."""
+        ...
+
+    def put_many(self, entity: str, hashes: Mapping[str, bytes]) -> None:
+        """Insert or replace hashes; called only after the rows they describe were committed."""
+        ...
@@ -0,0 +1,26 @@
+# python
+# file: src/core/ports/row_range_source.py
+
+from __future__ import annotations
+from typing import Any, Iterable, Optional, Protocol, Sequence, Tuple
+
+
+class RowRangeSource(Protocol):
+    """
+    One side of a reconciliation: an entity's rows as (source id, *compared values), read by
+    source id range. Both sides of a comparison must produce the same values in the same order
+    for rows that are in sync (convert types in the query or in the adapter).
+
+    A side may also offer `chunk_digests(lo, hi, width)` returning (chunk index, row count,
+    digest) per non-empty chunk, computed where the rows live (see
+    application.services.reconciliation.row_digest); the reconciler then reads no rows of
+    matching chunks.
+    """
+
+    def key_range(self) -> Optional[Tuple[int, int]]:
+        """(lowest, highest) source id, or None when the entity has no rows."""
+        ...
+
+    def rows_between(self, lo: int, hi: int) -> Iterable[Sequence[Any]]:
+        """Rows with lo <= source id < hi, ascending by source id; the source id comes first."""
+        ...
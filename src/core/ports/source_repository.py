@@ -1,7 +1,23 @@
 ﻿# python
-from typing import Iterable, Dict, Any, Protocol
+from typing import Iterable, Dict, Any, Optional, Protocol
+from core.record_batch import RecordBatch
 
 class SourceRepository(Protocol):
     def fetch_artists_batch(self, offset: int, limit: int) -> Iterable[Dict[str, Any]]:
-        \"\"\"Return raw rows (DB-specific dict) from source in batches.\"\"\"
+        """Return raw rows (DB-specific dict) from source in batches."""
+        ...
+
+    def fetch_artists_after(self, after_id: Optional[int], limit: int,
+                            before_id: Optional[int] = None) -> Iterable[Dict[str, Any]]:
+        """
+        Keyset (seek) pagination: return up to `limit` raw rows with id > after_id, ordered by id.
+        after_id=None starts from the beginning of the table; before_id (exclusive) bounds the
+        scan to one id range for partitioned runs. Cost per page does not grow with the
+        position in the table, unlike OFFSET paging.
+        """
+        ...
+
+    def fetch_artist_columns_after(self, after_id: Optional[int], limit: int,
+                                   before_id: Optional[int] = None) -> RecordBatch:
+        """Columnar form of fetch_artists_after: one RecordBatch (id, name, sort_name, country) per page."""
         ...
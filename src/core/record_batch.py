@@ -0,0 +1,218 @@
+# python
+# file: src/core/record_batch.py
+
+"""
+Columnar record batches.
+
+A RecordBatch holds one column per field instead of one object per row: numeric and boolean
+columns are packed `array` buffers (8 / 1 bytes per value), string and object columns are plain
+lists that reference the values the driver already produced. Nulls are tracked in a per-column
+byte mask that is only allocated once a column actually contains a null.
+
+A 500k-row batch therefore costs a handful of allocations per column rather than a dict (or
+dataclass) per row for every stage it passes through.
+"""
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STR = "str"
+OBJECT = "object"
+
+_TYPECODES = {INT: "q", FLOAT: "d", BOOL: "b"}
+_PLACEHOLDER = {INT: 0, FLOAT: 0.0, BOOL: 0}
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    name: str
+    type: str = OBJECT
+
+    def __post_init__(self) -> None:
+        if self.type not in (INT, FLOAT, BOOL, STR, OBJECT):
+            raise ValueError(f"Unknown field type for {self.name}: {self.type!r}")
+
+
+class Column:
+    """Values of one field: a typed buffer (or list) plus an optional null mask (1 = null)."""
+
+    __slots__ = ("field", "data", "nulls")
+
+    def __init__(self, field: Field, data: Any, nulls: Optional[bytearray] = None) -> None:
+        if nulls is not None and len(nulls) != len(data):
+            raise ValueError(f"null mask of {field.name} does not match its length")
+        self.field = field
+        self.data = data
+        self.nulls = nulls if nulls is not None and any(nulls) else None
+
+    @classmethod
+    def from_values(cls, field: Field, values: Iterable[Any]) -> "Column":
+        typecode = _TYPECODES.get(field.type)
+        if typecode is None:
+            data = values if isinstance(values, list) else list(values)
+            nulls = bytearray(v is None for v in data) if None in data else None
+            return cls(field, data, nulls)
+        data = array(typecode)
+        nulls = None
+        placeholder = _PLACEHOLDER[field.type]
+        for i, value in enumerate(values):
+            if value is None:
+                if nulls is None:
+                    nulls = bytearray(i)
+                nulls.append(1)
+                data.append(placeholder)
+            else:
+                if nulls is not None:
+                    nulls.append(0)
+                data.append(value)
+        return cls(field, data, nulls)
+
+    @property
+    def null_count(self) -> int:
+        return 0 if self.nulls is None else self.nulls.count(1)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, i: int) -> Any:
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        value = self.data[i]
+        return bool(value) if self.field.type == BOOL else value
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.nulls is None and self.field.type != BOOL:
+            return iter(self.data)
+        return (self[i] for i in range(len(self.data)))
+
+    def to_list(self) -> List[Any]:
+        return list(self)
+
+    def take(self, indices: Sequence[int]) -> "Column":
+        data = self.data
+        if isinstance(data, array):
+            taken = array(data.typecode, [data[i] for i in indices])
+        else:
+            taken = [data[i] for i in indices]
+        nulls = bytearray(self.nulls[i] for i in indices) if self.nulls is not None else None
+        return Column(self.field, taken, nulls)
+
+    def slice(self, start: int, stop: int) -> "Column":
+        nulls = self.nulls[start:stop] if self.nulls is not None else None
+        return Column(self.field, self.data[start:stop], nulls)
+
+    def renamed(self, name: str) -> "Column":
+        return Column(Field(name, self.field.type), self.data, self.nulls)
+
+
+class RecordBatch:
+    """
+    Immutable set of equally long columns.
+
+    Responsibilities:
+    - build from driver tuples, dicts or whole columns
+    - column access by name (`batch["name"]`) and row iteration as tuples (e.g. executemany)
+    - cheap derivation: select / rename / with_column share the untouched column buffers
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, columns: Sequence[Column]) -> None:
+        lengths = {len(c) for c in columns}
+        if len(lengths) > 1:
+            raise ValueError(f"columns differ in length: {sorted(lengths)}")
+        self._columns: Dict[str, Column] = {}
+        for column in columns:
+            if column.field.name in self._columns:
+                raise ValueError(f"duplicate column {column.field.name}")
+            self._columns[column.field.name] = column
+        self._length = lengths.pop() if lengths else 0
+
+    # -- construction -------------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, fields: Sequence[Field], columns: Sequence[Iterable[Any]]) -> "RecordBatch":
+        return cls([Column.from_values(f, values) for f, values in zip(fields, columns, strict=True)])
+
+    @classmethod
+    def from_rows(cls, fields: Sequence[Field], rows: Sequence[Sequence[Any]]) -> "RecordBatch":
+        """Positional rows (e.g. DB-API tuples) in `fields` order."""
+        return cls([Column.from_values(f, map(itemgetter(i), rows)) for i, f in enumerate(fields)])
+
+    @classmethod
+    def from_dicts(cls, fields: Sequence[Field], rows: Sequence[Mapping[str, Any]]) -> "RecordBatch":
+        return cls([Column.from_values(f, (r.get(f.name) for r in rows)) for f in fields])
+
+    @classmethod
+    def concat(cls, batches: Sequence["RecordBatch"]) -> "RecordBatch":
+        if not batches:
+            return cls([])
+        if len(batches) == 1:
+            return batches[0]
+        fields = batches[0].fields
+        return cls([Column.from_values(f, (v for b in batches for v in b[f.name])) for f in fields])
+
+    # -- access -------------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> Column:
+        return self._columns[name]
+
+    def get(self, name: str) -> Optional[Column]:
+        return self._columns.get(name)
+
+    @property
+    def fields(self) -> Tuple[Field, ...]:
+        return tuple(c.field for c in self._columns.values())
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._columns)
+
+    def rows(self, names: Optional[Sequence[str]] = None) -> Iterator[Tuple[Any, ...]]:
+        """Iterate rows as tuples of the given columns (default: all, in field order)."""
+        cols = [self._columns[n] for n in (names if names is not None else self._columns)]
+        return zip(*cols) if cols else iter(())
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {name: col[i] for name, col in self._columns.items()}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        names = self.names
+        return [dict(zip(names, values)) for values in self.rows()]
+
+    # -- derivation ---------------------------------------------------------------------------
+
+    def select(self, names: Sequence[str]) -> "RecordBatch":
+        return RecordBatch([self._columns[n] for n in names])
+
+    def rename(self, mapping: Mapping[str, str]) -> "RecordBatch":
+        return RecordBatch([c.renamed(mapping[n]) if n in mapping else c for n, c in self._columns.items()])
+
+    def with_column(self, field: Field, values: Iterable[Any]) -> "RecordBatch":
+        """Add (or replace) a column; other columns are shared, not copied."""
+        column = Column.from_values(field, values)
+        columns = dict(self._columns)
+        columns[field.name] = column
+        return RecordBatch(list(columns.values()))
+
+    def take(self, indices: Sequence[int]) -> "RecordBatch":
+        return RecordBatch([c.take(indices) for c in self._columns.values()])
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "RecordBatch":
+        stop = self._length if stop is None else stop
+        return RecordBatch([c.slice(start, stop) for c in self._columns.values()])
+
+    def __repr__(self) -> str:
+        return f"RecordBatch(rows={self._length}, fields={list(self.names)})"
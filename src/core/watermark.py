@@ -0,0 +1,163 @@
+# python
+# file: src/core/watermark.py
+
+"""
+Compound (source_updated_at, source_id) watermark.
+
+A timestamp-only cursor (`last_updated > since`) silently skips the rows that share the
+boundary timestamp with the last row of a page: MusicBrainz edit bursts stamp thousands of
+rows with the same second. Ordering rows by (timestamp, id) and seeking strictly past the
+pair makes every page boundary exact, so extractors can honour `limit` without losing rows:
+
+    WHERE (last_updated, id) > (%(ts)s, %(id)s) ORDER BY last_updated, id LIMIT %(limit)s
+
+Ids compare as integers when they are ints or decimal strings (translated rows carry the MB
+id as text) and as text otherwise. A watermark without an id (a legacy, timestamp-only
+watermark) sorts after every row of its timestamp, which is exactly what `> since` used to mean.
+
+persist_watermark() hands a persist_watermark_fn the whole watermark when it accepts a
+`watermark` keyword; a store that keeps only the timestamp resumes after the entire boundary
+timestamp and loses the rest of a tie group interrupted by a crash.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+import inspect
+
+from core.record_batch import RecordBatch
+
+# id key of a watermark without an id: after every id at its timestamp
+_AFTER_ALL_IDS = (2,)
+
+
+def id_key(source_id: Any) -> Tuple[Any, ...]:
+    if source_id is None:
+        return _AFTER_ALL_IDS
+    if isinstance(source_id, int):
+        return (0, source_id)
+    text = str(source_id)
+    return (0, int(text)) if text.isdigit() else (1, text)
+
+
+def sort_key(ts: Optional[datetime], source_id: Any) -> Tuple[Any, ...]:
+    """Row order of a watermark scan; rows without a timestamp sort first."""
+    return (True, ts, id_key(source_id)) if ts is not None else (False, 0, id_key(source_id))
+
+
+@dataclass(frozen=True, eq=False)
+class Watermark:
+    """Position after the row (source_updated_at, source_id); ordered by that pair."""
+    source_updated_at: datetime
+    source_id: Any = None
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        return sort_key(self.source_updated_at, self.source_id)
+
+    @property
+    def int_id(self) -> Optional[int]:
+        """The id as an integer (e.g. for Checkpoint.last_key), or None when it is not numeric."""
+        kind, *value = id_key(self.source_id)
+        return value[0] if kind == 0 else None
+
+    def precedes(self, ts: Optional[datetime], source_id: Any) -> bool:
+        """True when the row (ts, source_id) comes after this watermark, i.e. is still to load."""
+        return ts is not None and sort_key(ts, source_id) > self.key
+
+    @classmethod
+    def coerce(cls, since: Union[None, datetime, "Watermark"]) -> Optional["Watermark"]:
+        """A Watermark from a since argument; a bare datetime is a timestamp-only watermark."""
+        if since is None or isinstance(since, Watermark):
+            return since
+        return cls(since)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Watermark) and self.key == other.key
+
+    def __lt__(self, other: "Watermark") -> bool:
+        return self.key < other.key
+
+    def __le__(self, other: "Watermark") -> bool:
+        return self.key <= other.key
+
+    def __gt__(self, other: "Watermark") -> bool:
+        return self.key > other.key
+
+    def __ge__(self, other: "Watermark") -> bool:
+        return self.key >= other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+
+def since_for(extractor: Any, cursor: Optional[Watermark]) -> Union[None, datetime, Watermark]:
+    """
+    The `since` argument for an extractor: the Watermark itself when the extractor declares
+    `seeks_watermark = True`, else its timestamp (timestamp-only extractors keep `> since`).
+    """
+    if cursor is None or getattr(extractor, "seeks_watermark", False):
+        return cursor
+    return cursor.source_updated_at
+
+
+def _takes_watermark(fn: Callable[..., Any]) -> bool:
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "watermark" or p.kind is inspect.Parameter.VAR_KEYWORD for p in params)
+
+
+def persist_watermark(fn: Callable[..., Any], watermark: Optional[Watermark], batch_id: Any) -> Any:
+    """
+    Call persist_watermark_fn(max_ts, batch_id) for a loaded batch, adding `watermark=` (the
+    Watermark itself) when fn accepts it. Returns fn's result, which async callers may await.
+    """
+    max_ts = watermark.source_updated_at if watermark is not None else None
+    if _takes_watermark(fn):
+        return fn(max_ts, batch_id, watermark=watermark)
+    return fn(max_ts, batch_id)
+
+
+def _getter(item: Any) -> Callable[[Any], Tuple[Any, Any]]:
+    if isinstance(item, dict):
+        return lambda row: (row.get("source_updated_at"), row.get("source_id"))
+    has_ts = hasattr(item, "source_updated_at")
+    has_id = hasattr(item, "source_id")
+    return lambda row: (getattr(row, "source_updated_at") if has_ts else None,
+                        getattr(row, "source_id") if has_id else None)
+
+
+def max_watermark(items: Iterable[Any]) -> Optional[Watermark]:
+    """
+    Highest (source_updated_at, source_id) of translated rows - dicts, objects or a RecordBatch
+    with those columns - or None when no row carries a timestamp.
+
+    Attribute lookup is resolved once per row type rather than probed on every row.
+    """
+    if isinstance(items, RecordBatch):
+        ts_col, id_col = items.get("source_updated_at"), items.get("source_id")
+        if ts_col is None:
+            return None
+        pairs: Iterable[Tuple[Any, Any]] = zip(ts_col, id_col if id_col is not None else [None] * len(ts_col))
+    else:
+        getters: Dict[type, Callable[[Any], Tuple[Any, Any]]] = {}
+
+        def pair(row: Any) -> Tuple[Any, Any]:
+            get = getters.get(type(row))
+            if get is None:
+                get = getters[type(row)] = _getter(row)
+            return get(row)
+        pairs = map(pair, items)
+    best_ts: Optional[datetime] = None
+    tied: list = []
+    for ts, source_id in pairs:
+        if not ts:
+            continue
+        if best_ts is None or ts > best_ts:
+            best_ts, tied = ts, [source_id]
+        elif ts == best_ts:
+            tied.append(source_id)
+    return Watermark(best_ts, max(tied, key=id_key)) if best_ts is not None else None
@@ -0,0 +1,34 @@
+# python
+# file: src/infra/process.py
+
+"""Process resource probes (stdlib only)."""
+
+from __future__ import annotations
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int:
+    """
+    Resident set size of this process in bytes.
+
+    Reads /proc/self/statm where available (current RSS); elsewhere falls back to the peak RSS
+    reported by getrusage, which never decreases. Returns 0 when neither is available.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -1,31 +1,123 @@
 ﻿# python
-\"\"\"
+"""
 Composition root: only place where concrete adapters are instantiated and wired.
-\"\"\"
+"""
+import logging
+import os
+
 from infra.config import load_config
 from infra.logging import configure_logging
+from infra.process import current_rss_bytes
 from adapters.postgres.connection import PostgresConnection
 from adapters.postgres.repository import PostgresRepository
 from adapters.sqlserver.connection import SQLServerConnection
 from adapters.sqlserver.repository import SQLServerRepository
+from adapters.sqlserver.lookup_source import SQLServerLookupSource
+from adapters.sqlserver.identifier_source import SQLServerIdentifierSource
+from adapters.local.identifier_index import MmapIdentifierIndex
+from adapters.local.row_hash_store import SQLiteRowHashStore
+from adapters.local.prometheus_textfile import PrometheusTextfileExporter
+from adapters.sqlserver.run_audit import SQLServerRunAudit
+from adapters.sqlserver.checkpoint_store import SQLServerCheckpointStore
 from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
 from application.services.etl_service import ETLService
+from application.services.batch_sizing import AdaptiveBatchController
+from application.services.lookup_cache import LookupCache
+from application.services.change_detection import ChangeDetector
+from application.services.scheduler import DagScheduler, build_nodes
+from application.services.instrumentation import MetricsRecorder
 
 def main():
     configure_logging()
     cfg = load_config()
 
+    # one pool per database, shared by every repository: each pipeline thread / task borrows
+    # its own connection from it instead of serializing on one or reconnecting
+    p = cfg.pool
+    pool_opts = dict(min_size=p.min_size, max_size=p.max_size, checkout_timeout_s=p.checkout_timeout_s,
+                     validate_idle_s=p.validate_idle_s)
+    pg_pool = PostgresConnection.create_pool(cfg.postgres.dsn, **pool_opts)
+    ss_pool = SQLServerConnection.create_pool(cfg.sqlserver.conn_str, **pool_opts)
+    pg_pool.warm()
+    ss_pool.warm()
+
     # instantiate adapters (concrete)
-    pg_conn = PostgresConnection(cfg.postgres.dsn)
+    pg_conn = PostgresConnection(cfg.postgres.dsn, fetch_size=cfg.postgres.fetch_size, pool=pg_pool)
     src_repo = PostgresRepository(pg_conn)
 
-    ss_conn = SQLServerConnection(cfg.sqlserver.conn_str)
-    dst_repo = SQLServerRepository(ss_conn)
+    ss_conn = SQLServerConnection(cfg.sqlserver.conn_str, pool=ss_pool)
+    os.makedirs(cfg.state_dir, exist_ok=True)
+
+    # MB id -> ArtistId map on local disk; bootstrapped from music.Identifier on first run
+    identifiers = MmapIdentifierIndex(os.path.join(cfg.state_dir, 'identifiers'))
+    if identifiers.size('Artist') == (0, 0):
+        identifiers.rebuild('Artist', SQLServerIdentifierSource(ss_conn).fetch_identifier_pairs('Artist'))
+
+    dst_repo = SQLServerRepository(ss_conn, identifiers=identifiers)
+
+    # run-wide lookup id cache: one query per lookup table, shared by every entity pipeline
+    lookups = LookupCache()
+    lookups.preload(SQLServerLookupSource(ss_conn))
+
+    mapper = MusicBrainzToDomainMapper(lookups)
+
+    # skip artists whose destination row is unchanged since the last run
+    row_hashes = SQLiteRowHashStore(os.path.join(cfg.state_dir, 'row_hashes.sqlite'))
+
+    # page size adapts per entity toward the target batch latency, under the RSS ceiling
+    b = cfg.batch
+    artist_batches = AdaptiveBatchController(
+        initial=b.initial, min_size=b.min_size, max_size=b.max_size, target_latency_s=b.target_latency_s,
+        max_rss_bytes=b.max_rss_mb * 2**20 if b.max_rss_mb else None, rss_fn=current_rss_bytes)
+
+    # per-batch stage metrics: in-memory histograms, optional Prometheus textfile, ETLRun audit rows
+    metrics = MetricsRecorder()
+    hooks = [metrics]
+    exporter = None
+    if cfg.metrics_textfile:
+        exporter = PrometheusTextfileExporter(metrics, cfg.metrics_textfile, pools=[pg_pool, ss_pool])
+        hooks.append(exporter)
+    audit_conn = None
+    if cfg.run_audit:
+        # own, unpooled connection: a pooled one would be the calling thread's and share its
+        # open batch transaction, but audit rows must commit independently of it
+        audit_conn = SQLServerConnection(cfg.sqlserver.conn_str)
+        audit = SQLServerRunAudit(audit_conn)
+        audit.ensure_table()
+        hooks.append(audit)
+
+    # music.ETLWatermark rows on the destination connection: each checkpoint commits with its batch
+    checkpoints = SQLServerCheckpointStore(ss_conn, manage_transaction=False)
+    checkpoints.ensure_table()
 
-    mapper = MusicBrainzToDomainMapper()
+    etl = ETLService(src_repo, dst_repo, mapper, batch_size=b.initial,
+                     change_detector=ChangeDetector(row_hashes, 'Artist'), columnar=True,
+                     batch_sizer=artist_batches, hooks=hooks, checkpoints=checkpoints)
 
-    etl = ETLService(src_repo, dst_repo, mapper, batch_size=500)
-    etl.run_full_load()
+    # entity pipelines run in FK order (MUSIC_COLLECTION_DAG); register each entity here as it
+    # gets a pipeline. Pipelines running concurrently need their own connections.
+    pipelines = {
+        'Artist': etl.run_full_load,
+    }
+    report = DagScheduler(build_nodes(pipelines)).run()
+    logging.getLogger(__name__).info('Stage metrics:\n%s', metrics.summary())
+    if exporter is not None:
+        exporter.write()
+    if audit_conn is not None:
+        audit_conn.close()
+    pg_conn.close()
+    ss_conn.close()
+    for pool in (pg_pool, ss_pool):
+        stats = pool.stats()
+        logging.getLogger(__name__).info(
+            'Pool %s: %d checkouts, %d waited (p95 <= %.3fs), %d timeouts, %d connections opened',
+            stats.name, stats.checkouts, stats.waited, stats.wait.quantile(0.95), stats.timeouts, stats.created)
+        pool.close()
+    row_hashes.close()
+    identifiers.compact()
+    identifiers.close()
+    if not report.succeeded:
+        raise SystemExit(1)
 
 if __name__ == '__main__':
     main()
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 # Reuse the Protocol names from core.ports.etl_ports in tests via structural typing.
 # If your project names differ, adjust imports accordingly.
 from core.ports.etl_ports import Extractor, Translator, Loader, LoadResult
+from core.normalization import default_normalizer
+from core.watermark import Watermark, sort_key
 
 @dataclass
 class GenreIn:
@@ -24,17 +26,41 @@ class GenreOut:
     source_updated_at: datetime
 
 class MockGenreExtractor(Extractor[GenreIn]):
+    seeks_watermark = True
+
+    def __init__(self, rows: Iterable[GenreIn]):
+        self._rows = sorted(rows, key=lambda r: sort_key(r.last_updated, r.mb_id))
+
+    def extract_batch(self, since: datetime | Watermark | None, limit: int):
+        since = Watermark.coerce(since)
+        return [r for r in self._rows if since is None or since.precedes(r.last_updated, r.mb_id)][:limit]
+
+class PagedGenreExtractor(Extractor[GenreIn]):
+    """Timestamp-only extractor that honours `limit`, so a run spans several batches; records its calls."""
+
     def __init__(self, rows: Iterable[GenreIn]):
-        self._rows = list(rows)
+        self._rows = sorted(rows, key=lambda r: r.last_updated)
+        self.calls = 0
+        self.limits: list[int] = []
+        self.sinces: list = []
 
     def extract_batch(self, since: datetime | None, limit: int):
-        for r in self._rows:
-            if since is None or r.last_updated > since:
-                yield r
+        self.calls += 1
+        self.limits.append(limit)
+        self.sinces.append(since)
+        return [r for r in self._rows if since is None or r.last_updated > since][:limit]
 
 class MockGenreTranslator(Translator[GenreIn, GenreOut]):
     def translate(self, item: GenreIn) -> GenreOut:
-        normalized = " ".join(item.name.strip().lower().split())
+        return self._build(item, default_normalizer(item.name))
+
+    def translate_batch(self, items: Iterable[GenreIn]) -> List[GenreOut]:
+        items = list(items)
+        normalized = default_normalizer.normalize_many([i.name for i in items])
+        return [self._build(i, n) for i, n in zip(items, normalized)]
+
+    @staticmethod
+    def _build(item: GenreIn, normalized: str) -> GenreOut:
         return GenreOut(
             source_id=str(item.mb_id),
             name=item.name.strip(),
@@ -42,9 +68,6 @@ class MockGenreTranslator(Translator[GenreIn, GenreOut]):
             source_updated_at=item.last_updated,
         )
 
-    def translate_batch(self, items: Iterable[GenreIn]) -> List[GenreOut]:
-        return [self.translate(i) for i in items]
-
 class MockGenreLoader(Loader[GenreOut]):
     def __init__(self):
         # simple in-memory store keyed by normalized_name
@@ -74,3 +97,10 @@ def sample_genres():
         GenreIn(mb_id=11, name="Progressive Rock", last_updated=base + timedelta(hours=2)),
         GenreIn(mb_id=12, name=" electronic ", last_updated=base + timedelta(hours=3)),
     ]
+
+def make_genres(n: int, offset: int = 0, width: int = 0) -> List[GenreIn]:
+    """n genres a minute apart from 2020-01-01 (mb ids 0..n-1); `width` pads each name."""
+    base = datetime(2020, 1, 1)
+    pad = " " + "x" * width if width else ""
+    return [GenreIn(mb_id=i, name=f"Genre {i + offset}{pad}", last_updated=base + timedelta(minutes=i))
+            for i in range(n)]
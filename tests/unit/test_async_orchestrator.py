@@ -0,0 +1,162 @@
+# python
+# File: tests/unit/test_async_orchestrator.py
+from __future__ import annotations
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from application.services.async_orchestrator import (
+    AsyncOrchestrator, EndpointLimits, run_pipelines,
+)
+from core.ports.etl_ports import LoadResult
+from core.watermark import Watermark
+from .conftest import MockGenreExtractor, MockGenreTranslator, MockGenreLoader, GenreIn, GenreOut, make_genres
+
+
+class AsyncPagedExtractor:
+    def __init__(self, rows, log, delay=0.01):
+        self._rows = sorted(rows, key=lambda r: r.last_updated)
+        self.log = log
+        self.delay = delay
+
+    async def extract_batch(self, since, limit):
+        self.log.append("extract-start")
+        await asyncio.sleep(self.delay)
+        self.log.append("extract-end")
+        return [r for r in self._rows if since is None or r.last_updated > since][:limit]
+
+
+class AsyncRecordingLoader:
+    def __init__(self, log, delay=0.02, fail=False):
+        self.log = log
+        self.delay = delay
+        self.fail = fail
+        self.loaded: list[GenreOut] = []
+
+    async def load_batch(self, items, batch_id):
+        self.log.append("load-start")
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("destination unavailable")
+        self.loaded.extend(items)
+        self.log.append("load-end")
+        return LoadResult(inserted=len(items), updated=0, errors=[])
+
+
+def _recorder():
+    persisted = []
+
+    def persist(max_ts, batch_id):
+        persisted.append(max_ts)
+    return persisted, persist
+
+
+def test_sync_adapters_run_through_thread_shims(sample_genres):
+    loader = MockGenreLoader()
+    persisted, persist = _recorder()
+    orch = AsyncOrchestrator[GenreIn, GenreOut](MockGenreExtractor(sample_genres), MockGenreTranslator(), loader)
+
+    batches = asyncio.run(orch.run_full_load(persist))
+
+    assert batches == 1
+    assert set(loader.store) == {"rock", "progressive rock", "electronic"}
+    assert persisted == [max(g.last_updated for g in sample_genres)]
+
+
+def test_next_page_is_prefetched_while_loading():
+    log: list[str] = []
+    loader = AsyncRecordingLoader(log)
+    persisted, persist = _recorder()
+    orch = AsyncOrchestrator[GenreIn, GenreOut](AsyncPagedExtractor(make_genres(6), log), MockGenreTranslator(),
+                                                loader, batch_size=2)
+
+    assert asyncio.run(orch.run_full_load(persist)) == 3
+
+    assert [g.name for g in loader.loaded] == [f"Genre {i}" for i in range(6)]
+    assert persisted == [datetime(2020, 1, 1, 0, m) for m in (1, 3, 5)]
+    # page 2 is requested before page 1 finished loading
+    first_load_end = log.index("load-end")
+    assert log[:first_load_end].count("extract-start") == 2
+
+
+def test_async_persist_fn_is_awaited(sample_genres):
+    persisted = []
+
+    async def persist(max_ts, batch_id):
+        await asyncio.sleep(0)
+        persisted.append(max_ts)
+
+    orch = AsyncOrchestrator[GenreIn, GenreOut](MockGenreExtractor(sample_genres), MockGenreTranslator(),
+                                                MockGenreLoader())
+    asyncio.run(orch.run_full_load(persist))
+    assert len(persisted) == 1
+
+
+@pytest.mark.parametrize("seeks", [True, False])
+def test_pages_past_the_limit_are_cut_when_seeking_and_warned_about_otherwise(seeks, caplog):
+    class OverReturningExtractor(AsyncPagedExtractor):
+        seeks_watermark = seeks
+
+        async def extract_batch(self, since, limit):
+            pages.append(limit)
+            await asyncio.sleep(0)
+            since = Watermark.coerce(since)
+            return [r for r in self._rows if since is None or since.precedes(r.last_updated, r.mb_id)]
+
+    pages: list[int] = []
+    loader = AsyncRecordingLoader([], delay=0)
+    persisted, persist = _recorder()
+    orch = AsyncOrchestrator[GenreIn, GenreOut](OverReturningExtractor(make_genres(5), []), MockGenreTranslator(),
+                                                loader, batch_size=2)
+
+    batches = asyncio.run(orch.run_full_load(persist))
+
+    assert [g.name for g in loader.loaded] == [f"Genre {i}" for i in range(5)]
+    if seeks:
+        # every page is cut to the limit and its rest extracted again
+        assert (batches, len(persisted)) == (3, 3)
+        assert "batches are not bounded" not in caplog.text
+    else:
+        assert batches == 1
+        assert caplog.text.count("OverReturningExtractor returned 5 rows for limit 2") == 1
+
+
+def test_endpoint_limit_caps_concurrent_loads_across_pipelines():
+    limits = EndpointLimits({"destination": 2})
+    loaders = [AsyncRecordingLoader([]) for _ in range(5)]
+
+    async def main():
+        return await run_pipelines({
+            f"lookup{i}": AsyncOrchestrator[GenreIn, GenreOut](
+                AsyncPagedExtractor(make_genres(4, offset=10 * i), []), MockGenreTranslator(), loader,
+                batch_size=2, limits=limits).run_full_load(lambda ts, batch_id: None)
+            for i, loader in enumerate(loaders)
+        })
+
+    errors = asyncio.run(main())
+
+    assert errors == {f"lookup{i}": None for i in range(5)}
+    assert all(len(loader.loaded) == 4 for loader in loaders)
+    assert limits.peak["destination"] == 2
+    assert limits.peak["source"] > 1
+
+
+def test_failed_pipeline_does_not_stop_the_others():
+    good = AsyncRecordingLoader([])
+
+    async def main():
+        return await run_pipelines({
+            "good": AsyncOrchestrator(AsyncPagedExtractor(make_genres(3), []), MockGenreTranslator(), good,
+                                      ).run_full_load(lambda ts, batch_id: None),
+            "bad": AsyncOrchestrator(AsyncPagedExtractor(make_genres(3), []), MockGenreTranslator(),
+                                     AsyncRecordingLoader([], fail=True), max_retries=1,
+                                     ).run_full_load(lambda ts, batch_id: None),
+        })
+
+    errors = asyncio.run(main())
+
+    assert errors["good"] is None and len(good.loaded) == 3
+    assert isinstance(errors["bad"], RuntimeError)
+    with pytest.raises(ValueError):
+        EndpointLimits({"source": 0})
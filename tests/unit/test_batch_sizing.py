@@ -0,0 +1,100 @@
+# python
+# File: tests/unit/test_batch_sizing.py
+from __future__ import annotations
+
+import pytest
+
+from application.services.batch_sizing import AdaptiveBatchController, BatchObservation
+from application.services.orchestrator import Orchestrator
+from .conftest import MockGenreTranslator, MockGenreLoader, PagedGenreExtractor, GenreIn, GenreOut, make_genres
+
+
+def _obs(rows, seconds, rss=None):
+    return BatchObservation(rows, extract_s=seconds / 2, load_s=seconds / 2, rss_bytes=rss)
+
+
+def test_grows_toward_target_latency_within_growth_and_bounds():
+    ctl = AdaptiveBatchController(initial=100, min_size=50, max_size=1000, target_latency_s=1.0)
+    # 100 rows in 0.1s -> 10x headroom, but at most 2x per step
+    assert ctl.observe(_obs(100, 0.1)) == 200
+    assert ctl.observe(_obs(200, 0.2)) == 400
+    assert ctl.observe(_obs(400, 0.4)) == 800
+    assert ctl.observe(_obs(800, 0.8)) == 1000  # max_size
+    assert ctl.decisions[-1].reason == "under target latency"
+
+
+def test_shrinks_when_over_target_and_holds_when_on_target():
+    ctl = AdaptiveBatchController(initial=1000, min_size=100, max_size=5000, target_latency_s=1.0, smoothing=1.0)
+    assert ctl.observe(_obs(1000, 4.0)) == 500
+    assert ctl.observe(_obs(500, 1.05)) == 500
+    assert ctl.decisions[-1].reason == "on target"
+
+
+def test_rss_ceiling_shrinks_and_headroom_blocks_growth():
+    mib = 2**20
+    ctl = AdaptiveBatchController(initial=1000, min_size=100, target_latency_s=10.0, max_rss_bytes=100 * mib)
+    assert ctl.observe(_obs(1000, 0.1, rss=150 * mib)) == 500
+    assert ctl.decisions[-1].reason == "rss over ceiling"
+    assert ctl.observe(_obs(500, 0.05, rss=95 * mib)) == 500
+    assert ctl.decisions[-1].reason == "rss near ceiling"
+
+
+def test_rss_is_sampled_from_rss_fn():
+    ctl = AdaptiveBatchController(initial=400, max_rss_bytes=1000, rss_fn=lambda: 5000)
+    assert ctl.observe(BatchObservation(400, load_s=0.01)) == 200
+    assert ctl.decisions[-1].observation.rss_bytes == 5000
+
+
+def test_throughput_drop_after_growth_steps_back_and_caps():
+    ctl = AdaptiveBatchController(initial=100, min_size=10, max_size=10_000, target_latency_s=10.0)
+    assert ctl.observe(_obs(100, 0.1)) == 200         # 1000 rows/s
+    assert ctl.observe(_obs(200, 0.4)) == 100         # 500 rows/s: growth hurt
+    assert ctl.decisions[-1].reason == "throughput dropped"
+    assert ctl.observe(_obs(100, 0.1)) == 100         # capped at the size that performed
+    assert ctl.decisions[-1].reason == "at cap"
+
+
+def test_cap_decays_back_once_throughput_recovers():
+    ctl = AdaptiveBatchController(initial=100, min_size=10, max_size=10_000, target_latency_s=10.0, cap_decay=3)
+    assert ctl.observe(_obs(100, 0.1)) == 200
+    assert ctl.observe(_obs(200, 0.4)) == 100         # throughput dropped: cap at 100
+    assert ctl.observe(_obs(100, 0.1)) == 100
+    assert ctl.observe(_obs(100, 0.1)) == 100
+    assert ctl.decisions[-1].reason == "at cap"
+    assert ctl.observe(_obs(100, 0.1)) == 200         # third steady observation raises the cap
+    # the larger batch performs again, and the cap keeps decaying toward max_size
+    assert [ctl.observe(_obs(200, 0.2)) for _ in range(3)] == [200, 200, 400]
+    assert ctl.decisions[-1].reason == "under target latency"
+
+
+def test_short_batch_does_not_grow():
+    ctl = AdaptiveBatchController(initial=1000, target_latency_s=1.0)
+    assert ctl.observe(_obs(10, 0.001)) == 1000
+    assert ctl.decisions[-1].reason == "short batch"
+
+
+def test_invalid_bounds_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveBatchController(min_size=10, max_size=5)
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_orchestrator_extracts_with_controller_size(pipelined):
+    extractor = PagedGenreExtractor(make_genres(40))
+    loader = MockGenreLoader()
+    ctl = AdaptiveBatchController(initial=2, min_size=2, max_size=16, target_latency_s=60.0)
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+
+    Orchestrator[GenreIn, GenreOut](extractor, MockGenreTranslator(), loader, batch_size=500,
+                                    pipelined=pipelined, batch_sizer=ctl).run_full_load(persist)
+
+    assert len(loader.store) == 40
+    # sizes come from the controller (decisions depend on measured timings), never batch_size
+    assert extractor.limits[0] == 2
+    assert set(extractor.limits) <= {2} | {d.new_size for d in ctl.decisions}
+    assert sum(d.observation.rows for d in ctl.decisions) == 40
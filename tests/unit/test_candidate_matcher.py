@@ -0,0 +1,143 @@
+# python
+# File: tests/unit/test_candidate_matcher.py
+from __future__ import annotations
+import json
+from uuid import uuid4
+
+import pytest
+
+from adapters.sqlserver.review_store import SQLServerReviewStore
+from application.services.candidate_matcher import (
+    MATCHED, NEW, REVIEW, BlockingIndex, CandidateMatcher, dice, name_grams,
+)
+from core.ports.review_store import ReviewItem
+
+US, GB = 1, 2
+
+
+class MemoryReviewStore:
+    def __init__(self):
+        self.items = []
+
+    def add(self, items):
+        self.items.extend(items)
+
+    def pending(self, entity, limit=1000):
+        return [i for i in self.items if i.entity == entity][:limit]
+
+
+@pytest.fixture
+def index():
+    idx = BlockingIndex()
+    idx.build([
+        (10, "Radiohead", GB, True),
+        (11, "Sigur Rós", None, True),
+        (12, "Björk", 3, False),
+        (13, "John Smith", US, False),
+        (14, "John Smith", US, False),
+        (15, "The National", US, True),
+        (16, "Nationals", US, True),
+        (17, "Portishead", GB, True),
+    ])
+    return idx
+
+
+def _row(name, country=None, is_group=None, source_id=1):
+    return {"source_id": source_id, "name": name, "country_id": country, "is_group": is_group}
+
+
+def test_grams_and_dice():
+    assert name_grams("ab") == {"\x02ab", "ab\x03"}
+    assert dice(name_grams("radiohead"), name_grams("radiohead")) == 1.0
+    assert 0.6 < dice(name_grams("radiohead"), name_grams("radiohed")) < 0.92
+
+
+def test_exact_names_are_candidates_across_countries_and_fuzzy_ones_within_the_partition(index):
+    assert [index.ids[r] for r in index.candidates("john smith", None)] == [14, 13]
+    fuzzy = [index.ids[r] for r in index.candidates("radiohed", GB)]
+    assert fuzzy[0] == 10 and 15 not in fuzzy
+    # another country's partition is not probed for fuzzy candidates
+    assert 10 not in [index.ids[r] for r in index.candidates("radiohed", US)]
+    # NULL-country rows are probed from every partition
+    assert index.ids[index.candidates("sigur ross", US)[0]] == 11
+
+
+def test_batch_decisions_and_review_routing(index):
+    store = MemoryReviewStore()
+    matcher = CandidateMatcher(index, review_store=store)
+    batch_id = uuid4()
+    results = matcher.match_batch([
+        _row("RADIOHEAD", GB, True, 1),       # clear winner
+        _row("Radiohed", GB, True, 2),        # typo: weak
+        _row("John Smith", US, False, 3),     # two equal candidates
+        _row("Bjork", None, False, 4),        # exact after normalization, but no country
+        _row("Zzyzx Qwerty", US, None, 5),    # nothing close
+        _row("Radiohead", US, True, 6),       # known name, different country
+    ], batch_id)
+
+    assert [(r.decision, r.target_id) for r in results] == [
+        (MATCHED, 10), (REVIEW, None), (REVIEW, None), (REVIEW, None), (NEW, None), (REVIEW, None)]
+    assert [r.reason for r in results if r.decision == REVIEW] == ["weak match", "ambiguous", "no country", "weak match"]
+    assert [i.source_id for i in store.items] == ["2", "3", "4", "6"]
+    assert store.items[1].candidates[:2] == [(14, 1.0), (13, 1.0)]
+    assert store.items[0].candidates[0][0] == 10 and store.items[0].batch_id == batch_id
+    assert store.items[0].payload["name"] == "Radiohed"
+
+
+def test_exact_names_of_the_query_country_are_found_behind_more_than_limit_others():
+    idx = BlockingIndex()
+    idx.add(1, "John Williams", GB, False)
+    for i in range(11):
+        idx.add(100 + i, "John Williams", US, False)
+    idx.add(99, "John Williams", None, False)
+
+    assert [idx.ids[r] for r in idx.candidates("john williams", GB, limit=10)] == [1, 99]
+    assert [idx.ids[r] for r in idx.candidates("john williams", 3, limit=10)] == [99]
+    # no row in the query's own partitions: other countries' rows, up to the limit
+    idx.add(200, "Jane Doe", US, False)
+    idx.add(201, "Jane Doe", US, False)
+    assert [idx.ids[r] for r in idx.candidates("jane doe", GB, limit=1)] == [201]
+    result = CandidateMatcher(idx).match(_row("John Williams", GB, False))
+    assert result.decision != MATCHED or result.target_id == 1
+    assert result.candidates[0] == (1, 1.0)
+
+
+def test_is_group_disagreement_lowers_the_score(index):
+    matcher = CandidateMatcher(index)
+    (target, score), = matcher.score("portishead", GB, False)[:1]
+    assert target == 17 and score == pytest.approx(0.8)
+
+
+def test_names_of_stop_grams_only_are_narrowed_by_intersection():
+    idx = BlockingIndex(max_probe_rows=5)
+    idx.build((i, f"The Band {i % 7}", US, True) for i in range(200))
+    found = idx.candidates("the band 3x", US, limit=10)
+    assert 0 < len(found) <= 10
+    assert {idx.names[r] for r in found} <= {f"the band {i}" for i in range(7)}
+
+
+def test_sqlserver_review_store_writes_candidates_as_json():
+    class Conn:
+        def __init__(self):
+            self.many, self.commits = [], 0
+
+        def executemany(self, sql, rows):
+            self.many.append((sql, rows))
+
+        def commit(self):
+            self.commits += 1
+
+        def rollback(self):
+            pass
+
+    conn = Conn()
+    item = ReviewItem(entity="Artist", batch_id=uuid4(), source_id="42", payload={"name": "Radiohed"},
+                      reason="weak match", candidates=[(10, 0.823529), (17, 0.5)])
+    SQLServerReviewStore(conn).add([item])
+
+    sql, rows = conn.many[0]
+    assert "INSERT INTO music.ETLReview" in sql and conn.commits == 1
+    entity, batch, source_id, payload, reason, candidates = rows[0]
+    assert (entity, source_id, reason) == ("Artist", "42", "weak match")
+    assert json.loads(payload) == {"name": "Radiohed"}
+    assert json.loads(candidates) == [[10, 0.8235], [17, 0.5]]
@@ -0,0 +1,122 @@
+# python
+# File: tests/unit/test_change_detection.py
+from __future__ import annotations
+from datetime import datetime
+
+import pytest
+
+from adapters.local.row_hash_store import SQLiteRowHashStore
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from application.services.change_detection import ChangeDetector, InMemoryRowHashStore, row_hash
+from application.services.etl_service import ETLService
+from application.services.orchestrator import Orchestrator
+from core.ports.etl_ports import LoadResult
+from .conftest import MockGenreExtractor, MockGenreTranslator, GenreIn, GenreOut
+
+
+class CountingLoader:
+    def __init__(self, fail=False):
+        self.batches: list[list] = []
+        self.results: list[LoadResult] = []
+        self.fail = fail
+
+    def load_batch(self, items, batch_id):
+        if self.fail:
+            raise RuntimeError("deadlock victim")
+        self.batches.append(list(items))
+        self.results.append(LoadResult(inserted=len(self.batches[-1]), updated=0, errors=[]))
+        return self.results[-1]
+
+
+def _persist():
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+    return persist
+
+
+def test_row_hash_ignores_volatile_fields_and_key_order():
+    a = GenreOut(source_id="1", name="Rock", normalized_name="rock", source_updated_at=datetime(2020, 1, 1))
+    b = GenreOut(source_id="1", name="Rock", normalized_name="rock", source_updated_at=datetime(2024, 5, 5))
+    assert row_hash(a) == row_hash(b)
+    assert row_hash({"x": 1, "y": datetime(2020, 1, 1)}) == row_hash({"y": datetime(2020, 1, 1), "x": 1})
+    assert row_hash({"source_id": "1", "name": "Rock"}) != row_hash({"source_id": "1", "name": "rock"})
+
+
+def test_rerun_skips_unchanged_rows(sample_genres):
+    store = InMemoryRowHashStore()
+    first, second = CountingLoader(), CountingLoader()
+    Orchestrator[GenreIn, GenreOut](MockGenreExtractor(sample_genres), MockGenreTranslator(), first,
+                                    change_detector=ChangeDetector(store, "Genre")).run_full_load(_persist())
+
+    edited = list(sample_genres)
+    edited[1] = GenreIn(mb_id=11, name="Prog Rock", last_updated=edited[1].last_updated)
+    Orchestrator[GenreIn, GenreOut](MockGenreExtractor(edited), MockGenreTranslator(), second,
+                                    change_detector=ChangeDetector(store, "Genre")).run_full_load(_persist())
+
+    assert [len(b) for b in first.batches] == [3]
+    assert [[g.name for g in b] for b in second.batches] == [["Prog Rock"]]
+    assert second.results[0].skipped == 2
+
+
+def test_failed_load_does_not_record_hashes(sample_genres):
+    store = InMemoryRowHashStore()
+    orch = Orchestrator[GenreIn, GenreOut](MockGenreExtractor(sample_genres), MockGenreTranslator(),
+                                           CountingLoader(fail=True), max_retries=0,
+                                           change_detector=ChangeDetector(store, "Genre"))
+    with pytest.raises(RuntimeError):
+        orch.run_full_load(_persist())
+    assert len(store) == 0
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    store = SQLiteRowHashStore(str(tmp_path / "hashes.sqlite"))
+    store.put_many("Artist", {str(i): bytes([i % 256]) * 16 for i in range(1200)})
+    store.put_many("Artist", {"5": b"\xff" * 16})
+
+    found = store.get_many("Artist", ["5", "1199", "missing"])
+
+    assert found == {"5": b"\xff" * 16, "1199": bytes([1199 % 256]) * 16}
+    assert store.get_many("Genre", ["5"]) == {}
+    store.clear("Artist")
+    assert store.get_many("Artist", ["5"]) == {}
+    store.close()
+
+
+def test_etl_service_skips_unchanged_artists():
+    class Source:
+        rows = [{"id": 1, "name": "Björk", "sort_name": "Björk", "country": "IS"},
+                {"id": 2, "name": "Sigur Rós", "sort_name": "Sigur Rós", "country": "IS"}]
+
+        def fetch_artists_after(self, after_id, limit, before_id=None):
+            return [r for r in self.rows if r["id"] > (after_id or 0)][:limit]
+
+    class Destination:
+        def __init__(self):
+            self.upserts: list[list[dict]] = []
+
+        def begin_transaction(self):
+            pass
+
+        def upsert_artists(self, records):
+            self.upserts.append(list(records))
+            return len(self.upserts[-1])
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    detector = ChangeDetector(InMemoryRowHashStore(), "Artist")
+    dst = Destination()
+    etl = ETLService(Source(), dst, MusicBrainzToDomainMapper(), batch_size=10, change_detector=detector)
+
+    assert etl.run_full_load() == 0
+    Source.rows[1] = dict(Source.rows[1], country="GB")
+    assert etl.run_full_load() == 1
+
+    assert [[r["mb_id"] for r in batch] for batch in dst.upserts] == [["1", "2"], ["2"]]
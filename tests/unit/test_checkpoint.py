@@ -0,0 +1,204 @@
+# python
+# File: tests/unit/test_checkpoint.py
+from __future__ import annotations
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from adapters.local.checkpoint_store import SQLiteCheckpointStore
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from adapters.sqlserver.checkpoint_store import UPSERT_SQL, SQLServerCheckpointStore
+from adapters.synthetic.generator import SyntheticMusicBrainz
+from adapters.synthetic.memory import InMemoryDestination, InMemorySource
+from application.services.etl_service import ETLService
+from application.services.orchestrator import Orchestrator
+from core.ports.checkpoint_store import Checkpoint
+from .conftest import MockGenreTranslator, MockGenreLoader, PagedGenreExtractor, GenreIn, GenreOut, make_genres
+
+
+class CountingSource(InMemorySource):
+    def __init__(self, artists):
+        super().__init__(artists)
+        self.after_ids: list = []
+
+    def fetch_artists_after(self, after_id, limit, before_id=None):
+        self.after_ids.append(after_id)
+        return super().fetch_artists_after(after_id, limit, before_id)
+
+
+class FailOnceLoader(MockGenreLoader):
+    def __init__(self, fail_on_call):
+        super().__init__()
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def load_batch(self, items, batch_id):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("connection reset")
+        return super().load_batch(items, batch_id)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    yield s
+    s.close()
+
+
+def test_sqlite_store_round_trip_survives_reopen(tmp_path):
+    path = str(tmp_path / "cp.sqlite")
+    batch_id = uuid4()
+    ts = datetime(2024, 5, 1, 12, 30)
+    first = SQLiteCheckpointStore(path)
+    first.save(Checkpoint("Artist", "p1", last_key=42, last_ts=ts, batch_id=batch_id, rows=100))
+    first.close()
+
+    reopened = SQLiteCheckpointStore(path)
+    cp = reopened.load("Artist", "p1")
+    assert (cp.last_key, cp.last_ts, cp.batch_id, cp.rows, cp.completed) == (42, ts, batch_id, 100, False)
+    assert cp.updated_at is not None
+    assert reopened.load("Artist") is None
+    reopened.clear("Artist", "p1")
+    assert reopened.load("Artist", "p1") is None
+    reopened.close()
+
+
+def test_etl_service_resumes_after_last_committed_page(store):
+    artists = list(SyntheticMusicBrainz(1000, seed=9).artists())
+    ids = [a["id"] for a in artists]
+    dst = InMemoryDestination(fail_after=3)
+    first = CountingSource(artists)
+
+    with pytest.raises(RuntimeError, match="injected"):
+        ETLService(first, dst, MusicBrainzToDomainMapper(), batch_size=100, checkpoints=store).run_full_load()
+    cp = store.load("Artist")
+    assert (cp.last_key, cp.rows, cp.completed) == (ids[299], 300, False)
+    assert len(dst.rows) == 300
+
+    second = CountingSource(artists)
+    ETLService(second, dst, MusicBrainzToDomainMapper(), batch_size=100, checkpoints=store).run_full_load()
+    assert second.after_ids[0] == ids[299]  # no page before the checkpoint is read again
+    assert sorted(dst.rows) == ids
+    assert store.load("Artist").completed
+
+    third = CountingSource(artists)
+    ETLService(third, dst, MusicBrainzToDomainMapper(), batch_size=100, checkpoints=store).run_full_load()
+    assert third.after_ids[0] is None  # a completed run does not hold back the next full load
+
+
+def test_etl_service_saves_checkpoint_inside_the_batch_transaction():
+    events = []
+
+    class Destination:
+        def begin_transaction(self):
+            events.append("begin")
+
+        def upsert_artists(self, records):
+            events.append("upsert")
+            return len(list(records))
+
+        def commit(self):
+            events.append("commit")
+
+        def rollback(self):
+            events.append("rollback")
+
+    class JoiningStore:
+        manage_transaction = False
+
+        def load(self, entity, partition=""):
+            return None
+
+        def save(self, checkpoint):
+            events.append(("save", checkpoint.last_key, checkpoint.completed))
+
+    artists = [{"id": i, "name": f"A{i}", "sort_name": None, "country": None} for i in (1, 2, 3)]
+    ETLService(InMemorySource(artists), Destination(), MusicBrainzToDomainMapper(), batch_size=2,
+               checkpoints=JoiningStore()).run_full_load()
+
+    assert events == [
+        "begin", "upsert", ("save", 2, False), "commit",
+        "begin", "upsert", ("save", 3, False), "commit",
+        "begin", ("save", 3, True), "commit",
+    ]
+
+
+def test_sqlserver_store_joins_or_commits_transaction():
+    class Cursor:
+        def __init__(self, row=None):
+            self._row = row
+
+        def fetchone(self):
+            return self._row
+
+    class Conn:
+        def __init__(self):
+            self.executed = []
+            self.commits = 0
+
+        def execute(self, sql, params=None):
+            self.executed.append((sql, params))
+            return Cursor((7, None, None, 70, 1, None))
+
+        def commit(self):
+            self.commits += 1
+
+        def rollback(self):
+            pass
+
+    joined, own = Conn(), Conn()
+    SQLServerCheckpointStore(joined, manage_transaction=False).save(Checkpoint("Artist", last_key=7, rows=70))
+    SQLServerCheckpointStore(own).save(Checkpoint("Artist", last_key=7, rows=70))
+
+    assert joined.commits == 0 and own.commits == 1
+    sql, params = joined.executed[0]
+    assert sql == UPSERT_SQL and params == ("Artist", "", 7, None, None, 70, 0, 7, None, None, 70, 0)
+    cp = SQLServerCheckpointStore(own).load("Artist")
+    assert (cp.last_key, cp.rows, cp.completed) == (7, 70, True)
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_orchestrator_resumes_from_checkpoint_without_persist_fn(store, pipelined):
+    genres = make_genres(7)
+    loader = FailOnceLoader(fail_on_call=3)
+    orch = Orchestrator[GenreIn, GenreOut](PagedGenreExtractor(genres), MockGenreTranslator(), loader, batch_size=2,
+                                           max_retries=0, pipelined=pipelined, entity_name="Genre",
+                                           checkpoints=store)
+    with pytest.raises(RuntimeError, match="connection reset"):
+        orch.run_full_load()
+    assert store.load("Genre").last_ts == genres[3].last_updated
+    assert len(loader.store) == 4
+
+    resumed = PagedGenreExtractor(genres)
+    orch.extractor = resumed
+    orch.run_full_load()
+    assert resumed.sinces[0] == genres[3].last_updated
+    assert len(loader.store) == 7 and loader.calls == 5
+    cp = store.load("Genre")
+    assert cp.completed and cp.last_ts == genres[6].last_updated and cp.rows == 7
+
+
+def test_orchestrator_incremental_run_starts_from_later_of_since_and_checkpoint(store):
+    genres = make_genres(6)
+    store.save(Checkpoint("Genre", last_ts=genres[1].last_updated, completed=True))
+    extractor = PagedGenreExtractor(genres)
+    orch = Orchestrator[GenreIn, GenreOut](extractor, MockGenreTranslator(), MockGenreLoader(), batch_size=10,
+                                           entity_name="Genre", checkpoints=store)
+
+    orch.run_incremental(since=genres[0].last_updated)
+    assert extractor.sinces[0] == genres[1].last_updated
+
+    orch.run_incremental(since=genres[5].last_updated)
+    assert extractor.sinces[-1] == genres[5].last_updated
+
+
+def test_orchestrator_rejects_store_that_joins_transactions():
+    class JoiningStore:
+        manage_transaction = False
+
+    with pytest.raises(ValueError):
+        Orchestrator(None, None, None, checkpoints=JoiningStore())
+    with pytest.raises(ValueError):
+        Orchestrator(PagedGenreExtractor([]), MockGenreTranslator(), MockGenreLoader()).run_full_load()
@@ -0,0 +1,213 @@
+# python
+# File: tests/unit/test_connection_pool.py
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import threading
+import time
+
+import pytest
+
+from adapters.local.prometheus_textfile import render_pools
+from adapters.pool import ConnectionPool, PoolClosed, PoolTimeout
+from adapters.postgres.connection import PostgresConnection
+from adapters.sqlserver.connection import SQLServerConnection
+
+
+class FakeCursor:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def execute(self, sql, params=None):
+        if not self.raw.alive:
+            raise ConnectionError("server closed the connection")
+        self.raw.statements.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeRaw:
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(FakeRaw.ids)
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+        self.statements: list[str] = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(**kwargs):
+    opened: list[FakeRaw] = []
+
+    def connect(dsn):
+        opened.append(FakeRaw())
+        return opened[-1]
+    kwargs.setdefault("max_size", 2)
+    return SQLServerConnection.create_pool("Driver=test", connect=connect, **kwargs), opened
+
+
+def test_checkout_reuses_connections_and_times_out_when_exhausted():
+    pool, opened = _pool(checkout_timeout_s=0.05)
+    a = pool.acquire()
+    pool.release(a)
+    assert pool.acquire() is a
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert len(opened) == 2 and stats.size == 2 and stats.in_use == 2 and stats.timeouts == 1
+    assert a.rollbacks == 1  # reset on return
+
+
+def test_blocked_checkout_gets_the_released_connection_and_records_its_wait():
+    pool, _ = _pool(max_size=1)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(held)
+    waiter.join(1)
+
+    assert got == [held]
+    stats = pool.stats()
+    assert stats.waited == 1 and stats.checkouts == 2
+    assert stats.wait.count == 2 and stats.wait.sum >= 0.04
+
+
+def test_dead_idle_connection_is_replaced_on_borrow():
+    pool, opened = _pool(validate_idle_s=0.0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.alive = False
+
+    fresh = pool.acquire()
+    assert fresh is not conn and conn.closed
+    stats = pool.stats()
+    assert stats.validation_failures == 1 and stats.size == 1 and stats.created == 2
+
+
+def test_checkout_block_discards_connection_on_error_and_warm_opens_min_size():
+    pool, opened = _pool(min_size=2)
+    pool.warm()
+    assert len(opened) == 2 and pool.stats().idle == 2
+    with pytest.raises(RuntimeError):
+        with pool.checkout() as conn:
+            raise RuntimeError("driver error")
+    assert conn.closed and pool.stats().size == 1
+
+    pool.close()
+    with pytest.raises(PoolClosed):
+        pool.acquire()
+    assert all(c.closed for c in opened)
+
+
+def test_wrapper_binds_one_connection_per_thread_and_reclaims_finished_threads():
+    pool, opened = _pool(max_size=3)
+    shared = SQLServerConnection("Driver=test", pool=pool)
+    seen: dict[str, set] = {}
+    barrier = threading.Barrier(3)
+
+    def work(name):
+        ids = set()
+        for _ in range(3):
+            shared.execute("SELECT 1")
+            ids.add(shared.raw().id)
+            barrier.wait(1)  # all three threads hold their connection at the same time
+        seen[name] = ids
+
+    threads = [threading.Thread(target=work, args=(f"t{i}",)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(2)
+
+    assert all(len(ids) == 1 for ids in seen.values())
+    assert len(set().union(*seen.values())) == 3
+    # the threads never released; their connections come back instead of a timeout
+    assert shared.raw() in opened and pool.stats().reclaimed == 3
+    shared.close()
+    assert pool.stats().in_use == 0 and len(opened) == 3
+
+
+def test_asyncio_tasks_get_their_own_connection():
+    pool, opened = _pool(max_size=4)
+    shared = PostgresConnection("postgresql://test", pool=pool)
+
+    async def task():
+        first = shared.raw()
+        await asyncio.sleep(0)
+        same = shared.raw() is first
+        shared.close()
+        return first.id, same
+
+    async def main():
+        return await asyncio.gather(*(task() for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert all(same for _, same in results)
+    assert len({conn_id for conn_id, _ in results}) == 3
+    assert pool.stats().in_use == 0
+
+
+def test_nested_connection_blocks_share_the_binding():
+    pool, opened = _pool()
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        assert pool.current() is outer
+    assert pool.current() is None and pool.stats().idle == 1
+
+
+def test_long_lived_workers_hand_connections_back_after_each_unit_of_work():
+    pool, opened = _pool(max_size=2, checkout_timeout_s=0.5)
+    destination = SQLServerConnection("Driver=test", pool=pool)
+    source = PostgresConnection("postgresql://test", pool=pool)
+    barrier = threading.Barrier(4)
+
+    def batch(_):
+        barrier.wait(1)  # more live worker threads than connections
+        destination.execute("MERGE ...")
+        destination.commit()
+        with source.session() as conn:
+            conn.cursor().execute("SELECT 1")
+        return pool.current()
+
+    with ThreadPoolExecutor(max_workers=4) as workers:
+        leftovers = list(workers.map(batch, range(8)))
+
+    assert leftovers == [None] * 8
+    stats = pool.stats()
+    assert len(opened) <= 2 and stats.in_use == 0 and stats.timeouts == 0 and stats.reclaimed == 0
+
+
+def test_pool_metrics_render_as_prometheus_text():
+    pool, _ = _pool(checkout_timeout_s=0.01, max_size=1)
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+    text = render_pools([pool.stats()])
+    assert 'etl_pool_wait_seconds_count{pool="sqlserver"} 1' in text
+    assert 'etl_pool_connections{pool="sqlserver",state="in_use"} 1' in text
+    assert 'etl_pool_timeouts_total{pool="sqlserver"} 1' in text
+    assert "# TYPE etl_pool_wait_seconds histogram" in text
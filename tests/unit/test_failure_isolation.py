@@ -0,0 +1,207 @@
+# python
+# File: tests/unit/test_failure_isolation.py
+from __future__ import annotations
+from datetime import datetime, timedelta
+from uuid import uuid4
+import math
+
+import pytest
+
+from adapters.sqlserver.quarantine_store import INSERT_SQL, SQLServerQuarantineStore
+from application.services.change_detection import ChangeDetector, InMemoryRowHashStore
+from application.services.failure_isolation import (
+    FailureIsolation, InMemoryQuarantineStore, QuarantineLimitExceeded, RetryPolicy, is_transient,
+)
+from application.services.instrumentation import RunHooks
+from application.services.junction_sync import InMemoryJunctionStore, JunctionPage, JunctionSyncLoader
+from application.services.orchestrator import Orchestrator
+from core.ports.etl_ports import LoadResult
+from core.ports.quarantine_store import QuarantinedRow
+from .conftest import MockGenreTranslator, GenreIn, GenreOut
+
+
+class OperationalError(Exception):
+    """Named like the DB-API class drivers raise for lost connections."""
+
+
+class ConstraintLoader:
+    """All-or-nothing loads that fail while a batch contains a poison name, like a rolled back MERGE."""
+
+    def __init__(self, poison=(), transient_failures=0):
+        self.poison = set(poison)
+        self.transient_failures = transient_failures
+        self.calls = 0
+        self.committed: dict[str, GenreOut] = {}
+
+    def load_batch(self, items, batch_id):
+        self.calls += 1
+        if self.transient_failures:
+            self.transient_failures -= 1
+            raise OperationalError("08S01", "communication link failure")
+        bad = [g.name for g in items if g.name in self.poison]
+        if bad:
+            raise ValueError(f"CHECK constraint violated by {bad[0]!r}")
+        for g in items:
+            self.committed[g.source_id] = g
+        return LoadResult(inserted=len(items), updated=0, errors=[], source_ids={int(g.source_id): 1 for g in items},
+                          rows=[({"Name": g.name}, 1) for g in items])
+
+
+def _translated(n):
+    base = datetime(2020, 1, 1)
+    return [GenreOut(source_id=str(i), name=f"Genre {i}", normalized_name=f"genre {i}",
+                     source_updated_at=base + timedelta(minutes=i)) for i in range(n)]
+
+
+def _no_wait(**kwargs):
+    waits = []
+    return RetryPolicy(sleep=waits.append, jitter=0, **kwargs), waits
+
+
+def test_transient_classification():
+    assert is_transient(ConnectionResetError())
+    assert is_transient(OperationalError("08S01", "link failure"))
+    assert is_transient(RuntimeError("40001", "[SQL Server]Transaction was deadlocked"))
+    assert is_transient(RuntimeError("Transaction (Process ID 57) was deadlocked on lock resources"))
+    assert not is_transient(ValueError("CHECK constraint violated"))
+    assert not is_transient(RuntimeError("23000", "Violation of UNIQUE KEY constraint"))
+
+
+def test_retry_policy_backs_off_exponentially_and_only_for_transient_errors():
+    policy, waits = _no_wait(max_retries=4, base_delay_s=0.5, max_delay_s=3.0)
+    assert [policy.delay(n) for n in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    loader = ConstraintLoader(transient_failures=3)
+    result = policy.call(loader.load_batch, _translated(4), uuid4())
+    assert result.inserted == 4 and waits == [0.5, 1.0, 2.0]
+
+    waits.clear()
+    with pytest.raises(ValueError):
+        policy.call(ConstraintLoader(poison={"Genre 1"}).load_batch, _translated(4), uuid4())
+    assert waits == []
+
+
+def test_jitter_stays_within_bounds():
+    policy = RetryPolicy(base_delay_s=1.0, jitter=0.2)
+    assert all(0.8 <= policy.delay(1) <= 1.2 for _ in range(100))
+
+
+@pytest.mark.parametrize("size,poison", [(64, {"Genre 17"}), (1000, {"Genre 3", "Genre 512", "Genre 999"})])
+def test_bisection_commits_good_rows_and_quarantines_poison_rows(size, poison):
+    rows = _translated(size)
+    loader = ConstraintLoader(poison=poison)
+    quarantine = InMemoryQuarantineStore()
+    batch_id = uuid4()
+    policy, _ = _no_wait()
+
+    result = FailureIsolation(quarantine, "Genre", policy).load(rows, batch_id, loader.load_batch)
+
+    assert result.inserted == size - len(poison)
+    assert len(loader.committed) == size - len(poison)
+    assert sorted(q.payload["name"] for q in quarantine.rows) == sorted(poison)
+    assert all(q.batch_id == batch_id and q.error_type == "ValueError" for q in quarantine.rows)
+    assert {e["source_id"] for e in result.errors} == set(result.quarantined) == {n.split()[1] for n in poison}
+    assert len(result.source_ids) == len(result.rows) == size - len(poison)
+    # extra loads stay logarithmic in the batch size per poison row
+    assert loader.calls <= 1 + 2 * len(poison) * math.ceil(math.log2(size))
+
+
+def test_bisection_keeps_the_deletes_of_the_pages_that_loaded():
+    store = InMemoryJunctionStore({"music.RecordingArtist": [(owner, 1) for owner in range(16)]})
+    junctions = JunctionSyncLoader(store, "music.RecordingArtist")
+
+    def load_batch(pages, batch_id):
+        if any(p.lo == 11 for p in pages):
+            raise ValueError("FOREIGN KEY constraint violated by member 2")
+        return junctions.load_batch(pages, batch_id)
+
+    # every owner swaps member 1 for member 2: one insert and one delete per page
+    pages = [JunctionPage(owner, owner + 1, [(owner, 2)]) for owner in range(16)]
+    policy, _ = _no_wait()
+    result = FailureIsolation(InMemoryQuarantineStore(), "RecordingArtist", policy).load(pages, uuid4(), load_batch)
+
+    assert (result.inserted, result.deleted) == (15, 15) == (store.inserted, store.deleted)
+    assert len(result.errors) == 1
+
+
+def test_systemic_failure_is_not_quarantined():
+    class DownLoader:
+        calls = 0
+
+        def load_batch(self, items, batch_id):
+            DownLoader.calls += 1
+            raise ValueError("Invalid object name 'music.Genre'")
+
+    quarantine = InMemoryQuarantineStore()
+    policy, _ = _no_wait()
+    with pytest.raises(QuarantineLimitExceeded):
+        FailureIsolation(quarantine, "Genre", policy).load(_translated(256), uuid4(), DownLoader().load_batch)
+    assert quarantine.rows == []
+    assert DownLoader.calls < 256 // 4
+
+
+def test_orchestrator_isolates_poison_rows_and_keeps_their_hashes_out():
+    class Extractor:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def extract_batch(self, since, limit):
+            return [r for r in self.rows if since is None or r.last_updated > since][:limit]
+
+    class Errors(RunHooks):
+        rows_error = 0
+
+        def batch_finished(self, batch):
+            Errors.rows_error += batch.rows_error
+
+    base = datetime(2020, 1, 1)
+    genres = [GenreIn(mb_id=i, name=f"Genre {i}", last_updated=base + timedelta(minutes=i)) for i in range(20)]
+    loader = ConstraintLoader(poison={"Genre 5", "Genre 14"})
+    quarantine = InMemoryQuarantineStore()
+    hashes = InMemoryRowHashStore()
+    policy, _ = _no_wait()
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+
+    Orchestrator[GenreIn, GenreOut](
+        Extractor(genres), MockGenreTranslator(), loader, batch_size=8, hooks=Errors(),
+        change_detector=ChangeDetector(hashes, "Genre"),
+        failure_isolation=FailureIsolation(quarantine, "Genre", policy),
+    ).run_full_load(persist)
+
+    assert len(loader.committed) == 18
+    assert [q.source_id for q in quarantine.pending("Genre")] == ["5", "14"]
+    assert Errors.rows_error == 2
+    assert state["ts"] == genres[-1].last_updated
+    assert "5" not in hashes.get_many("Genre", ["5", "6"]) and len(hashes) == 18
+
+
+def test_sqlserver_store_inserts_json_payloads_in_one_round_trip():
+    class Conn:
+        def __init__(self):
+            self.batches = []
+            self.commits = 0
+
+        def executemany(self, sql, rows):
+            self.batches.append((sql, rows))
+
+        def commit(self):
+            self.commits += 1
+
+    conn = Conn()
+    batch_id = uuid4()
+    rows = [QuarantinedRow("Genre", batch_id, str(i), {"name": f"Genre {i}", "at": datetime(2020, 1, 1)},
+                           "ValueError", "CHECK constraint") for i in range(3)]
+    store = SQLServerQuarantineStore(conn)
+    store.add(rows)
+    store.add([])
+
+    assert conn.commits == 1 and len(conn.batches) == 1
+    sql, params = conn.batches[0]
+    assert sql == INSERT_SQL and len(params) == 3
+    assert params[0] == ("Genre", str(batch_id), "0", '{"at": "2020-01-01 00:00:00", "name": "Genre 0"}',
+                         "ValueError", "CHECK constraint")
@@ -0,0 +1,149 @@
+# python
+# File: tests/unit/test_fan_out.py
+from __future__ import annotations
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.synthetic.memory import InMemoryExtractor
+from application.services.fan_out import FanOutExtractor
+from application.services.orchestrator import Orchestrator
+from core.ports.etl_ports import LoadResult
+
+BASE = datetime(2024, 1, 1)
+
+
+def artists(n):
+    return [{"id": i, "name": f"Artist {i}", "genres": [g for g in (1, 2, 3) if (i + g) % 2],
+             "last_updated": BASE + timedelta(seconds=i // 2)} for i in range(1, n + 1)]
+
+
+class CountingSource(InMemoryExtractor):
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.calls = 0
+
+    def extract_batch(self, since, limit):
+        self.calls += 1
+        return super().extract_batch(since, limit)
+
+
+class ArtistTranslator:
+    def translate_batch(self, items):
+        return [{"source_id": str(r["id"]), "name": r["name"], "source_updated_at": r["last_updated"]} for r in items]
+
+
+class PairTranslator:
+    def translate_batch(self, items):
+        return [{"owner": r["artist_id"], "member": r["genre_id"], "source_id": str(r["artist_id"]),
+                 "source_updated_at": r["last_updated"]} for r in items]
+
+
+class RecordingLoader:
+    def __init__(self, log=None, name="", fail_on=None):
+        self.rows = []
+        self.log = log if log is not None else []
+        self.name = name
+        self.fail_on = fail_on
+
+    def load_batch(self, items, batch_id):
+        if self.fail_on is not None and any(r["source_id"] == self.fail_on for r in items):
+            raise RuntimeError("load failed")
+        self.rows.extend(items)
+        self.log.append((self.name, max(int(r["source_id"]) for r in items)))
+        return LoadResult(inserted=len(items), updated=0, errors=[])
+
+
+def genre_pairs(page):
+    return [{"artist_id": r["id"], "genre_id": g, "last_updated": r["last_updated"]} for r in page for g in r["genres"]]
+
+
+def build(rows, batch_size=10, artist_loader=None, genre_loader=None, genre_since=None):
+    source = CountingSource(rows)
+    fan = FanOutExtractor(source, batch_size=batch_size, queue_depth=2)
+    artist_route = fan.route("Artist")
+    genre_route = fan.route("ArtistGenre", derive=genre_pairs, after="Artist")
+    artist_loader = artist_loader or RecordingLoader(name="Artist")
+    genre_loader = genre_loader or RecordingLoader(artist_loader.log, "ArtistGenre")
+    artist_orch = Orchestrator(artist_route, ArtistTranslator(), artist_loader, batch_size=100,
+                               hooks=artist_route.progress)
+    genre_orch = Orchestrator(genre_route, PairTranslator(), genre_loader, batch_size=100)
+    artist_marks, genre_marks = [], []
+    pipelines = {
+        "Artist": lambda: artist_orch.run_incremental(None, lambda ts, b: artist_marks.append(ts)),
+        "ArtistGenre": lambda: genre_orch.run_incremental(genre_since, lambda ts, b: genre_marks.append(ts)),
+    }
+    return fan, source, pipelines, artist_loader, genre_loader, artist_marks, genre_marks
+
+
+def test_one_scan_feeds_every_route_with_its_own_watermarks():
+    rows = artists(95)
+    fan, source, pipelines, artist_loader, genre_loader, artist_marks, genre_marks = build(rows)
+
+    report = fan.run(pipelines)
+
+    assert report.succeeded
+    assert source.calls == 11  # 10 pages and the empty one that ends the scan
+    assert [int(r["source_id"]) for r in artist_loader.rows] == list(range(1, 96))
+    assert [(r["owner"], r["member"]) for r in genre_loader.rows] == [
+        (r["id"], g) for r in rows for g in r["genres"]]
+    assert artist_marks == genre_marks and artist_marks[-1] == rows[-1]["last_updated"]
+    assert len(artist_marks) == 10
+
+
+def test_child_route_waits_until_the_parent_loaded_its_rows():
+    log = []
+    fan, _, pipelines, *_ = build(artists(60), artist_loader=RecordingLoader(log, "Artist"))
+
+    fan.run(pipelines)
+
+    loaded = {"Artist": 0}
+    for name, upto in log:
+        if name == "Artist":
+            loaded["Artist"] = upto
+        else:
+            assert upto <= loaded["Artist"]
+
+
+def test_pipeline_ahead_of_the_scan_skips_pages_it_already_loaded():
+    rows = artists(40)
+    # ids 20 and 21 share a timestamp: a timestamp-only cursor only skips pages ending before it
+    since = rows[21]["last_updated"]
+    fan, _, pipelines, artist_loader, genre_loader, *_ = build(rows, genre_since=since)
+
+    fan.run(pipelines)
+
+    assert len(artist_loader.rows) == 40
+    assert fan.routes["ArtistGenre"].skipped_pages == 2
+    assert min(r["owner"] for r in genre_loader.rows) == 21
+
+
+def test_failed_parent_stops_the_child_and_the_scan():
+    rows = artists(200)
+    fan, source, pipelines, _, genre_loader, *_ = build(rows, artist_loader=RecordingLoader(name="Artist", fail_on="35"))
+
+    with pytest.raises(RuntimeError, match="load failed"):
+        fan.run(pipelines)
+
+    assert max(r["owner"] for r in genre_loader.rows) <= 30
+    assert source.calls < 20
+    assert not [t for t in threading.enumerate() if t.name.startswith("fanout")]
+
+
+def test_scan_errors_fail_every_route_and_routes_validate():
+    class Broken:
+        def extract_batch(self, since, limit):
+            raise OSError("connection reset")
+
+    fan = FanOutExtractor(Broken())
+    route = fan.route("Artist")
+    orch = Orchestrator(route, ArtistTranslator(), RecordingLoader(), batch_size=10)
+    with pytest.raises(OSError):
+        fan.run({"Artist": lambda: orch.run_full_load(lambda ts, b: None)})
+    with pytest.raises(ValueError):
+        fan.route("Artist")
+    with pytest.raises(ValueError):
+        fan.route("Membership", after="Genre")
+    with pytest.raises(ValueError):
+        fan.run({"Other": lambda: None})
@@ -0,0 +1,129 @@
+# python
+# File: tests/unit/test_identifier_index.py
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from adapters.local.identifier_index import MmapIdentifierIndex
+from adapters.sqlserver.connection import SQLServerConnection
+from adapters.sqlserver.repository import SQLServerRepository
+from application.services.orchestrator import Orchestrator
+from core.ports.etl_ports import LoadResult
+from .conftest import MockGenreExtractor, MockGenreTranslator, GenreIn
+
+
+def test_batch_lookup_is_aligned_with_input(tmp_path):
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as index:
+        index.rebuild("Artist", [(2, 20), (5, 50), (9, 90), (1000, 7)])
+
+        assert index.lookup_many("Artist", [9, 3, None, 2, 1000, 9, 10_000]) == [90, None, None, 20, 7, 90, None]
+        assert index.lookup_many("Recording", [2]) == [None]
+
+
+def test_added_mappings_override_base_and_survive_reopen(tmp_path):
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as index:
+        index.rebuild("Artist", [(1, 10), (2, 20)])
+        index.add("Artist", {2: 21, 3: 30})
+        assert index.size("Artist") == (2, 2)
+        assert index.lookup_many("Artist", [1, 2, 3]) == [10, 21, 30]
+
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as reopened:
+        assert reopened.lookup_many("Artist", [1, 2, 3]) == [10, 21, 30]
+        assert reopened.compact("Artist") == {"Artist": 3}
+        assert reopened.size("Artist") == (3, 0)
+        assert reopened.lookup_many("Artist", [3, 2, 1]) == [30, 21, 10]
+    assert os.path.getsize(tmp_path / "Artist.delta") == 0
+
+
+def test_add_compacts_once_threshold_is_reached(tmp_path):
+    with MmapIdentifierIndex(str(tmp_path), compact_threshold=3, durable=False) as index:
+        index.add("Track", {5: 1, 1: 2})
+        assert index.size("Track") == (0, 2)
+        index.add("Track", {3: 3})
+        assert index.size("Track") == (3, 0)
+        assert index.lookup_many("Track", [1, 3, 5]) == [2, 3, 1]
+
+
+def test_torn_delta_tail_is_ignored(tmp_path):
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as index:
+        index.add("Artist", {1: 10})
+    with open(tmp_path / "Artist.delta", "ab") as f:
+        f.write(b"\x01\x02\x03")  # crash mid-append
+
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as index:
+        assert index.lookup_many("Artist", [1]) == [10]
+
+
+def test_rebuild_rejects_unordered_pairs(tmp_path):
+    with MmapIdentifierIndex(str(tmp_path), durable=False) as index:
+        with pytest.raises(ValueError):
+            index.rebuild("Artist", [(2, 20), (1, 10)])
+        with pytest.raises(ValueError):
+            index.lookup_many("../etc", [1])
+
+
+def test_orchestrator_records_merge_source_ids(tmp_path, sample_genres):
+    class SourceIdLoader:
+        def load_batch(self, items, batch_id):
+            return LoadResult(inserted=len(items), updated=0, errors=[],
+                              source_ids={int(it.source_id): 100 + int(it.source_id) for it in items})
+
+    index = MmapIdentifierIndex(str(tmp_path), durable=False)
+    orch = Orchestrator[GenreIn, object](
+        MockGenreExtractor(sample_genres), MockGenreTranslator(), SourceIdLoader(),
+        identifier_map=index, identifier_entity="Genre")
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+
+    orch.run_full_load(persist)
+
+    assert index.lookup_many("Genre", [10, 11, 12]) == [110, 111, 112]
+    index.close()
+
+
+def test_repository_publishes_identifiers_only_on_commit(tmp_path):
+    class Cursor:
+        def __init__(self, raw):
+            self.raw = raw
+            self.fast_executemany = False
+
+        def execute(self, query, *params):
+            pass
+
+        def executemany(self, query, rows):
+            pass
+
+        def fetchall(self):
+            return self.raw.output
+
+    class Raw:
+        output = [("INSERT", 10, 1, "Björk", None, False)]
+
+        def cursor(self):
+            return Cursor(self)
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    index = MmapIdentifierIndex(str(tmp_path), durable=False)
+    repo = SQLServerRepository(SQLServerConnection("Driver=test", connect=lambda s: Raw()), identifiers=index)
+
+    repo.begin_transaction()
+    repo.upsert_artists([{"mb_id": "1", "name": "Björk"}])
+    repo.rollback()
+    assert index.lookup_many("Artist", [1]) == [None]
+
+    repo.begin_transaction()
+    repo.upsert_artists([{"mb_id": "1", "name": "Björk"}])
+    repo.commit()
+    assert index.lookup_many("Artist", [1]) == [10]
+    index.close()
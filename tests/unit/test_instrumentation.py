@@ -0,0 +1,182 @@
+# python
+# File: tests/unit/test_instrumentation.py
+from __future__ import annotations
+from uuid import uuid4
+
+import pytest
+
+from adapters.local.prometheus_textfile import PrometheusTextfileExporter, render
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from adapters.sqlserver.run_audit import INSERT_SQL, SQLServerRunAudit
+from application.services.etl_service import ETLService
+from application.services.instrumentation import (
+    FAILED, SUCCEEDED, BatchMetrics, Histogram, MetricsRecorder, RunHooks,
+)
+from application.services.orchestrator import Orchestrator
+from .conftest import MockGenreTranslator, MockGenreLoader, PagedGenreExtractor, GenreIn, GenreOut, make_genres
+
+
+class EventLog(RunHooks):
+    def __init__(self):
+        self.events: list[tuple] = []
+        self.finished: list[BatchMetrics] = []
+
+    def batch_started(self, batch):
+        self.events.append(("start", batch.batch_number))
+
+    def stage_finished(self, batch, stage, seconds, rows):
+        assert seconds >= 0
+        self.events.append((stage, batch.batch_number, rows))
+
+    def batch_finished(self, batch):
+        self.events.append(("end", batch.batch_number, batch.status))
+        self.finished.append(batch)
+
+    def queue_depth(self, entity, queue_name, depth):
+        self.events.append(("depth", queue_name))
+
+
+def _run(orch):
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+
+    orch.run_full_load(persist)
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+    assert hist.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert hist.count == 4 and hist.sum == pytest.approx(3.65)
+    assert hist.quantile(0.5) == 0.1
+    assert hist.quantile(0.99) == float("inf")
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_orchestrator_reports_every_stage_of_every_batch(pipelined):
+    log = EventLog()
+    recorder = MetricsRecorder()
+    orch = Orchestrator[GenreIn, GenreOut](PagedGenreExtractor(make_genres(5)), MockGenreTranslator(), MockGenreLoader(),
+                                           batch_size=2, pipelined=pipelined, hooks=[log, recorder],
+                                           entity_name="Genre")
+    _run(orch)
+
+    stages = [e for e in log.events if e[0] != "depth"]
+    if not pipelined:
+        assert stages[:5] == [("start", 1), ("extract", 1, 2), ("translate", 1, 2), ("load", 1, 2),
+                              ("end", 1, SUCCEEDED)]
+    assert [b.rows_extracted for b in log.finished] == [2, 2, 1]
+    assert all(set(b.stage_s) == {"extract", "translate", "load"} for b in log.finished)
+    assert all(b.entity == "Genre" and b.rows_inserted == b.rows_extracted for b in log.finished)
+    depths = [e for e in log.events if e[0] == "depth"]
+    assert ("depth", "translated") in depths if pipelined else depths == []
+
+    genre = recorder.snapshot()["Genre"]
+    assert genre.rows["extracted"] == genre.rows["inserted"] == 5
+    assert genre.batches[SUCCEEDED] == 3
+    assert {stage: h.count for stage, h in genre.stage_latency.items()} == {"extract": 3, "translate": 3, "load": 3}
+
+
+def test_failed_batch_is_reported_and_failing_hook_is_ignored():
+    class BrokenHook(RunHooks):
+        def batch_finished(self, batch):
+            raise RuntimeError("metrics backend down")
+
+    class FailingLoader:
+        def load_batch(self, items, batch_id):
+            raise RuntimeError("deadlock victim")
+
+    log = EventLog()
+    orch = Orchestrator[GenreIn, GenreOut](PagedGenreExtractor(make_genres(2)), MockGenreTranslator(), FailingLoader(),
+                                           max_retries=0, hooks=[BrokenHook(), log])
+    with pytest.raises(RuntimeError, match="deadlock"):
+        _run(orch)
+    assert [b.status for b in log.finished] == [FAILED]
+    assert log.finished[0].error_samples == ["RuntimeError: deadlock victim"]
+
+
+def test_etl_service_reports_pages():
+    class Source:
+        rows = [{"id": i, "name": f"Artist {i}", "sort_name": None, "country": None} for i in range(1, 6)]
+
+        def fetch_artists_after(self, after_id, limit, before_id=None):
+            return [r for r in self.rows if r["id"] > (after_id or 0)][:limit]
+
+    class Destination:
+        def begin_transaction(self):
+            pass
+
+        def upsert_artists(self, records):
+            return len(list(records))
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    log = EventLog()
+    ETLService(Source(), Destination(), MusicBrainzToDomainMapper(), batch_size=2, hooks=log).run_full_load()
+    assert [(b.entity, b.rows_extracted, b.rows_loaded) for b in log.finished] == [
+        ("Artist", 2, 2), ("Artist", 2, 2), ("Artist", 1, 1)]
+
+
+def test_prometheus_textfile(tmp_path):
+    recorder = MetricsRecorder(bounds=(0.5,))
+    batch = BatchMetrics(uuid4(), 'Genre "x"', 1, rows_extracted=3)
+    recorder.stage_finished(batch, "load", 0.2, 3)
+    batch.finish()
+    recorder.batch_finished(batch)
+    recorder.queue_depth('Genre "x"', "translated", 2)
+
+    text = render(recorder.snapshot())
+    assert '# TYPE etl_stage_duration_seconds histogram' in text
+    assert 'etl_stage_duration_seconds_bucket{entity="Genre \\"x\\"",stage="load",le="0.5"} 1' in text
+    assert 'etl_stage_duration_seconds_bucket{entity="Genre \\"x\\"",stage="load",le="+Inf"} 1' in text
+    assert 'etl_rows_total{entity="Genre \\"x\\"",kind="extracted"} 3' in text
+    assert 'etl_queue_depth{entity="Genre \\"x\\"",queue="translated"} 2' in text
+
+    path = tmp_path / "metrics" / "etl.prom"
+    exporter = PrometheusTextfileExporter(recorder, str(path), min_interval_s=3600)
+    exporter.batch_finished(batch)
+    assert path.read_text(encoding="utf-8") == text
+    recorder.queue_depth('Genre "x"', "translated", 0)
+    exporter.batch_finished(batch)  # throttled
+    assert path.read_text(encoding="utf-8") == text
+    exporter.write()
+    assert 'queue="translated"} 0' in path.read_text(encoding="utf-8")
+    assert [p.name for p in path.parent.iterdir()] == ["etl.prom"]
+
+
+def test_run_audit_inserts_one_row_per_batch():
+    class Conn:
+        def __init__(self):
+            self.executed: list[tuple] = []
+            self.commits = 0
+
+        def execute(self, sql, params=None):
+            self.executed.append((sql, params))
+
+        def commit(self):
+            self.commits += 1
+
+        def rollback(self):
+            pass
+
+    conn = Conn()
+    batch = BatchMetrics(uuid4(), "Artist", 7, rows_extracted=10, rows_inserted=4, rows_updated=5, rows_error=1,
+                         stage_s={"extract": 0.0123, "load": 1.5})
+    batch.finish()
+    SQLServerRunAudit(conn).batch_finished(batch)
+
+    (sql, params), = conn.executed
+    assert sql == INSERT_SQL and conn.commits == 1
+    assert params[:4] == (str(batch.batch_id), "Artist", 7, SUCCEEDED)
+    assert params[7:10] == (12, None, 1500)
+    assert params[10:17] == (10, 0, 4, 5, 0, 0, 1)
+    assert params[4].tzinfo is None
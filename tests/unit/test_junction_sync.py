@@ -0,0 +1,162 @@
+# python
+# File: tests/unit/test_junction_sync.py
+from __future__ import annotations
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from adapters.sqlserver.junction_store import SQLServerJunctionStore
+from adapters.sqlserver.tables import credit_junction
+from application.services.instrumentation import BatchMetrics
+from application.services.junction_sync import (
+    InMemoryJunctionStore, JunctionPage, JunctionSyncLoader, diff_pairs, pack_pairs, unpack_pair,
+)
+from application.services.orchestrator import Orchestrator
+from core.record_batch import INT, Field, RecordBatch
+
+
+class CountingStore(InMemoryJunctionStore):
+    def __init__(self, tables=None):
+        super().__init__(tables)
+        self.applies = []
+
+    def apply(self, table, inserts, deletes):
+        self.applies.append((list(inserts), list(deletes)))
+        super().apply(table, inserts, deletes)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConn:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+        self.many = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        return FakeCursor(self.rows)
+
+    def executemany(self, sql, rows):
+        self.many.append((sql, list(rows)))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_packed_pairs_sort_owner_major_and_diff_into_sorted_deltas():
+    packed = pack_pairs([(2, 1), (1, 7), (1, 3), (1, 3)])
+    assert [unpack_pair(k) for k in packed] == [(1, 3), (1, 7), (2, 1)]
+    inserts, deletes = diff_pairs(packed, pack_pairs([(1, 3), (2, 1), (2, 9)]))
+    assert [unpack_pair(k) for k in inserts] == [(2, 9)]
+    assert [unpack_pair(k) for k in deletes] == [(1, 7)]
+    assert diff_pairs(packed, pack_pairs([(2, 1), (1, 7), (1, 3)])) == (pack_pairs([]), pack_pairs([]))
+    with pytest.raises(ValueError):
+        pack_pairs([(-1, 2)])
+
+
+def test_unchanged_range_reads_but_writes_nothing():
+    pairs = [(o, g) for o in range(10) for g in (1, 2)]
+    store = CountingStore({"ArtistGenre": pairs})
+    result = JunctionSyncLoader(store, "ArtistGenre").load_batch(JunctionPage(0, 10, pairs), uuid4())
+
+    assert (result.inserted, result.deleted, result.skipped) == (0, 0, 20)
+    assert store.applies == []
+
+
+def test_page_is_authoritative_for_its_whole_owner_range():
+    store = CountingStore({"TrackGenre": [(1, 5), (2, 5), (2, 6), (3, 5), (9, 1)]})
+    loader = JunctionSyncLoader(store, "TrackGenre")
+    result = loader.load_batch(JunctionPage(0, 5, [(1, 5), (2, 7), (3, 5)]), uuid4())
+
+    # owner 2 swapped genres; owner 9 lies outside the range and is left alone
+    assert store.pairs("TrackGenre") == {(1, 5), (2, 7), (3, 5), (9, 1)}
+    assert (result.inserted, result.deleted, result.skipped) == (1, 2, 2)
+    assert store.applies == [([(2, 7)], [(2, 5), (2, 6)])]
+    with pytest.raises(ValueError, match="outside the owner range"):
+        loader.sync_range(0, 2, [(2, 1)])
+
+
+def test_plain_rows_only_speak_for_the_owners_they_mention():
+    store = CountingStore({"AlbumGenre": [(1, 1), (2, 1), (3, 1), (3, 2)]})
+    loader = JunctionSyncLoader(store, "AlbumGenre", owner_field="album_id", member_field="genre_id")
+    rows = [{"album_id": 1, "genre_id": 4}, {"album_id": 3, "genre_id": 2}]
+    result = loader.load_batch(rows, uuid4())
+
+    # album 2 sits between the owners of the batch but is not mentioned: untouched
+    assert store.pairs("AlbumGenre") == {(1, 4), (2, 1), (3, 2)}
+    assert (result.inserted, result.deleted) == (1, 2)
+
+
+def test_record_batch_input_and_deleted_counts_reach_the_metrics():
+    store = InMemoryJunctionStore({"ArtistGenre": [(7, 1), (7, 2)]})
+    batch = RecordBatch.from_dicts([Field("owner_id", INT), Field("member_id", INT)],
+                                   [{"owner_id": 7, "member_id": 2}, {"owner_id": 7, "member_id": 3}])
+    result = JunctionSyncLoader(store, "ArtistGenre").load_batch(batch, uuid4())
+
+    assert store.pairs("ArtistGenre") == {(7, 2), (7, 3)}
+    metrics = BatchMetrics(entity="ArtistGenre", batch_id=uuid4())
+    metrics.record_load(result)
+    assert (metrics.rows_inserted, metrics.rows_deleted, metrics.rows_skipped) == (1, 1, 1)
+
+
+def test_sqlserver_store_selects_the_range_and_applies_scoped_deltas():
+    performers = credit_junction(1, "performer")
+    conn = FakeConn(rows=[(10, 3), (10, 4)])
+    store = SQLServerJunctionStore(conn, specs={"TrackPerformer": performers})
+
+    assert store.fetch_pairs("TrackPerformer", 10, 20) == [(10, 3), (10, 4)]
+    select, params = conn.executed[-1]
+    assert "FROM music.Credit" in select and "[TargetId] >= ? AND [TargetId] < ?" in select
+    assert params == (10, 20, 1, "performer")
+
+    store.apply("TrackPerformer", [(10, 5)], [(10, 3)])
+    assert conn.many[0] == ("INSERT INTO #del_Credit (Owner, Member) VALUES (?, ?)", [(10, 3)])
+    delete_sql, delete_params = conn.executed[-1]
+    assert delete_sql.startswith("DELETE t FROM music.Credit AS t JOIN #del_Credit")
+    assert delete_params == (1, "performer")
+    insert_sql, insert_rows = conn.many[1]
+    assert insert_sql == ("INSERT INTO music.Credit ([TargetId], [ArtistId], [TargetType], [Role]) "
+                          "VALUES (?, ?, ?, ?)")
+    assert insert_rows == [(10, 5, 1, "performer")]
+    assert conn.commits == 1
+
+    unscoped = FakeConn()
+    SQLServerJunctionStore(unscoped).apply("ArtistGenre", [(1, 2)], [])
+    assert unscoped.executed == [] and unscoped.many[0][1] == [(1, 2)]
+    with pytest.raises(KeyError):
+        store.fetch_pairs("Nope", 0, 1)
+
+
+def test_orchestrator_runs_pair_rows_through_the_junction_loader():
+    base = datetime(2024, 1, 1)
+    source = [{"artist_id": a, "genre_id": g, "last_updated": base + timedelta(seconds=a)}
+              for a in range(1, 6) for g in (1, 2)]
+
+    class Extractor:
+        def extract_batch(self, since, limit):
+            return [r for r in source if since is None or r["last_updated"] > since][:limit]
+
+    class Translator:
+        def translate_batch(self, items):
+            return [{"owner_id": r["artist_id"], "member_id": r["genre_id"], "source_id": str(r["artist_id"]),
+                     "source_updated_at": r["last_updated"]} for r in items]
+
+    store = InMemoryJunctionStore({"ArtistGenre": [(1, 1), (1, 2), (1, 3), (2, 1)]})
+    Orchestrator(Extractor(), Translator(), JunctionSyncLoader(store, "ArtistGenre"),
+                 batch_size=4).run_full_load(lambda max_ts, batch_id: None)
+
+    assert store.pairs("ArtistGenre") == {(a, g) for a in range(1, 6) for g in (1, 2)}
+    assert (store.inserted, store.deleted) == (7, 1)
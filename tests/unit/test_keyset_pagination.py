@@ -0,0 +1,162 @@
+# python
+# File: tests/unit/test_keyset_pagination.py
+from __future__ import annotations
+
+import pytest
+
+from adapters.postgres.connection import PostgresConnection
+from adapters.postgres.repository import PostgresRepository
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from application.services.etl_service import ETLService
+
+
+class FakeCursor:
+    """DB-API cursor double that answers the artist queries from an in-memory table."""
+
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.description = [("id",), ("name",), ("sort_name",), ("country",)]
+        self.fetch_sizes: list[int] = []
+        self._pending: list[tuple] = []
+        self.closed = False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((self.name, query, dict(params or {})))
+        if "after_id" in params:
+            before = params.get("before_id", float("inf"))
+            rows = [r for r in self.conn.rows if params["after_id"] < r[0] < before]
+        else:
+            rows = self.conn.rows[params["offset"]:]
+        self._pending = rows[:params["limit"]]
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed: list[tuple] = []
+        self.cursors: list[FakeCursor] = []
+
+    def cursor(self, name=None):
+        cur = FakeCursor(self, name)
+        self.cursors.append(cur)
+        return cur
+
+
+class RecordingDestination:
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+
+    def begin_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def upsert_artists(self, records):
+        self.batches.append(list(records))
+        return len(self.batches[-1])
+
+
+@pytest.fixture
+def artist_rows():
+    # ids are sparse on purpose: keyset paging must not assume contiguous keys
+    return [(i * 3, f"Artist {i}", f"{i}, Artist", "GB" if i % 2 else None) for i in range(1, 11)]
+
+
+def _connection(rows, fetch_size=4):
+    raw = FakeConnection(rows)
+    return PostgresConnection("postgresql://test", fetch_size=fetch_size, connect=lambda dsn: raw), raw
+
+
+def test_stream_uses_named_cursor_and_fetch_size(artist_rows):
+    conn, raw = _connection(artist_rows, fetch_size=4)
+    repo = PostgresRepository(conn)
+
+    rows = list(repo.fetch_artists_after(None, 100))
+
+    assert [r["id"] for r in rows] == [r[0] for r in artist_rows]
+    cur = raw.cursors[0]
+    assert cur.name and cur.name.startswith("mbetl_")
+    assert cur.fetch_sizes == [4, 4, 4, 4]
+    assert cur.closed
+
+
+def test_fetch_artists_after_seeks_on_id(artist_rows):
+    conn, raw = _connection(artist_rows)
+    repo = PostgresRepository(conn, fetch_size=2)
+
+    page = list(repo.fetch_artists_after(9, 3))
+
+    assert [r["id"] for r in page] == [12, 15, 18]
+    _, query, params = raw.executed[-1]
+    assert "WHERE a.id > %(after_id)s" in query
+    assert "OFFSET" not in query
+    assert params == {"after_id": 9, "limit": 3}
+
+
+def test_etl_service_keyset_full_load(artist_rows):
+    conn, raw = _connection(artist_rows)
+    dst = RecordingDestination()
+    etl = ETLService(PostgresRepository(conn), dst, MusicBrainzToDomainMapper(), batch_size=4)
+
+    etl.run_full_load()
+
+    assert [len(b) for b in dst.batches] == [4, 4, 2]
+    assert [r["mb_id"] for b in dst.batches for r in b] == [str(r[0]) for r in artist_rows]
+    # each page seeks past the last id of the previous page
+    assert [p["after_id"] for _, _, p in raw.executed] == [0, 12, 24, 30]
+
+
+def test_etl_service_offset_mode_still_supported(artist_rows):
+    conn, raw = _connection(artist_rows)
+    dst = RecordingDestination()
+    etl = ETLService(PostgresRepository(conn), dst, MusicBrainzToDomainMapper(), batch_size=4, pagination="offset")
+
+    etl.run_full_load()
+
+    assert sum(len(b) for b in dst.batches) == len(artist_rows)
+    assert [p["offset"] for _, _, p in raw.executed] == [0, 4, 8, 10]
+
+
+def test_unknown_pagination_mode_rejected():
+    with pytest.raises(ValueError):
+        ETLService(None, None, None, pagination="cursor")
+
+
+def test_etl_service_restricted_to_key_range(artist_rows):
+    from application.services.partitioned import KeyRange, PartitionedRunner, split_key_range
+
+    conn, raw = _connection(artist_rows)
+    dst = RecordingDestination()
+    etl = ETLService(PostgresRepository(conn), dst, MusicBrainzToDomainMapper(), batch_size=2)
+
+    etl.run_full_load(key_range=KeyRange(9, 19))
+
+    assert [r["mb_id"] for b in dst.batches for r in b] == ["9", "12", "15", "18"]
+    assert all(p["before_id"] == 19 for _, _, p in raw.executed)
+
+    # one service per range, driven concurrently, covers the table exactly once
+    dsts = {}
+
+    def run_partition(key_range):
+        pconn, _ = _connection(artist_rows)
+        dsts[key_range] = RecordingDestination()
+        ETLService(PostgresRepository(pconn), dsts[key_range], MusicBrainzToDomainMapper(),
+                   batch_size=2).run_full_load(key_range=key_range)
+
+    results = PartitionedRunner(run_partition).run(split_key_range(1, 31, 3))
+    assert all(r.succeeded for r in results)
+    loaded = sorted(int(r["mb_id"]) for d in dsts.values() for b in d.batches for r in b)
+    assert loaded == [r[0] for r in artist_rows]
@@ -0,0 +1,116 @@
+# python
+# File: tests/unit/test_lookup_cache.py
+from __future__ import annotations
+
+import pytest
+
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from application.services.lookup_cache import DEFAULT_INDEXES, LookupCache
+from application.services.orchestrator import Orchestrator
+from core.models import Artist
+from core.ports.etl_ports import LoadResult
+from .conftest import MockGenreExtractor, MockGenreTranslator, GenreIn
+
+
+class FakeLookupSource:
+    tables = {
+        "Country": {("Name", "CountryCode"): [("United Kingdom", "GB", 1), ("Iceland", "IS", 2), ("Unknown", None, 3)]},
+        "Genre": {("Name",): [("Rock", 10), ("Post-Rock", 11)]},
+        "Label": {("Name", "CountryId"): [("Warp", 1, 20), ("Warp", None, 21)]},
+    }
+
+    def __init__(self):
+        self.queries: list[tuple[str, tuple]] = []
+
+    def fetch_lookup_ids(self, table, key_columns):
+        self.queries.append((table, tuple(key_columns)))
+        return self.tables.get(table, {}).get(tuple(key_columns), [])
+
+
+def test_preload_issues_one_query_per_table():
+    source = FakeLookupSource()
+    cache = LookupCache()
+
+    loaded = cache.preload(source)
+
+    assert sorted(t for t, _ in source.queries) == sorted({ix.table for ix in DEFAULT_INDEXES})
+    assert ("Country", ("Name", "CountryCode")) in source.queries
+    assert loaded["Country"] == 3 and loaded["CountryCode"] == 2
+    assert cache.resolve("CountryCode", "gb") == 1
+    assert cache.resolve("Label", ("WARP", None)) == 21
+
+
+def test_resolve_many_reports_misses_and_counts_hits():
+    cache = LookupCache()
+    cache.preload(FakeLookupSource(), tables=["Genre"])
+
+    res = cache.resolve_many("Genre", ["rock", " Post-Rock ", "jazz", None, "Jazz", "ROCK"])
+
+    assert res.ids == [10, 11, None, None, None, 10]
+    assert res.misses == ["jazz", "Jazz"]
+    stats = cache.stats()["Genre"]
+    assert (stats.hits, stats.misses) == (3, 2)
+    assert stats.hit_ratio == pytest.approx(0.6)
+
+
+def test_update_from_merge_output_ids():
+    cache = LookupCache()
+    cache.update_from_result("Genre", LoadResult(inserted=1, updated=0, errors=[], ids={"Shoegaze": 42}))
+    assert cache.resolve("Genre", "shoegaze") == 42
+
+    with pytest.raises(KeyError):
+        cache.update("Instrument", {"Guitar": 1})
+
+
+def test_update_from_merge_output_rows_refreshes_every_index_of_the_table():
+    cache = LookupCache()
+    cache.update_from_result("Country", LoadResult(
+        inserted=2, updated=0, errors=[], ids={"Norway": 7, "Kosovo": 8},
+        rows=[({"Name": "Norway", "CountryCode": "NO"}, 7), ({"Name": "Kosovo", "CountryCode": None}, 8)]))
+
+    assert cache.resolve("Country", "norway") == 7
+    assert cache.resolve("CountryCode", "no") == 7
+    assert cache.resolve("Country", "Kosovo") == 8
+    assert len(cache) == 3
+
+
+def test_orchestrator_publishes_loader_ids(sample_genres):
+    class IdAssigningLoader:
+        def __init__(self):
+            self.next_id = 100
+
+        def load_batch(self, items, batch_id):
+            ids = {}
+            for it in items:
+                ids[it.name] = self.next_id
+                self.next_id += 1
+            return LoadResult(inserted=len(ids), updated=0, errors=[], ids=ids)
+
+    cache = LookupCache()
+    orch = Orchestrator[GenreIn, object](
+        MockGenreExtractor(sample_genres), MockGenreTranslator(), IdAssigningLoader(),
+        lookup_cache=cache, lookup_index="Genre")
+    state = {"ts": None}
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return state["ts"]
+        state["ts"] = max_ts
+
+    orch.run_full_load(persist)
+
+    assert cache.resolve_many("Genre", ["rock", "progressive rock", "electronic"]).ids == [100, 101, 102]
+
+
+def test_mapper_resolves_country_column_through_cache():
+    cache = LookupCache()
+    cache.preload(FakeLookupSource(), tables=["Country"])
+    mapper = MusicBrainzToDomainMapper(cache)
+    artists = [Artist(id="1", name="Björk", country="IS"), Artist(id="2", name="Boards of Canada", country="GB"),
+               Artist(id="3", name="Nobody", country="ZZ"), Artist(id="4", name="Anon")]
+
+    rows = mapper.map_artists_to_destination(artists)
+
+    assert [r["country_id"] for r in rows] == [2, 1, None, None]
+    assert cache.stats()["CountryCode"].misses == 1
+    assert MusicBrainzToDomainMapper().map_artist_to_destination(artists[0])["country_id"] is None
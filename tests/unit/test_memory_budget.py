@@ -0,0 +1,139 @@
+# python
+# File: tests/unit/test_memory_budget.py
+from __future__ import annotations
+import os
+import threading
+import time
+
+import pytest
+
+from adapters.local.prometheus_textfile import render
+from application.services.instrumentation import MetricsRecorder
+from application.services.memory_budget import MemoryBudget, estimate_bytes, iter_chunks
+from application.services.orchestrator import Orchestrator
+from .conftest import MockGenreLoader, MockGenreTranslator, GenreIn, GenreOut, make_genres
+
+
+class GreedyGenreExtractor:
+    """Timestamp-only extractor that ignores `limit`, streaming every newer row."""
+
+    def __init__(self, rows):
+        self._rows = sorted(rows, key=lambda r: r.last_updated)
+        self.pulled = 0
+
+    def extract_batch(self, since, limit):
+        for row in self._rows:
+            if since is None or row.last_updated > since:
+                self.pulled += 1
+                yield row
+
+
+class RecordingLoader(MockGenreLoader):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.batches = []
+        self.delay = delay
+
+    def load_batch(self, items, batch_id):
+        items = list(items)
+        self.batches.append([int(i.source_id) for i in items])
+        time.sleep(self.delay)
+        return super().load_batch(items, batch_id)
+
+
+def _persist_recorder():
+    persisted = []
+    return persisted, lambda max_ts, batch_id: persisted.append(max_ts)
+
+
+def test_iter_chunks_bounds_rows_and_bytes_and_pulls_lazily():
+    pulled = []
+
+    def rows():
+        for i in range(1000):
+            pulled.append(i)
+            yield {"id": i, "payload": "y" * 200}
+
+    chunks = iter_chunks(rows(), limit=300, chunk_bytes=64 * 2**10)
+    first = next(chunks)
+    per_row = estimate_bytes(first) // len(first)
+    assert len(first) < 300 and len(first) * per_row <= 2 * 64 * 2**10
+    assert len(pulled) == len(first)
+    rest = list(chunks)
+    assert sum(map(len, rest)) + len(first) == 1000
+    assert [len(c) for c in iter_chunks(range(7), limit=3, chunk_bytes=2**20)] == [3, 3, 1]
+
+
+def test_reserve_waits_for_release_and_admits_an_oversized_chunk_alone():
+    budget = MemoryBudget(100)
+    assert budget.try_reserve(250)  # nothing in flight: granted, reported
+    assert not budget.try_reserve(1)
+    released = threading.Timer(0.1, budget.release, (250,))
+    released.start()
+    assert budget.reserve(60)
+    assert budget.report.blocked_s >= 0.05
+    assert budget.report.oversized_chunks == 1 and budget.report.peak_bytes == 250
+    stop = threading.Event()
+    stop.set()
+    assert budget.reserve(60, stop) is False
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
+
+
+def test_sequential_run_streams_an_over_long_page_in_chunks(caplog):
+    rows = make_genres(50, width=500)
+    extractor = GreedyGenreExtractor(rows)
+    loader = RecordingLoader()
+    budget = MemoryBudget(64 * 2**10, chunk_bytes=8 * 2**10)
+    orch = Orchestrator[GenreIn, GenreOut](extractor, MockGenreTranslator(), loader, batch_size=20,
+                                           memory_budget=budget, entity_name="Genre")
+    persisted, persist = _persist_recorder()
+
+    orch.run_full_load(persist)
+
+    assert sorted(i for b in loader.batches for i in b) == list(range(50))
+    assert max(map(len, loader.batches)) < 20 and len(loader.batches) > 3
+    # the whole page is one watermark step, persisted once after its last chunk loaded
+    assert persisted == [rows[-1].last_updated]
+    report = orch.memory_report
+    assert 0 < report.peak_bytes <= budget.budget_bytes and report.spilled_chunks == 0
+    assert "loading them in chunks" in caplog.text
+
+
+def test_pipelined_run_spills_over_budget_chunks_and_loads_them_in_order(tmp_path):
+    rows = make_genres(200, width=1000)
+    loader = RecordingLoader(delay=0.01)
+    budget = MemoryBudget(32 * 2**10, spill_dir=str(tmp_path), chunk_bytes=8 * 2**10)
+    recorder = MetricsRecorder()
+    orch = Orchestrator[GenreIn, GenreOut](GreedyGenreExtractor(rows), MockGenreTranslator(), loader,
+                                           batch_size=50, pipelined=True, queue_depth=64,
+                                           memory_budget=budget, hooks=recorder, entity_name="Genre")
+    persisted, persist = _persist_recorder()
+
+    orch.run_full_load(persist)
+
+    assert [i for b in loader.batches for i in b] == list(range(200))
+    assert persisted == [rows[-1].last_updated]
+    report = orch.memory_report
+    assert report.spilled_chunks > 0 and report.spilled_rows > 0
+    assert report.peak_bytes <= budget.budget_bytes + budget.chunk_bytes
+    assert os.listdir(tmp_path) == []
+    assert recorder.snapshot()["Genre"].memory_peak_bytes == report.peak_bytes
+    assert f'etl_spilled_chunks_total{{entity="Genre"}} {report.spilled_chunks}' in render(recorder.snapshot())
+
+
+def test_budget_does_not_change_the_result_of_a_paged_run():
+    rows = make_genres(30, width=10)
+
+    class PagedExtractor:
+        def extract_batch(self, since, limit):
+            return [r for r in rows if since is None or r.last_updated > since][:limit]
+
+    results = []
+    for budget in (None, MemoryBudget(2**20)):
+        loader = RecordingLoader()
+        persisted, persist = _persist_recorder()
+        Orchestrator[GenreIn, GenreOut](PagedExtractor(), MockGenreTranslator(), loader, batch_size=7,
+                                        memory_budget=budget).run_full_load(persist)
+        results.append((loader.batches, persisted))
+    assert results[0] == results[1]
@@ -0,0 +1,253 @@
+# python
+# File: tests/unit/test_merge_loader.py
+from __future__ import annotations
+from uuid import UUID
+
+import pytest
+
+from adapters.sqlserver.connection import SQLServerConnection
+from adapters.sqlserver.merge_loader import BulkMergeLoader, SqlServerMergeDialect
+from adapters.sqlserver.repository import SQLServerRepository
+from adapters.sqlserver.tables import TABLES
+from application.services.simple_examples import CountryOut
+from core.normalization import normalize_name
+
+BATCH = UUID(int=7)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.fast_executemany = False
+        self._result = []
+
+    def execute(self, query, *params):
+        self.conn.log.append(("execute", query))
+        if query.startswith("MERGE"):
+            if self.conn.fail_merge:
+                raise RuntimeError("constraint violation")
+            self._result = self.conn.merge_output
+
+    def executemany(self, query, rows):
+        self.conn.log.append(("executemany", query, list(rows), self.fast_executemany))
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeODBC:
+    def __init__(self, merge_output=(), fail_merge=False):
+        self.merge_output = list(merge_output)
+        self.fail_merge = fail_merge
+        self.log: list[tuple] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _conn(raw):
+    return SQLServerConnection("Driver=test", connect=lambda conn_str: raw)
+
+
+def test_country_batch_is_staged_and_merged_in_four_round_trips():
+    raw = FakeODBC(merge_output=[("INSERT", 1, 1, "United States", "US"),
+                                   ("UPDATE", 2, 2, "United Kingdom", "GB")])
+    loader = BulkMergeLoader(_conn(raw), TABLES["Country"])
+    items = [
+        CountryOut(source_id="1", code="US", name="United States", normalized_name="united states", source_updated_at=None),
+        CountryOut(source_id="2", code="GB", name="United Kingdom", normalized_name="united kingdom", source_updated_at=None),
+    ]
+
+    result = loader.load_batch(items, BATCH)
+
+    kinds = [entry[0] for entry in raw.log]
+    assert kinds == ["execute", "execute", "executemany", "execute"]
+    assert raw.log[1][1].startswith("CREATE TABLE #stg_Country")
+    _, insert_sql, rows, fast = raw.log[2]
+    assert insert_sql.startswith(
+        "INSERT INTO #stg_Country ([BatchId], [SourceId], [Name], [CountryCode], [Description], [NormalizedName])")
+    assert rows == [(str(BATCH), 1, "United States", "US", None, "united states"),
+                    (str(BATCH), 2, "United Kingdom", "GB", None, "united kingdom")]
+    assert fast is True
+    assert raw.log[3][1].endswith("OUTPUT $action, inserted.[CountryId], s.[SourceId], inserted.[Name], "
+                                  "inserted.[CountryCode];")
+    assert raw.commits == 1
+    assert (result.inserted, result.updated) == (1, 1)
+    assert result.ids == {"United States": 1, "United Kingdom": 2}
+    assert result.rows == [({"Name": "United States", "CountryCode": "US"}, 1),
+                           ({"Name": "United Kingdom", "CountryCode": "GB"}, 2)]
+    assert result.source_ids == {1: 1, 2: 2}
+
+
+def test_merge_sql_matches_on_natural_key_with_null_safe_columns():
+    sql = SqlServerMergeDialect().merge_sql(TABLES["Label"])
+
+    assert sql.startswith("MERGE music.Label WITH (HOLDLOCK) AS t")
+    assert "PARTITION BY [NormalizedName] COLLATE Latin1_General_100_CI_AI, [CountryId]" in sql
+    assert "s.[NormalizedName] = REPLACE(REPLACE(REPLACE(TRIM(TRANSLATE(t.[Name], NCHAR(9)" in sql
+    assert "COLLATE Latin1_General_100_CI_AI" in sql
+    assert "(t.[CountryId] = s.[CountryId] OR (t.[CountryId] IS NULL AND s.[CountryId] IS NULL))" in sql
+    assert "EXCEPT SELECT t.[SortName]" in sql
+    assert sql.endswith("OUTPUT $action, inserted.[LabelId], s.[SourceId], inserted.[Name], inserted.[CountryId];")
+
+
+def test_artists_match_on_identifier_then_on_name_country_and_group():
+    sql = SqlServerMergeDialect().merge_sql(TABLES["Artist"])
+
+    assert "LEFT JOIN music.Identifier i ON i.[EntityType] = 1 AND i.[Source] = N'MusicBrainz'" in sql
+    # the natural key resolves only MB ids without a mapping, so a renamed artist keeps its row
+    assert ("WHERE i.[EntityId] IS NULL AND d.[NormalizedName] = REPLACE(REPLACE(REPLACE(TRIM(TRANSLATE(n.[Name], NCHAR(9)"
+            in sql)
+    assert "(n.[CountryId] = d.[CountryId] OR (n.[CountryId] IS NULL AND d.[CountryId] IS NULL))" in sql
+    assert "ON (t.[ArtistId] = s.[MatchedId])" in sql
+    assert "t.[Name] = s.[Name]" in sql.split("WHEN MATCHED")[1]
+    assert "t.[UpdatedUtc] = sysutcdatetime()" in sql
+    assert sql.endswith(
+        "OUTPUT $action, inserted.[ArtistId], s.[SourceId], inserted.[Name], inserted.[CountryId], inserted.[IsGroup];")
+
+
+def test_artist_rename_matches_the_mapped_row_and_keeps_its_mapping():
+    raw = FakeODBC(merge_output=[("UPDATE", 10, 1, "Björk Guðmundsdóttir", 7, False)])
+    loader = BulkMergeLoader(_conn(raw), TABLES["Artist"])
+
+    result = loader.load_batch([{"mb_id": "1", "name": "Björk Guðmundsdóttir", "country_id": 7}], BATCH)
+
+    merge_sql = raw.log[3][1]
+    # one row per resolved target: the mapping wins over any row the new name matches
+    assert ("ROW_NUMBER() OVER (PARTITION BY COALESCE(i.[EntityId], k.[Id]), "
+            "CASE WHEN COALESCE(i.[EntityId], k.[Id]) IS NULL THEN d.[NormalizedName] COLLATE Latin1_General_100_CI_AI END") in merge_sql
+    assert "t.[Name] = s.[Name]" in merge_sql
+    _, identifier_sql, mappings, _ = raw.log[4]
+    assert mappings == [(1, 10, "MusicBrainz", "1", 1, "MusicBrainz", "1")]
+    assert (result.updated, result.source_ids) == (1, {1: 10})
+    assert result.ids == {("Björk Guðmundsdóttir", 7, False): 10}
+
+
+def test_artists_colliding_on_natural_key_are_all_mapped_to_one_row():
+    # MB ids 1 and 2 share (Name, CountryId, IsGroup): the MERGE keeps one, and every staged MB id
+    # the MERGE returned nothing for is mapped through the key afterwards
+    raw = FakeODBC(merge_output=[("INSERT", 10, 2, "Nirvana", None, True)])
+    loader = BulkMergeLoader(_conn(raw), TABLES["Artist"])
+
+    result = loader.load_batch([{"mb_id": "1", "name": "Nirvana", "is_group": True},
+                                {"mb_id": "2", "name": "NIRVANA", "is_group": True}], BATCH)
+
+    kinds = [entry[0] for entry in raw.log]
+    assert kinds == ["execute", "execute", "executemany", "execute", "executemany", "execute"]
+    assert [row[1] for row in raw.log[2][2]] == [1, 2]
+    assert raw.log[4][2] == [(1, 10, "MusicBrainz", "2", 1, "MusicBrainz", "2")]
+    by_key = raw.log[5][1]
+    assert by_key.startswith("INSERT INTO music.Identifier ([EntityType], [EntityId], [Source], [Value], [IsPrimary])\n"
+                             "SELECT 1, k.[Id], N'MusicBrainz', CAST(d.[SourceId] AS nvarchar(120)), 1")
+    assert "FROM #stg_Artist WHERE [SourceId] IS NOT NULL" in by_key
+    assert "WHERE d.[NormalizedName] = REPLACE(REPLACE(REPLACE(TRIM(TRANSLATE(n.[Name], NCHAR(9)" in by_key
+    assert "AND NOT EXISTS (SELECT 1 FROM music.Identifier i" in by_key
+    assert raw.commits == 1
+    assert result.inserted == 1 and result.source_ids == {2: 10}
+
+
+def test_names_apart_only_by_a_non_latin_mark_are_staged_apart_but_merged_as_one():
+    raw = FakeODBC(merge_output=[("INSERT", 3, None, "Иорк", None)])
+    loader = BulkMergeLoader(_conn(raw), TABLES["Label"])
+
+    loader.load_batch([{"name": "Йорк"}, {"name": "Иорк"}], BATCH)
+
+    # normalize_name keeps the breve of "й"; the _AI collation the MERGE compares under does not
+    assert [row[-1] for row in raw.log[2][2]] == ["йорк", "иорк"]
+    merge_sql = raw.log[3][1]
+    on = merge_sql.split("ON (", 1)[1].split(")\nWHEN", 1)[0]
+    assert on.startswith("s.[NormalizedName] = ") and "COLLATE Latin1_General_100_CI_AI" in on
+    # so staging is deduplicated under that collation: one source row, not two matching one target
+    assert "PARTITION BY [NormalizedName] COLLATE Latin1_General_100_CI_AI, [CountryId]" in merge_sql
+
+
+def test_match_sql_collapses_the_whitespace_normalize_name_splits_on():
+    sql = SqlServerMergeDialect().match_sql("t.[Name]")
+
+    spaced = sql.split("TRANSLATE(t.[Name], ", 1)[1].split(")), ", 1)[0]
+    chars, spaces = spaced.rsplit(", ", 1)
+    codes = [int(c[len("NCHAR("):-1]) for c in chars.split(" + ")]
+    assert {9, 10, 13, 160, 0x3000} <= set(codes)
+    assert spaces == "N'" + " " * len(codes) + "'"
+    assert all(normalize_name(f"a{chr(c)}b") == "a b" for c in codes)
+
+
+def test_key_only_table_has_no_update_branch():
+    sql = SqlServerMergeDialect().merge_sql(TABLES["Tag"])
+    assert "WHEN MATCHED" not in sql
+    assert "INSERT ([Name]) VALUES (s.[Name])" in sql
+
+
+def test_recordings_match_on_identifier_then_isrc_never_on_title():
+    sql = SqlServerMergeDialect().merge_sql(TABLES["Recording"])
+
+    assert "LEFT JOIN music.Identifier i ON i.[EntityType] = 2 AND i.[Source] = N'MusicBrainz'" in sql
+    assert "WHERE i.[EntityId] IS NULL AND n.[ISRC] = d.[ISRC]" in sql
+    assert "ON (t.[RecordingId] = s.[MatchedId])" in sql
+    assert "PARTITION BY COALESCE([SourceId], -[RowNo])" in sql
+    # a NULL ISRC matches nothing, so those new rows are never deduplicated against each other
+    assert "CASE WHEN COALESCE(i.[EntityId], k.[Id]) IS NULL THEN CASE WHEN d.[ISRC] IS NULL THEN d.[RowNo] END END" in sql
+    assert "[Name] =" not in sql.split("WHEN MATCHED")[0]
+
+
+def test_albums_match_on_identifier_only_and_record_new_mappings():
+    raw = FakeODBC(merge_output=[("INSERT", 5, 700), ("UPDATE", 6, 701), ("INSERT", 7, None)])
+    loader = BulkMergeLoader(_conn(raw), TABLES["Album"])
+
+    result = loader.load_batch([{"source_id": 700, "name": "Live", "primary_artist_id": 1},
+                                {"source_id": 701, "name": "Live", "primary_artist_id": 1},
+                                {"name": "Live", "primary_artist_id": 1}], BATCH)
+
+    merge_sql = raw.log[3][1]
+    assert "ON (t.[AlbumId] = s.[MatchedId])" in merge_sql
+    assert merge_sql.endswith("OUTPUT $action, inserted.[AlbumId], s.[SourceId];")
+    _, identifier_sql, mappings, _ = raw.log[4]
+    assert identifier_sql.startswith("INSERT INTO music.Identifier")
+    assert mappings == [(3, 5, "MusicBrainz", "700", 3, "MusicBrainz", "700"),
+                        (3, 6, "MusicBrainz", "701", 3, "MusicBrainz", "701")]
+    assert (result.inserted, result.updated) == (2, 1)
+    assert result.ids == {} and result.source_ids == {700: 5, 701: 6}
+
+
+def test_row_defaults_fill_not_null_columns():
+    values = TABLES["Artist"].row_values({"name": "Björk", "country_id": 7})
+    assert values == ("Björk", "Björk", None, False, None, 7, None)
+    assert TABLES["Artist"].key_of(values) == ("Björk", 7, False)
+    # the text key is matched on the key translators and LookupCache use
+    assert TABLES["Artist"].match_values(values) == ("bjork",)
+
+
+def test_failed_merge_rolls_back_batch():
+    raw = FakeODBC(fail_merge=True)
+    loader = BulkMergeLoader(_conn(raw), TABLES["Genre"])
+
+    with pytest.raises(RuntimeError):
+        loader.load_batch([{"name": "Rock"}], BATCH)
+    assert (raw.commits, raw.rollbacks) == (0, 1)
+
+
+def test_empty_batch_skips_round_trips():
+    raw = FakeODBC()
+    result = BulkMergeLoader(_conn(raw), TABLES["Genre"]).load_batch([], BATCH)
+    assert raw.log == [] and result.inserted == result.updated == 0
+
+
+def test_repository_upsert_leaves_transaction_to_caller():
+    raw = FakeODBC(merge_output=[("INSERT", 10, 1, "Björk", None, False), ("INSERT", 11, 2, "Sigur Rós", None, True)])
+    repo = SQLServerRepository(_conn(raw))
+
+    repo.begin_transaction()
+    affected = repo.upsert_artists([{"mb_id": "1", "name": "Björk"}, {"mb_id": "2", "name": "Sigur Rós", "is_group": True}])
+
+    assert affected == 2
+    assert raw.commits == 0
+    repo.commit()
+    assert raw.commits == 1
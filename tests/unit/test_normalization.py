@@ -0,0 +1,53 @@
+# python
+# File: tests/unit/test_normalization.py
+from __future__ import annotations
+
+import pytest
+
+from application.services.lookup_cache import normalize_key
+from application.services.simple_examples import CountryIn, CountryTranslator
+from core.normalization import NameNormalizer, normalize_name
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("  Progressive   Rock ", "progressive rock"),
+    ("Björk", "bjork"),
+    ("Sigur Rós", "sigur ros"),
+    ("Mötley Crüe", "motley crue"),
+    ("Mu\u0301m", "mum"),                # decomposed input folds like the composed one
+    ("Røyksopp", "royksopp"),
+    ("Łona", "lona"),
+    ("ＡＢＣ Straße", "abc strasse"),             # full-width letters and sharp s
+    ("Кино Й", "кино й"),                       # Cyrillic keeps its marks
+    ("ザ・ブルーハーツ", "ザ・ブルーハーツ"),           # so does kana with dakuten
+    (None, None),
+])
+def test_normalize_name_rules(raw, expected):
+    assert normalize_name(raw) == expected
+
+
+def test_lookup_keys_are_the_translators_normalized_names():
+    assert normalize_key(" BJÖRK ") == normalize_key("Bjork") == normalize_name("Björk")
+    assert normalize_key(("Warp  Records", None)) == ("warp records", None)
+
+
+def test_normalize_many_memoizes_repeated_names():
+    normalizer = NameNormalizer(maxsize=8)
+
+    out = normalizer.normalize_many(["Rock", "Jazz", None, "Rock", "Björk", "Rock"])
+
+    assert out == ["rock", "jazz", None, "rock", "bjork", "rock"]
+    info = normalizer.cache_info()
+    assert (info.hits, info.misses) == (2, 4)
+
+
+def test_country_translator_batch_matches_single_item():
+    rows = [CountryIn(mb_id=1, iso_code="is", name=" Ísland ", last_updated=None),
+            CountryIn(mb_id=2, iso_code=None, name="Côte  d'Ivoire", last_updated=None)]
+    translator = CountryTranslator(NameNormalizer())
+
+    batch = translator.translate_batch(rows)
+
+    assert [c.normalized_name for c in batch] == ["island", "cote d'ivoire"]
+    assert batch == [translator.translate(r) for r in rows]
+    assert batch[0].code == "IS" and batch[0].name == "Ísland"
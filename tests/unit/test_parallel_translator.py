@@ -0,0 +1,82 @@
+# python
+# File: tests/unit/test_parallel_translator.py
+from __future__ import annotations
+from datetime import datetime
+
+import pytest
+
+from application.services.orchestrator import Orchestrator
+from application.services.parallel_translator import ParallelTranslator
+from application.services.simple_examples import CountryIn, CountryTranslator, InMemoryLoader
+
+
+def _countries(n):
+    return [CountryIn(mb_id=i, iso_code=f"c{i % 50}", name=f"  Country   {i} ", last_updated=datetime(2020, 1, 1))
+            for i in range(n)]
+
+
+def test_parallel_translation_preserves_order():
+    items = _countries(103)
+    with ParallelTranslator(CountryTranslator(), workers=2, chunk_size=10) as translator:
+        out = translator.translate_batch(items)
+
+    assert out == CountryTranslator().translate_batch(items)
+    assert [o.source_id for o in out] == [str(i) for i in range(103)]
+
+
+def test_small_batches_are_translated_inline():
+    translator = ParallelTranslator(CountryTranslator(), workers=2, chunk_size=50)
+
+    out = translator.translate_batch(iter(_countries(5)))
+
+    assert len(out) == 5
+    assert translator._pool is None
+
+
+def test_batches_up_to_one_chunk_are_translated_inline_by_default():
+    translator = ParallelTranslator(CountryTranslator(), workers=2, chunk_size=4)
+    assert translator.min_parallel_items == 8
+
+    translator.translate_batch(_countries(4))
+    translator.translate_batch(_countries(7))
+    assert translator._pool is None
+    with translator:
+        assert len(translator.translate_batch(_countries(8))) == 8
+        assert translator._pool is not None
+
+
+def test_pool_is_reused_across_batches_and_closed():
+    translator = ParallelTranslator(CountryTranslator(), workers=2, chunk_size=4, min_parallel_items=1)
+    translator.translate_batch(_countries(8))
+    pool = translator._pool
+    translator.translate_batch(_countries(8))
+    assert translator._pool is pool
+
+    translator.close()
+    assert translator._pool is None
+
+
+def test_plugs_into_orchestrator():
+    loader = InMemoryLoader()
+    with ParallelTranslator(CountryTranslator(), workers=2, chunk_size=3, min_parallel_items=1) as translator:
+        orch = Orchestrator(_SinglePassExtractor(_countries(10)), translator, loader, batch_size=100)
+        orch.run_full_load(lambda max_ts, batch_id, read_only=False: None)
+
+    assert len(loader.store) == 10
+
+
+def test_invalid_configuration_rejected():
+    with pytest.raises(ValueError):
+        ParallelTranslator(CountryTranslator(), chunk_size=0)
+    for workers in (0, -1):
+        with pytest.raises(ValueError):
+            ParallelTranslator(CountryTranslator(), workers=workers)
+
+
+class _SinglePassExtractor:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def extract_batch(self, since, limit):
+        rows, self._rows = self._rows, []
+        return rows
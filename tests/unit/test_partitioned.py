@@ -0,0 +1,141 @@
+# python
+# File: tests/unit/test_partitioned.py
+from __future__ import annotations
+from datetime import datetime
+
+import pytest
+
+from application.services.partitioned import (
+    KeyRange, PartitionedOrchestrator, PartitionWatermarks, split_key_range,
+)
+from core.watermark import Watermark
+from .conftest import MockGenreTranslator, MockGenreLoader, GenreIn, make_genres
+
+
+class RangeGenreExtractor:
+    """Extractor over one id range that honours `limit`."""
+
+    def __init__(self, rows, key_range: KeyRange):
+        self._rows = sorted((r for r in rows if r.mb_id in key_range), key=lambda r: r.last_updated)
+
+    def extract_batch(self, since, limit):
+        return [r for r in self._rows if since is None or r.last_updated > since][:limit]
+
+
+@pytest.fixture
+def genres():
+    return make_genres(100)
+
+
+def test_split_key_range_covers_space_without_overlap():
+    ranges = split_key_range(0, 10, 3)
+    assert ranges == [KeyRange(0, 4), KeyRange(4, 7), KeyRange(7, 10)]
+    assert split_key_range(0, 2, 8) == [KeyRange(0, 1), KeyRange(1, 2)]
+    with pytest.raises(ValueError):
+        split_key_range(5, 5, 2)
+
+
+def test_partitions_load_concurrently_with_own_watermarks(genres):
+    loaders = {}
+
+    def loader_factory(key_range):
+        loaders[key_range] = MockGenreLoader()
+        return loaders[key_range]
+
+    watermarks = PartitionWatermarks()
+    runner = PartitionedOrchestrator(
+        lambda r: RangeGenreExtractor(genres, r), MockGenreTranslator(), loader_factory, watermarks, batch_size=7)
+    partitions = split_key_range(0, 100, 4)
+
+    results = runner.run(partitions)
+
+    assert all(r.succeeded for r in results)
+    assert sum(len(loader.store) for loader in loaders.values()) == 100
+    for key_range in partitions:
+        assert watermarks.get(key_range) == genres[key_range.hi - 1].last_updated
+
+
+def test_failed_partition_resumes_without_redoing_others(genres):
+    partitions = split_key_range(0, 100, 4)
+    broken = partitions[2]
+    calls = {"extracts": {}}
+
+    class CountingExtractor(RangeGenreExtractor):
+        def __init__(self, rows, key_range):
+            super().__init__(rows, key_range)
+            self.key_range = key_range
+
+        def extract_batch(self, since, limit):
+            batch = super().extract_batch(since, limit)
+            calls["extracts"].setdefault(self.key_range, []).extend(batch)
+            return batch
+
+    class FlakyLoader(MockGenreLoader):
+        fail = True
+
+        def load_batch(self, items, batch_id):
+            items = list(items)
+            if FlakyLoader.fail and any(it.source_id == "60" for it in items):
+                raise RuntimeError("deadlock victim")
+            return super().load_batch(items, batch_id)
+
+    watermarks = PartitionWatermarks()
+    runner = PartitionedOrchestrator(
+        lambda r: CountingExtractor(genres, r), MockGenreTranslator(), lambda r: FlakyLoader(),
+        watermarks, batch_size=5, max_retries=0)
+
+    first = runner.run(partitions)
+    assert [r.succeeded for r in first] == [True, True, False, True]
+    assert isinstance(first[2].error, RuntimeError)
+    # the broken partition committed the batches before the poison batch
+    assert watermarks.get(broken) == genres[59].last_updated
+
+    FlakyLoader.fail = False
+    calls["extracts"].clear()
+    second = runner.run(partitions)
+
+    assert all(r.succeeded for r in second)
+    assert watermarks.get(broken) == genres[74].last_updated
+    # finished partitions extracted nothing new; the broken one resumed at its watermark
+    assert all(not calls["extracts"].get(r) for r in partitions if r != broken)
+    assert [int(g.mb_id) for g in calls["extracts"][broken]] == list(range(60, 75))
+
+
+def test_partition_failing_inside_a_tie_group_resumes_after_its_last_loaded_row():
+    stamp = datetime(2020, 1, 1)
+    # one edit burst: every row carries the same timestamp
+    burst = [GenreIn(mb_id=i, name=f"Genre {i}", last_updated=stamp) for i in range(20)]
+    partition = KeyRange(0, 20)
+    extracted = []
+
+    class SeekingExtractor:
+        seeks_watermark = True
+
+        def extract_batch(self, since, limit):
+            rows = [r for r in burst if since is None or since.precedes(r.last_updated, r.mb_id)][:limit]
+            extracted.extend(rows)
+            return rows
+
+    class FlakyLoader(MockGenreLoader):
+        fail = True
+
+        def load_batch(self, items, batch_id):
+            items = list(items)
+            if FlakyLoader.fail and any(it.source_id == "12" for it in items):
+                raise RuntimeError("deadlock victim")
+            return super().load_batch(items, batch_id)
+
+    watermarks = PartitionWatermarks()
+    runner = PartitionedOrchestrator(
+        lambda r: SeekingExtractor(), MockGenreTranslator(), lambda r: FlakyLoader(),
+        watermarks, batch_size=5, max_retries=0)
+
+    assert [r.succeeded for r in runner.run([partition])] == [False]
+    assert watermarks.watermark(partition) == Watermark(stamp, "9")
+    assert watermarks.get(partition) == stamp
+
+    FlakyLoader.fail = False
+    extracted.clear()
+    assert [r.succeeded for r in runner.run([partition])] == [True]
+    assert [g.mb_id for g in extracted] == list(range(10, 20))
+    assert watermarks.watermark(partition) == Watermark(stamp, "19")
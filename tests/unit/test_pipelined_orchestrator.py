@@ -0,0 +1,109 @@
+# python
+# File: tests/unit/test_pipelined_orchestrator.py
+from __future__ import annotations
+import threading
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from application.services.orchestrator import Orchestrator
+from .conftest import MockGenreTranslator, MockGenreLoader, PagedGenreExtractor, GenreIn, GenreOut, make_genres
+
+
+def _watermark_recorder():
+    persisted: list[tuple[datetime | None, UUID | None]] = []
+
+    def persist_watermark_fn(max_ts, batch_id, read_only=False):
+        if read_only:
+            return persisted[-1][0] if persisted else None
+        persisted.append((max_ts, batch_id))
+        return max_ts
+
+    return persisted, persist_watermark_fn
+
+
+def test_pipelined_loads_every_batch_and_persists_watermarks_in_order():
+    rows = make_genres(10)
+    loader = MockGenreLoader()
+    orch = Orchestrator[GenreIn, GenreOut](
+        PagedGenreExtractor(rows), MockGenreTranslator(), loader, batch_size=3, pipelined=True)
+    persisted, persist = _watermark_recorder()
+
+    orch.run_full_load(persist)
+
+    assert len(loader.store) == 10
+    timestamps = [ts for ts, _ in persisted]
+    assert len(timestamps) == 4
+    assert timestamps == sorted(timestamps)
+    assert timestamps[-1] == rows[-1].last_updated
+    assert len({bid for _, bid in persisted}) == 4
+
+
+def test_pipelined_matches_sequential_result():
+    rows = make_genres(7)
+    results = []
+    for pipelined in (False, True):
+        loader = MockGenreLoader()
+        orch = Orchestrator[GenreIn, GenreOut](
+            PagedGenreExtractor(rows), MockGenreTranslator(), loader, batch_size=2, pipelined=pipelined)
+        persisted, persist = _watermark_recorder()
+        orch.run_full_load(persist)
+        results.append((loader.store, [ts for ts, _ in persisted]))
+    assert results[0] == results[1]
+
+
+def test_next_batch_is_extracted_while_previous_batch_loads():
+    rows = make_genres(4)
+    second_extract = threading.Event()
+
+    class SignallingExtractor(PagedGenreExtractor):
+        def extract_batch(self, since, limit):
+            if self.calls == 1:
+                second_extract.set()
+            return super().extract_batch(since, limit)
+
+    class BlockingLoader(MockGenreLoader):
+        def load_batch(self, items, batch_id):
+            # the first load only finishes once the next extract has started
+            if not second_extract.is_set():
+                assert second_extract.wait(timeout=5), "extract did not overlap with load"
+            return super().load_batch(items, batch_id)
+
+    loader = BlockingLoader()
+    orch = Orchestrator[GenreIn, GenreOut](
+        SignallingExtractor(rows), MockGenreTranslator(), loader, batch_size=2, pipelined=True)
+    _, persist = _watermark_recorder()
+
+    orch.run_full_load(persist)
+
+    assert len(loader.store) == 4
+
+
+def test_pipelined_load_failure_stops_run_without_persisting():
+    class FailingLoader:
+        def load_batch(self, items, batch_id):
+            raise RuntimeError("destination down")
+
+    orch = Orchestrator[GenreIn, GenreOut](
+        PagedGenreExtractor(make_genres(9)), MockGenreTranslator(), FailingLoader(),
+        batch_size=3, max_retries=1, pipelined=True)
+    persisted, persist = _watermark_recorder()
+
+    with pytest.raises(RuntimeError, match="destination down"):
+        orch.run_full_load(persist)
+    assert persisted == []
+
+
+def test_pipelined_translate_failure_is_reraised():
+    class FailingTranslator(MockGenreTranslator):
+        def translate_batch(self, items):
+            raise ValueError("bad payload")
+
+    orch = Orchestrator[GenreIn, GenreOut](
+        PagedGenreExtractor(make_genres(5)), FailingTranslator(), MockGenreLoader(), batch_size=2, pipelined=True)
+    _, persist = _watermark_recorder()
+
+    with pytest.raises(ValueError, match="bad payload"):
+        orch.run_full_load(persist)
+
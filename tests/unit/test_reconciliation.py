@@ -0,0 +1,151 @@
+# python
+# File: tests/unit/test_reconciliation.py
+from __future__ import annotations
+
+import pytest
+
+from adapters.sqlserver.row_range import SQLServerRowRange
+from adapters.sqlserver.tables import TABLES
+from adapters.synthetic.sqlite import SQLiteDestination, SQLiteRowRange, SQLiteSource
+from application.services.reconciliation import Reconciler, digest_chunks, row_digest
+
+
+def artists(n, start=1):
+    return [{"id": i, "name": f"Artist {i}", "sort_name": f"{i}, Artist", "country": "GB" if i % 3 else None,
+             "last_updated": "2024-01-01"} for i in range(start, start + n)]
+
+
+class ListSide:
+    """Row-streaming side (no digest pushdown) that records the ranges it was asked for."""
+
+    def __init__(self, rows):
+        self.rows = sorted(rows)
+        self.ranges = []
+
+    def key_range(self):
+        return (self.rows[0][0], self.rows[-1][0]) if self.rows else None
+
+    def rows_between(self, lo, hi):
+        self.ranges.append((lo, hi))
+        return [r for r in self.rows if lo <= r[0] < hi]
+
+
+@pytest.fixture
+def pair():
+    source = SQLiteSource()
+    source.populate(artists(5000))
+    destination = SQLiteDestination()
+    destination.upsert_artists({"mb_id": a["id"], "name": a["name"], "sort_name": a["sort_name"],
+                                "country": a["country"], "country_id": None} for a in artists(5000))
+    columns = ("name", "sort_name", "country")
+    yield (source, destination, SQLiteRowRange(source.connection, "artist", "id", columns),
+           SQLiteRowRange(destination.connection, "artist", "mb_id", columns))
+    source.close()
+    destination.close()
+
+
+def test_digests_are_order_independent_and_value_sensitive():
+    rows = [(1, "a", None), (2, "b", 3), (12, "c", 1.5)]
+    assert digest_chunks(rows, 0, 10) == digest_chunks(reversed(rows), 0, 10)
+    assert set(digest_chunks(rows, 0, 10)) == {0, 1}
+    assert row_digest((1, "a", None)) != row_digest((1, "a", ""))
+    assert row_digest((1, "a")) == row_digest([1, "a"])
+    assert 0 <= row_digest((2, "b")) < 2**64
+
+
+def test_identical_tables_need_one_pass_and_no_rows(pair):
+    *_, source, destination = pair
+    report = Reconciler(source, destination, "Artist", chunk_width=1000).run()
+
+    assert report.in_sync
+    assert (report.lo, report.hi, report.chunks) == (1, 5001, 5)
+    assert (report.mismatched_chunks, report.ranges_drilled, report.rows_read) == (0, 0, 0)
+
+
+def test_reports_exactly_the_missing_extra_and_drifted_ids(pair):
+    src_table, dst_table, source, destination = pair
+    db = dst_table.connection
+    db.execute("DELETE FROM artist WHERE mb_id IN (17, 4242)")
+    db.execute("UPDATE artist SET name = 'Artist 2500 ' WHERE mb_id = 2500")
+    db.execute("UPDATE artist SET country = NULL WHERE mb_id = 2501")
+    db.execute("INSERT INTO artist VALUES (7000, 'Ghost', 'Ghost', NULL, NULL)")
+
+    report = Reconciler(source, destination, "Artist", chunk_width=1000, leaf_rows=16).run()
+
+    assert report.missing == [17, 4242]
+    assert report.extra == [7000]
+    assert report.drifted == [2500, 2501]
+    assert (report.lo, report.hi) == (1, 7001)
+    # 4 of the 6 non-empty top-level chunks differ; each is narrowed down before rows are read
+    assert (report.chunks, report.mismatched_chunks) == (6, 4)
+    assert 0 < report.rows_read < 200
+
+
+def test_only_mismatched_ranges_are_streamed_and_projection_applies_to_the_source():
+    source = ListSide([(i, f"name {i}".upper()) for i in range(100)])
+    destination = ListSide([(i, "other" if i == 64 else f"name {i}") for i in range(100) if i != 63])
+
+    report = Reconciler(source, destination, chunk_width=32, leaf_rows=4,
+                        project=lambda r: (r[0], r[1].lower())).run()
+
+    assert (report.missing, report.extra, report.drifted) == ([63], [], [64])
+    first_pass, *drilled = source.ranges
+    assert first_pass == (0, 100)
+    assert drilled and all(32 <= lo and hi <= 96 for lo, hi in drilled)
+    assert drilled[-1][1] - drilled[-1][0] <= 4
+
+
+def test_bounds_and_empty_sides():
+    empty = ListSide([])
+    assert Reconciler(empty, ListSide([])).run().chunks == 0
+    report = Reconciler(ListSide([(5, "x"), (6, "y")]), empty, leaf_rows=1).run(lo=6, hi=7)
+    assert (report.missing, report.extra) == ([6], [])
+    with pytest.raises(ValueError):
+        Reconciler(empty, empty, leaf_rows=0)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchmany(self, size):
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        return FakeCursor(self.rows)
+
+
+def test_sqlserver_side_keys_rows_by_their_musicbrainz_identifier():
+    conn = FakeConn([("10", "A", 3), ("11", "B", None)])
+    side = SQLServerRowRange(conn, TABLES["Artist"], columns=("Name", "CountryId"), fetch_size=1)
+
+    assert list(side.rows_between(10, 20)) == [(10, "A", 3), (11, "B", None)]
+    sql, params = conn.executed[-1]
+    assert "JOIN music.Artist t ON t.[ArtistId] = i.[EntityId]" in sql and "t.[Name], t.[CountryId]" in sql
+    assert params == (1, "MusicBrainz", 10, 20)
+    assert "TRY_CAST(i.[Value] AS bigint) >= ?" in sql
+    conn.rows = [(None, None)]
+    assert side.key_range() is None
+
+
+def test_sqlserver_side_seeks_on_a_persisted_key_column():
+    conn = FakeConn([(10, "A", 3)])
+    side = SQLServerRowRange(conn, TABLES["Artist"], columns=("Name", "CountryId"), key_column="SourceKey")
+
+    assert list(side.rows_between(10, 20)) == [(10, "A", 3)]
+    sql, _ = conn.executed[-1]
+    assert "i.[SourceKey] >= ? AND i.[SourceKey] < ?" in sql and "TRY_CAST" not in sql
+    conn.rows = [(10, 11)]
+    assert side.key_range() == (10, 11)
+    assert "MIN(i.[SourceKey])" in conn.executed[-1][0]
@@ -0,0 +1,147 @@
+# python
+# File: tests/unit/test_record_batch.py
+from __future__ import annotations
+from array import array
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from adapters.postgres.connection import PostgresConnection
+from adapters.postgres.repository import ARTIST_FIELDS, PostgresRepository
+from adapters.sqlserver.tables import TABLES
+from application.services.change_detection import ChangeDetector, InMemoryRowHashStore
+from application.services.etl_service import ETLService
+from application.services.lookup_cache import LookupCache
+from application.services.orchestrator import Orchestrator
+from core.models import Artist
+from core.ports.etl_ports import LoadResult
+from core.record_batch import BOOL, INT, STR, Field, RecordBatch
+
+ARTISTS = [(1, "Björk", "Björk", "IS"), (2, "Sigur Rós", None, "IS"), (3, "Anon", "Anon", None)]
+
+
+def test_columns_are_typed_buffers_with_null_masks():
+    batch = RecordBatch.from_rows(ARTIST_FIELDS, ARTISTS)
+
+    assert len(batch) == 3 and batch.names == ("id", "name", "sort_name", "country")
+    assert isinstance(batch["id"].data, array) and batch["id"].nulls is None
+    assert batch["country"].to_list() == ["IS", "IS", None]
+    assert batch["country"].null_count == 1
+    assert list(batch.rows(["id", "sort_name"])) == [(1, "Björk"), (2, None), (3, "Anon")]
+    assert batch.row(1) == {"id": 2, "name": "Sigur Rós", "sort_name": None, "country": "IS"}
+
+
+def test_typed_nulls_and_derivations():
+    flags = RecordBatch.from_columns([Field("id", INT), Field("is_group", BOOL)], [[1, None, 3], [True, False, None]])
+    assert flags["id"].to_list() == [1, None, 3]
+    assert flags["is_group"].to_list() == [True, False, None]
+
+    taken = flags.take([2, 0])
+    assert taken.to_dicts() == [{"id": 3, "is_group": None}, {"id": 1, "is_group": True}]
+    assert flags.slice(1).to_dicts() == [{"id": None, "is_group": False}, {"id": 3, "is_group": None}]
+
+    renamed = flags.rename({"id": "mb_id"})
+    assert renamed["mb_id"].data is flags["id"].data
+    with pytest.raises(ValueError):
+        RecordBatch.from_columns([Field("a", INT), Field("b", STR)], [[1], ["x", "y"]])
+
+
+def test_models_are_slotted():
+    with pytest.raises(AttributeError):
+        Artist(id="1", name="x").extra = 1  # type: ignore[attr-defined]
+
+
+def test_merge_loader_rows_match_dict_path():
+    spec = TABLES["Artist"]
+    dicts = [{"mb_id": "1", "name": "Björk", "country_id": 7}, {"mb_id": "2", "name": "Sigur Rós", "sort_name": "Rós"}]
+    batch = RecordBatch.from_columns(
+        [Field("mb_id", INT), Field("name", STR), Field("sort_name", STR), Field("country_id", INT)],
+        [[1, 2], ["Björk", "Sigur Rós"], [None, "Rós"], [7, None]])
+
+    columnar = list(zip(spec.batch_source_ids(batch), *spec.batch_columns(batch)))
+    per_row = [(spec.source_id_of(d),) + spec.row_values(d) for d in dicts]
+
+    assert columnar == per_row
+
+
+class ChunkConnection(PostgresConnection):
+    def __init__(self, rows):
+        super().__init__("postgresql://test")
+        self.rows = rows
+
+    def stream_chunks(self, query, params=None, fetch_size=None):
+        rows = [r for r in self.rows if r[0] > params["after_id"]][:params["limit"]]
+        for i in range(0, len(rows), 2):
+            yield ["id", "name", "sort_name", "country"], rows[i:i + 2]
+
+
+def test_columnar_etl_service_load():
+    class Destination:
+        def __init__(self):
+            self.batches = []
+
+        def begin_transaction(self):
+            pass
+
+        def upsert_artists(self, records):
+            self.batches.append(records)
+            return len(records)
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+    lookups = LookupCache()
+    lookups.update("CountryCode", {"IS": 352})
+    dst = Destination()
+    detector = ChangeDetector(InMemoryRowHashStore(), "Artist")
+    etl = ETLService(PostgresRepository(ChunkConnection(ARTISTS)), dst, MusicBrainzToDomainMapper(lookups),
+                     batch_size=2, columnar=True, change_detector=detector)
+
+    assert etl.run_full_load() == 0
+    assert etl.run_full_load() == 3
+
+    assert all(isinstance(b, RecordBatch) for b in dst.batches)
+    assert [b["mb_id"].to_list() for b in dst.batches] == [[1, 2], [3]]
+    assert dst.batches[0]["country_id"].to_list() == [352, 352]
+    with pytest.raises(ValueError):
+        ETLService(None, None, None, pagination="offset", columnar=True)
+
+
+def test_orchestrator_passes_record_batches_through():
+    fields = [Field("source_id", INT), Field("name", STR), Field("source_updated_at")]
+    rows = [(i, f"Genre {i}", datetime(2024, 1, i)) for i in range(1, 6)]
+
+    class BatchExtractor:
+        def extract_batch(self, since, limit):
+            return RecordBatch.from_rows(fields, [r for r in rows if since is None or r[2] > since][:limit])
+
+    class UpperTranslator:
+        def translate_batch(self, batch):
+            return batch.with_column(Field("name", STR), (n.upper() for n in batch["name"]))
+
+    class BatchLoader:
+        def __init__(self):
+            self.loaded = []
+
+        def load_batch(self, items, batch_id):
+            assert isinstance(batch_id, UUID)
+            self.loaded.append(items)
+            return LoadResult(inserted=len(items), updated=0, errors=[])
+
+    loader = BatchLoader()
+    watermarks = []
+
+    def persist(max_ts, batch_id, read_only=False):
+        if read_only:
+            return watermarks[-1]
+        watermarks.append(max_ts)
+
+    Orchestrator(BatchExtractor(), UpperTranslator(), loader, batch_size=2).run_full_load(persist)
+
+    assert [b["name"].to_list() for b in loader.loaded] == [["GENRE 1", "GENRE 2"], ["GENRE 3", "GENRE 4"], ["GENRE 5"]]
+    assert watermarks == [datetime(2024, 1, 2), datetime(2024, 1, 4), datetime(2024, 1, 5)]
@@ -0,0 +1,103 @@
+# python
+# File: tests/unit/test_scheduler.py
+from __future__ import annotations
+import threading
+import time
+
+import pytest
+
+from application.services.scheduler import (
+    FAILED, MUSIC_COLLECTION_DAG, SKIPPED, SUCCEEDED, DagScheduler, PipelineNode, build_nodes,
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def pipeline(self, name, seconds=0.02, fail=False):
+        def run():
+            with self.lock:
+                self.events.append(("start", name))
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(seconds)
+            with self.lock:
+                self.active -= 1
+                self.events.append(("end", name))
+            if fail:
+                raise RuntimeError(f"{name} failed")
+        return run
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+def test_nodes_start_after_parents_commit_and_lookups_run_together():
+    rec = Recorder()
+    names = ["Country", "ArtistType", "Genre", "MediumFormat", "Tag", "Website", "Label", "Artist", "ArtistGenre"]
+    nodes = build_nodes({n: rec.pipeline(n) for n in names})
+
+    report = DagScheduler(nodes).run()
+
+    assert report.succeeded
+    assert rec.peak >= 6
+    assert rec.index("start", "Label") > rec.index("end", "Country")
+    assert rec.index("start", "Artist") > max(rec.index("end", "Country"), rec.index("end", "ArtistType"))
+    assert rec.index("start", "ArtistGenre") > max(rec.index("end", "Artist"), rec.index("end", "Genre"))
+
+
+def test_failure_skips_only_descendants():
+    rec = Recorder()
+    nodes = build_nodes({
+        "Country": rec.pipeline("Country"),
+        "ArtistType": rec.pipeline("ArtistType", fail=True),
+        "Genre": rec.pipeline("Genre"),
+        "Label": rec.pipeline("Label"),
+        "Artist": rec.pipeline("Artist"),
+        "ArtistGenre": rec.pipeline("ArtistGenre"),
+    })
+
+    report = DagScheduler(nodes).run()
+
+    status = {name: r.status for name, r in report.results.items()}
+    assert status == {"Country": SUCCEEDED, "ArtistType": FAILED, "Genre": SUCCEEDED, "Label": SUCCEEDED,
+                      "Artist": SKIPPED, "ArtistGenre": SKIPPED}
+    assert not report.succeeded
+    assert isinstance(report.results["ArtistType"].error, RuntimeError)
+
+
+def test_critical_path_follows_the_slowest_chain():
+    rec = Recorder()
+    nodes = [
+        PipelineNode("a", rec.pipeline("a", 0.01)),
+        PipelineNode("b", rec.pipeline("b", 0.08)),
+        PipelineNode("c", rec.pipeline("c", 0.01), depends_on=("a", "b")),
+        PipelineNode("d", rec.pipeline("d", 0.02), depends_on=("a",)),
+    ]
+
+    report = DagScheduler(nodes).run()
+
+    assert report.critical_path == ["b", "c"]
+    assert report.critical_path_s >= 0.09
+    assert "critical path" in report.summary()
+
+
+def test_absent_entities_are_bypassed_transitively():
+    nodes = {n.name: n for n in build_nodes({"Edition": lambda: None, "Recording": lambda: None,
+                                             "Track": lambda: None})}
+    assert nodes["Track"].depends_on == ("Edition", "Recording")
+    assert nodes["Edition"].depends_on == ()
+
+
+def test_graph_validation():
+    with pytest.raises(ValueError, match="cycle"):
+        DagScheduler([PipelineNode("a", lambda: None, ("b",)), PipelineNode("b", lambda: None, ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        DagScheduler([PipelineNode("a", lambda: None, ("zzz",))])
+    with pytest.raises(ValueError):
+        build_nodes({"Playlist": lambda: None})
+    assert DagScheduler(build_nodes({n: (lambda: None) for n in MUSIC_COLLECTION_DAG})).run().succeeded
@@ -0,0 +1,157 @@
+# python
+# File: tests/unit/test_spool.py
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from adapters.local.spool import SpoolExtractor, SpoolingExtractor, SpoolReader, SpoolWriter
+from adapters.synthetic.generator import SyntheticMusicBrainz
+from adapters.synthetic.memory import InMemoryExtractor
+from core.record_batch import BOOL, FLOAT, INT, OBJECT, STR, Field, RecordBatch
+from .conftest import GenreIn
+
+FIELDS = [Field("id", INT), Field("score", FLOAT), Field("active", BOOL), Field("name", STR),
+          Field("last_updated", OBJECT), Field("tags", OBJECT)]
+
+
+def _batch(start, n):
+    base = datetime(2024, 1, 1)
+    rows = [{"id": i, "score": i / 2, "active": i % 2 == 0, "name": None if i % 5 == 0 else f"Näme {i}",
+             "last_updated": base + timedelta(minutes=i), "tags": ["rock", i] if i % 3 else None}
+            for i in range(start, start + n)]
+    return RecordBatch.from_dicts(FIELDS, rows), rows
+
+
+def test_round_trip_preserves_types_and_nulls_with_zero_copy_numeric_columns(tmp_path):
+    batch, rows = _batch(0, 50)
+    writer = SpoolWriter(str(tmp_path), "artist", ts_field="last_updated", durable=False)
+    entry = writer.append(batch)
+
+    with SpoolReader(str(tmp_path), "artist") as reader:
+        back = reader.read(entry.batch_id)
+        assert back.to_dicts() == rows
+        assert [f.type for f in back.fields] == [INT, FLOAT, BOOL, STR, OBJECT, OBJECT]
+        assert isinstance(back["id"].data, memoryview) and isinstance(back["score"].data, memoryview)
+        assert (entry.rows, entry.min_ts, entry.max_ts) == (50, rows[0]["last_updated"], rows[-1]["last_updated"])
+        del back
+
+
+def test_index_finds_batches_by_id_and_watermark_range(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "artist", ts_field="last_updated", durable=False)
+    ids = [uuid4() for _ in range(3)]
+    for i, batch_id in enumerate(ids):
+        writer.append(_batch(i * 100, 100)[0], batch_id=batch_id)
+
+    reader = SpoolReader(str(tmp_path), "artist")
+    assert reader.find(ids[1]).rows == 100 and reader.find(uuid4()) is None
+    base = datetime(2024, 1, 1)
+    hit = reader.entries_between(base + timedelta(minutes=150), base + timedelta(minutes=210))
+    assert [e.batch_id for e in hit] == ids[1:]
+    assert reader.entries_between(base + timedelta(minutes=299)) == []
+    reader.close()
+
+
+def test_dict_and_dataclass_rows_are_typed_by_inference(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "genre", ts_field="last_updated", durable=False)
+    ts = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    entry = writer.append([GenreIn(mb_id=1, name="rock", last_updated=ts),
+                           GenreIn(mb_id=2, name="jazz", last_updated=None)])
+
+    reader = SpoolReader(str(tmp_path), "genre")
+    back = reader.read(entry)
+    assert [(f.name, f.type) for f in back.fields] == [("mb_id", INT), ("name", STR), ("last_updated", OBJECT)]
+    assert [GenreIn(**r) for r in back.to_dicts()] == [GenreIn(1, "rock", ts), GenreIn(2, "jazz", None)]
+    assert entry.max_ts == datetime(2024, 3, 1)  # aware watermarks are indexed as UTC
+    del back
+    reader.close()
+
+
+def test_segments_roll_over_and_reader_picks_up_appends(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "artist", segment_bytes=4096, durable=False)
+    reader = SpoolReader(str(tmp_path), "artist")
+    assert len(reader) == 0
+    entries = [writer.append(_batch(i * 40, 40)[0]) for i in range(4)]
+    assert len({e.segment for e in entries}) > 1
+
+    assert reader.refresh() == 4 and reader.rows == 160
+    assert [r["id"] for _, b in reader.iter_batches() for r in b.to_dicts()] == list(range(160))
+    # a writer reopening the spool continues after the last segment
+    assert SpoolWriter(str(tmp_path), "artist", segment_bytes=4096, durable=False).append(
+        _batch(160, 1)[0]).segment == entries[-1].segment
+    reader.close()
+
+
+def test_torn_index_record_and_unindexed_block_are_ignored(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "artist", durable=False)
+    writer.append(_batch(0, 10)[0])
+    writer.append(_batch(10, 10)[0])
+    index = tmp_path / "artist.index"
+    data = index.read_bytes()
+    index.write_bytes(data[:-20])  # crash while writing the second index record
+
+    reader = SpoolReader(str(tmp_path), "artist")
+    assert len(reader) == 1
+    # the orphaned block is overwritten by nothing; the next append lands after it and is visible
+    index.write_bytes(data[:64])
+    entry = writer.append(_batch(20, 5)[0])
+    assert reader.refresh() == 1 and reader.read(entry)["id"].to_list() == list(range(20, 25))
+    reader.close()
+
+
+def test_corrupt_block_fails_the_crc_check(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "artist", durable=False)
+    entry = writer.append(_batch(0, 10)[0])
+    segment = next(tmp_path.glob("*.seg"))
+    raw = bytearray(segment.read_bytes())
+    raw[entry.offset + entry.length - 3] ^= 0xFF
+    segment.write_bytes(bytes(raw))
+
+    reader = SpoolReader(str(tmp_path), "artist")
+    with pytest.raises(ValueError, match="CRC"):
+        reader.read(entry)
+    reader.close()
+
+
+def test_replay_serves_the_same_pages_as_the_original_extract(tmp_path):
+    # one row per timestamp, so paging by timestamp never skips ties at a page boundary
+    tracks = list({r["last_updated"]: r for r in SyntheticMusicBrainz(scale=300, seed=3).recordings()}.values())
+    source = InMemoryExtractor(tracks)
+    writer = SpoolWriter(str(tmp_path), "recording", ts_field="last_updated", durable=False)
+    spooling = SpoolingExtractor(source, writer)
+
+    def drain(extractor, limit):
+        pages, since = [], None
+        while True:
+            page = extractor.extract_batch(since=since, limit=limit)
+            if not len(page):
+                return pages
+            pages.append(page)
+            since = max(r["last_updated"] for r in page)
+
+    original = drain(spooling, 64)
+    reader = SpoolReader(str(tmp_path), "recording")
+    assert len(reader) == len(original) and reader.rows == sum(len(p) for p in original)
+    assert drain(SpoolExtractor(reader, "last_updated"), 64) == original
+    # a smaller page size splits spooled batches; pages never straddle two of them
+    replayed = drain(SpoolExtractor(reader, "last_updated"), 25)
+    assert [r for p in replayed for r in p] == [r for p in original for r in p]
+    assert len(replayed) == len(original) * 3 and max(len(p) for p in replayed) == 25
+    resumed = SpoolExtractor(reader, "last_updated", columnar=True).extract_batch(
+        since=original[1][10]["last_updated"], limit=1000)
+    assert isinstance(resumed, RecordBatch) and resumed.to_dicts() == [
+        r for r in original[1] if r["last_updated"] > original[1][10]["last_updated"]]
+    del resumed
+    reader.close()
+
+
+def test_spools_without_a_watermark_refuse_to_replay(tmp_path):
+    writer = SpoolWriter(str(tmp_path), "artist", durable=False)
+    writer.append(_batch(0, 5)[0])
+
+    with SpoolReader(str(tmp_path), "artist") as reader:
+        with pytest.raises(ValueError, match="no last_updated watermark"):
+            SpoolExtractor(reader, "last_updated").extract_batch(None, 10)
+    with pytest.raises(ValueError, match="ts_field"):
+        SpoolingExtractor(InMemoryExtractor([]), writer)
@@ -0,0 +1,96 @@
+# python
+# File: tests/unit/test_streaming_join.py
+from __future__ import annotations
+import os
+import random
+from datetime import datetime
+
+import pytest
+
+from adapters.local.identifier_index import MmapIdentifierIndex
+from application.services.streaming_join import ExternalSorter, StreamingTrackJoin
+from core.ports.etl_ports import LoadResult
+
+BASE = datetime(2024, 1, 1)
+
+
+def _tracks(n, media=40, recordings=60, seed=3):
+    rnd = random.Random(seed)
+    return [{"id": i, "medium_id": rnd.randrange(media), "recording_id": 1000 + rnd.randrange(recordings),
+             "position": i % 12 + 1, "name": f"Track {i}", "length_ms": 1000 * i, "last_updated": BASE}
+            for i in range(n)]
+
+
+@pytest.fixture
+def spill(tmp_path):
+    path = tmp_path / "spill"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def identifiers(tmp_path):
+    index = MmapIdentifierIndex(str(tmp_path / "ids"), durable=False)
+    index.rebuild("Disc", ((m, 500 + m) for m in range(40)))
+    index.rebuild("Recording", ((1000 + r, 9000 + r) for r in range(60)))
+    yield index
+    index.close()
+
+
+def test_external_sorter_spills_runs_and_merges_them_in_order(spill):
+    rows = [(random.Random(i).randrange(10_000), i) for i in range(5000)]
+    sorter = ExternalSorter(key=lambda r: r[0], memory_budget_bytes=20_000, spill_dir=str(spill), fan_in=4)
+    sorter.extend(rows)
+    assert sorter.spilled_runs > 4  # forces intermediate merges at fan_in=4
+
+    assert list(sorter.sorted()) == sorted(rows, key=lambda r: r[0])
+    assert os.listdir(spill) == []
+
+
+def test_external_sorter_stays_in_memory_under_budget(spill):
+    sorter = ExternalSorter(key=lambda r: r, spill_dir=str(spill))
+    sorter.extend([3, 1, 2])
+    assert list(sorter.sorted()) == [1, 2, 3] and sorter.spilled_runs == 0
+    assert os.listdir(spill) == []
+
+
+@pytest.mark.parametrize("budget", [10 ** 8, 30_000])
+def test_track_join_matches_an_in_memory_join_in_or_out_of_budget(identifiers, spill, budget):
+    tracks = _tracks(3000)
+    join = StreamingTrackJoin(identifiers, memory_budget_bytes=budget, spill_dir=str(spill), batch_size=500)
+    batches = list(join.batches([tracks[:1000], tracks[1000:]]))
+
+    assert [len(b) for b in batches] == [500] * 6
+    out = {r["source_id"]: r for b in batches for r in b}
+    for t in tracks:
+        row = out[t["id"]]
+        assert (row["disc_id"], row["recording_id"]) == (500 + t["medium_id"], 9000 + t["recording_id"] - 1000)
+        assert (row["title"], row["track_number"], row["duration_ms"]) == (t["name"], t["position"], t["length_ms"])
+    # emitted in recording order, i.e. the order of the last merge join
+    flat = [r["recording_id"] for b in batches for r in b]
+    assert flat == sorted(flat)
+    assert (join.stats.spilled_runs > 0) == (budget < 10 ** 8)
+    assert os.listdir(spill) == []
+
+
+def test_tracks_without_parent_identities_are_counted_and_dropped(identifiers):
+    tracks = _tracks(10)
+    tracks[0]["medium_id"] = 99
+    tracks[1]["recording_id"] = 5
+    tracks[2]["recording_id"] = 6
+
+    class Loader:
+        def __init__(self):
+            self.rows = []
+
+        def load_batch(self, items, batch_id):
+            self.rows.extend(items)
+            return LoadResult(inserted=len(items), updated=0, errors=[])
+
+    loader = Loader()
+    join = StreamingTrackJoin(identifiers, batch_size=4)
+    result = join.run(tracks, loader)
+
+    assert result.inserted == 7 and len(loader.rows) == 7
+    assert (join.stats.tracks, join.stats.emitted) == (10, 7)
+    assert (join.stats.unresolved_disc, join.stats.unresolved_recording) == (1, 2)
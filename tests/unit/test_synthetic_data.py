@@ -0,0 +1,85 @@
+# python
+# File: tests/unit/test_synthetic_data.py
+from __future__ import annotations
+from itertools import islice
+
+from adapters.mappers.musicbrainz_to_domain import MusicBrainzToDomainMapper
+from adapters.synthetic.generator import SyntheticMusicBrainz
+from adapters.synthetic.memory import InMemoryDestination, InMemoryExtractor, InMemorySource
+from adapters.synthetic.sqlite import SQLiteDestination, SQLiteSource
+from application.services.etl_service import ETLService
+
+
+def test_generator_is_deterministic_per_seed():
+    a = list(SyntheticMusicBrainz(2000, seed=7).artists())
+    b = list(SyntheticMusicBrainz(2000, seed=7).artists())
+    c = list(SyntheticMusicBrainz(2000, seed=8).artists())
+
+    assert a == b
+    assert a != c
+
+
+def test_streams_are_independent_of_consumption_order():
+    gen = SyntheticMusicBrainz(500, seed=1)
+    recordings_first = list(islice(gen.recordings(), 50))
+    artists = list(gen.artists())
+
+    fresh = SyntheticMusicBrainz(500, seed=1)
+    assert list(islice(fresh.recordings(), 50)) == recordings_first
+    assert [a["id"] for a in artists] == list(fresh.artist_ids())
+
+
+def test_artist_distributions():
+    artists = list(SyntheticMusicBrainz(5000, seed=3).artists())
+    ids = [a["id"] for a in artists]
+    stamps = [a["last_updated"] for a in artists]
+    null_country = sum(a["country"] is None for a in artists) / len(artists)
+    non_ascii = sum(not a["name"].isascii() for a in artists) / len(artists)
+    distinct_names = len({a["name"] for a in artists})
+
+    assert ids == sorted(set(ids))
+    assert stamps == sorted(stamps) and len(set(stamps)) < len(stamps)  # timestamp ties
+    assert 0.25 < null_country < 0.45
+    assert 0.08 < non_ascii < 0.25
+    assert distinct_names < len(artists)  # skewed, repeated names
+
+
+def test_child_rows_reference_generated_parents():
+    gen = SyntheticMusicBrainz(300, seed=5)
+    artist_ids = set(gen.artist_ids())
+    recordings = list(gen.recordings())
+    releases = list(gen.releases())
+
+    assert {r["artist_id"] for r in recordings} <= artist_ids
+    assert {r["artist_id"] for r in releases} <= artist_ids
+    recording_ids = {r["id"] for r in recordings}
+    release_ids = {r["id"] for r in releases}
+    for track in islice(gen.tracks(), 500):
+        assert track["recording_id"] in recording_ids and track["release_id"] in release_ids
+
+
+def test_in_memory_extractor_pages_on_timestamp():
+    rows = list(SyntheticMusicBrainz(200, seed=2).recordings())
+    extractor = InMemoryExtractor(rows)
+
+    first = extractor.extract_batch(None, 10)
+    rest = extractor.extract_batch(first[-1]["last_updated"], 10_000)
+
+    assert len(first) == 10
+    assert all(r["last_updated"] > first[-1]["last_updated"] for r in rest)
+
+
+def test_etl_service_round_trip_in_memory_and_sqlite():
+    artists = list(SyntheticMusicBrainz(1500, seed=11).artists())
+
+    memory_dst = InMemoryDestination()
+    ETLService(InMemorySource(artists), memory_dst, MusicBrainzToDomainMapper(), batch_size=400).run_full_load()
+
+    sqlite_src = SQLiteSource()
+    assert sqlite_src.populate(artists) == len(artists)
+    sqlite_dst = SQLiteDestination()
+    ETLService(sqlite_src, sqlite_dst, MusicBrainzToDomainMapper(), batch_size=400, columnar=True).run_full_load()
+
+    assert sorted(memory_dst.rows) == sorted(a["id"] for a in artists)
+    assert len(sqlite_dst) == len(artists)
+    assert memory_dst.commits == 4
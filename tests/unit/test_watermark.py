@@ -0,0 +1,170 @@
+# python
+# File: tests/unit/test_watermark.py
+from __future__ import annotations
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from adapters.local.checkpoint_store import SQLiteCheckpointStore
+from adapters.local.spool import SpoolExtractor, SpoolReader, SpoolWriter
+from application.services.async_orchestrator import AsyncOrchestrator
+from application.services.orchestrator import Orchestrator
+from core.record_batch import INT, OBJECT, STR, Field, RecordBatch
+from core.watermark import Watermark, max_watermark, persist_watermark
+from .conftest import MockGenreExtractor, MockGenreTranslator, MockGenreLoader, GenreIn, GenreOut, make_genres
+
+BASE = datetime(2020, 1, 1)
+
+
+def _burst(n, distinct=2):
+    """n genres edited in the same few seconds: most rows share a timestamp with others."""
+    return [GenreIn(mb_id=i, name=f"Genre {i}", last_updated=BASE + timedelta(seconds=i % distinct))
+            for i in range(n)]
+
+
+class RecordingExtractor(MockGenreExtractor):
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.pages: list[int] = []
+        self.sinces: list = []
+
+    def extract_batch(self, since, limit):
+        self.sinces.append(since)
+        page = super().extract_batch(since, limit)
+        self.pages.append(len(page))
+        return page
+
+
+def _persist(max_ts, batch_id):
+    pass
+
+
+def test_watermark_orders_by_timestamp_then_numeric_id():
+    assert Watermark(BASE, "9") < Watermark(BASE, 10) < Watermark(BASE, "10a")
+    assert Watermark(BASE, "10") == Watermark(BASE, 10)
+    # a timestamp-only watermark is past every row of its timestamp
+    legacy = Watermark.coerce(BASE)
+    assert legacy > Watermark(BASE, 10 ** 12) and legacy < Watermark(BASE + timedelta(microseconds=1), 0)
+    assert Watermark(BASE, 5).precedes(BASE, 6) and not Watermark(BASE, 5).precedes(BASE, 5)
+    assert not legacy.precedes(None, 1) and Watermark(BASE, "x").int_id is None
+
+
+def test_max_watermark_breaks_timestamp_ties_on_the_source_id():
+    rows = [GenreOut(str(i), "n", "n", BASE + timedelta(seconds=i // 10)) for i in range(25)]
+    assert max_watermark(rows) == Watermark(BASE + timedelta(seconds=2), 24)
+    dicts = [{"source_id": "7", "source_updated_at": BASE}, {"source_id": "12", "source_updated_at": BASE},
+             {"source_id": "99", "source_updated_at": None}]
+    assert max_watermark(dicts) == Watermark(BASE, 12)
+    batch = RecordBatch.from_dicts([Field("source_id", STR), Field("source_updated_at", OBJECT)], dicts)
+    assert max_watermark(batch) == Watermark(BASE, 12)
+    assert max_watermark([{"name": "no timestamp"}]) is None
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_rows_sharing_the_boundary_timestamp_are_all_loaded_in_bounded_batches(pipelined):
+    extractor = RecordingExtractor(_burst(25))
+    loader = MockGenreLoader()
+    Orchestrator[GenreIn, GenreOut](extractor, MockGenreTranslator(), loader, batch_size=4,
+                                    pipelined=pipelined).run_full_load(_persist)
+
+    assert len(loader.store) == 25
+    assert max(extractor.pages) == 4 and sum(extractor.pages) == 25
+    assert all(isinstance(s, Watermark) for s in extractor.sinces[1:])
+
+
+def test_over_long_pages_are_cut_for_seeking_extractors_and_flagged_for_others(caplog):
+    class Unbounded(MockGenreExtractor):
+        def extract_batch(self, since, limit):
+            return super().extract_batch(since, 10 ** 6)
+
+    class LegacyUnbounded:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def extract_batch(self, since, limit):
+            return (r for r in self.rows if since is None or r.last_updated > since)
+
+    loader = MockGenreLoader()
+    orch = Orchestrator[GenreIn, GenreOut](Unbounded(_burst(10)), MockGenreTranslator(), loader, batch_size=3)
+    orch.run_full_load(_persist)
+    assert len(loader.store) == 10
+
+    legacy = MockGenreLoader()
+    with caplog.at_level(logging.WARNING, logger="application.services.orchestrator"):
+        Orchestrator[GenreIn, GenreOut](LegacyUnbounded(make_genres(6)), MockGenreTranslator(), legacy,
+                                        batch_size=2).run_full_load(_persist)
+    assert len(legacy.store) == 6
+    assert "returned 6 rows for limit 2" in caplog.text
+
+
+def test_checkpoint_resumes_inside_a_timestamp_tie_group(tmp_path):
+    class FailOnce(MockGenreLoader):
+        calls = 0
+
+        def load_batch(self, items, batch_id):
+            FailOnce.calls += 1
+            if FailOnce.calls == 3:
+                raise RuntimeError("connection reset")
+            return super().load_batch(items, batch_id)
+
+    store = SQLiteCheckpointStore(str(tmp_path / "cp.sqlite"))
+    rows = _burst(12, distinct=1)  # every row has the same timestamp
+    loader = FailOnce()
+    with pytest.raises(RuntimeError):
+        Orchestrator[GenreIn, GenreOut](MockGenreExtractor(rows), MockGenreTranslator(), loader, batch_size=5,
+                                        max_retries=0, checkpoints=store, entity_name="Genre").run_full_load()
+    cp = store.load("Genre")
+    assert (cp.last_ts, cp.last_key, cp.rows) == (BASE, 9, 10)
+
+    resumed = RecordingExtractor(rows)
+    Orchestrator[GenreIn, GenreOut](resumed, MockGenreTranslator(), loader, batch_size=5,
+                                    checkpoints=store, entity_name="Genre").run_full_load()
+    assert resumed.sinces[0] == Watermark(BASE, 9)
+    assert len(loader.store) == 12 and resumed.pages[0] == 2
+    store.close()
+
+
+def test_async_orchestrator_seeks_on_the_watermark():
+    extractor = RecordingExtractor(_burst(9, distinct=1))
+    loader = MockGenreLoader()
+    batches = asyncio.run(AsyncOrchestrator[GenreIn, GenreOut](
+        extractor, MockGenreTranslator(), loader, batch_size=4).run_full_load(_persist))
+
+    assert batches == 3 and len(loader.store) == 9
+    assert extractor.sinces[1:3] == [Watermark(BASE, 3), Watermark(BASE, 7)]
+
+
+def test_spool_replay_with_an_id_field_pages_through_timestamp_ties(tmp_path):
+    fields = [Field("id", INT), Field("last_updated", OBJECT)]
+    rows = [{"id": i, "last_updated": BASE + timedelta(seconds=i // 4)} for i in range(10)]
+    writer = SpoolWriter(str(tmp_path), "burst", ts_field="last_updated", durable=False)
+    writer.append(RecordBatch.from_dicts(fields, rows[:6]))
+    writer.append(RecordBatch.from_dicts(fields, rows[6:]))
+
+    reader = SpoolReader(str(tmp_path), "burst")
+    extractor = SpoolExtractor(reader, "last_updated", id_field="id")
+    pages, since = [], None
+    while True:
+        page = extractor.extract_batch(since, 3)
+        if not page:
+            break
+        pages.append([r["id"] for r in page])
+        since = Watermark(page[-1]["last_updated"], page[-1]["id"])
+    assert pages == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    # without an id the timestamp-only cursor skips the rest of a tie group
+    assert [r["id"] for r in SpoolExtractor(reader, "last_updated").extract_batch(Watermark(BASE, 1), 10)] == [4, 5]
+    reader.close()
+
+
+def test_persist_watermark_passes_the_watermark_only_to_functions_that_take_it():
+    mark = Watermark(datetime(2020, 1, 1), "7")
+    legacy, full = [], []
+
+    persist_watermark(lambda max_ts, batch_id: legacy.append((max_ts, batch_id)), mark, "b1")
+    persist_watermark(lambda max_ts, batch_id, watermark=None: full.append(watermark), mark, "b2")
+    persist_watermark(lambda *a, **k: full.append(k["watermark"]), None, "b3")
+
+    assert legacy == [(datetime(2020, 1, 1), "b1")]
+    assert full == [mark, None]
@@ -1,5 +1,5 @@
 ﻿# python
-\"\"\"
+"""
 Simple import-edge checker to catch accidental cross-layer imports.
 Run this in CI: python tools/check_imports.py
 It scans imports and asserts:
@@ -8,7 +8,7 @@ It scans imports and asserts:
  - src.adapters may import src.core and src.application and src.infra
  - src.infra imports only stdlib / typing (no app/adapters/core)
 This is a coarse check and should be adapted for your exact package names.
-\"\"\"
+"""
 import ast
 import pathlib
 import sys
@@ -30,7 +30,7 @@ def package_of(path: pathlib.Path) -> str:
     return f'src.{first}' if first else 'src'
 
 def check_file(path: pathlib.Path):
-    text = path.read_text()
+    text = path.read_text(encoding='utf-8-sig')
     tree = ast.parse(text)
     pkg = package_of(path)
     violations = []